@@ -0,0 +1,416 @@
+"""
+비용 예측 기반 요청 승인 제어 (admission control)
+
+요청마다 고정 4000MB로 메모리를 확인하던 방식 대신, 요청별 최대 작업 메모리와 처리 시간을
+오디오 길이(파일 헤더), 프리셋(compute_type/청크 크기/배치 크기), 활성화된 LLM 후처리 단계로 예측하고
+전역 메모리 예산 안에서 승인한다. (엔진 가중치 메모리는 engine_manager 예산에서 별도 관리)
+
+- 예산 안에 들어가면 즉시 승인, 아니면 우선순위 대기열에서 대기 (최대 ADMISSION_MAX_WAIT_SEC)
+- 대기열 정렬: (우선순위 - 대기 시간 / ADMISSION_AGING_SEC, 도착 순서) → 낮은 우선순위도 결국 처리
+- 대기열 맨 앞 요청이 들어갈 수 없으면, 그 요청의 예상 시작 시각 전에 끝날 것으로 예측되는
+  뒤쪽 요청만 먼저 승인 (backfill: 긴 파일 1개와 짧은 파일 여러 개가 유휴 용량 없이 공존)
+- 예상 대기 시간이 최대 대기 시간을 넘거나 대기열이 가득 차면 즉시 거절하고,
+  실행 중/대기 중 요청의 예상 종료 시각으로 계산한 Retry-After를 함께 반환
+- 예측 보정: 프리셋별 실시간 배율(RTF)은 STT 결과로, 전체 처리 시간은 승인~반납 시간으로 EWMA 갱신
+
+API 서버는 단일 이벤트 루프에서 동작하므로 예약량/대기열은 별도 잠금 없이 갱신한다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from api_server.constants import PRESET_SEGMENT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# 16kHz mono float32 디코딩 버퍼 (초당 MB) × 2 (디코딩 결과 + 리샘플/청크 복사본)
+_AUDIO_MB_PER_SEC = 16000 * 4 / MB * 2
+
+# 청크 1초 × 배치 1개당 모델 활성값 메모리 (MB, compute_type별)
+_ACTIVATION_MB_PER_CHUNK_SEC = {"float32": 12.0, "float16": 6.0, "int8": 4.0}
+
+# 프리셋별 기본 실시간 배율 (처리 시간 / 오디오 길이, 실측 STT 결과로 EWMA 갱신)
+_DEFAULT_RTF = {"accuracy": 0.85, "balanced": 0.5, "speed": 0.27, "cpu_int8": 0.5}
+_DEFAULT_RTF_BY_COMPUTE = {"float32": 0.85, "float16": 0.5, "int8": 0.35}
+
+# 우선순위 (작을수록 먼저, 0~9)
+PRIORITY_LEVELS = {"high": 0, "normal": 5, "low": 9}
+
+# EWMA 평활 계수 / 처리 시간 보정 배율 범위
+_EWMA_ALPHA = 0.2
+_CORRECTION_RANGE = (0.25, 4.0)
+
+# RTF 갱신에 사용할 최소 오디오 길이 (초, 짧은 파일은 고정 비용 비중이 커서 제외)
+_MIN_RTF_SAMPLE_SEC = 5.0
+
+
+class AdmissionRejected(RuntimeError):
+    """예산/대기 한도 초과로 승인 거절 (retry_after: 다시 시도할 때까지 권장 대기 시간, 초)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_priority(value: Optional[str]) -> int:
+    """
+    우선순위 값 변환 (high/normal/low 또는 0~9, 알 수 없는 값은 normal)
+
+    Args:
+        value: Form 필드 priority 또는 X-Priority 헤더 값
+
+    Returns:
+        0(가장 먼저) ~ 9
+    """
+    value = (value or "").strip().lower()
+    if value in PRIORITY_LEVELS:
+        return PRIORITY_LEVELS[value]
+    try:
+        return min(max(int(value), 0), 9)
+    except ValueError:
+        return PRIORITY_LEVELS["normal"]
+
+
+class RequestCost:
+    """요청 1건의 예측 비용"""
+
+    __slots__ = ("memory_mb", "service_sec", "duration_sec", "preset", "stages")
+
+    def __init__(self, memory_mb: float, service_sec: float, duration_sec: float,
+                 preset: str, stages: List[str]):
+        self.memory_mb = memory_mb
+        self.service_sec = service_sec
+        self.duration_sec = duration_sec
+        self.preset = preset
+        self.stages = stages
+
+    def to_dict(self) -> Dict:
+        return {
+            "memory_mb": round(self.memory_mb, 1),
+            "service_sec": round(self.service_sec, 2),
+            "duration_sec": round(self.duration_sec, 2),
+            "preset": self.preset,
+            "stages": self.stages
+        }
+
+
+class AdmissionTicket:
+    """승인 대기/승인된 요청 (release()까지 예약 메모리 유지)"""
+
+    def __init__(self, cost: RequestCost, reserved_mb: float, priority: int, seq: int, source: str):
+        self.cost = cost
+        self.reserved_mb = reserved_mb
+        self.priority = priority
+        self.seq = seq
+        self.source = source
+        self.enqueued_at = time.monotonic()
+        self.admitted_at: Optional[float] = None
+        self.future: Optional[asyncio.Future] = None
+        self.detached = False
+        self.released = False
+
+    def detach(self) -> None:
+        """반납 책임을 스트리밍 응답 본문으로 넘김 (의존성 종료 시 반납하지 않음)"""
+        self.detached = True
+
+    @property
+    def waited_sec(self) -> float:
+        return (self.admitted_at or time.monotonic()) - self.enqueued_at
+
+
+class AdmissionController:
+    """전역 메모리 예산 기반 요청 승인 / 우선순위 대기열"""
+
+    def __init__(self):
+        self.budget_mb = 8192.0
+        self.max_wait_sec = 120.0
+        self.max_queue = 64
+        self.aging_sec = 30.0
+        self.base_mb = 300.0
+        self.llm_stage_mb = 64.0
+        self.llm_stage_sec = 10.0
+
+        self._reserved_mb = 0.0
+        self._running: List[AdmissionTicket] = []
+        self._waiting: List[AdmissionTicket] = []
+        self._seq = itertools.count()
+        self._rtf: Dict[str, float] = {}
+        self._correction = 1.0
+        self._recent = deque(maxlen=50)
+        self._stats = {"admitted": 0, "queued": 0, "backfilled": 0, "rejected": 0, "timeouts": 0,
+                       "wait_sec": 0.0}
+
+    def configure(self, budget_mb: float = 0.0, max_wait_sec: float = 120.0, max_queue: int = 64,
+                  aging_sec: float = 30.0, base_mb: float = 300.0, llm_stage_mb: float = 64.0,
+                  llm_stage_sec: float = 10.0, engine_budget_mb: float = 0.0):
+        """
+        예산/대기열 설정
+
+        Args:
+            budget_mb: 동시에 승인할 요청 작업 메모리 합계 (MB, 0이면 시스템 메모리의 85% - 엔진 예산)
+            max_wait_sec: 대기열 최대 대기 시간 (초, 예상 대기가 이보다 길면 즉시 거절)
+            max_queue: 대기열 최대 길이
+            aging_sec: 대기 시간이 이만큼 지날 때마다 우선순위 1단계 상승 (초)
+            base_mb: 요청당 고정 작업 메모리 (MB)
+            llm_stage_mb: LLM 후처리 단계당 메모리 (MB)
+            llm_stage_sec: LLM 후처리 단계당 예상 시간 (초)
+            engine_budget_mb: 엔진 상주 메모리 예산 (budget_mb 자동 계산 시 제외)
+        """
+        if budget_mb <= 0:
+            import psutil
+            total_mb = psutil.virtual_memory().total / MB
+            budget_mb = max(total_mb * 0.85 - engine_budget_mb, 2048.0)
+        self.budget_mb = budget_mb
+        self.max_wait_sec = max_wait_sec
+        self.max_queue = max_queue
+        self.aging_sec = aging_sec
+        self.base_mb = base_mb
+        self.llm_stage_mb = llm_stage_mb
+        self.llm_stage_sec = llm_stage_sec
+        logger.info(f"[Admission] 예산 {budget_mb:.0f}MB, 최대 대기 {max_wait_sec:g}초, 대기열 {max_queue}개, "
+                    f"aging {aging_sec:g}초")
+
+    # ========================================================================
+    # 비용 예측
+    # ========================================================================
+
+    def estimate(self, duration_sec: float, preset: Optional[str], compute_type: Optional[str] = None,
+                 stages: Optional[List[str]] = None) -> RequestCost:
+        """
+        요청 비용 예측
+
+        Args:
+            duration_sec: 오디오 길이 (초, 텍스트 입력이면 0)
+            preset: 프리셋 (없으면 compute_type 기준 기본 청크 설정)
+            compute_type: 엔진 compute_type (프리셋에 없을 때 사용)
+            stages: 활성화된 LLM 후처리 단계
+
+        Returns:
+            RequestCost (memory_mb: 최대 작업 메모리, service_sec: 예상 처리 시간)
+        """
+        stages = stages or []
+        config = PRESET_SEGMENT_CONFIG.get(preset or "", {})
+        compute_type = (config.get("compute_type") or compute_type or "float32").lower()
+        key = preset or "default"
+
+        memory_mb = self.base_mb + self.llm_stage_mb * len(stages)
+        service_sec = self.llm_stage_sec * len(stages)
+        if duration_sec > 0:
+            chunk_sec = config.get("chunk_duration", 30)
+            # 배치 디코딩은 파일의 청크 수보다 많이 묶을 수 없음
+            batch = min(max(config.get("batch_size", 1), 1), max(math.ceil(duration_sec / chunk_sec), 1))
+            activation_mb = _ACTIVATION_MB_PER_CHUNK_SEC.get(compute_type, _ACTIVATION_MB_PER_CHUNK_SEC["float32"])
+            memory_mb += duration_sec * _AUDIO_MB_PER_SEC + chunk_sec * batch * activation_mb
+            rtf = self._rtf.get(key) or _DEFAULT_RTF.get(key) or _DEFAULT_RTF_BY_COMPUTE.get(compute_type, 0.85)
+            service_sec += duration_sec * rtf
+        return RequestCost(memory_mb, max(service_sec, 0.5), duration_sec, key, stages)
+
+    def observe_stt(self, stt, result: Dict, elapsed: float) -> None:
+        """STT 결과로 프리셋별 RTF 갱신 (WhisperSTT.result_observers에 등록)"""
+        duration = result.get("duration") or 0
+        if result.get("cancelled") or result.get("is_dummy") or duration < _MIN_RTF_SAMPLE_SEC:
+            return
+        key = stt.preset or "default"
+        rtf = elapsed / duration
+        previous = self._rtf.get(key)
+        self._rtf[key] = rtf if previous is None else previous + _EWMA_ALPHA * (rtf - previous)
+
+    def _predicted_end(self, ticket: AdmissionTicket, now: float) -> float:
+        # 예측보다 오래 걸리는 요청은 곧 끝난다고 가정 (최소 1초 뒤)
+        expected = ticket.admitted_at + ticket.cost.service_sec * self._correction
+        return max(expected, now + 1.0)
+
+    # ========================================================================
+    # 승인 / 반납
+    # ========================================================================
+
+    async def admit(self, cost: RequestCost, priority: int = PRIORITY_LEVELS["normal"],
+                    source: str = "transcribe") -> AdmissionTicket:
+        """
+        예산 안에서 승인될 때까지 대기
+
+        Args:
+            cost: estimate() 결과
+            priority: 0(가장 먼저) ~ 9
+            source: 로그/상태 표시용 label
+
+        Returns:
+            승인된 AdmissionTicket (처리 후 release() 필수)
+
+        Raises:
+            AdmissionRejected: 대기열 가득 참 / 예상 대기 시간 초과 / 대기 중 시간 초과
+        """
+        # 예산보다 큰 요청은 예산 전체를 예약해 단독 실행
+        ticket = AdmissionTicket(cost, min(cost.memory_mb, self.budget_mb), priority, next(self._seq), source)
+
+        if not self._waiting and self._fits(ticket):
+            self._grant(ticket)
+            return ticket
+
+        # 대기열에 넣고 바로 배정 (backfill로 즉시 승인될 수 있음), 남아 있으면 한도 확인
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._waiting.append(ticket)
+        self._dispatch()
+        if ticket.admitted_at is not None:
+            return ticket
+        if len(self._waiting) > self.max_queue:
+            self._waiting.remove(ticket)
+            raise self._reject(ticket, f"대기열 가득 참 ({self.max_queue}개)")
+        expected_wait = self._simulate_wait(ticket)
+        if expected_wait > self.max_wait_sec:
+            self._waiting.remove(ticket)
+            raise self._reject(ticket, f"예상 대기 {expected_wait:.1f}초 > 최대 {self.max_wait_sec:g}초",
+                               expected_wait)
+
+        self._stats["queued"] += 1
+        logger.info(f"[Admission] 대기열 추가: {cost.duration_sec:.0f}초 오디오, {cost.memory_mb:.0f}MB, "
+                    f"우선순위 {priority}, 예상 대기 {expected_wait:.1f}초 (대기 {len(self._waiting)}개)")
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout=self.max_wait_sec)
+        except asyncio.TimeoutError:
+            if ticket.admitted_at is not None:
+                return ticket
+            self._waiting.remove(ticket)
+            self._stats["timeouts"] += 1
+            raise self._reject(ticket, f"대기 시간 초과 ({self.max_wait_sec:g}초)")
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 등: 대기열에서 빼고, 이미 승인됐으면 반납
+            if ticket.admitted_at is None:
+                self._waiting.remove(ticket)
+                self._dispatch()
+            else:
+                self.release(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """예약 반납 + 처리 시간 보정 + 대기 요청 승인 (중복 호출 무시)"""
+        if ticket.released or ticket.admitted_at is None:
+            return
+        ticket.released = True
+        self._running.remove(ticket)
+        self._reserved_mb -= ticket.reserved_mb
+
+        held = time.monotonic() - ticket.admitted_at
+        if ticket.cost.service_sec >= 1.0:
+            ratio = min(max(held / ticket.cost.service_sec, _CORRECTION_RANGE[0]), _CORRECTION_RANGE[1])
+            self._correction += _EWMA_ALPHA * (ratio - self._correction)
+        self._recent.append({
+            "source": ticket.source, **ticket.cost.to_dict(), "priority": ticket.priority,
+            "waited_sec": round(ticket.waited_sec, 2), "held_sec": round(held, 2)
+        })
+        self._dispatch()
+
+    def _fits(self, ticket: AdmissionTicket) -> bool:
+        return self._reserved_mb + ticket.reserved_mb <= self.budget_mb
+
+    def _grant(self, ticket: AdmissionTicket) -> None:
+        ticket.admitted_at = time.monotonic()
+        self._reserved_mb += ticket.reserved_mb
+        self._running.append(ticket)
+        self._stats["admitted"] += 1
+        self._stats["wait_sec"] += ticket.waited_sec
+        if ticket.future is not None and not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _effective_priority(self, ticket: AdmissionTicket, now: float) -> float:
+        if self.aging_sec <= 0:
+            return ticket.priority
+        return ticket.priority - (now - ticket.enqueued_at) / self.aging_sec
+
+    def _ordered_waiting(self, now: float) -> List[AdmissionTicket]:
+        return sorted(self._waiting, key=lambda t: (self._effective_priority(t, now), t.seq))
+
+    def _dispatch(self) -> None:
+        """대기열 순서대로 승인 (맨 앞이 막히면 그 예상 시작 전에 끝나는 요청만 backfill)"""
+        now = time.monotonic()
+        head_start = None
+        for ticket in self._ordered_waiting(now):
+            if not self._fits(ticket):
+                if head_start is None:
+                    head_start = now + self._simulate_wait(ticket, ahead=[])
+                continue
+            if head_start is not None:
+                if now + ticket.cost.service_sec * self._correction > head_start:
+                    continue
+                self._stats["backfilled"] += 1
+            self._waiting.remove(ticket)
+            self._grant(ticket)
+
+    def _simulate_wait(self, ticket: AdmissionTicket, ahead: Optional[List[AdmissionTicket]] = None) -> float:
+        """
+        실행 중 요청의 예상 종료 시각으로 승인까지 걸릴 시간 예측 (초)
+
+        Args:
+            ticket: 대상 요청
+            ahead: 먼저 승인될 대기 요청 (None이면 현재 대기열에서 우선순위가 앞선 요청 전체)
+        """
+        now = time.monotonic()
+        if ahead is None:
+            key = (self._effective_priority(ticket, now), ticket.seq)
+            ahead = [t for t in self._ordered_waiting(now)
+                     if t is not ticket and (self._effective_priority(t, now), t.seq) < key]
+
+        ends = [(self._predicted_end(t, now), t.reserved_mb) for t in self._running]
+        heapq.heapify(ends)
+        free = self.budget_mb - self._reserved_mb
+        clock = now
+        for item in [*ahead, ticket]:
+            while free < item.reserved_mb and ends:
+                end, memory_mb = heapq.heappop(ends)
+                clock = max(clock, end)
+                free += memory_mb
+            free -= item.reserved_mb
+            heapq.heappush(ends, (clock + item.cost.service_sec * self._correction, item.reserved_mb))
+        return clock - now
+
+    def _reject(self, ticket: AdmissionTicket, reason: str, expected_wait: Optional[float] = None) -> AdmissionRejected:
+        if expected_wait is None:
+            expected_wait = self._simulate_wait(ticket)
+        retry_after = max(int(math.ceil(expected_wait)), 1)
+        self._stats["rejected"] += 1
+        logger.warning(f"[Admission] 거절: {reason} ({ticket.cost.duration_sec:.0f}초 오디오, "
+                       f"{ticket.cost.memory_mb:.0f}MB, Retry-After {retry_after}초)")
+        return AdmissionRejected(f"요청 처리 대기 한도 초과: {reason}", retry_after)
+
+    @property
+    def reserved_mb(self) -> float:
+        return self._reserved_mb
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def status(self) -> Dict:
+        """예산/대기열 현황 (/admin/admission)"""
+        now = time.monotonic()
+        return {
+            "budget_mb": round(self.budget_mb, 1),
+            "reserved_mb": round(self._reserved_mb, 1),
+            "running": len(self._running),
+            "waiting": len(self._waiting),
+            "max_queue": self.max_queue,
+            "max_wait_sec": self.max_wait_sec,
+            "service_time_correction": round(self._correction, 3),
+            "rtf": {key: round(value, 3) for key, value in self._rtf.items()},
+            "queue": [
+                {"source": t.source, **t.cost.to_dict(), "priority": t.priority,
+                 "waited_sec": round(now - t.enqueued_at, 2)}
+                for t in self._ordered_waiting(now)
+            ],
+            "stats": {key: round(value, 3) if isinstance(value, float) else value
+                      for key, value in self._stats.items()},
+            "recent": list(self._recent)
+        }
+
+
+# 전역 인스턴스 생성
+admission = AdmissionController()
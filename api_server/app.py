@@ -13,20 +13,20 @@ FastAPI를 사용한 STT(Speech-to-Text) 서버
 - OpenAI Whisper: 공식 모델명만 (tiny, base, small, medium, large)
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Body, Form, Query, Depends, Request
-from fastapi.responses import JSONResponse, FileResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI, File, UploadFile, HTTPException, Body, Form, Query, Depends, Request, WebSocket
+from fastapi.responses import JSONResponse, FileResponse, Response
 from pathlib import Path
 from typing import Optional
+from contextlib import asynccontextmanager
 import tempfile
 import os
 import sys
 import logging
-import logging.handlers
 import time
 import json
 import wave
 import asyncio
+import hmac
 
 # Docker 환경에서 모듈을 찾을 수 있도록 경로 설정
 app_root = Path(__file__).parent.parent
@@ -35,9 +35,21 @@ if str(app_root) not in sys.path:
 
 from stt_engine import WhisperSTT
 from stt_utils import check_memory_available, check_audio_file
-from utils.performance_monitor import PerformanceMonitor
+from utils.performance_monitor import PerformanceMonitor, resource_sampler
 from api_server.constants import ErrorCode, PRESET_SEGMENT_CONFIG, VLLM_MODEL_NAME
 from api_server.config import FormDataConfig
+from api_server.startup import startup_manager
+from api_server.engine_manager import engine_manager, EngineUnavailableError, ENGINE_MEMORY_BUDGET_MB
+from api_server.admission import admission, AdmissionRejected, parse_priority
+from api_server.response_encoding import response_encoder, FieldSelection
+from api_server.live_transcribe import live_sessions
+from api_server import metrics
+from utils.metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils import tracing
+from utils.tracing import tracer
+from utils.logging_pipeline import log_pipeline, lazy
+from utils.memory_governor import memory_governor
+from api_server.profiler import profiler, ProfilerBusyError, to_collapsed, to_speedscope, render_flamegraph_svg
 from api_server.services.privacy_removal import (
     PrivacyRemovalService,
     _async_get_privacy_removal_service
@@ -45,12 +57,16 @@ from api_server.services.privacy_removal import (
 import torch
 from api_server.transcribe_endpoint import (
     validate_and_prepare_file,
+    audio_duration_hint,
     perform_stt,
+    stream_stt,
     perform_privacy_removal,
     perform_classification,
     build_transcribe_response,
+    format_stream_event,
+    CleanupStreamingResponse,
 )
-from api_server.models import ClassificationResult
+from api_server.models import ClassificationResult, TranscribeResponse
 
 
 # ============================================================================
@@ -68,65 +84,263 @@ def _normalize_model_name(model_name: str) -> str:
 
 
 # 로깅 설정 (환경변수 LOG_LEVEL로 조절 가능)
+# 콘솔/파일 출력은 리스너 스레드에서 처리 (utils/logging_pipeline.py, 요청 스레드는 큐에 넣기만 함)
+# LOG_JSON: 콘솔/파일을 JSON 1줄 형식으로 출력 (기본: false)
+# LOG_QUEUE_SIZE: 출력 대기 레코드 수 한도 (기본: 10000, 초과분은 버림)
+# LOG_RATE_LIMITS: 로거별 초당 최대 INFO/DEBUG 레코드 수 (예: stt_engine=20,*=200, 기본: 제한 없음)
+# LOG_LEVELS: 로거별 레벨 (예: stt_engine=DEBUG,httpx=WARNING)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # 기본값: INFO
 LOG_FORMAT = '[%(asctime)s] %(levelname)s - %(message)s'
 
-# 로그 디렉토리 생성
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
-
-# 루트 로거 설정
-root_logger = logging.getLogger()
-root_logger.setLevel(getattr(logging, LOG_LEVEL))
-
-# 콘솔 핸들러 (중복 정리 + 1개만 유지)
-console_handlers = [
-    h for h in root_logger.handlers
-    if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
-]
-if len(console_handlers) == 0:
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    root_logger.addHandler(console_handler)
-else:
-    console_handlers[0].setFormatter(logging.Formatter(LOG_FORMAT))
-    for extra_handler in console_handlers[1:]:
-        root_logger.removeHandler(extra_handler)
-
-# 파일 핸들러 (api_server.log 중복 정리 + 1개만 유지)
-api_file_handlers = [
-    h for h in root_logger.handlers
-    if isinstance(h, logging.handlers.RotatingFileHandler)
-    and Path(getattr(h, "baseFilename", "")).name == "api_server.log"
-]
-if len(api_file_handlers) == 0:
-    file_handler = logging.handlers.RotatingFileHandler(
-        LOG_DIR / "api_server.log",
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    root_logger.addHandler(file_handler)
-else:
-    api_file_handlers[0].setFormatter(logging.Formatter(LOG_FORMAT))
-    for extra_handler in api_file_handlers[1:]:
-        root_logger.removeHandler(extra_handler)
+# 로그 디렉토리 생성 (LOG_DIR: 로그 디렉토리, 기본: 현재 디렉토리의 logs)
+LOG_DIR = Path(os.getenv("LOG_DIR", "logs"))
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+log_pipeline.configure(
+    file_name="api_server.log",
+    level=LOG_LEVEL,
+    log_format=LOG_FORMAT,
+    json_format=os.getenv("LOG_JSON", "false").lower() == "true",
+    queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+    rate_limits=os.getenv("LOG_RATE_LIMITS", ""),
+    levels=os.getenv("LOG_LEVELS", ""),
+    log_dir=str(LOG_DIR)
+)
 
 # 모듈 로거
 logger = logging.getLogger(__name__)
 
+# 요청 추적 (Web UI → /transcribe → LLM 호출을 하나의 trace ID로 연결)
+# TRACING_ENABLED: span 기록 여부 (기본: true, false여도 traceparent 헤더 전파는 유지)
+# TRACE_EXPORT_FILE: span JSONL 파일 (기본: logs/traces.jsonl, 빈 문자열이면 사용 안 함)
+# TRACE_OTLP_ENDPOINT: OTLP HTTP 수집기 주소 (예: http://otel-collector:4318, 기본: 사용 안 함)
+# TRACE_BUFFER_SIZE: /debug/trace/{id}로 조회할 수 있는 최근 trace 수
+tracer.configure(
+    service="stt-api",
+    enabled=os.getenv("TRACING_ENABLED", "true").lower() == "true",
+    export_file=os.getenv("TRACE_EXPORT_FILE", str(LOG_DIR / "traces.jsonl")),
+    otlp_endpoint=os.getenv("TRACE_OTLP_ENDPOINT", ""),
+    max_traces=int(os.getenv("TRACE_BUFFER_SIZE", "500"))
+)
+
+# 메모리 거버너 (세그먼트/파일/요청 경계에서 기준을 넘었을 때만 gc.collect + malloc_trim / CUDA empty_cache)
+# MEMORY_RSS_HIGH_MB: RSS high-water mark (기본: 0 → 증가량 기준만 사용)
+# MEMORY_RSS_GROWTH_MB: 직전 정리 후 RSS가 이만큼 늘면 정리 (기본: 512MB)
+# MEMORY_CUDA_CACHE_HIGH_MB: CUDA 재사용 대기 캐시(예약 - 사용)가 이보다 크면 empty_cache (기본: 1024MB)
+# MEMORY_CHECK_INTERVAL_SEC: 확인 최소 간격 (기본: 1초)
+# MEMORY_MALLOC_TRIM: gc 후 malloc_trim(0)으로 해제된 힙을 OS에 반환 (기본: true, glibc만)
+memory_governor.configure(
+    rss_high_mb=float(os.getenv("MEMORY_RSS_HIGH_MB", "0")),
+    rss_growth_mb=float(os.getenv("MEMORY_RSS_GROWTH_MB", "512")),
+    cuda_cache_high_mb=float(os.getenv("MEMORY_CUDA_CACHE_HIGH_MB", "1024")),
+    check_interval_sec=float(os.getenv("MEMORY_CHECK_INTERVAL_SEC", "1")),
+    trim_enabled=os.getenv("MEMORY_MALLOC_TRIM", "true").lower() == "true"
+)
+
+# /transcribe 승인 제어 (요청별 오디오 길이/프리셋/LLM 단계로 작업 메모리와 처리 시간을 예측, api_server/admission.py)
+# ADMISSION_MEMORY_BUDGET_MB: 동시에 승인할 요청 작업 메모리 합계 (기본: 0 → 시스템 메모리 85% - ENGINE_MEMORY_BUDGET_MB)
+# ADMISSION_MAX_WAIT_SEC: 대기열 최대 대기 시간 (기본: 120초, 예상 대기가 더 길면 즉시 503 + Retry-After)
+# ADMISSION_MAX_QUEUE: 대기열 최대 길이 (기본: 64)
+# ADMISSION_AGING_SEC: 대기 시간이 이만큼 지날 때마다 우선순위 1단계 상승 (기본: 30초)
+# ADMISSION_BASE_MB / ADMISSION_LLM_STAGE_MB / ADMISSION_LLM_STAGE_SEC: 요청당 고정 메모리, LLM 단계당 메모리/시간
+admission.configure(
+    budget_mb=float(os.getenv("ADMISSION_MEMORY_BUDGET_MB", "0")),
+    max_wait_sec=float(os.getenv("ADMISSION_MAX_WAIT_SEC", "120")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "64")),
+    aging_sec=float(os.getenv("ADMISSION_AGING_SEC", "30")),
+    base_mb=float(os.getenv("ADMISSION_BASE_MB", "300")),
+    llm_stage_mb=float(os.getenv("ADMISSION_LLM_STAGE_MB", "64")),
+    llm_stage_sec=float(os.getenv("ADMISSION_LLM_STAGE_SEC", "10")),
+    engine_budget_mb=ENGINE_MEMORY_BUDGET_MB
+)
+
+# /transcribe JSON 응답 압축 (Accept-Encoding에 따라 br/gzip, api_server/response_encoding.py)
+# RESPONSE_COMPRESS_MIN_BYTES: 이 크기 이상의 본문만 압축 (기본: 4096 bytes)
+# RESPONSE_GZIP_LEVEL: gzip 레벨 1~9 (기본: 1) / RESPONSE_BROTLI_QUALITY: brotli 품질 0~11 (기본: 4, brotli 설치 시)
+response_encoder.configure(
+    min_bytes=int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "4096")),
+    gzip_level=int(os.getenv("RESPONSE_GZIP_LEVEL", "1")),
+    brotli_quality=int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+)
+
+# 관리자 전용 엔드포인트 (/admin/*) 인증
+# ADMIN_API_TOKEN: X-Admin-Token 헤더로 전달할 토큰 (기본: 빈 문자열 → /admin/* 비활성화)
+# PROFILER_MAX_SECONDS: /admin/profile 최대 샘플링 시간 (기본: 60초)
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+
+def require_admin(request: Request):
+    """X-Admin-Token 헤더 검증 (토큰 미설정 시 관리자 엔드포인트 전체 비활성화)"""
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 엔드포인트 비활성화 (ADMIN_API_TOKEN 미설정)")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode("utf-8"), ADMIN_API_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다")
+
+
 # 전역 동시 처리 슬롯 제한 (세마포어)
 # 의미: 동시에 실행 가능한 transcribe 작업 수 (동시 사용자 수와 1:1 아님)
 MAX_CONCURRENT_SLOTS = int(os.getenv("MAX_CONCURRENT_SLOTS", "6"))  # 기본값: 6
 transcribe_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SLOTS)
 logger.info(f"[Slot 제한] 최대 동시 STT 슬롯: {MAX_CONCURRENT_SLOTS}개")
 
+# 슬롯 사용 현황 (/health로 노출 → Web UI 스케줄러가 동시 요청 수 조절에 사용)
+# 단일 이벤트 루프에서만 갱신되므로 별도 잠금 불필요
+transcribe_slot_stats = {"in_use": 0, "waiting": 0}
+
+
+@asynccontextmanager
+async def transcribe_slot(source: str = "transcribe"):
+    """
+    전역 슬롯 획득/반납 (스트리밍 응답은 본문 생성기 안에서 직접 사용)
+
+    Args:
+        source: 대기 시간 메트릭 label (transcribe / live)
+    """
+    transcribe_slot_stats["waiting"] += 1
+    wait_start = time.perf_counter()
+    try:
+        await transcribe_semaphore.acquire()
+    finally:
+        transcribe_slot_stats["waiting"] -= 1
+    waited = time.perf_counter() - wait_start
+    metrics.QUEUE_WAIT_SECONDS.labels(source).observe(waited)
+    tracer.record_span("slot_wait", time.time() - waited, source=source)
+
+    transcribe_slot_stats["in_use"] += 1
+    try:
+        yield
+    finally:
+        transcribe_slot_stats["in_use"] -= 1
+        transcribe_semaphore.release()
+
 
 async def acquire_transcribe_slot():
     """transcribe 계열 엔드포인트의 전역 슬롯 획득/반납"""
-    async with transcribe_semaphore:
+    async with transcribe_slot():
         yield
 
+
+# 요청 비용 예측에 반영하는 LLM 후처리 단계 (Form 필드명)
+ADMISSION_LLM_STAGES = ("privacy_removal", "classification", "element_detection")
+
+
+async def admit_transcribe_request(request: Request):
+    """
+    /transcribe 요청 승인 (예측 비용이 메모리 예산에 들어갈 때까지 우선순위 대기열에서 대기)
+
+    오디오 길이는 파일 헤더로 읽고, 프리셋/LLM 단계는 Form 필드로 판단한다.
+    우선순위는 Form 필드 priority 또는 X-Priority 헤더 (high/normal/low 또는 0~9).
+    대기열이 가득 찼거나 예상 대기 시간이 ADMISSION_MAX_WAIT_SEC를 넘으면 503 + Retry-After.
+    스트리밍 응답은 ticket.detach() 후 응답 전송이 끝날 때 반납한다 (CleanupStreamingResponse).
+    """
+    form_data = await request.form()
+    config = FormDataConfig(form_data, debug=False)
+    file_path = config.get_str('file_path')
+    preset = (form_data.get("preset") or "").lower().strip() or None
+    default_engine = engine_manager.current
+    if preset is None and default_engine is not None:
+        preset = default_engine.preset
+
+    duration_sec = await asyncio.to_thread(audio_duration_hint, file_path) if file_path else 0.0
+    cost = admission.estimate(
+        duration_sec,
+        preset,
+        compute_type=default_engine.compute_type if default_engine is not None else None,
+        stages=[stage for stage in ADMISSION_LLM_STAGES if config.get_bool(stage)]
+    )
+    priority = parse_priority(form_data.get("priority") or request.headers.get("x-priority"))
+
+    try:
+        ticket = await admission.admit(cost, priority)
+    except AdmissionRejected as e:
+        metrics.ADMISSION_REJECTED.inc()
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": ErrorCode.STT_SERVER_BUSY.value,
+                "message": str(e),
+                "retry_after": e.retry_after
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    metrics.QUEUE_WAIT_SECONDS.labels("admission").observe(ticket.waited_sec)
+    tracer.record_span("admission_wait", time.time() - ticket.waited_sec,
+                       memory_mb=round(cost.memory_mb), service_sec=round(cost.service_sec, 1))
+    try:
+        yield ticket
+    finally:
+        if not ticket.detached:
+            admission.release(ticket)
+
+
+# /metrics 게이지 (조회 시점에 현재 상태를 읽음) + STT 결과 관찰자 등록
+def _loaded_backends():
+    return {
+        (engine["key"], engine["backend"], engine["compute_type"] or ""): 1
+        for engine in engine_manager.get_status()["engines"]
+    }
+
+
+def _system_memory_available_bytes():
+    import psutil
+    return psutil.virtual_memory().available
+
+
+def _sampled(field: str):
+    sample = resource_sampler.latest()
+    return sample[field] * 1024 * 1024 if sample else None
+
+
+metrics.SLOTS_IN_USE.set_function(lambda: transcribe_slot_stats["in_use"])
+metrics.SLOTS_WAITING.set_function(lambda: transcribe_slot_stats["waiting"])
+metrics.SLOTS_MAX.set(MAX_CONCURRENT_SLOTS)
+metrics.BACKENDS_LOADED.set_function(_loaded_backends)
+metrics.ENGINE_IN_FLIGHT.set_function(
+    lambda: {engine["key"]: engine["in_flight"] for engine in engine_manager.get_status()["engines"]}
+)
+metrics.LIVE_SESSIONS.set_function(lambda: live_sessions.get_stats()["active"])
+metrics.PROCESS_MEMORY_BYTES.set_function(lambda: _sampled("ram_mb") or resource_sampler.process.memory_info().rss)
+metrics.SYSTEM_MEMORY_AVAILABLE_BYTES.set_function(_system_memory_available_bytes)
+metrics.GPU_MEMORY_USED_BYTES.set_function(lambda: _sampled("gpu_vram_mb"))
+if metrics.record_stt_result not in WhisperSTT.result_observers:
+    WhisperSTT.result_observers.append(metrics.record_stt_result)
+if metrics.record_memory_reclaim not in memory_governor.observers:
+    memory_governor.observers.append(metrics.record_memory_reclaim)
+if admission.observe_stt not in WhisperSTT.result_observers:
+    WhisperSTT.result_observers.append(admission.observe_stt)
+metrics.ADMISSION_RESERVED_BYTES.set_function(lambda: admission.reserved_mb * 1024 * 1024)
+metrics.ADMISSION_WAITING.set_function(lambda: admission.waiting)
+metrics.ADMISSION_BUDGET_BYTES.set_function(lambda: admission.budget_mb * 1024 * 1024)
+
+
+async def lease_stt_engine(request: Request):
+    """
+    요청 처리 동안 STT 엔진 대여 (백엔드 전환 중에도 시작한 엔진으로 끝까지 처리)
+
+    Form 필드 preset(speed/balanced/accuracy)이 있으면 해당 프리셋 엔진으로 라우팅하고,
+    없으면 기본 엔진(STT_PRESET 또는 /backend/reload로 지정)을 사용한다.
+    """
+    preset = None
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(("multipart/form-data", "application/x-www-form-urlencoded")):
+        form_data = await request.form()
+        preset = (form_data.get("preset") or "").lower().strip() or None
+
+    if preset and preset not in PRESET_SEGMENT_CONFIG:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 preset: {preset} (사용 가능: {', '.join(PRESET_SEGMENT_CONFIG.keys())})"
+        )
+
+    try:
+        async with engine_manager.lease(preset) as engine:
+            yield engine
+    except EngineUnavailableError as e:
+        logger.error(f"[Engine] {preset} 엔진 준비 실패: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+
 # 스트리밍 청크 설정 (30초 청크 + 3초 overlap = 10% 중복)
 # 변경 사유: 세그멘트 경계의 중복 문제 해결 (12초 → 3초)
 # accuracy 모드에서는 높은 정확도로 인해 3초 오버랩만으로도 충분함
@@ -134,175 +348,138 @@ STREAM_CHUNK_DURATION = 30  # 초
 STREAM_OVERLAP_DURATION = 3   # 초 (10% overlap)
 STREAM_CHUNK_SIZE = 10 * 1024 * 1024  # 폴백용 (deprecated)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    서버 수명 주기
+
+    모델 로드는 백그라운드 태스크(스레드)로 실행해 uvicorn이 바로 요청을 받도록 한다.
+    (/health는 즉시 응답, /ready는 로드 완료 후 200)
+    요청별 성능 지표는 프로세스 전역 리소스 샘플러 1개가 기록한 구간을 읽는다.
+    """
+    async def _load_model():
+        engine_manager.install(await asyncio.to_thread(startup_manager.load))
+
+    resource_sampler.ensure_started()
+    load_task = asyncio.create_task(_load_model())
+    try:
+        yield
+    finally:
+        if not load_task.done():
+            load_task.cancel()
+        resource_sampler.stop()
+
+
 app = FastAPI(
     title="Whisper STT API",
     version="1.0.0",
-    description="다중 백엔드 STT API (faster-whisper, transformers, OpenAI Whisper)"
+    description="다중 백엔드 STT API (faster-whisper, transformers, OpenAI Whisper)",
+    lifespan=lifespan
 )
 
-# /health 엔드포인트의 반복적인 로그를 줄이기 위한 미들웨어
-class HealthCheckLoggingMiddleware(BaseHTTPMiddleware):
+# /health 엔드포인트의 반복적인 로그를 줄이기 위한 access 로그 필터
+class HealthCheckAccessLogFilter(logging.Filter):
     """
-    /health 엔드포인트의 로깅을 조절하는 미들웨어
+    uvicorn access 로그에서 /health, /ready 요청을 주기마다 한 번만 남기는 필터
     기본값: 60초마다 한 번씩 로깅 (환경변수 HEALTH_CHECK_LOG_INTERVAL로 조절)
+
+    요청마다 uvicorn.access 로거 레벨을 바꾸면 동시에 처리 중인 다른 요청의 access 로그까지
+    사라지므로, 로거에 필터를 한 번만 등록하고 레코드의 경로로 판단합니다.
     """
-    last_health_log_time = 0
-    
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path == "/health":
-            import time
-            current_time = time.time()
-            # 환경변수에서 로그 주기 읽기 (기본값: 60초)
-            health_log_interval = float(os.getenv("HEALTH_CHECK_LOG_INTERVAL", "60"))
-            
-            # 마지막 로그 이후 지정된 시간 이상 경과했으면 로그 활성화
-            if current_time - HealthCheckLoggingMiddleware.last_health_log_time >= health_log_interval:
-                HealthCheckLoggingMiddleware.last_health_log_time = current_time
-                # 로그 레벨을 INFO로 유지 (정상적으로 로깅됨)
-                response = await call_next(request)
-            else:
-                # 로그를 비활성화하기 위해 uvicorn access logger의 레벨을 높임
-                uvicorn_logger = logging.getLogger("uvicorn.access")
-                original_level = uvicorn_logger.level
-                uvicorn_logger.setLevel(logging.WARNING)
-                try:
-                    response = await call_next(request)
-                finally:
-                    uvicorn_logger.setLevel(original_level)
-            
-            return response
-        else:
-            return await call_next(request)
 
-app.add_middleware(HealthCheckLoggingMiddleware)
+    HEALTH_PATHS = ("/health", "/ready")
+
+    def __init__(self, interval: float):
+        super().__init__()
+        self.interval = interval
+        self.last_health_log_time = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn access 레코드 args: (client_addr, method, full_path, http_version, status_code)
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3 and str(args[2]).split("?", 1)[0] in self.HEALTH_PATHS:
+            current_time = time.monotonic()
+            if current_time - self.last_health_log_time < self.interval:
+                return False
+            self.last_health_log_time = current_time
+        return True
+
+
+logging.getLogger("uvicorn.access").addFilter(
+    HealthCheckAccessLogFilter(float(os.getenv("HEALTH_CHECK_LOG_INTERVAL", "60")))
+)
+
+
+class TracingMiddleware:
+    """
+    요청 루트 span 기록 (ASGI 미들웨어)
+
+    /transcribe 계열 요청과 traceparent 헤더가 있는 요청만 추적합니다.
+    BaseHTTPMiddleware와 달리 스트리밍 응답 본문이 끝날 때까지를 한 span으로 기록하고,
+    응답에 X-Trace-Id 헤더를 붙입니다.
+    """
+
+    TRACED_PREFIXES = ("/transcribe",)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope.get("headers") or [])
+        parent = tracing.parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        path = scope["path"]
+        if parent is None and not path.startswith(self.TRACED_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        async with tracer.span(f"{scope['method']} {path}", parent=parent) as span:
+            trace_id_header = (tracing.TRACE_ID_HEADER.lower().encode("latin-1"), span.trace_id.encode("latin-1"))
+
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    span.set(status_code=message["status"])
+                    message["headers"] = list(message.get("headers", [])) + [trace_id_header]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace_id)
+        logger.info(f"[Trace] {scope['method']} {path} trace_id={span.trace_id} "
+                    f"status={span.attributes.get('status_code')} ({span.duration:.2f}s)")
+
+
+app.add_middleware(TracingMiddleware)
+
+# STT_PRESET에 따른 세그멘트 설정 적용 (모델 로드와 무관하므로 import 시점에 적용)
+initial_preset = os.getenv("STT_PRESET", "accuracy").lower()
+if initial_preset in PRESET_SEGMENT_CONFIG:
+    segment_config = PRESET_SEGMENT_CONFIG[initial_preset]
+    STREAM_CHUNK_DURATION = segment_config["chunk_duration"]
+    STREAM_OVERLAP_DURATION = segment_config["overlap_duration"]
+    logger.info(f"🔧 STT_PRESET='{initial_preset}'에 따른 세그멘트 설정 적용:")
+    logger.info(f"   - STREAM_CHUNK_DURATION: {STREAM_CHUNK_DURATION}초")
+    logger.info(f"   - STREAM_OVERLAP_DURATION: {STREAM_OVERLAP_DURATION}초")
+    logger.info(f"   - 설명: {segment_config['description']}")
 
 # 모델 초기화
-# 환경변수 STT_DEVICE로 cpu/cuda 선택 가능 (기본값: cpu)
-try:
-    # Docker 환경: /app/models에 마운트됨
-    # 로컬 개발: models/ 디렉토리 사용
-    docker_model_path = Path("/app/models/openai_whisper-large-v3-turbo")
-    local_model_path = Path(__file__).parent.parent / "models" / "openai_whisper-large-v3-turbo"
-    model_path = docker_model_path if docker_model_path.exists() else local_model_path
-    device = os.getenv("STT_DEVICE", "auto")
-    
-    # 환경변수로 compute_type 지정 가능 (기본값: device에 따라 자동)
-    compute_type = os.getenv("STT_COMPUTE_TYPE")
-    if compute_type is None:
-        # device="auto"일 때 CUDA 가용성 확인
-        use_cuda = device == "cuda" or (device == "auto" and torch.cuda.is_available())
-        compute_type = "float16" if use_cuda else "float32"  # CPU는 float32가 더 안정적
-    
-    logger.info(f"STT 모델 로드 시작 (다중 백엔드)")
-    logger.info(f"  모델: openai_whisper-large-v3-turbo")
-    logger.info(f"  경로: {model_path}")
-    logger.info(f"  디바이스 설정: {device}")
-    if device == "auto":
-        logger.info(f"     → 실행 시점에 CUDA 자동 감지 (GPU 있으면 cuda, 없으면 cpu)")
-    logger.info(f"  Compute Type: {compute_type}")
-    logger.info(f"  우선순위:")
-    logger.info(f"    1. faster-whisper (CTranslate2)")
-    logger.info(f"    2. transformers (PyTorch/SafeTensors)")
-    logger.info(f"    3. OpenAI Whisper (공식 모델만)")
-    
-    stt = WhisperSTT(
-        str(model_path),
-        device=device,
-        compute_type=compute_type
-    )
-    
-    # 로드된 백엔드 타입 확인
-    backend_type = type(stt.backend).__name__
-    logger.info(f"✅ STT 모델 로드 완료")
-    logger.info(f"   Backend Type: {backend_type}")
-    logger.info(f"   Device: {device}")
-    print(f"✅ STT 모델 로드 완료 (Backend: {backend_type}, Device: {device})")
-    
-    # STT_PRESET에 따른 세그멘트 설정 적용
-    initial_preset = os.getenv("STT_PRESET", "accuracy").lower()
-    if initial_preset in PRESET_SEGMENT_CONFIG:
-        segment_config = PRESET_SEGMENT_CONFIG[initial_preset]
-        STREAM_CHUNK_DURATION = segment_config["chunk_duration"]
-        STREAM_OVERLAP_DURATION = segment_config["overlap_duration"]
-        logger.info(f"🔧 STT_PRESET='{initial_preset}'에 따른 세그멘트 설정 적용:")
-        logger.info(f"   - STREAM_CHUNK_DURATION: {STREAM_CHUNK_DURATION}초")
-        logger.info(f"   - STREAM_OVERLAP_DURATION: {STREAM_OVERLAP_DURATION}초")
-        logger.info(f"   - 설명: {segment_config['description']}")
-    
-    # 초기 프리셋 설정 (환경변수 STT_PRESET으로 지정 가능, 기본값: accuracy)
-    if initial_preset:
-        logger.info(f"🔄 초기 프리셋 적용 중: {initial_preset}")
-        
-        try:
-            # preset="custom"인 경우, device와 compute_type을 환경변수에서 읽음
-            if initial_preset == "custom":
-                custom_device = os.getenv("STT_DEVICE", device)
-                custom_compute_type = os.getenv("STT_COMPUTE_TYPE", compute_type)
-                custom_backend = os.getenv("STT_BACKEND")
-                
-                logger.info(f"   📌 CUSTOM 모드 설정:")
-                logger.info(f"      STT_DEVICE={custom_device}")
-                logger.info(f"      STT_COMPUTE_TYPE={custom_compute_type}")
-                logger.info(f"      STT_BACKEND={custom_backend}")
-                
-                preset_result = stt.reload_backend(
-                    preset="custom",
-                    backend=custom_backend,
-                    device=custom_device,
-                    compute_type=custom_compute_type
-                )
-            else:
-                # 미리정의된 프리셋 (speed/balanced/accuracy)
-                preset_result = stt.reload_backend(preset=initial_preset)
-            
-            if preset_result.get("status") == "success":
-                logger.info(f"✅ 프리셋 적용 완료: {initial_preset}")
-                logger.info(f"   현재 백엔드: {preset_result.get('current_backend')}")
-                logger.info(f"   디바이스: {preset_result.get('device')}")
-                logger.info(f"   컴퓨트 타입: {preset_result.get('compute_type')}")
-                print(f"✅ 초기 프리셋 적용: {initial_preset} ({preset_result.get('current_backend')})")
-            else:
-                logger.warning(f"⚠️  프리셋 적용 실패: {preset_result.get('message')}")
-        except Exception as e:
-            logger.warning(f"⚠️  프리셋 적용 중 오류: {type(e).__name__}: {e}")
-    
-except FileNotFoundError as e:
-    logger.error(f"❌ 모델 파일을 찾을 수 없음: {e}")
-    logger.error(f"  확인 사항:")
-    logger.error(f"  1. 모델이 다운로드되었는가? (python3 download_model_hf.py)")
-    logger.error(f"  2. 필요한 파일들:")
-    logger.error(f"     - CTranslate2: models/openai_whisper-large-v3-turbo/ctranslate2_model/model.bin")
-    logger.error(f"     - PyTorch: models/openai_whisper-large-v3-turbo/pytorch_model.bin 또는 model.safetensors")
-    logger.error(f"  3. Docker 실행 시 마운트:")
-    logger.error(f"     docker run -v /path/to/models:/app/models ...")
-    print(f"❌ 모델 로드 실패: {e}")
-    stt = None
-    
-except RuntimeError as e:
-    logger.error(f"❌ 모든 백엔드 로드 실패: {e}")
-    logger.error(f"  해결 방법:")
-    logger.error(f"  1. EC2에서 모델 다운로드 및 변환:")
-    logger.error(f"     python3 download_model_hf.py")
-    logger.error(f"  2. 변환된 모델 확인:")
-    logger.error(f"     ls -lh models/openai_whisper-large-v3-turbo/")
-    logger.error(f"  3. Docker 이미지 재빌드:")
-    logger.error(f"     bash scripts/build-server-image.sh")
-    print(f"❌ 모델 로드 실패: {e}")
-    stt = None
-    
-except Exception as e:
-    logger.error(f"❌ 예상치 못한 오류: {type(e).__name__}: {e}")
-    print(f"❌ 모델 로드 실패: {e}")
-    stt = None
+# lifespan에서 startup_manager가 STT_PRESET의 백엔드 하나만 백그라운드로 로드해 engine_manager에 등록
+# 로드 완료 전까지 engine_manager.current는 None이며 /ready는 503을 반환
+# 추론 엔드포인트는 lease_stt_engine으로 엔진을 빌려 씀 (/backend/reload의 blue/green 전환 대응)
 
 
 @app.get("/health")
 async def health():
-    """헬스 체크 (메모리 정보 포함)"""
+    """
+    헬스 체크 (프로세스 생존 여부, 메모리 정보 포함)
+
+    모델 로드 중에도 응답하며, 트래픽을 받을 수 있는지는 /ready로 확인한다.
+    """
+    stt = engine_manager.current
     if stt is None:
+        startup_status = startup_manager.get_status()
         return {
-            "status": "error",
-            "message": "STT 모델을 로드할 수 없음"
+            "status": "error" if startup_status["state"] == "failed" else "loading",
+            "message": "STT 모델을 로드할 수 없음" if startup_status["state"] == "failed" else "STT 모델 로드 중",
+            "startup": startup_status
         }
     
     # 메모리 상태 확인
@@ -325,7 +502,187 @@ async def health():
             "used_percent": memory_info['used_percent'],
             "status": "warning" if memory_info['warning'] else ("critical" if memory_info['critical'] else "ok"),
             "message": memory_info['message']
-        }
+        },
+        "slots": {
+            "max": MAX_CONCURRENT_SLOTS,
+            "in_use": transcribe_slot_stats["in_use"],
+            "waiting": transcribe_slot_stats["waiting"]
+        },
+        "admission": {
+            "budget_mb": round(admission.budget_mb, 1),
+            "reserved_mb": round(admission.reserved_mb, 1),
+            "waiting": admission.waiting,
+            "max_queue": admission.max_queue
+        },
+        "live_sessions": live_sessions.get_stats(),
+        "engine": engine_manager.get_status()
+    }
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """
+    Prometheus 메트릭 (텍스트 노출 형식)
+
+    슬롯 대기, 오디오 디코딩, STT 디코딩/RTF, LLM 단계별 지연 히스토그램과
+    슬롯/엔진/메모리 게이지, Dummy fallback 카운터를 반환한다.
+    """
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/debug/traces")
+async def debug_traces(limit: int = Query(20, ge=1, le=500), min_ms: float = Query(0.0, ge=0)):
+    """
+    최근 trace 목록 (최신순, min_ms 이상 걸린 요청만)
+
+    Returns:
+        {"traces": [{"trace_id", "root", "start", "duration_ms", "status", "spans"}], "dropped": 내보내기 못한 span 수}
+    """
+    return {"traces": tracer.recent(limit, min_ms), "dropped": tracer.dropped}
+
+
+@app.get("/debug/trace/{trace_id}")
+async def debug_trace(trace_id: str, format: str = Query("json", pattern="^(json|text|spans)$")):
+    """
+    trace 1건의 span 트리 (최근 TRACE_BUFFER_SIZE개 trace만 보관)
+
+    Args:
+        trace_id: trace ID (응답 헤더 X-Trace-Id, 로그의 trace_id)
+        format: json (트리 + critical path) / text (워터폴) / spans (원본 span 목록, Web UI 병합용)
+    """
+    if not tracing.is_trace_id(trace_id):
+        raise HTTPException(status_code=400, detail="trace ID는 32자리 16진수입니다")
+    spans = tracer.get_trace(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"trace 없음 (만료되었거나 잘못된 ID): {trace_id}")
+    if format == "spans":
+        return {"trace_id": trace_id, "spans": spans}
+    if format == "text":
+        return Response(tracing.render_text(spans), media_type="text/plain; charset=utf-8")
+    return tracing.trace_view(trace_id, spans)
+
+
+@app.get("/admin/profile")
+async def admin_profile(
+    seconds: float = Query(10.0, gt=0),
+    hz: int = Query(100, ge=1, le=1000),
+    format: str = Query("svg", pattern="^(svg|speedscope|collapsed|json)$"),
+    idle: bool = Query(False),
+    tracemalloc: bool = Query(False),
+    _admin: None = Depends(require_admin)
+):
+    """
+    운영 중 샘플링 프로파일 (서버 재시작 없이 모든 스레드 스택을 seconds초 동안 수집)
+
+    Args:
+        seconds: 샘플링 시간 (최대 PROFILER_MAX_SECONDS)
+        hz: 초당 샘플 수 (1~1000)
+        format: svg (플레임 그래프) / speedscope (speedscope.app JSON) / collapsed (flamegraph.pl 입력) /
+                json (collapsed stack + 통계 + 할당 차이)
+        idle: 대기 중인 스레드(Event.wait, selector 등) 스택도 포함
+        tracemalloc: 구간 동안의 tracemalloc 할당 차이 포함 (svg, json에 표시, 구간 동안 할당 속도 저하)
+
+    Returns:
+        선택한 형식의 프로파일 (한 번에 하나만 실행, 실행 중이면 409)
+    """
+    if seconds > PROFILER_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds는 최대 {PROFILER_MAX_SECONDS:g}초입니다")
+    try:
+        result = await profiler.profile(seconds, hz, include_idle=idle, trace_allocations=tracemalloc)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    filename = f"stt-api-profile-{time.strftime('%Y%m%d-%H%M%S')}"
+    if format == "svg":
+        return Response(
+            render_flamegraph_svg(result, title=f"stt-api ({time.strftime('%Y-%m-%d %H:%M:%S')})"),
+            media_type="image/svg+xml",
+            headers={"Content-Disposition": f'inline; filename="{filename}.svg"'}
+        )
+    if format == "speedscope":
+        return JSONResponse(
+            to_speedscope(result),
+            headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'}
+        )
+    if format == "collapsed":
+        return Response(to_collapsed(result["stacks"]), media_type="text/plain; charset=utf-8")
+    return result
+
+
+@app.get("/admin/logging")
+async def admin_logging_status(_admin: None = Depends(require_admin)):
+    """
+    로깅 파이프라인 상태 (로거별 레벨, 큐 적재량, 버려진/제한된/샘플링으로 생략된 레코드 수)
+    """
+    return log_pipeline.status()
+
+
+@app.put("/admin/logging")
+async def admin_logging_set_level(
+    logger_name: str = Query(..., alias="logger"),
+    level: str = Query(...),
+    ttl: Optional[float] = Query(None, gt=0, le=86400),
+    _admin: None = Depends(require_admin)
+):
+    """
+    실행 중 로거 레벨 변경 (재시작 없이 특정 모듈만 DEBUG 켜기)
+
+    Args:
+        logger: 로거 이름 (예: stt_engine, api_server.app, root)
+        level: DEBUG / INFO / WARNING / ERROR / CRITICAL, reset이면 변경 전 레벨로 복구
+        ttl: 지정 시 ttl초 후 자동 복구 (운영 중 DEBUG를 켜둔 채 잊는 것 방지)
+
+    Returns:
+        변경 후 로깅 파이프라인 상태
+    """
+    if level.lower() == "reset":
+        log_pipeline.reset_level(logger_name)
+        logger.info(f"[Logging] 레벨 복구: {logger_name}")
+    else:
+        try:
+            applied = log_pipeline.set_level(logger_name, level, ttl=ttl)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        logger.info(f"[Logging] 레벨 변경: {logger_name} → {applied}" + (f" ({ttl:g}초 후 복구)" if ttl else ""))
+    return log_pipeline.status()
+
+
+@app.get("/admin/memory")
+async def admin_memory(reclaim: bool = Query(False), _admin: None = Depends(require_admin)):
+    """
+    메모리 거버너 상태 (현재 RSS / CUDA 예약·사용량, 기준값, 누적 회수량, 최근 정리 이벤트)
+
+    Args:
+        reclaim: true면 기준과 관계없이 즉시 정리한 뒤 상태 반환
+    """
+    if reclaim:
+        await asyncio.to_thread(memory_governor.reclaim, "admin")
+    return memory_governor.status()
+
+
+@app.get("/admin/admission")
+async def admin_admission(_admin: None = Depends(require_admin)):
+    """
+    승인 제어 상태 (메모리 예산/예약량, 대기열과 요청별 예측 비용, 프리셋별 RTF, 처리 시간 보정 배율, 최근 요청)
+    """
+    return admission.status()
+
+
+@app.get("/ready")
+async def ready():
+    """
+    준비 상태 확인 (readiness)
+
+    모델 로드(+ STT_WARMUP=true인 경우 warm-up)가 끝나야 200, 그 전에는 503을 반환한다.
+    로드밸런서/오케스트레이터의 트래픽 투입 기준으로 사용한다.
+    """
+    stt = engine_manager.current
+    startup_status = startup_manager.get_status()
+    if stt is None or not startup_status["ready"]:
+        return JSONResponse(status_code=503, content={"ready": False, **startup_status})
+    return {
+        **startup_status,
+        "backend": stt.get_backend_info()["current_backend"]
     }
 
 
@@ -343,6 +700,7 @@ async def get_current_backend():
     - available_backends: 설치된 백엔드 목록
     - loaded: 백엔드 로드 여부
     """
+    stt = engine_manager.current
     if stt is None:
         raise HTTPException(status_code=503, detail="STT 모델이 로드되지 않음")
     
@@ -360,10 +718,11 @@ async def reload_backend(request_body: dict = Body(None)):
     Parameters (JSON body에서):
     
     1️⃣ 프리셋 모드 (권장):
-       - preset: "speed" | "balanced" | "accuracy" | "default"
+       - preset: "speed" | "balanced" | "accuracy" | "cpu_int8" | "default"
          * "speed": faster-whisper + int8 (가장 빠름)
          * "balanced": faster-whisper + float16 (균형)
          * "accuracy": transformers + float32 (최고 정확도) ⭐ 권장
+         * "cpu_int8": transformers + 동적 int8 양자화 (CPU 전용 노드)
          * "default": 기본값 복원
     
     2️⃣ 커스텀 모드:
@@ -371,6 +730,10 @@ async def reload_backend(request_body: dict = Body(None)):
        - compute_type: "int8" | "float16" | "float32" (faster-whisper만)
        - device: "cuda" | "cpu"
     
+    전환 방식 (무중단):
+    - blue_green: 메모리 여유가 있으면 새 엔진을 백그라운드 로드 → 포인터 교체 → 이전 엔진은 진행 중 요청 완료 후 언로드
+    - sequential: 여유가 없으면 새 요청을 잠시 대기시키고 이전 엔진 언로드 후 로드 (실패 시 이전 설정 복구)
+    
     Returns:
     {
         "status": "success" | "error",
@@ -378,7 +741,9 @@ async def reload_backend(request_body: dict = Body(None)):
         "device": 사용 디바이스,
         "compute_type": 계산 정밀도,
         "message": 상세 메시지,
-        "backend_info": 전체 백엔드 정보
+        "backend_info": 전체 백엔드 정보,
+        "swap_mode": "blue_green" | "sequential",
+        "headroom": 메모리 여유 확인 결과
     }
     
     예시 (curl):
@@ -386,8 +751,11 @@ async def reload_backend(request_body: dict = Body(None)):
     - 속도 우선: curl -X POST http://localhost:8003/backend/reload -H "Content-Type: application/json" -d '{"preset": "speed"}'
     - 커스텀: curl -X POST http://localhost:8003/backend/reload -H "Content-Type: application/json" -d '{"backend": "transformers", "device": "cuda", "compute_type": "float32"}'
     """
+    stt = engine_manager.current
     if stt is None:
         raise HTTPException(status_code=503, detail="STT 모델이 로드되지 않음")
+    if engine_manager.swapping:
+        raise HTTPException(status_code=409, detail="백엔드 전환이 이미 진행 중입니다")
     
     # JSON body에서 파라미터 추출
     request_body = request_body or {}
@@ -413,7 +781,7 @@ async def reload_backend(request_body: dict = Body(None)):
             if device:
                 logger.info(f"  디바이스: {device}")
         
-        result = stt.reload_backend(
+        result = await engine_manager.swap(
             backend=backend,
             compute_type=compute_type,
             device=device,
@@ -430,8 +798,8 @@ async def reload_backend(request_body: dict = Body(None)):
         
         logger.info(f"[API] 백엔드 재로드 완료: {old_backend} → {result['current_backend']}")
         
-        # 재로드 후 백엔드 정보
-        new_backend_info = stt.get_backend_info()
+        # 재로드 후 백엔드 정보 (교체된 새 엔진 기준)
+        new_backend_info = engine_manager.current.get_backend_info()
         
         return {
             "status": "success",
@@ -445,7 +813,9 @@ async def reload_backend(request_body: dict = Body(None)):
             "current_device": result['device'],
             "current_compute_type": result['compute_type'],
             "backend_info": new_backend_info,
-            "details": result['message']
+            "details": result['message'],
+            "swap_mode": result['swap_mode'],
+            "headroom": result['headroom']
         }
     
     except HTTPException:
@@ -467,11 +837,269 @@ async def reload_backend(request_body: dict = Body(None)):
 # Improved Transcribe Endpoint
 # ============================================================================
 
+async def _post_processing_stages(stt_result: dict, config: FormDataConfig):
+    """
+    /transcribe 후처리 단계 실행 (Privacy Removal → Classification → 요소 탐지)
+    
+    Form 설정에서 활성화된 단계만 순서대로 실행하고, 단계가 끝날 때마다
+    (단계 이름, 결과)를 내보냅니다. 스트리밍 응답은 이를 그대로 이벤트로 전송합니다.
+    
+    Args:
+        stt_result: STT 결과 (또는 텍스트 입력으로 구성한 결과)
+        config: 요청 FormDataConfig
+    
+    Yields:
+        ("privacy_removal", PrivacyRemovalResult | None)
+        ("classification", ClassificationResult | None)
+        ("element_detection", dict)
+    """
+    # Privacy Removal 설정
+    privacy_removal = config.get_bool('privacy_removal')
+    privacy_llm_type = config.get_str('privacy_llm_type', 'vllm')
+    privacy_vllm_model_name = config.get_vllm_model_name('privacy_removal')
+    privacy_vllm_api_base = config.get_vllm_api_base('privacy_removal')
+    privacy_prompt_type = config.get_str('privacy_prompt_type', 'privacy_remover_default_v6')
+    
+    # Classification 설정
+    classification = config.get_bool('classification')
+    classification_llm_type = config.get_str('classification_llm_type', 'openai')
+    classification_vllm_model_name = config.get_vllm_model_name('classification')
+    classification_vllm_api_base = config.get_vllm_api_base('classification')
+    classification_prompt_type = config.get_str('classification_prompt_type', 'classification_default_v1')
+    
+    # Element Detection 설정
+    element_detection = config.get_bool('element_detection')
+    detection_types = config.get_str('detection_types', '')  # CSV: "incomplete_sales,aggressive_sales"
+    # 우선순위: Form 파라미터 → 환경변수 → 기본값 'ai_agent'
+    # 지원 값: 'ai_agent', 'vllm', 'fallback'
+    detection_api_type = config.get_str('detection_api_type') or os.getenv('ELEMENT_DETECTION_API_TYPE', 'ai_agent')
+    detection_llm_type = config.get_str('detection_llm_type', 'vllm')
+    detection_vllm_model_name = config.get_vllm_model_name('element_detection')
+    element_detection_prompt_type = config.get_str('element_detection_prompt_type', 'element_detection_qwen')
+    agent_url = config.get_agent_url()
+    
+    # DEBUG: 후처리 설정 로깅
+    logger.debug(f"[DEBUG] element_detection value: {repr(element_detection)} (type: {type(element_detection).__name__})")
+    logger.debug(f"[DEBUG] LLM 모델 설정:")
+    logger.debug(f"  - Privacy: {privacy_llm_type}/{privacy_vllm_model_name}")
+    logger.debug(f"  - Classification: {classification_llm_type}/{classification_vllm_model_name}")
+    logger.debug(f"  - Detection: {detection_llm_type}/{detection_vllm_model_name}")
+    
+    # 3. Privacy Removal (선택)
+    privacy_removal_enabled = privacy_removal  # privacy_removal은 이미 get_bool()에서 boolean으로 변환됨
+    privacy_result = None
+    
+    if privacy_removal_enabled:
+        logger.info(f"[API] Privacy Removal 처리 시작 (llm_type={privacy_llm_type}, model={privacy_vllm_model_name})")
+        privacy_result = await perform_privacy_removal(
+            text=stt_result.get('text', ''),
+            prompt_type=privacy_prompt_type,
+            llm_type=privacy_llm_type,
+            vllm_model_name=privacy_vllm_model_name,
+            vllm_api_base=privacy_vllm_api_base
+        )
+        yield "privacy_removal", privacy_result
+    
+    # 4. Classification (선택)
+    classification_enabled = classification  # classification은 이미 get_bool()에서 boolean으로 변환됨
+    classification_result = None
+    
+    if classification_enabled:
+        # Classification을 위해서는 Privacy Removal이 먼저 수행되어야 함
+        # privacy_result가 None인 경우 안전하게 처리
+        classification_text = privacy_result.text if privacy_result else stt_result.get('text', '')
+        
+        logger.info(f"[API] Classification 처리 시작 (llm_type={classification_llm_type}, model={classification_vllm_model_name})")
+        classification_response = await perform_classification(
+            text=classification_text,
+            prompt_type=classification_prompt_type,
+            llm_type=classification_llm_type,
+            vllm_model_name=classification_vllm_model_name,
+            vllm_api_base=classification_vllm_api_base
+        )
+        
+        if classification_response and classification_response.get('success', False):
+            classification_result = ClassificationResult(
+                code=classification_response['code'],
+                category=classification_response['category'],
+                confidence=classification_response['confidence'],
+                reason=classification_response.get('reason')
+            )
+            logger.info(f"[API] Classification 완료: {classification_result.code}")
+        else:
+            logger.warning(f"[API] Classification 실패: {classification_response}")
+        yield "classification", classification_result
+    
+    # 5. 요소 탐지 처리 (선택)
+    element_detection_enabled = element_detection  # element_detection은 이미 get_bool()에서 boolean으로 변환됨
+    element_result = None
+    
+    if element_detection_enabled:
+        logger.info(f"[API] 요소 탐지 처리 시작 (detection_types={detection_types}, api_type={detection_api_type})")
+        logger.info(f"[API] agent_url 값: {repr(agent_url)}")
+        from api_server.transcribe_endpoint import perform_element_detection
+        
+        # 정제된 텍스트 또는 원본 사용
+        # privacy_result가 있으면 정제된 텍스트 사용, 없으면 원본 STT 결과 사용
+        detection_text = privacy_result.text if privacy_result else stt_result.get('text', '')
+        logger.info(f"[API] 요소 탐지 텍스트 선택: privacy_result={privacy_result is not None}, text_length={len(detection_text)}, text_preview={detection_text[:100] if detection_text else ''}")
+        
+        # detection_types를 리스트로 파싱 (CSV 형식 지원)
+        detection_types_list = [t.strip() for t in detection_types.split(',') if t.strip()] if detection_types else []
+        
+        # vLLM 엔드포인트 URL 설정
+        vllm_base_url = os.getenv("VLLM_BASE_URL", "http://localhost:8001")
+        
+        # 로깅: Element Detection 호출 시 사용할 모델 확인
+        logger.info(f"[API] Element Detection 모델 설정:")
+        logger.info(f"  - LLM Type: {detection_llm_type}")
+        logger.info(f"  - vLLM Model: {detection_vllm_model_name}")
+        logger.info(f"[API] Element Detection 호출 전 stt_result 상태: success={stt_result.get('success')}, backend={stt_result.get('backend')}, text_len={len(stt_result.get('text', ''))}")
+        
+        # ai_agent 모드와 vllm 모드의 파라미터 구분
+        if detection_api_type == "ai_agent":
+            # AI Agent 모드: agent_url만 필요
+            element_response = await perform_element_detection(
+                text=detection_text,
+                detection_types=detection_types_list,
+                api_type=detection_api_type,
+                agent_url=agent_url
+            )
+        else:
+            # vLLM 모드: vLLM 설정 필요
+            element_response = await perform_element_detection(
+                text=detection_text,
+                detection_types=detection_types_list,
+                api_type=detection_api_type,
+                llm_type=detection_llm_type,
+                vllm_model_name=detection_vllm_model_name,
+                vllm_base_url=vllm_base_url,
+                prompt_type=element_detection_prompt_type
+            )
+        
+        logger.info(f"[API] Element Detection 응답: success={element_response.get('success')}, api_type={element_response.get('api_type')}, error={element_response.get('error')}")
+        
+        # success 여부와 관계없이 element_result 설정 (미탐지도 유효한 결과)
+        element_result = element_response
+        
+        if element_response.get('success'):
+            detected_yn = element_response.get('detection_results', {}).get('detected_yn', 'N')
+            detection_details = element_response.get('detection_results', {})
+            logger.info(f"[API] ✅ 요소 탐지 완료 (api_type={element_response.get('api_type')}, detected_yn={detected_yn})")
+            logger.debug("[API] 요소 탐지 상세 결과 (JSON): %s", lazy(json.dumps, detection_details, ensure_ascii=False, indent=2))
+            logger.debug("[API] element_result type: %s", lazy(type, element_result))
+        else:
+            logger.warning(f"[API] ⚠️ 요소 탐지 실패: {element_response.get('error')}")
+        yield "element_detection", element_result
+
+
+async def _transcribe_event_stream(config: FormDataConfig, preset: Optional[str], file_path_obj: Path,
+                                   file_check: dict, file_size_mb: float, memory_info: dict, language: str,
+                                   perf_monitor: PerformanceMonitor, start_time: float, sse: bool, ticket,
+                                   selection: FieldSelection):
+    """
+    /transcribe 스트리밍 응답 본문 (is_stream=true)
+    
+    FastAPI yield 의존성(슬롯, 엔진 lease)은 응답 본문 전송 전에 종료되므로 생성기 안에서
+    슬롯과 엔진을 다시 잡습니다. 엔진 lease는 STT가 끝나면 반납하고 슬롯은 후처리까지 유지합니다.
+    승인 제어 예약(ticket)은 의존성에서 넘겨받아 본문이 끝날 때 반납하고, 본문이 시작되지 못한 경우
+    (첫 청크 전 연결 끊김 등)를 위해 CleanupStreamingResponse가 성능 모니터 종료와 함께 한 번 더 반납합니다.
+    클라이언트 연결이 끊기면 진행 중인 변환은 다음 세그먼트 시점에 중단됩니다.
+    
+    이벤트 순서:
+        start → segment × N → stt_done → privacy_removal / classification / element_detection (활성화된 단계만)
+        → result (TranscribeResponse), 실패 시 error 이벤트로 종료
+    """
+    def event(name: str, data) -> bytes:
+        return format_stream_event(name, data, sse)
+    
+    try:
+        async with transcribe_slot():
+            async with engine_manager.lease(preset) as stt:
+                yield event("start", {
+                    "file_path": str(file_path_obj),
+                    "duration": file_check.get('duration_sec') if file_check else None,
+                    "language": language,
+                    "preset": preset
+                })
+                
+                stt_result = None
+                segment_count = 0
+                async for kind, value in stream_stt(stt, file_path_obj, language):
+                    if kind == "segment":
+                        yield event("segment", {"index": segment_count, **value})
+                        segment_count += 1
+                    else:
+                        stt_result = value
+            
+            if not stt_result or not stt_result.get('success', False) or 'error' in stt_result:
+                error_message = stt_result.get('error', 'STT processing failed') if stt_result else 'STT processing failed'
+                logger.error(f"[API] STT 스트리밍 실패: {error_message}")
+                yield event("error", {
+                    "error": ErrorCode.STT_PROCESSING_ERROR.value,
+                    "message": error_message,
+                    "processing_time": time.time() - start_time
+                })
+                return
+            
+            yield event("stt_done", {
+                "text": stt_result.get('text', ''),
+                "language": stt_result.get('language'),
+                "backend": stt_result.get('backend'),
+                "segments": segment_count,
+                "first_segment_sec": stt_result.get('first_segment_sec'),
+                "elapsed_sec": round(time.time() - start_time, 2)
+            })
+            
+            post_results = {}
+            async for stage, stage_result in _post_processing_stages(stt_result, config):
+                post_results[stage] = stage_result
+                yield event(stage, stage_result.dict() if hasattr(stage_result, "dict") else stage_result)
+            
+            processing_time = time.time() - start_time
+            response = build_transcribe_response(
+                stt_result=stt_result,
+                file_check=file_check,
+                file_size_mb=file_size_mb,
+                memory_info=memory_info,
+                perf_metrics=perf_monitor.stop(),
+                processing_time=processing_time,
+                privacy_result=post_results.get("privacy_removal"),
+                classification_result=post_results.get("classification"),
+                element_detection_result=post_results.get("element_detection"),
+                element_detection_enabled=config.get_bool('element_detection'),
+                file_path_obj=file_path_obj,
+                processing_mode="streaming"
+            )
+            yield event("result", selection.dump(response))
+            logger.info(f"[API] ✅ 스트리밍 요청 처리 완료 (처리시간: {processing_time:.2f}초, "
+                        f"첫 세그먼트: {stt_result.get('first_segment_sec')}초)")
+    
+    except EngineUnavailableError as e:
+        logger.error(f"[Engine] {preset} 엔진 준비 실패: {e}")
+        yield event("error", {
+            "error": ErrorCode.STT_PROCESSING_ERROR.value,
+            "message": str(e),
+            "processing_time": time.time() - start_time
+        })
+    except Exception as e:
+        logger.error(f"[API] 스트리밍 처리 중 오류: {type(e).__name__}: {e}", exc_info=True)
+        yield event("error", {
+            "error": ErrorCode.INTERNAL_ERROR.value,
+            "message": str(e)[:200],
+            "processing_time": time.time() - start_time
+        })
+    finally:
+        admission.release(ticket)
+
+
 @app.post("/transcribe")
 async def transcribe(
     request: Request,
     export: Optional[str] = Query(None, description="Export format: 'txt' or 'json'"),
+    ticket=Depends(admit_transcribe_request),
     _slot: None = Depends(acquire_transcribe_slot),
+    stt=Depends(lease_stt_engine),
 ):
     """
     통합 음성인식 엔드포인트 (단건 처리)
@@ -484,7 +1112,13 @@ async def transcribe(
     - file_path: 서버 파일 경로 (선택: file_path 또는 stt_text 중 하나 필수)
     - stt_text: 이미 변환된 텍스트 (선택: NEW - STT 스킵)
     - language: 언어 코드 (기본: "ko")
-    - is_stream: 스트리밍 모드 (기본: "false")
+    - preset: STT 프리셋 (speed/balanced/accuracy/cpu_int8, 기본: 기본 엔진) - 해당 프리셋 엔진으로 라우팅
+    - priority: 승인 대기열 우선순위 (high/normal/low 또는 0~9, 기본: normal, X-Priority 헤더로도 지정)
+    - fields: 응답에 포함할 필드 (쉼표 구분 점 경로, 예: "success,text,element_detection", 기본: 전체)
+    - exclude: 응답에서 제외할 필드 (예: "segments,memory_info,performance")
+    - omit_original_text: Privacy Removal 결과가 있으면 원문 text/segments 제외 (기본: "false")
+    - is_stream: 스트리밍 모드 (기본: "false") - file_path 입력 시 세그먼트/후처리 결과를 처리되는 대로 전송
+    - stream_format: 스트리밍 형식 (ndjson/sse, 기본: "ndjson", Accept: text/event-stream이면 sse)
     - privacy_removal: 개인정보 제거 (기본: "false")
     - privacy_llm_type: Privacy Removal LLM 타입 (openai, vllm, ollama) (기본: "openai")
     - vllm_model_name: vLLM 모델명 (privacy_llm_type='vllm'일 때)
@@ -502,7 +1136,11 @@ async def transcribe(
     - export: 내보내기 형식 ("txt" 또는 "json")
     
     Returns:
-    - TranscribeResponse: 처리 결과
+    - TranscribeResponse: 처리 결과 (본문이 크면 Accept-Encoding에 따라 br/gzip 압축)
+    - 503 STT_SERVER_BUSY: 승인 대기열 초과 (Retry-After 헤더: 다시 시도할 때까지 예상 대기 시간, 초)
+    - is_stream=true: 이벤트 스트림 (application/x-ndjson 또는 text/event-stream)
+      start → segment × N → stt_done → privacy_removal/classification/element_detection → result (TranscribeResponse)
+      NDJSON 한 줄: {"event": "segment", "data": {"index": 0, "start": 0.0, "end": 4.2, "text": "..."}}
     
     Example (음성파일):
     ```bash
@@ -511,6 +1149,13 @@ async def transcribe(
       -F 'privacy_removal=true'
     ```
     
+    Example (스트리밍):
+    ```bash
+    curl -N -X POST http://localhost:8003/transcribe \
+      -F 'file_path=/app/audio/test.wav' \
+      -F 'is_stream=true'
+    ```
+    
     Example (텍스트 입력):
     ```bash
     curl -X POST http://localhost:8003/transcribe \
@@ -527,38 +1172,11 @@ async def transcribe(
     language = config.get_str('language', 'ko')
     is_stream = config.get_bool('is_stream')
     
-    # Privacy Removal 설정
-    privacy_removal = config.get_bool('privacy_removal')
-    privacy_llm_type = config.get_str('privacy_llm_type', 'vllm')
-    privacy_vllm_model_name = config.get_vllm_model_name('privacy_removal')
-    privacy_vllm_api_base = config.get_vllm_api_base('privacy_removal')
-    privacy_prompt_type = config.get_str('privacy_prompt_type', 'privacy_remover_default_v6')
-    
-    # Classification 설정
-    classification = config.get_bool('classification')
-    classification_llm_type = config.get_str('classification_llm_type', 'openai')
-    classification_vllm_model_name = config.get_vllm_model_name('classification')
-    classification_vllm_api_base = config.get_vllm_api_base('classification')
-    classification_prompt_type = config.get_str('classification_prompt_type', 'classification_default_v1')
-    
-    # Element Detection 설정
+    # 후처리 단계 설정은 _post_processing_stages()에서 추출
     element_detection = config.get_bool('element_detection')
-    detection_types = config.get_str('detection_types', '')  # CSV: "incomplete_sales,aggressive_sales"
-    # 우선순위: Form 파라미터 → 환경변수 → 기본값 'ai_agent'
-    # 지원 값: 'ai_agent', 'vllm', 'fallback'
-    detection_api_type = config.get_str('detection_api_type') or os.getenv('ELEMENT_DETECTION_API_TYPE', 'ai_agent')
-    detection_llm_type = config.get_str('detection_llm_type', 'vllm')
-    detection_vllm_model_name = config.get_vllm_model_name('element_detection')
-    element_detection_prompt_type = config.get_str('element_detection_prompt_type', 'element_detection_qwen')
-    agent_url = config.get_agent_url()
     
     # DEBUG: FormData 내용 로깅
     logger.debug(f"[DEBUG] FormData Keys: {list(form_data.keys())}")
-    logger.debug(f"[DEBUG] element_detection value: {repr(element_detection)} (type: {type(element_detection).__name__})")
-    logger.debug(f"[DEBUG] LLM 모델 설정:")
-    logger.debug(f"  - Privacy: {privacy_llm_type}/{privacy_vllm_model_name}")
-    logger.debug(f"  - Classification: {classification_llm_type}/{classification_vllm_model_name}")
-    logger.debug(f"  - Detection: {detection_llm_type}/{detection_vllm_model_name}")
     
     # 처리 시간 측정
     start_time = time.time()
@@ -589,6 +1207,23 @@ async def transcribe(
                 }
             )
         
+        # 응답 필드 선택 (잘못된 필드명은 처리 전에 400)
+        try:
+            selection = FieldSelection(
+                TranscribeResponse,
+                fields=config.get_str('fields', ''),
+                exclude=config.get_str('exclude', ''),
+                omit_original_text=config.get_bool('omit_original_text')
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": ErrorCode.INVALID_REQUEST.value,
+                    "message": str(e)
+                }
+            )
+        
         # 1. 파일 검증 및 STT 처리 (file_path 기반)
         file_path_obj = None
         file_check = None
@@ -604,11 +1239,36 @@ async def transcribe(
                 raise HTTPException(status_code=503, detail="STT 모델 로드 실패")
             
             # 기존 방식: 파일 검증 및 STT 수행
-            file_path_obj, file_check, memory_info = await validate_and_prepare_file(file_path)
+            # 메모리는 승인 제어에서 이미 예약됨 → 여기서는 다시 거절하지 않음
+            file_path_obj, file_check, memory_info = await validate_and_prepare_file(
+                file_path, required_mb=None
+            )
             file_size_mb = file_path_obj.stat().st_size / (1024**2)
             
             # 2. STT 처리
             is_streaming = is_stream  # is_stream은 이미 config.get_bool()에서 boolean으로 변환됨
+            if is_streaming and not export:
+                # 세그먼트 → 후처리 → 최종 결과를 처리되는 대로 전송 (NDJSON 기본, SSE 선택)
+                use_sse = "text/event-stream" in request.headers.get("accept", "") or \
+                    config.get_str('stream_format', 'ndjson').lower() == 'sse'
+                preset = (form_data.get("preset") or "").lower().strip() or None
+                logger.info(f"[API] 스트리밍 응답 시작 (format={'sse' if use_sse else 'ndjson'})")
+                ticket.detach()
+                
+                def cleanup_stream():
+                    perf_monitor.stop()
+                    admission.release(ticket)
+                
+                return CleanupStreamingResponse(
+                    _transcribe_event_stream(
+                        config, preset, file_path_obj, file_check, file_size_mb, memory_info,
+                        language, perf_monitor, start_time, use_sse, ticket, selection
+                    ),
+                    cleanup=cleanup_stream,
+                    media_type="text/event-stream" if use_sse else "application/x-ndjson",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+                )
+            
             stt_result = await perform_stt(
                 stt_instance=stt,
                 file_path_obj=file_path_obj,
@@ -621,18 +1281,8 @@ async def transcribe(
             # 새로운 방식: 텍스트 직접 입력 (STT 스킵)
             is_streaming = False  # STT 스킵시 스트리밍 불가
             
-            # 메모리 확인 (텍스트 입력도 후처리에 메모리 필요)
-            from stt_utils import check_memory_available
-            memory_info = check_memory_available(logger=logger)
-            if memory_info['critical']:
-                logger.error(f"[API] 메모리 부족: {memory_info['message']}")
-                raise HTTPException(
-                    status_code=503,
-                    detail={
-                        "error": ErrorCode.STT_MEMORY_ERROR.value,
-                        "message": memory_info['message'],
-                    }
-                )
+            # 메모리 상태 기록 (후처리 메모리는 승인 제어에서 이미 예약됨)
+            memory_info = check_memory_available(required_mb=0, logger=logger)
             
             # 텍스트 기반 결과 구성
             stt_result = {
@@ -666,109 +1316,14 @@ async def transcribe(
                 }
             )
         
-        # 3. Privacy Removal (선택)
-        privacy_removal_enabled = privacy_removal  # privacy_removal은 이미 get_bool()에서 boolean으로 변환됨
-        privacy_result = None
-        
-        if privacy_removal_enabled:
-            logger.info(f"[API] Privacy Removal 처리 시작 (llm_type={privacy_llm_type}, model={privacy_vllm_model_name})")
-            privacy_result = await perform_privacy_removal(
-                text=stt_result.get('text', ''),
-                prompt_type=privacy_prompt_type,
-                llm_type=privacy_llm_type,
-                vllm_model_name=privacy_vllm_model_name,
-                vllm_api_base=privacy_vllm_api_base
-            )
-        
-        # 4. Classification (선택)
-        classification_enabled = classification  # classification은 이미 get_bool()에서 boolean으로 변환됨
-        classification_result = None
-        
-        if classification_enabled:
-            # Classification을 위해서는 Privacy Removal이 먼저 수행되어야 함
-            # privacy_result가 None인 경우 안전하게 처리
-            classification_text = privacy_result.text if privacy_result else stt_result.get('text', '')
-            
-            logger.info(f"[API] Classification 처리 시작 (llm_type={classification_llm_type}, model={classification_vllm_model_name})")
-            classification_response = await perform_classification(
-                text=classification_text,
-                prompt_type=classification_prompt_type,
-                llm_type=classification_llm_type,
-                vllm_model_name=classification_vllm_model_name,
-                vllm_api_base=classification_vllm_api_base
-            )
-            
-            if classification_response and classification_response.get('success', False):
-                classification_result = ClassificationResult(
-                    code=classification_response['code'],
-                    category=classification_response['category'],
-                    confidence=classification_response['confidence'],
-                    reason=classification_response.get('reason')
-                )
-                logger.info(f"[API] Classification 완료: {classification_result.code}")
-            else:
-                logger.warning(f"[API] Classification 실패: {classification_response}")
-        
-        # 5. 요소 탐지 처리 (선택)
-        element_detection_enabled = element_detection  # element_detection은 이미 get_bool()에서 boolean으로 변환됨
-        element_result = None
-        
-        if element_detection_enabled:
-            logger.info(f"[API] 요소 탐지 처리 시작 (detection_types={detection_types}, api_type={detection_api_type})")
-            logger.info(f"[API] agent_url 값: {repr(agent_url)}")
-            from api_server.transcribe_endpoint import perform_element_detection
-            
-            # 정제된 텍스트 또는 원본 사용
-            # privacy_result가 있으면 정제된 텍스트 사용, 없으면 원본 STT 결과 사용
-            detection_text = privacy_result.text if privacy_result else stt_result.get('text', '')
-            logger.info(f"[API] 요소 탐지 텍스트 선택: privacy_result={privacy_result is not None}, text_length={len(detection_text)}, text_preview={detection_text[:100] if detection_text else ''}")
-            
-            # detection_types를 리스트로 파싱 (CSV 형식 지원)
-            detection_types_list = [t.strip() for t in detection_types.split(',') if t.strip()] if detection_types else []
-            
-            # vLLM 엔드포인트 URL 설정
-            vllm_base_url = os.getenv("VLLM_BASE_URL", "http://localhost:8001")
-            
-            # 로깅: Element Detection 호출 시 사용할 모델 확인
-            logger.info(f"[API] Element Detection 모델 설정:")
-            logger.info(f"  - LLM Type: {detection_llm_type}")
-            logger.info(f"  - vLLM Model: {detection_vllm_model_name}")
-            logger.info(f"[API] Element Detection 호출 전 stt_result 상태: success={stt_result.get('success')}, backend={stt_result.get('backend')}, text_len={len(stt_result.get('text', ''))}")
-            
-            # ai_agent 모드와 vllm 모드의 파라미터 구분
-            if detection_api_type == "ai_agent":
-                # AI Agent 모드: agent_url만 필요
-                element_response = await perform_element_detection(
-                    text=detection_text,
-                    detection_types=detection_types_list,
-                    api_type=detection_api_type,
-                    agent_url=agent_url
-                )
-            else:
-                # vLLM 모드: vLLM 설정 필요
-                element_response = await perform_element_detection(
-                    text=detection_text,
-                    detection_types=detection_types_list,
-                    api_type=detection_api_type,
-                    llm_type=detection_llm_type,
-                    vllm_model_name=detection_vllm_model_name,
-                    vllm_base_url=vllm_base_url,
-                    prompt_type=element_detection_prompt_type
-                )
-            
-            logger.info(f"[API] Element Detection 응답: success={element_response.get('success')}, api_type={element_response.get('api_type')}, error={element_response.get('error')}")
-            
-            # success 여부와 관계없이 element_result 설정 (미탐지도 유효한 결과)
-            element_result = element_response
-            
-            if element_response.get('success'):
-                detected_yn = element_response.get('detection_results', {}).get('detected_yn', 'N')
-                detection_details = element_response.get('detection_results', {})
-                logger.info(f"[API] ✅ 요소 탐지 완료 (api_type={element_response.get('api_type')}, detected_yn={detected_yn})")
-                logger.info(f"[API] 요소 탐지 상세 결과 (JSON): {json.dumps(detection_details, ensure_ascii=False, indent=2)}")
-                logger.debug(f"[API] element_result type: {type(element_result)}, keys: {element_result.keys() if isinstance(element_result, dict) else 'N/A'}")
-            else:
-                logger.warning(f"[API] ⚠️ 요소 탐지 실패: {element_response.get('error')}")
+        # 3~5. 후처리 (Privacy Removal → Classification → 요소 탐지, 각 단계 선택)
+        post_results = {}
+        async for stage, stage_result in _post_processing_stages(stt_result, config):
+            post_results[stage] = stage_result
+        privacy_result = post_results.get("privacy_removal")
+        classification_result = post_results.get("classification")
+        element_result = post_results.get("element_detection")
+        element_detection_enabled = element_detection
         
         # 6. 처리 시간 계산
         processing_time = time.time() - start_time
@@ -794,37 +1349,26 @@ async def transcribe(
         
         # 8. 내보내기 처리
         if export and export.lower() in ["txt", "json"]:
+            filename = f"transcription_{int(time.time())}.{export.lower()}"
+            disposition = {"Content-Disposition": f'attachment; filename="{filename}"'}
             if export.lower() == "txt":
                 # 텍스트 파일 다운로드
-                content = response.text.encode('utf-8')
-                return FileResponse(
-                    content=content,
-                    filename=f"transcription_{int(time.time())}.txt",
-                    media_type="text/plain; charset=utf-8"
-                )
-            elif export.lower() == "json":
-                # JSON 파일 다운로드
-                content = json.dumps(response.dict(), ensure_ascii=False, indent=2).encode('utf-8')
-                return FileResponse(
-                    content=content,
-                    filename=f"transcription_{int(time.time())}.json",
-                    media_type="application/json; charset=utf-8"
+                return Response(
+                    content=response.text.encode('utf-8'),
+                    media_type="text/plain",  # charset=utf-8은 Starlette가 붙임
+                    headers=disposition
                 )
+            # JSON 파일 다운로드 (사람이 읽는 파일이므로 들여쓰기 유지)
+            return await response_encoder.render(response, request, selection, headers=disposition, indent=2)
         
-        # 9. JSON 응답
-        json_response = JSONResponse(
-            content=response.dict(),
-            status_code=200,
-            headers={"Content-Type": "application/json; charset=utf-8"}
-        )
+        # 9. JSON 응답 (필드 선택 + 모델 직접 직렬화 + Accept-Encoding에 따라 압축)
+        json_response = await response_encoder.render(response, request, selection)
         
-        # 응답 반환 직전 메모리 정리 (동시 요청 시 로컬 변수 즉시 해제)
+        # 응답 반환 직전 메모리 정리 (로컬 변수 즉시 해제, gc는 RSS가 기준을 넘었을 때만)
         try:
-            import gc
             del response, stt_result, privacy_result, classification_result, element_result
             del file_path_obj, file_check, memory_info, perf_metrics
-            gc.collect()
-            logger.debug(f"[API] 메모리 정리 완료")
+            memory_governor.checkpoint("request_end")
         except Exception as e:
             logger.debug(f"[API] 메모리 정리 중 오류: {e}")
         
@@ -862,6 +1406,7 @@ async def transcribe(
     remove_privacy: str = Form("false", description="개인정보 제거 활성화 (true/false)"),
     privacy_prompt_type: str = Form("privacy_remover_default_v6", description="프롬프트 타입"),
     _slot: None = Depends(acquire_transcribe_slot),
+    stt=Depends(lease_stt_engine),
 ):
     """
     서버 로컬 파일을 음성인식으로 변환 (권장 방식)
@@ -1029,11 +1574,11 @@ async def transcribe(
         
         if is_streaming:
             # 스트리밍 모드: 청크 단위 처리
-            result = await _transcribe_streaming(str(file_path_obj), language, file_size_mb)
+            result = await _transcribe_streaming(stt, str(file_path_obj), language, file_size_mb)
         else:
             # 일반 모드: 직접 처리
             try:
-                result = stt.transcribe(str(file_path_obj), language=language)
+                result = await stt.transcribe_async(str(file_path_obj), language=language)
                 logger.info(f"[API] STT 처리 완료 - 백엔드: {result.get('backend', 'unknown')}, 성공: {result.get('success', False)}")
             except Exception as e:
                 logger.error(f"[API] STT 처리 중 예상치 못한 오류: {type(e).__name__}: {e}", exc_info=True)
@@ -1153,6 +1698,7 @@ async def transcribe(
             "processing_mode": processing_mode,
             "processing_time_seconds": round(processing_time, 2),
             "segments_processed": result.get("segments_processed"),
+            "segments": result.get("segments"),
             "memory_info": {
                 "available_mb": memory_info.get('available_mb', 0),
                 "used_percent": memory_info.get('used_percent', 0)
@@ -1301,6 +1847,67 @@ async def transcribe(
         )
 
 
+# ============================================================================
+# Live Transcribe (WebSocket)
+# ============================================================================
+
+@app.websocket("/ws/transcribe")
+async def live_transcribe(websocket: WebSocket):
+    """
+    실시간 통화 음성인식 (WebSocket)
+    
+    Query Parameters:
+    - encoding: 프레임 형식 (pcm_s16le/pcm_f32le/opus, 기본: "pcm_s16le")
+    - sample_rate: PCM 샘플레이트 (기본: 16000, opus는 무시)
+    - channels: 채널 수 (1 또는 2, 기본: 1)
+    - language: 언어 코드 (기본: "ko")
+    - preset: STT 프리셋 (speed/balanced/accuracy/cpu_int8, 기본: 기본 엔진)
+    
+    각 디코딩은 /transcribe와 같은 전역 슬롯과 엔진 lease를 사용하므로 배치 요청과 모델을 공유합니다.
+    메시지 형식은 api_server/live_transcribe.py 참고.
+    
+    Example:
+    ```bash
+    python3 scripts/test_live_transcribe.py audio/samples/long_10s.wav --encoding opus
+    ```
+    """
+    params = websocket.query_params
+    language = params.get("language", "ko")
+    preset = (params.get("preset") or "").lower().strip() or None
+    if preset and preset not in PRESET_SEGMENT_CONFIG:
+        await websocket.accept()
+        await websocket.send_json({
+            "type": "error",
+            "message": f"지원하지 않는 preset: {preset} (사용 가능: {', '.join(PRESET_SEGMENT_CONFIG.keys())})"
+        })
+        await websocket.close(code=1008)
+        return
+    
+    async def decode(audio, prompt: str) -> dict:
+        async with transcribe_slot("live"):
+            async with engine_manager.lease(preset) as engine:
+                return await asyncio.to_thread(engine.transcribe_window, audio, language, prompt)
+    
+    try:
+        sample_rate = int(params.get("sample_rate", "16000"))
+        channels = int(params.get("channels", "1"))
+    except ValueError:
+        await websocket.accept()
+        await websocket.send_json({"type": "error", "message": "sample_rate/channels는 정수여야 합니다"})
+        await websocket.close(code=1008)
+        return
+    
+    await live_sessions.serve(
+        websocket,
+        decode,
+        encoding=params.get("encoding", "pcm_s16le").lower(),
+        sample_rate=sample_rate,
+        channels=channels,
+        language=language,
+        preset=preset
+    )
+
+
 # ============================================================================
 # Batch Transcribe Endpoint
 # ============================================================================
@@ -1316,6 +1923,7 @@ async def transcribe_batch_endpoint(
     privacy_prompt_type: str = Form("privacy_remover_default_v6"),
     classification_prompt_type: str = Form("classification_default_v1"),
     _slot: None = Depends(acquire_transcribe_slot),
+    stt=Depends(lease_stt_engine),
 ):
     """
     배치 음성인식 처리
@@ -1323,6 +1931,7 @@ async def transcribe_batch_endpoint(
     Parameters:
     - file_paths: JSON 리스트 문자열 (예: '[\"/app/audio/test1.wav\", \"/app/audio/test2.wav\"]')
     - language: 언어 코드 (기본: "ko")
+    - preset: STT 프리셋 (speed/balanced/accuracy/cpu_int8, 기본: 기본 엔진) - 해당 프리셋 엔진으로 라우팅
     - is_stream: 스트리밍 모드 (기본: "false")
     - privacy_removal: 개인정보 제거 (기본: "false")
     - classification: 통화 분류 (기본: "false")
@@ -1507,7 +2116,7 @@ def merge_chunk_results(chunks_info: list) -> dict:
     }
 
 
-async def _transcribe_streaming(file_path: str, language: str, file_size_mb: float):
+async def _transcribe_streaming(stt, file_path: str, language: str, file_size_mb: float):
     """
     스트리밍 모드로 파일 처리 (30초 청크 + 3초 overlap = 10% 중복)
     - 30초 시간 기반 청크 분할
@@ -1515,8 +2124,13 @@ async def _transcribe_streaming(file_path: str, language: str, file_size_mb: flo
     - accuracy 모드에서 높은 정확도로 인해 3초 오버랩만으로도 충분
     - 각 청크 독립 처리 후 overlap 부분 병합
     """
+    # 요청별 프리셋 엔진의 세그멘트 설정 우선 (없으면 STT_PRESET 기준 전역 설정)
+    segment_config = PRESET_SEGMENT_CONFIG.get(stt.preset, {})
+    chunk_duration = segment_config.get("chunk_duration", STREAM_CHUNK_DURATION)
+    overlap_duration = segment_config.get("overlap_duration", STREAM_OVERLAP_DURATION)
+    
     logger.info(f"[STREAM] 스트리밍 모드 시작 (Overlap 기반)")
-    logger.info(f"[STREAM] 청크 설정: {STREAM_CHUNK_DURATION}초 / Overlap: {STREAM_OVERLAP_DURATION}초")
+    logger.info(f"[STREAM] 청크 설정: {chunk_duration}초 / Overlap: {overlap_duration}초")
     
     tmp_chunk_paths = []
     
@@ -1535,8 +2149,8 @@ async def _transcribe_streaming(file_path: str, language: str, file_size_mb: flo
         logger.info(f"  - 지속시간: {duration_sec:.2f}초")
         
         # 2단계: 청크 경계 계산 (30초 청크 + 12초 overlap)
-        frames_per_chunk = sample_rate * STREAM_CHUNK_DURATION  # 30초 = 프레임 개수
-        frames_per_overlap = sample_rate * STREAM_OVERLAP_DURATION  # 12초
+        frames_per_chunk = sample_rate * chunk_duration  # 30초 = 프레임 개수
+        frames_per_overlap = sample_rate * overlap_duration  # 12초
         step_frames = frames_per_chunk - frames_per_overlap  # 새로운 프레임 개수 (18초)
         
         chunk_ranges = []
@@ -1583,7 +2197,7 @@ async def _transcribe_streaming(file_path: str, language: str, file_size_mb: flo
                 
                 # 청크 처리
                 logger.info(f"[STREAM] 청크 {chunk_idx} 처리 중...")
-                chunk_result = stt.transcribe(chunk_file, language=language)
+                chunk_result = await stt.transcribe_async(chunk_file, language=language)
                 
                 if not chunk_result.get('success', False):
                     logger.warning(f"[STREAM] 청크 {chunk_idx} 실패: {chunk_result.get('error', '알 수 없음')}")
@@ -1626,9 +2240,21 @@ async def _transcribe_streaming(file_path: str, language: str, file_size_mb: flo
         merged_text = ""
         successful_chunks = [cr for cr in chunks_results if cr['result'].get('success', False)]
         
+        merged_segments = []
         for i, chunk_result in enumerate(successful_chunks):
             text = chunk_result['result'].get('text', '').strip()
             
+            # 청크 내 타임스탬프를 파일 기준으로 변환 (overlap 구간에서 이미 나온 구간은 제외)
+            for segment in chunk_result['result'].get('segments') or []:
+                start = round(chunk_result['start_sec'] + segment['start'], 2)
+                if merged_segments and start < merged_segments[-1]['end']:
+                    continue
+                merged_segments.append({
+                    'start': start,
+                    'end': round(chunk_result['start_sec'] + segment['end'], 2),
+                    'text': segment['text']
+                })
+            
             if i == 0:
                 # 첫 청크: 전체 포함
                 merged_text = text
@@ -1643,13 +2269,14 @@ async def _transcribe_streaming(file_path: str, language: str, file_size_mb: flo
         final_result = {
             'success': True,
             'text': merged_text.strip(),
+            'segments': merged_segments,
             'language': language,
             'duration_sec': duration_sec,
             'backend': 'faster-whisper',  # 기본값
             'processing_mode': 'streaming',
             'chunks_processed': len(successful_chunks),
             'total_chunks': len(chunk_ranges),
-            'merge_strategy': f'{STREAM_CHUNK_DURATION}s chunk + {STREAM_OVERLAP_DURATION}s overlap'
+            'merge_strategy': f'{chunk_duration}s chunk + {overlap_duration}s overlap'
         }
         
         logger.info(f"[STREAM] 처리 완료: {len(successful_chunks)}/{len(chunk_ranges)} 청크 성공")
@@ -1700,6 +2327,7 @@ async def transcribe_by_upload(
     language: str = Form("ko"),
     export: str = Query(None, description="Export format: 'txt' or 'json', default: None (JSON response)"),
     _slot: None = Depends(acquire_transcribe_slot),
+    stt=Depends(lease_stt_engine),
 ):
     """
     파일 업로드를 통한 음성인식 (파일 전송 필요)
@@ -1822,7 +2450,7 @@ async def transcribe_by_upload(
         # STT 처리
         logger.info(f"[API] STT 처리 시작 (파일: {file.filename}, 길이: {file_check['duration_sec']:.1f}초, 언어: {language})")
         try:
-            result = stt.transcribe(tmp_path, language=language)
+            result = await stt.transcribe_async(tmp_path, language=language)
             logger.info(f"[API] STT 처리 완료 - 백엔드: {result.get('backend', 'unknown')}, 성공: {result.get('success', False)}")
         except Exception as e:
             logger.error(f"[API] STT 처리 중 예상치 못한 오류: {type(e).__name__}: {e}", exc_info=True)
@@ -1909,6 +2537,7 @@ async def transcribe_by_upload(
             "file_size_mb": file_size_mb,
             "processing_time_seconds": round(processing_time, 2),
             "segments_processed": result.get("segments_processed"),
+            "segments": result.get("segments"),
             "memory_info": {
                 "available_mb": memory_info.get('available_mb', 0),
                 "used_percent": memory_info.get('used_percent', 0)
@@ -81,6 +81,8 @@ async def transcribe_batch(
         logger.info(f"[Batch] 파일 {idx+1}/{len(file_paths)} 처리: {file_path}")
         
         file_start_time = time.time()
+        perf_monitor = PerformanceMonitor()
+        perf_monitor.start()
         
         try:
             # 파일 검증
@@ -129,8 +131,7 @@ async def transcribe_batch(
             
             # 처리 시간
             file_processing_time = time.time() - file_start_time
-            perf_monitor = PerformanceMonitor()
-            perf_metrics = perf_monitor.stop() if hasattr(perf_monitor, 'stop') else None
+            perf_metrics = perf_monitor.stop()
             
             # 응답 구성
             transcribe_response = build_transcribe_response(
@@ -299,6 +299,7 @@ class STTConfig(FormDataConfig):
     | speed | faster-whisper | int8 | ~8초 | ⚡ 가장 빠름, 정확도 낮음 |
     | balanced | faster-whisper | float16 | ~15초 | 🟡 중간 속도, 중간 정확도 |
     | accuracy | transformers | float32 | ~25초+ | 🐌 매우 느림, 정확도 최고 ⚠️ |
+    | cpu_int8 | transformers | int8 (동적 양자화) | - | 💻 CPU 전용 노드용, accuracy보다 빠름 |
     | custom | 사용자 지정 | 사용자 지정 | - | 명시적으로 device/compute_type/backend 지정 |
     
     **성능 차이 분석:**
@@ -330,11 +331,11 @@ class STTConfig(FormDataConfig):
     SUPPORTED_DEVICES = ['cpu', 'cuda', 'mps', 'auto']
     SUPPORTED_BACKENDS = ['faster_whisper', 'transformers', 'openai']
     SUPPORTED_COMPUTE_TYPES = ['float32', 'float16', 'bfloat16', 'int8']
-    SUPPORTED_PRESETS = ['speed', 'balanced', 'accuracy', 'custom']
+    SUPPORTED_PRESETS = ['speed', 'balanced', 'accuracy', 'cpu_int8', 'custom']
     
     def get_preset(self, default: str = "accuracy") -> str:
         """
-        STT 프리셋 선택 (speed, balanced, accuracy, custom)
+        STT 프리셋 선택 (speed, balanced, accuracy, cpu_int8, custom)
         
         *** 이것이 STT 설정의 가장 높은 우선순위입니다 ***
         
@@ -347,6 +348,7 @@ class STTConfig(FormDataConfig):
         - "speed"     : faster-whisper + int8    (⚡ 가장 빠름, ~8초/30초 오디오)
         - "balanced"  : faster-whisper + float16 (🟡 중간 속도, ~15초/30초 오디오)
         - "accuracy"  : transformers + float32   (🐌 최고정확도, ~25초+/30초 오디오) ⚠️ 매우 느림!
+        - "cpu_int8"  : transformers + 동적 int8 양자화 (💻 CPU 전용, 양자화 결과 디스크 캐시)
         - "custom"    : device, compute_type, backend 개별 지정 (reload_backend()에서 직접 설정)
         
         Args:
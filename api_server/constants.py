@@ -152,7 +152,8 @@ class ErrorCode(str, Enum):
     STT_MEMORY_ERROR = "STT_MEMORY_ERROR"
     STT_CUDA_OUT_OF_MEMORY = "STT_CUDA_OUT_OF_MEMORY"
     STT_PROCESSING_ERROR = "STT_PROCESSING_ERROR"
-    
+    STT_SERVER_BUSY = "STT_SERVER_BUSY"
+
     # Privacy Removal 관련 에러
     PRIVACY_SERVICE_UNAVAILABLE = "PRIVACY_SERVICE_UNAVAILABLE"
     PRIVACY_PROCESSING_ERROR = "PRIVACY_PROCESSING_ERROR"
@@ -207,33 +208,80 @@ STREAM_OVERLAP_DURATION = 3  # 기존 12초에서 변경 (40% → 10%)
 #   - "speed"     → faster-whisper + int8 (가장 빠름, 약 8초/30초 오디오)
 #   - "balanced"  → faster-whisper + float16 (중간 속도, 약 15초/30초 오디오)
 #   - "accuracy"  → transformers + float32 (정확도 최고, 약 25초+/30초 오디오) ⚠️ 매우 느림!
+#   - "cpu_int8"  → transformers + Linear 동적 int8 양자화 (CPU 전용, accuracy 대비 빠르고 메모리 약 1/3)
+#                   비교: python3 scripts/performance/compare_cpu_int8.py
 #   - "custom"    → 사용자 지정값 사용 (reload_backend()에 backend/compute_type/device 직접 지정)
 #
 # 세그멘트 오버랩은 수% 정도만 영향을 미치므로 모든 PRESET에서 동일하게 설정합니다.
+#
+# batch_size (faster-whisper 전용): 1보다 크면 BatchedInferencePipeline 사용
+#   VAD로 나눈 음성 구간을 batch_size개씩 묶어 CTranslate2에서 한 번에 디코딩 (긴 파일에서 효과 큼)
+#   0 또는 생략 시 기존 순차 디코딩 / custom 프리셋은 custom_segment_config["batch_size"]
+#   비교: python3 scripts/performance/benchmark_batched_faster_whisper.py
 PRESET_SEGMENT_CONFIG = {
     "accuracy": {
         "chunk_duration": 15,  # 30초 → 15초 (메모리 최적화)
         "overlap_duration": 2,
         "backend": "transformers",
         "compute_type": "float32",
-        "description": "Highest accuracy (transformers + float32, ~25sec/30sec audio) ⚠️ SLOW"
+        "description": "Highest accuracy (transformers + float32, ~25sec/30sec audio) ⚠️ SLOW",
+        "decoding": {"logprob_threshold": -0.6, "compression_ratio_threshold": 2.2}
     },
     "balanced": {
         "chunk_duration": 30,
         "overlap_duration": 3,
         "backend": "faster-whisper",
         "compute_type": "float16",
-        "description": "Balanced speed & accuracy (faster-whisper + float16, ~15sec/30sec audio)"
+        "batch_size": 8,
+        "description": "Balanced speed & accuracy (faster-whisper + float16, ~15sec/30sec audio)",
+        "decoding": {"logprob_threshold": -0.8}
     },
     "speed": {
         "chunk_duration": 30,
         "overlap_duration": 2,
         "backend": "faster-whisper",
         "compute_type": "int8",
-        "description": "Fastest processing (faster-whisper + int8, ~8sec/30sec audio)"
+        "batch_size": 16,
+        "description": "Fastest processing (faster-whisper + int8, ~8sec/30sec audio)",
+        "decoding": {"logprob_threshold": -1.0, "temperatures": [0.4]}
+    },
+    "cpu_int8": {
+        "chunk_duration": 30,  # 입력이 30초로 패딩되므로 CPU에서는 30초 청크가 encoder 호출 수 최소
+        "overlap_duration": 2,
+        "backend": "transformers",
+        "compute_type": "int8",
+        "description": "CPU-optimised transformers (dynamic int8 Linear quantisation, cached on disk)",
+        "decoding": {"logprob_threshold": -0.8, "beam_size": 3, "temperatures": [0.4]}
     }
 }
 
+# 적응형 디코딩 기본값 (프리셋의 "decoding" 항목이 덮어씀, custom 프리셋은 custom_segment_config["decoding"])
+#
+# 모든 세그먼트를 먼저 greedy로 디코딩하고, 아래 기준을 넘는 세그먼트만 beam search로 다시 디코딩합니다.
+# beam으로도 기준 미달이면 temperatures 순서대로 샘플링하여 평균 log 확률이 가장 높은 결과를 사용합니다.
+#   - logprob_threshold: 세그먼트 토큰 평균 log 확률이 이 값보다 낮으면 재디코딩
+#   - compression_ratio_threshold: 텍스트 zlib 압축률이 이 값보다 높으면 (반복/환각) 재디코딩
+#   - no_speech_threshold: 무음 확률이 이 값보다 높은데 텍스트가 나오면 재디코딩 (faster-whisper만 제공)
+#   - beam_size / best_of: 재디코딩 beam 크기 / 샘플링 후보 수
+#   - adaptive: False면 기존처럼 모든 세그먼트를 beam_size로 디코딩
+DEFAULT_DECODING_CONFIG = {
+    "adaptive": True,
+    "logprob_threshold": -0.8,
+    "compression_ratio_threshold": 2.4,
+    "no_speech_threshold": 0.6,
+    "beam_size": 5,
+    "best_of": 5,
+    "temperatures": [0.2, 0.4, 0.6]
+}
+
+# 백엔드 1개를 상주시키는 데 필요한 메모리 추정치 (MB, large-v3-turbo 기준)
+# /backend/reload의 blue/green 전환 시 새 엔진을 기존 엔진과 동시에 올릴 수 있는지 판단에 사용
+BACKEND_MEMORY_ESTIMATE_MB = {
+    "float32": 3300,
+    "float16": 1800,
+    "int8": 1100
+}
+
 # 기본 언어
 DEFAULT_LANGUAGE = "ko"
 SUPPORTED_LANGUAGES = ["ko", "en", "ja", "zh", "es", "fr", "de", "it", "pt", "ru"]
@@ -0,0 +1,461 @@
+"""
+STT 엔진 관리자 (프리셋별 엔진 레지스트리 + blue/green 전환)
+
+여러 프리셋의 엔진(WhisperSTT 인스턴스)을 메모리 예산 안에서 동시에 상주시키고
+요청의 preset 값에 맞는 엔진으로 라우팅한다.
+(예: 대량 백필은 speed, 검토자 재실행은 accuracy를 동시에 사용)
+
+- 기본 엔진: 시작 시 로드(STT_PRESET) 또는 /backend/reload로 교체된 엔진, preset 미지정 요청이 사용
+- 추가 엔진: 요청의 preset으로 처음 필요할 때 로드 (lazy), 예산 초과 시 유휴 엔진부터 LRU 제거
+- 요청은 lease()로 엔진을 빌려 쓰며, 엔진별 참조 수(refs)를 유지
+- 교체/제거된 엔진은 진행 중인 요청이 모두 끝난 뒤(refs == 0) 언로드
+- /backend/reload: 새 엔진을 백그라운드에서 로드한 뒤 포인터만 교체 (blue/green)
+  두 엔진을 동시에 올릴 메모리 여유가 없으면 순차 전환:
+  새 요청은 잠시 대기 → 기존 요청 완료 → 이전 엔진 언로드 → 새 엔진 로드
+  (새 엔진 로드 실패 시 이전 설정으로 복구)
+
+API 서버는 단일 이벤트 루프에서 동작하므로 참조 수/레지스트리는 별도 잠금 없이 갱신한다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from api_server.constants import BACKEND_MEMORY_ESTIMATE_MB, PRESET_SEGMENT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# blue/green 동시 적재 시 새 엔진 추정치 외에 남겨둘 여유 메모리 (MB)
+ENGINE_SWAP_HEADROOM_MB = int(os.getenv("ENGINE_SWAP_HEADROOM_MB", "1024"))
+
+# 순차 전환/예산 대기 중 새 요청이 엔진을 기다리는 최대 시간 (초, 초과 시 503)
+ENGINE_SWAP_WAIT_SEC = float(os.getenv("ENGINE_SWAP_WAIT_SEC", "180"))
+
+# 동시에 상주할 수 있는 엔진들의 메모리 예산 (MB, BACKEND_MEMORY_ESTIMATE_MB 기준 합계)
+# 기본값: transformers float32 + faster-whisper int8 + float16 동시 상주 가능
+ENGINE_MEMORY_BUDGET_MB = int(os.getenv("ENGINE_MEMORY_BUDGET_MB", "6500"))
+
+# 기본 엔진의 레지스트리 키 (프리셋이 없는 엔진)
+DEFAULT_ENGINE_KEY = "default"
+
+
+class EngineUnavailableError(RuntimeError):
+    """요청한 프리셋의 엔진을 준비할 수 없음 (로드 실패/예산 부족/대기 시간 초과)"""
+
+
+def _engine_memory_mb(compute_type: Optional[str]) -> int:
+    return BACKEND_MEMORY_ESTIMATE_MB.get((compute_type or "float32").lower(), BACKEND_MEMORY_ESTIMATE_MB["float32"])
+
+
+class _EngineSlot:
+    """엔진 1개와 참조 수"""
+
+    def __init__(self, engine, generation: int, key: str):
+        self.engine = engine
+        self.generation = generation
+        self.key = key
+        self.memory_mb = _engine_memory_mb(engine.compute_type)
+        self.refs = 0
+        self.retired = False
+        self.drained = asyncio.Event()
+        self.last_used = time.time()
+
+
+class EngineManager:
+    """프리셋별 엔진 레지스트리와 blue/green 교체 관리"""
+
+    def __init__(self):
+        # 키 → 슬롯 (LRU 순서: 앞쪽이 가장 오래 사용되지 않은 엔진)
+        self._slots: "OrderedDict[str, _EngineSlot]" = OrderedDict()
+        self._default_key: Optional[str] = None
+        self._generation = 0
+        self._available = asyncio.Event()
+        self._released = asyncio.Event()
+        self._swap_lock = asyncio.Lock()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._reserved_mb = 0
+        self._retiring: Dict[int, _EngineSlot] = {}
+        self._last_swap: Optional[Dict] = None
+        self._stats = {"lazy_loads": 0, "evictions": 0}
+
+    @property
+    def _current(self) -> Optional[_EngineSlot]:
+        return self._slots.get(self._default_key) if self._default_key else None
+
+    @property
+    def current(self):
+        """현재 기본 엔진 (없으면 None) - 상태 조회용, 추론에는 lease() 사용"""
+        slot = self._current
+        return slot.engine if slot else None
+
+    @property
+    def swapping(self) -> bool:
+        return self._swap_lock.locked()
+
+    @staticmethod
+    def _key_of(engine) -> str:
+        return engine.preset if engine.preset in PRESET_SEGMENT_CONFIG else DEFAULT_ENGINE_KEY
+
+    def _register(self, engine) -> _EngineSlot:
+        self._generation += 1
+        slot = _EngineSlot(engine, self._generation, self._key_of(engine))
+        self._slots[slot.key] = slot
+        return slot
+
+    def install(self, engine) -> None:
+        """시작 시 로드된 엔진을 기본 엔진으로 등록"""
+        if engine is None:
+            return
+        self._default_key = self._register(engine).key
+        self._available.set()
+
+    # ========================================================================
+    # 엔진 대여 (요청 단위)
+    # ========================================================================
+
+    @asynccontextmanager
+    async def lease(self, preset: Optional[str] = None):
+        """
+        요청 처리 동안 엔진을 빌림 (async with)
+
+        Args:
+            preset: speed / balanced / accuracy (None이면 기본 엔진)
+
+        Yields:
+            WhisperSTT 인스턴스 (로드된 기본 엔진이 없으면 None)
+
+        Raises:
+            EngineUnavailableError: 요청한 프리셋의 엔진을 준비할 수 없음
+        """
+        slot = await self._resolve_slot(preset)
+        while slot is not None and slot.retired:
+            # 로드 직후 다른 요청의 LRU 제거/전환으로 정리된 경우 다시 확보
+            slot = await self._resolve_slot(preset)
+        if slot is None:
+            yield None
+            return
+
+        slot.refs += 1
+        slot.last_used = time.time()
+        self._slots.move_to_end(slot.key)
+        try:
+            yield slot.engine
+        finally:
+            slot.refs -= 1
+            if slot.refs == 0:
+                if slot.retired:
+                    slot.drained.set()
+                self._released.set()
+
+    async def _wait_for_default(self) -> Optional[_EngineSlot]:
+        """순차 전환 중이면 기본 엔진이 다시 준비될 때까지 대기"""
+        if self._current is None and self.swapping:
+            try:
+                await asyncio.wait_for(self._available.wait(), timeout=ENGINE_SWAP_WAIT_SEC)
+            except asyncio.TimeoutError:
+                logger.warning(f"[Engine] 엔진 전환 대기 시간 초과 ({ENGINE_SWAP_WAIT_SEC}s)")
+        return self._current
+
+    async def _resolve_slot(self, preset: Optional[str]) -> Optional[_EngineSlot]:
+        default = await self._wait_for_default()
+        if not preset or default is None or preset == default.key:
+            return default
+
+        slot = self._slots.get(preset)
+        if slot is not None:
+            return slot
+
+        # 같은 프리셋을 동시에 요청하면 로드는 한 번만 수행
+        pending = self._loading.get(preset)
+        if pending is None:
+            pending = asyncio.ensure_future(self._lazy_load(preset, default.engine))
+            self._loading[preset] = pending
+            pending.add_done_callback(lambda _: self._loading.pop(preset, None))
+        return await asyncio.shield(pending)
+
+    async def _lazy_load(self, preset: str, base) -> _EngineSlot:
+        """요청된 프리셋 엔진을 예산 안에서 로드"""
+        required_mb = _engine_memory_mb(PRESET_SEGMENT_CONFIG[preset]["compute_type"])
+        await self._reserve(required_mb)
+        try:
+            logger.info(f"[Engine] 프리셋 엔진 로드 시작: {preset} (추정 {required_mb}MB)")
+            engine, result = await asyncio.to_thread(self._build_engine, base, None, None, None, preset)
+            if result.get("status") != "success":
+                raise EngineUnavailableError(f"{preset} 엔진 로드 실패: {result.get('message')}")
+            slot = self._register(engine)
+            self._stats["lazy_loads"] += 1
+            logger.info(f"[Engine] 프리셋 엔진 로드 완료: {preset} (상주 {self._resident_mb()}MB / 예산 {ENGINE_MEMORY_BUDGET_MB}MB)")
+            return slot
+        finally:
+            self._reserved_mb -= required_mb
+
+    # ========================================================================
+    # 메모리 예산 / LRU 제거
+    # ========================================================================
+
+    def _resident_mb(self) -> int:
+        return sum(slot.memory_mb for slot in self._slots.values())
+
+    def _evict_one(self) -> bool:
+        """유휴(refs == 0) 비기본 엔진 중 가장 오래 사용되지 않은 엔진 제거"""
+        for key, slot in self._slots.items():
+            if key != self._default_key and slot.refs == 0:
+                del self._slots[key]
+                self._retire(slot)
+                self._stats["evictions"] += 1
+                logger.info(f"[Engine] LRU 제거: {key} ({slot.memory_mb}MB)")
+                asyncio.create_task(self._drain_and_unload(slot))
+                return True
+        return False
+
+    async def _reserve(self, required_mb: int) -> None:
+        """새 엔진을 올릴 예산 확보 (유휴 엔진 LRU 제거, 사용 중이면 반납 대기)"""
+        deadline = time.monotonic() + ENGINE_SWAP_WAIT_SEC
+        while self._resident_mb() + self._reserved_mb + required_mb > ENGINE_MEMORY_BUDGET_MB:
+            if self._evict_one():
+                continue
+
+            # 기본 엔진과 로드 중인 엔진만으로 예산을 넘으면 기다려도 확보 불가
+            evictable_mb = sum(
+                slot.memory_mb for key, slot in self._slots.items() if key != self._default_key
+            )
+            if self._resident_mb() - evictable_mb + self._reserved_mb + required_mb > ENGINE_MEMORY_BUDGET_MB:
+                raise EngineUnavailableError(
+                    f"메모리 예산 부족 (필요 {required_mb}MB, 예산 {ENGINE_MEMORY_BUDGET_MB}MB)"
+                )
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise EngineUnavailableError("사용 중인 엔진 반납 대기 시간 초과")
+            self._released.clear()
+            try:
+                await asyncio.wait_for(self._released.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+        self._reserved_mb += required_mb
+
+    # ========================================================================
+    # 엔진 교체 (/backend/reload)
+    # ========================================================================
+
+    def _check_headroom(self, device: str, required_mb: int) -> Dict:
+        """
+        새 엔진을 기존 엔진과 동시에 올릴 메모리 여유 확인
+
+        Returns:
+            {"allowed": bool, "device": str, "available_mb": int, "required_mb": int}
+        """
+        available_mb = None
+        if device == "cuda":
+            try:
+                import torch
+                free_bytes, _ = torch.cuda.mem_get_info()
+                available_mb = free_bytes // (1024**2)
+            except Exception as e:
+                logger.warning(f"[Engine] GPU 여유 메모리 확인 실패: {type(e).__name__}: {e}")
+        else:
+            from stt_utils import check_memory_available
+            available_mb = check_memory_available(required_mb=0)["available_mb"]
+
+        needed_mb = required_mb + ENGINE_SWAP_HEADROOM_MB
+        return {
+            "allowed": available_mb is not None and available_mb >= needed_mb,
+            "device": device,
+            "available_mb": available_mb,
+            "required_mb": needed_mb
+        }
+
+    def _build_engine(self, base, backend, compute_type, device, preset):
+        """새 WhisperSTT 인스턴스에 요청된 백엔드 로드 (스레드에서 실행)"""
+        from stt_engine import WhisperSTT
+
+        engine = WhisperSTT(base.model_path, device=device or base.device,
+                            compute_type=compute_type or base.compute_type, auto_load=False)
+        engine.custom_segment_config = dict(base.custom_segment_config)
+        result = engine.reload_backend(backend=backend, compute_type=compute_type, device=device, preset=preset)
+        if result.get("status") != "success":
+            engine.unload()
+        return engine, result
+
+    async def _drain_and_unload(self, slot: _EngineSlot) -> None:
+        """이전 엔진의 진행 중 요청 완료 후 언로드"""
+        if slot.refs > 0:
+            logger.info(f"[Engine] 이전 엔진(gen={slot.generation}) 진행 중 요청 {slot.refs}건 완료 대기")
+            await slot.drained.wait()
+        await asyncio.to_thread(slot.engine.unload)
+        self._retiring.pop(slot.generation, None)
+        logger.info(f"[Engine] 이전 엔진(gen={slot.generation}) 언로드 완료")
+
+    def _retire(self, slot: _EngineSlot) -> None:
+        slot.retired = True
+        if slot.refs == 0:
+            slot.drained.set()
+        self._retiring[slot.generation] = slot
+
+    def _promote(self, slot: _EngineSlot) -> None:
+        """기본 엔진 교체 (이전 기본 엔진은 drain 후 언로드)"""
+        old = self._current
+        if old is not None and old is not slot:
+            self._slots.pop(old.key, None)
+            self._retire(old)
+            asyncio.create_task(self._drain_and_unload(old))
+        self._slots[slot.key] = slot
+        self._default_key = slot.key
+
+    async def swap(self, backend: Optional[str] = None, compute_type: Optional[str] = None,
+                   device: Optional[str] = None, preset: Optional[str] = None) -> Dict:
+        """
+        새 엔진을 로드한 뒤 기본 엔진과 교체
+
+        요청한 프리셋의 엔진이 이미 상주 중이면 로드 없이 기본 엔진으로 지정한다.
+
+        Args:
+            backend / compute_type / device / preset: WhisperSTT.reload_backend()와 동일
+
+        Returns:
+            reload_backend() 결과 + {"swap_mode": "resident" | "blue_green" | "sequential", "headroom": {...}}
+
+        Raises:
+            RuntimeError: 이미 교체 진행 중이거나 로드된 엔진이 없음
+        """
+        if self.swapping:
+            raise RuntimeError("백엔드 전환이 이미 진행 중입니다")
+
+        async with self._swap_lock:
+            old = self._current
+            if old is None:
+                raise RuntimeError("STT 모델이 로드되지 않음")
+
+            start = time.time()
+            preset_key = preset.lower().strip() if preset else None
+            resident = self._slots.get(preset_key) if preset_key in PRESET_SEGMENT_CONFIG else None
+            if resident is not None and not (backend or compute_type or device):
+                swap_mode = "resident"
+                headroom = None
+                self._promote(resident)
+                result = {
+                    "status": "success",
+                    "current_backend": resident.engine._get_current_backend_name(),
+                    "preset": resident.engine.preset,
+                    "device": resident.engine.device,
+                    "compute_type": resident.engine.compute_type,
+                    "message": f"상주 중인 {preset_key} 엔진을 기본 엔진으로 지정"
+                }
+            else:
+                target_compute = compute_type
+                if preset_key in PRESET_SEGMENT_CONFIG:
+                    target_compute = PRESET_SEGMENT_CONFIG[preset_key]["compute_type"]
+                target_device = (device or old.engine.device).lower()
+                headroom = self._check_headroom(target_device, _engine_memory_mb(target_compute or old.engine.compute_type))
+
+                if headroom["allowed"]:
+                    swap_mode = "blue_green"
+                    logger.info(f"[Engine] blue/green 전환 시작 (여유 {headroom['available_mb']}MB ≥ 필요 {headroom['required_mb']}MB)")
+                    engine, result = await asyncio.to_thread(
+                        self._build_engine, old.engine, backend, compute_type, device, preset
+                    )
+                    if result.get("status") == "success":
+                        self._generation += 1
+                        self._replace_default(_EngineSlot(engine, self._generation, self._key_of(engine)))
+                    else:
+                        result["current_backend"] = old.engine._get_current_backend_name()
+                else:
+                    swap_mode = "sequential"
+                    result = await self._sequential_swap(old, headroom, backend, compute_type, device, preset)
+
+            self._last_swap = {
+                "mode": swap_mode,
+                "status": result.get("status"),
+                "elapsed_sec": round(time.time() - start, 2),
+                "finished_at": time.time()
+            }
+            logger.info(f"[Engine] 전환 종료: {self._last_swap}")
+            return {**result, "swap_mode": swap_mode, "headroom": headroom}
+
+    def _replace_default(self, slot: _EngineSlot) -> None:
+        """새 기본 엔진 등록 (같은 키의 비기본 엔진이 있으면 함께 정리)"""
+        same_key = self._slots.get(slot.key)
+        if same_key is not None and same_key is not self._current:
+            del self._slots[slot.key]
+            self._retire(same_key)
+            asyncio.create_task(self._drain_and_unload(same_key))
+        self._promote(slot)
+
+    async def _sequential_swap(self, old: _EngineSlot, headroom: Dict, backend, compute_type, device, preset) -> Dict:
+        logger.warning(
+            f"[Engine] 메모리 여유 부족 → 순차 전환 "
+            f"(여유 {headroom['available_mb']}MB < 필요 {headroom['required_mb']}MB)"
+        )
+        previous = {
+            "backend": old.engine._get_current_backend_name(),
+            "compute_type": old.engine.compute_type,
+            "device": old.engine.device
+        }
+        self._available.clear()
+        self._slots.pop(old.key, None)
+        self._default_key = None
+        self._retire(old)
+        await self._drain_and_unload(old)
+
+        engine, result = await asyncio.to_thread(
+            self._build_engine, old.engine, backend, compute_type, device, preset
+        )
+        if result.get("status") != "success":
+            logger.error(f"[Engine] 새 엔진 로드 실패 → 이전 설정으로 복구: {previous}")
+            engine, restore = await asyncio.to_thread(
+                self._build_engine, old.engine, previous["backend"],
+                previous["compute_type"], previous["device"], None
+            )
+            result["current_backend"] = restore.get("current_backend")
+            if restore.get("status") != "success":
+                engine = None
+                logger.error(f"[Engine] 이전 설정 복구 실패: {restore.get('message')}")
+
+        if engine is not None:
+            self._generation += 1
+            self._replace_default(_EngineSlot(engine, self._generation, self._key_of(engine)))
+        self._available.set()
+        return result
+
+    def get_status(self) -> Dict:
+        """
+        엔진 상태 조회
+
+        Returns:
+            {"default": str, "generation": int, "in_flight": int, "engines": [...], "budget_mb": int, ...}
+        """
+        current = self._current
+        return {
+            "default": self._default_key,
+            "generation": current.generation if current else None,
+            "in_flight": current.refs if current else 0,
+            "swapping": self.swapping,
+            "engines": [
+                {
+                    "key": key,
+                    "backend": slot.engine._get_current_backend_name(),
+                    "compute_type": slot.engine.compute_type,
+                    "memory_mb": slot.memory_mb,
+                    "in_flight": slot.refs,
+                    "last_used": slot.last_used
+                }
+                for key, slot in self._slots.items()
+            ],
+            "loading": list(self._loading.keys()),
+            "resident_mb": self._resident_mb(),
+            "budget_mb": ENGINE_MEMORY_BUDGET_MB,
+            "retiring": [
+                {"generation": slot.generation, "in_flight": slot.refs}
+                for slot in self._retiring.values()
+            ],
+            "last_swap": self._last_swap,
+            **self._stats
+        }
+
+
+# 전역 인스턴스 생성
+engine_manager = EngineManager()
@@ -0,0 +1,525 @@
+"""
+실시간 통화 음성인식 (WebSocket 세션)
+
+통화 중인 음성을 프레임 단위로 받아 누적 버퍼를 주기적으로 디코딩하고,
+연속된 두 가설이 일치하는 앞부분(LocalAgreement-2)만 확정하여 partial/final 결과를 보낸다.
+
+- 입력: 바이너리 프레임 (pcm_s16le / pcm_f32le: interleaved PCM, opus: 프레임당 Opus 패킷 1개)
+        → 16kHz mono float32로 변환 (Opus 디코딩은 PyAV(faster-whisper 의존성), 리샘플은 utils/audio_frontend)
+- 디코딩: 새 오디오가 LIVE_MIN_CHUNK_SEC 이상 쌓이면 버퍼 전체를 greedy 디코딩
+          (각 디코딩은 /transcribe와 같은 전역 슬롯 + 엔진 lease를 사용하므로 배치 요청과 모델을 공유)
+- 버퍼: 확정된 단어가 있으면 LIVE_TRIM_SEC 초과 시 마지막 확정 단어 끝에서 자름,
+        LIVE_MAX_WINDOW_SEC 초과 시(타임스탬프 없는 백엔드 등) 현재 가설을 모두 확정하고 비움
+- backpressure: 디코딩 대기 오디오가 LIVE_MAX_LAG_SEC를 넘으면 수신을 멈춤
+               (클라이언트 송신 버퍼/TCP 윈도우로 전달, 중단할 때마다 backpressure 메시지 전송)
+- 세션 제한: 동시 세션 수(LIVE_MAX_SESSIONS), 세션 최대 길이(LIVE_MAX_SESSION_SEC), 무입력 시간(LIVE_IDLE_TIMEOUT_SEC)
+
+프로토콜 (ws://host:8003/ws/transcribe?encoding=pcm_s16le&sample_rate=16000&channels=1&language=ko&preset=speed):
+    클라이언트 → 서버: 바이너리 오디오 프레임, 종료 시 텍스트 {"type": "end"}
+    서버 → 클라이언트 (JSON 텍스트):
+        {"type": "ready", "session_id", "encoding", "sample_rate", "channels", "language", "preset"}
+        {"type": "partial", "text", "start", "end"}   - 아직 확정되지 않은 뒤쪽 가설 (다음 메시지에서 바뀔 수 있음)
+        {"type": "final", "text", "start", "end"}     - 새로 확정된 단어 (이후 바뀌지 않음)
+            start/end는 세션 시작 기준 초. transformers 백엔드는 단어 타임스탬프가 없어 None
+            (클라이언트가 오디오 위치로 이동할 수 없고, 버퍼는 LIVE_MAX_WINDOW_SEC마다 통째로 확정)
+        {"type": "backpressure", "lag_sec"}
+        {"type": "error", "message"}
+        {"type": "end", "text", "duration_sec", "stats"}  - 전체 확정 텍스트, 이후 서버가 연결 종료
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.audio_frontend import StreamingResampler, downmix
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# 동시 실시간 세션 수 (초과 시 연결 직후 error + 1013 종료)
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", "4"))
+
+# 새 오디오가 이만큼 쌓이면 디코딩 (초, partial 갱신 주기)
+LIVE_MIN_CHUNK_SEC = float(os.getenv("LIVE_MIN_CHUNK_SEC", "1.0"))
+
+# 확정 단어 기준 버퍼 자르기 시작 길이 (초)
+LIVE_TRIM_SEC = float(os.getenv("LIVE_TRIM_SEC", "15"))
+
+# 버퍼 최대 길이 (초, Whisper 입력 한도 30초 이내) - 초과 시 현재 가설 전체 확정
+LIVE_MAX_WINDOW_SEC = float(os.getenv("LIVE_MAX_WINDOW_SEC", "25"))
+
+# 디코딩 대기 오디오 상한 (초) - 초과 시 수신 중단 (backpressure)
+LIVE_MAX_LAG_SEC = float(os.getenv("LIVE_MAX_LAG_SEC", "10"))
+
+# 세션 최대 오디오 길이 (초)
+LIVE_MAX_SESSION_SEC = float(os.getenv("LIVE_MAX_SESSION_SEC", "7200"))
+
+# 프레임 무입력 제한 시간 (초)
+LIVE_IDLE_TIMEOUT_SEC = float(os.getenv("LIVE_IDLE_TIMEOUT_SEC", "30"))
+
+# 디코딩 문맥으로 넘길 확정 텍스트 길이 (글자)
+LIVE_PROMPT_CHARS = 200
+
+DecodeFn = Callable[[np.ndarray, str], Awaitable[Dict]]
+
+
+class LiveSessionLimitError(RuntimeError):
+    """동시 실시간 세션 수 초과"""
+
+
+def _normalize_word(word: str) -> str:
+    """가설 비교용 단어 정규화 (대소문자/문장부호 무시)"""
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def _join_words(words: List[Dict]) -> str:
+    return " ".join(word["word"] for word in words)
+
+
+class AudioFrameDecoder:
+    """WebSocket 바이너리 프레임 → 16kHz mono float32"""
+
+    ENCODINGS = ("pcm_s16le", "pcm_f32le", "opus")
+
+    def __init__(self, encoding: str, sample_rate: int, channels: int):
+        """
+        Args:
+            encoding: pcm_s16le / pcm_f32le / opus
+            sample_rate: PCM 샘플레이트 (opus는 무시, 디코더 출력 48kHz)
+            channels: 채널 수 (1 또는 2, 2채널은 평균으로 mono 변환)
+
+        Raises:
+            ValueError: 지원하지 않는 encoding/channels
+            ImportError: opus인데 PyAV 미설치
+        """
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"지원하지 않는 encoding: {encoding} (사용 가능: {', '.join(self.ENCODINGS)})")
+        if channels not in (1, 2):
+            raise ValueError(f"지원하지 않는 channels: {channels} (1 또는 2)")
+        if sample_rate <= 0:
+            raise ValueError(f"잘못된 sample_rate: {sample_rate}")
+
+        self.encoding = encoding
+        self.sample_rate = 48000 if encoding == "opus" else sample_rate
+        self.channels = channels
+        self._remainder = b""
+        self._codec = None
+        # 프레임 경계와 무관하게 같은 결과를 내는 스트리밍 리샘플러
+        self._resampler = StreamingResampler(self.sample_rate) if self.sample_rate != SAMPLE_RATE else None
+
+        if encoding == "opus":
+            import av
+            self._av = av
+            self._codec = av.CodecContext.create("opus", "r")
+            self._codec.sample_rate = 48000
+            self._codec.layout = "stereo" if channels == 2 else "mono"
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """프레임 1개 디코딩 (PCM이 샘플 경계에서 잘려 들어오면 나머지는 다음 프레임에 이어 붙임)"""
+        if self._codec is not None:
+            # 디코더 출력 (채널, 샘플) → (샘플, 채널)
+            blocks = [frame.to_ndarray() for frame in self._codec.decode(self._av.Packet(data))]
+            if not blocks:
+                return np.zeros(0, dtype=np.float32)
+            samples = self._to_float32(np.concatenate(blocks, axis=1).T)
+        else:
+            width = 2 if self.encoding == "pcm_s16le" else 4
+            data = self._remainder + data
+            usable = len(data) // (width * self.channels) * (width * self.channels)
+            self._remainder = data[usable:]
+            if usable == 0:
+                return np.zeros(0, dtype=np.float32)
+            samples = self._to_float32(np.frombuffer(data[:usable], dtype="<i2" if width == 2 else "<f4"))
+            samples = samples.reshape(-1, self.channels)
+
+        mono = downmix(samples)
+        return mono if self._resampler is None else self._resampler.process(mono)
+
+    def flush(self) -> np.ndarray:
+        """리샘플러에 남은 샘플 반환 (세션 종료 시)"""
+        if self._resampler is None:
+            return np.zeros(0, dtype=np.float32)
+        return self._resampler.flush()
+
+    @staticmethod
+    def _to_float32(samples: np.ndarray) -> np.ndarray:
+        """int16 → float32 [-1, 1) (float64 중간 배열 없음)"""
+        if samples.dtype == np.int16:
+            out = samples.astype(np.float32)
+            out *= np.float32(1.0 / 32768.0)
+            return out
+        return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+class LocalAgreement:
+    """
+    LocalAgreement-2 안정 접두어 정책
+
+    같은 오디오 앞부분에 대한 연속된 두 가설에서 일치하는 앞부분 단어만 확정한다.
+    확정된 단어는 이후 가설에서 제거되며 다시 바뀌지 않는다.
+    """
+
+    def __init__(self):
+        self.committed: List[Dict] = []         # 세션 전체 확정 단어 (세션 절대 시각)
+        self.buffer_committed: List[Dict] = []  # 현재 버퍼 구간에서 확정된 단어 (타임스탬프 없는 백엔드용)
+        self.previous: List[Dict] = []          # 직전 가설의 미확정 부분
+
+    @property
+    def last_end(self) -> Optional[float]:
+        return self.committed[-1]["end"] if self.committed else None
+
+    @property
+    def text(self) -> str:
+        return _join_words(self.committed)
+
+    def prompt(self) -> str:
+        """다음 디코딩의 문맥 (최근 확정 텍스트)"""
+        return self.text[-LIVE_PROMPT_CHARS:]
+
+    def insert(self, words: List[Dict], offset: float, timestamps: bool) -> Tuple[List[Dict], List[Dict]]:
+        """
+        새 가설 반영
+
+        Args:
+            words: 버퍼 디코딩 결과 [{"start", "end", "word"}] (버퍼 시작 기준 시각)
+            offset: 버퍼 시작의 세션 절대 시각 (초)
+            timestamps: 단어 타임스탬프 유무
+
+        Returns:
+            (새로 확정된 단어, 미확정 단어)
+        """
+        if timestamps:
+            words = [{**w, "start": round(w["start"] + offset, 2), "end": round(w["end"] + offset, 2)} for w in words]
+            last_end = self.last_end
+            if last_end is not None:
+                words = [w for w in words if w["start"] > last_end - 0.1]
+                # 경계에 걸친 단어 중복 제거: 확정된 끝 n-gram과 가설 앞 n-gram이 같으면 제거 (n ≤ 5)
+                for n in range(min(5, len(self.committed), len(words)), 0, -1):
+                    tail = [_normalize_word(w["word"]) for w in self.committed[-n:]]
+                    if tail == [_normalize_word(w["word"]) for w in words[:n]]:
+                        words = words[n:]
+                        break
+        else:
+            # 버퍼 시작부터 다시 디코딩되므로 이 버퍼에서 이미 확정한 단어 수만큼 제거
+            words = words[len(self.buffer_committed):]
+
+        agreed = []
+        for prev, cur in zip(self.previous, words):
+            if _normalize_word(prev["word"]) != _normalize_word(cur["word"]):
+                break
+            agreed.append(cur)
+
+        self.committed.extend(agreed)
+        self.buffer_committed.extend(agreed)
+        self.previous = words[len(agreed):]
+        return agreed, self.previous
+
+    def flush(self) -> List[Dict]:
+        """미확정 가설 전체 확정 (세션 종료/버퍼 한도 초과 시)"""
+        flushed = self.previous
+        self.committed.extend(flushed)
+        self.buffer_committed.extend(flushed)
+        self.previous = []
+        return flushed
+
+    def reset_buffer(self) -> None:
+        """버퍼를 자르거나 비운 뒤 호출"""
+        self.buffer_committed = []
+
+
+class LiveSession:
+    """WebSocket 실시간 인식 세션 1개"""
+
+    def __init__(self, websocket, frame_decoder: AudioFrameDecoder, language: str, preset: Optional[str]):
+        self.session_id = uuid.uuid4().hex[:12]
+        self.websocket = websocket
+        self.frame_decoder = frame_decoder
+        self.language = language
+        self.preset = preset
+        self.started_at = time.time()
+
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0
+        self.received_sec = 0.0
+        self.agreement = LocalAgreement()
+        self.ended = False
+        self.disconnected = False
+        self.end_reason = "client"
+
+        self._pending: List[np.ndarray] = []
+        self._pending_samples = 0
+        self._audio_ready = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._space_available.set()
+        self._send_lock = asyncio.Lock()
+        self._last_partial: Optional[str] = None
+        self.stats = {
+            "decodes": 0,
+            "decode_sec": 0.0,
+            "max_decode_sec": 0.0,
+            "backpressure": 0,
+            "max_lag_sec": 0.0,
+            "forced_commits": 0
+        }
+
+    @property
+    def lag_sec(self) -> float:
+        return self._pending_samples / SAMPLE_RATE
+
+    async def send(self, message: Dict) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+
+    def _enqueue(self, samples: np.ndarray) -> None:
+        if len(samples) == 0:
+            return
+        self._pending.append(samples)
+        self._pending_samples += len(samples)
+        self.received_sec += len(samples) / SAMPLE_RATE
+        self.stats["max_lag_sec"] = max(self.stats["max_lag_sec"], round(self.lag_sec, 2))
+        self._audio_ready.set()
+
+    async def receive_loop(self) -> None:
+        """프레임 수신 → 대기 큐 (디코딩이 밀리면 수신 중단)"""
+        while True:
+            try:
+                message = await asyncio.wait_for(self.websocket.receive(), timeout=LIVE_IDLE_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                self.end_reason = "idle_timeout"
+                break
+
+            if message["type"] == "websocket.disconnect":
+                self.disconnected = True
+                break
+
+            if message.get("bytes") is not None:
+                self._enqueue(self.frame_decoder.decode(message["bytes"]))
+                if self.received_sec > LIVE_MAX_SESSION_SEC:
+                    self.end_reason = "max_session_duration"
+                    break
+                if self.lag_sec > LIVE_MAX_LAG_SEC:
+                    # 디코딩이 따라잡을 때까지 수신 중단 → 클라이언트 송신 버퍼/TCP 윈도우로 역압 전달
+                    self.stats["backpressure"] += 1
+                    logger.warning(f"[Live] 세션 {self.session_id} 디코딩 지연 {self.lag_sec:.1f}초 → 수신 일시 중단")
+                    await self.send({"type": "backpressure", "lag_sec": round(self.lag_sec, 2)})
+                    self._space_available.clear()
+                    await self._space_available.wait()
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if control.get("type") in ("end", "stop"):
+                    break
+
+        if not self.disconnected:
+            self._enqueue(self.frame_decoder.flush())
+        self.ended = True
+        self._audio_ready.set()
+
+    async def decode_loop(self, decode_fn: DecodeFn) -> None:
+        """누적 버퍼 주기적 디코딩 → partial/final 전송"""
+        while True:
+            await self._audio_ready.wait()
+            self._audio_ready.clear()
+            if self.disconnected:
+                return
+            if not self.ended and self._pending_samples < LIVE_MIN_CHUNK_SEC * SAMPLE_RATE:
+                continue
+
+            if self._pending:
+                self.buffer = np.concatenate([self.buffer, *self._pending])
+                self._pending = []
+                self._pending_samples = 0
+                self._space_available.set()
+
+            final = self.ended
+            if len(self.buffer) >= int(0.1 * SAMPLE_RATE):
+                await self._decode_buffer(decode_fn, final)
+            elif final:
+                await self._send_final(self.agreement.flush())
+            if final:
+                return
+
+    async def _decode_buffer(self, decode_fn: DecodeFn, final: bool) -> None:
+        start = time.monotonic()
+        result = await decode_fn(self.buffer, self.agreement.prompt())
+        elapsed = time.monotonic() - start
+        self.stats["decodes"] += 1
+        self.stats["decode_sec"] = round(self.stats["decode_sec"] + elapsed, 3)
+        self.stats["max_decode_sec"] = round(max(self.stats["max_decode_sec"], elapsed), 3)
+
+        words = result.get("words", [])
+        timestamps = all(word["start"] is not None for word in words)
+        committed, tail = self.agreement.insert(words, self.buffer_offset, timestamps)
+        if final:
+            committed = committed + self.agreement.flush()
+            tail = []
+        await self._send_final(committed)
+
+        tail_text = _join_words(tail)
+        if tail_text != self._last_partial:
+            self._last_partial = tail_text
+            await self.send({
+                "type": "partial",
+                "text": tail_text,
+                "start": tail[0]["start"] if tail else None,
+                "end": tail[-1]["end"] if tail else None
+            })
+
+        buffer_sec = len(self.buffer) / SAMPLE_RATE
+        last_end = self.agreement.last_end
+        if timestamps and buffer_sec > LIVE_TRIM_SEC and last_end is not None and last_end > self.buffer_offset:
+            # 마지막 확정 단어 끝까지 버퍼에서 제거 (미확정 가설은 절대 시각이라 그대로 유효)
+            cut = min(last_end - self.buffer_offset, buffer_sec)
+            self.buffer = self.buffer[int(cut * SAMPLE_RATE):]
+            self.buffer_offset = round(self.buffer_offset + cut, 3)
+            self.agreement.reset_buffer()
+        elif buffer_sec > LIVE_MAX_WINDOW_SEC:
+            # 확정이 진행되지 않거나 타임스탬프가 없으면 현재 가설 전체를 확정하고 버퍼 비움
+            self.stats["forced_commits"] += 1
+            await self._send_final(self.agreement.flush())
+            self.buffer = np.zeros(0, dtype=np.float32)
+            self.buffer_offset = round(self.buffer_offset + buffer_sec, 3)
+            self.agreement.reset_buffer()
+
+    async def _send_final(self, words: List[Dict]) -> None:
+        if not words:
+            return
+        self._last_partial = None
+        await self.send({
+            "type": "final",
+            "text": _join_words(words),
+            "start": words[0]["start"],
+            "end": words[-1]["end"]
+        })
+
+    def get_info(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "preset": self.preset,
+            "language": self.language,
+            "encoding": self.frame_decoder.encoding,
+            "received_sec": round(self.received_sec, 1),
+            "lag_sec": round(self.lag_sec, 2),
+            "elapsed_sec": round(time.time() - self.started_at, 1)
+        }
+
+
+class LiveSessionRegistry:
+    """실시간 세션 수 제한과 세션 실행"""
+
+    def __init__(self, max_sessions: int = LIVE_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, LiveSession] = {}
+        self._stats = {"opened": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    async def serve(self, websocket, decode_fn: DecodeFn, encoding: str, sample_rate: int, channels: int,
+                    language: str, preset: Optional[str]) -> None:
+        """
+        WebSocket 연결 1개를 세션으로 처리 (연결 수락 ~ 종료)
+
+        Args:
+            websocket: starlette WebSocket (accept 전)
+            decode_fn: async (audio, prompt) -> {"words": [...]} (슬롯/엔진 lease 포함)
+            encoding / sample_rate / channels: 입력 프레임 형식
+            language: 언어 코드
+            preset: 사용할 프리셋 (None이면 기본 엔진)
+        """
+        await websocket.accept()
+
+        try:
+            frame_decoder = AudioFrameDecoder(encoding, sample_rate, channels)
+        except (ValueError, ImportError) as e:
+            await websocket.send_text(json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False))
+            await websocket.close(code=1008)
+            return
+
+        if len(self._sessions) >= self.max_sessions:
+            self._stats["rejected"] += 1
+            logger.warning(f"[Live] 세션 거부: 동시 세션 한도 {self.max_sessions}개 초과")
+            await websocket.send_text(json.dumps({
+                "type": "error",
+                "message": f"동시 실시간 세션 한도 초과 ({self.max_sessions}개)"
+            }, ensure_ascii=False))
+            await websocket.close(code=1013)
+            return
+
+        session = LiveSession(websocket, frame_decoder, language, preset)
+        self._sessions[session.session_id] = session
+        self._stats["opened"] += 1
+        logger.info(f"[Live] 세션 시작: {session.session_id} (encoding={encoding}, sample_rate={frame_decoder.sample_rate}, "
+                    f"channels={channels}, language={language}, preset={preset})")
+
+        receiver = decoder = None
+        try:
+            await session.send({
+                "type": "ready",
+                "session_id": session.session_id,
+                "encoding": encoding,
+                "sample_rate": frame_decoder.sample_rate,
+                "channels": channels,
+                "language": language,
+                "preset": preset
+            })
+            receiver = asyncio.create_task(session.receive_loop())
+            decoder = asyncio.create_task(session.decode_loop(decode_fn))
+            await asyncio.wait({receiver, decoder}, return_when=asyncio.FIRST_EXCEPTION)
+            for task in (receiver, decoder):
+                if task.done() and task.exception() is not None:
+                    raise task.exception()
+            await decoder
+
+            if not session.disconnected:
+                await session.send({
+                    "type": "end",
+                    "text": session.agreement.text,
+                    "duration_sec": round(session.received_sec, 2),
+                    "reason": session.end_reason,
+                    "stats": session.stats
+                })
+                await websocket.close()
+            self._stats["completed"] += 1
+            logger.info(f"[Live] 세션 종료: {session.session_id} ({session.received_sec:.1f}초, "
+                        f"사유={'disconnect' if session.disconnected else session.end_reason}, stats={session.stats})")
+
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error(f"[Live] 세션 {session.session_id} 오류: {type(e).__name__}: {e}", exc_info=True)
+            if not session.disconnected:
+                try:
+                    await session.send({"type": "error", "message": f"{type(e).__name__}: {str(e)[:200]}"})
+                    await websocket.close(code=1011)
+                except Exception:
+                    pass
+        finally:
+            for task in (receiver, decoder):
+                if task is not None and not task.done():
+                    task.cancel()
+            self._sessions.pop(session.session_id, None)
+
+    def get_stats(self) -> Dict:
+        """
+        실시간 세션 현황
+
+        Returns:
+            {"max": int, "active": int, "sessions": [...], "opened": int, "rejected": int, ...}
+        """
+        return {
+            "max": self.max_sessions,
+            "active": len(self._sessions),
+            "sessions": [session.get_info() for session in self._sessions.values()],
+            **self._stats
+        }
+
+
+# 전역 인스턴스 생성
+live_sessions = LiveSessionRegistry()
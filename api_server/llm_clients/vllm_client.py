@@ -7,6 +7,7 @@ import logging
 import httpx
 import json
 
+from utils.tracing import tracer
 from .base import LLMClient
 
 logger = logging.getLogger(__name__)
@@ -92,7 +93,9 @@ class vLLMClient(LLMClient):
             }
             
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.endpoint, json=payload)
+                with tracer.span("http.vllm", url=self.endpoint) as span:
+                    response = await client.post(self.endpoint, json=payload, headers=tracer.inject_headers())
+                    span.set(status_code=response.status_code)
                 response.raise_for_status()
                 
                 result = response.json()
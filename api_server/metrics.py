@@ -0,0 +1,171 @@
+"""
+API 서버 메트릭 정의 (/metrics, Prometheus 텍스트 형식)
+
+- 히스토그램: 슬롯 대기, 오디오 디코딩, STT 디코딩 + 실시간 배율(RTF), LLM 단계, HTTP 클라이언트 커넥션 대기,
+  메모리 거버너 정리 시간
+- 게이지: 슬롯 사용/대기, 로드된 백엔드, 메모리 (조회 시점 콜백, app.py에서 등록)
+- 카운터: Dummy fallback, 처리한 오디오 길이, 메모리 거버너 회수량
+
+기록은 utils.metrics의 스레드별 샤드에 쓰므로 요청 경로에 락이 없습니다.
+"""
+
+import functools
+import time
+from typing import Any, Callable
+
+from utils.metrics import Counter, Gauge, Histogram, aiohttp_trace_config
+from utils import tracing
+from utils.tracing import tracer
+
+# RTF(처리 시간 / 오디오 길이) 버킷
+RTF_BUCKETS = (0.02, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+# 커넥션 대기 버킷 (초)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+QUEUE_WAIT_SECONDS = Histogram(
+    "stt_queue_wait_seconds", "전역 전사 슬롯 / 승인 제어(source=admission) 대기 시간 (초)", ["source"]
+)
+AUDIO_DECODE_SECONDS = Histogram(
+    "stt_audio_decode_seconds", "오디오 파일 디코딩/리샘플 시간 (초)", ["backend"]
+)
+STT_DECODE_SECONDS = Histogram(
+    "stt_decode_seconds", "STT 디코딩 시간 (초, 오디오 디코딩 제외)", ["preset", "backend"]
+)
+STT_REALTIME_FACTOR = Histogram(
+    "stt_realtime_factor", "STT 처리 시간 / 오디오 길이", ["preset", "backend"], buckets=RTF_BUCKETS
+)
+STT_AUDIO_SECONDS = Counter(
+    "stt_audio_seconds_total", "인식한 오디오 길이 합계 (초)", ["preset", "backend"]
+)
+LLM_STAGE_SECONDS = Histogram(
+    "stt_llm_stage_seconds", "LLM 후처리 단계 소요 시간 (초)", ["stage", "outcome"]
+)
+HTTP_CLIENT_POOL_WAIT_SECONDS = Histogram(
+    "stt_http_client_pool_wait_seconds", "HTTP 클라이언트 커넥션 대기/생성 시간 (초)", ["target", "phase"],
+    buckets=POOL_WAIT_BUCKETS
+)
+MEMORY_RECLAIM_SECONDS = Histogram(
+    "stt_memory_reclaim_seconds", "메모리 거버너 정리 소요 시간 (초)", ["stage", "kind"], buckets=POOL_WAIT_BUCKETS
+)
+MEMORY_RECLAIMED_BYTES = Counter(
+    "stt_memory_reclaimed_bytes_total", "메모리 거버너가 회수한 메모리 (bytes, RSS / CUDA 캐시)", ["kind"]
+)
+RESPONSE_ENCODE_SECONDS = Histogram(
+    "stt_response_encode_seconds", "응답 직렬화 / 압축 소요 시간 (초)", ["stage"], buckets=POOL_WAIT_BUCKETS
+)
+RESPONSE_BYTES = Counter(
+    "stt_response_bytes_total", "응답 본문 크기 합계 (bytes, raw: 압축 전 / sent: 전송)", ["kind"]
+)
+ADMISSION_REJECTED = Counter(
+    "stt_admission_rejected_total", "승인 제어가 503 + Retry-After로 거절한 요청 수"
+)
+DUMMY_FALLBACKS = Counter(
+    "stt_dummy_fallback_total", "Dummy 응답으로 fallback한 횟수", ["component"]
+)
+
+SLOTS_IN_USE = Gauge("stt_transcribe_slots_in_use", "사용 중인 전사 슬롯 수")
+SLOTS_WAITING = Gauge("stt_transcribe_slots_waiting", "슬롯 대기 중인 요청 수")
+SLOTS_MAX = Gauge("stt_transcribe_slots_max", "전사 슬롯 한도 (MAX_CONCURRENT_SLOTS)")
+ADMISSION_BUDGET_BYTES = Gauge("stt_admission_budget_bytes", "승인 제어 메모리 예산 (ADMISSION_MEMORY_BUDGET_MB)")
+ADMISSION_RESERVED_BYTES = Gauge("stt_admission_reserved_bytes", "승인된 요청의 예측 작업 메모리 합계 (bytes)")
+ADMISSION_WAITING = Gauge("stt_admission_waiting", "승인 대기열의 요청 수")
+BACKENDS_LOADED = Gauge("stt_backend_loaded", "로드된 STT 엔진 (1 = 로드됨)", ["preset", "backend", "compute_type"])
+ENGINE_IN_FLIGHT = Gauge("stt_engine_in_flight", "엔진별 처리 중인 요청 수", ["preset"])
+LIVE_SESSIONS = Gauge("stt_live_sessions", "실시간 WebSocket 세션 수")
+PROCESS_MEMORY_BYTES = Gauge("stt_process_resident_memory_bytes", "API 서버 프로세스 RSS (bytes)")
+SYSTEM_MEMORY_AVAILABLE_BYTES = Gauge("stt_system_memory_available_bytes", "시스템 가용 메모리 (bytes)")
+GPU_MEMORY_USED_BYTES = Gauge("stt_gpu_memory_used_bytes", "GPU VRAM 사용량 (bytes, 모든 GPU 합계)")
+
+_trace_configs = {}  # {target: [커넥션 대기, 요청 span]}
+
+
+def http_trace_configs(target: str) -> list:
+    """
+    aiohttp.ClientSession(trace_configs=...)용 설정 (target별 1벌 재사용)
+
+    - 커넥션 대기 히스토그램
+    - 요청 span (http.<target>) + traceparent / X-Request-ID 헤더 전파
+
+    Args:
+        target: 호출 대상 label (vllm / agent 등)
+    """
+    trace_configs = _trace_configs.get(target)
+    if trace_configs is None:
+        trace_configs = _trace_configs.setdefault(target, [
+            aiohttp_trace_config(HTTP_CLIENT_POOL_WAIT_SECONDS, target),
+            tracing.aiohttp_trace_config(tracer, f"http.{target}")
+        ])
+    return trace_configs
+
+
+def record_stt_result(stt, result: dict, elapsed: float) -> None:
+    """
+    WhisperSTT.transcribe() 결과 기록 (WhisperSTT.result_observers에 등록)
+
+    Args:
+        stt: 변환한 WhisperSTT 엔진
+        result: transcribe() 결과
+        elapsed: transcribe() 소요 시간 (초)
+    """
+    if result.get("cancelled"):
+        return
+    if result.get("is_dummy"):
+        DUMMY_FALLBACKS.labels("stt").inc()
+        return
+
+    preset = stt.preset or "default"
+    backend = result.get("backend", "unknown")
+    audio_decode_sec = result.get("audio_decode_sec")
+    if audio_decode_sec is not None:
+        AUDIO_DECODE_SECONDS.labels(backend).observe(audio_decode_sec)
+        elapsed_decode = max(elapsed - audio_decode_sec, 0.0)
+    else:
+        elapsed_decode = elapsed
+    STT_DECODE_SECONDS.labels(preset, backend).observe(elapsed_decode)
+
+    duration = result.get("duration")
+    if duration:
+        STT_REALTIME_FACTOR.labels(preset, backend).observe(elapsed / duration)
+        STT_AUDIO_SECONDS.labels(preset, backend).inc(duration)
+
+
+def record_memory_reclaim(event: dict) -> None:
+    """
+    메모리 거버너 정리 이벤트 기록 (memory_governor.observers에 등록)
+
+    Args:
+        event: MemoryGovernor가 정리할 때마다 만드는 이벤트 (gc_ms / rss_freed_mb / cuda_ms / cuda_freed_mb)
+    """
+    if "gc_ms" in event:
+        MEMORY_RECLAIM_SECONDS.labels(event["stage"], "gc").observe(event["gc_ms"] / 1000)
+        MEMORY_RECLAIMED_BYTES.labels("rss").inc(max(event["rss_freed_mb"], 0) * 1024 * 1024)
+    if "cuda_ms" in event:
+        MEMORY_RECLAIM_SECONDS.labels(event["stage"], "cuda").observe(event["cuda_ms"] / 1000)
+        MEMORY_RECLAIMED_BYTES.labels("cuda").inc(max(event["cuda_freed_mb"], 0) * 1024 * 1024)
+
+
+def timed_llm_stage(stage: str, outcome_of: Callable[[Any], str]):
+    """
+    LLM 후처리 함수 소요 시간 기록 데코레이터 (async 함수용, llm.<stage> span도 함께 기록)
+
+    Args:
+        stage: 단계 label (privacy_removal / classification / element_detection)
+        outcome_of: 결과 → outcome label (success / failure / dummy), 예외는 "error"로 기록 후 다시 던짐
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                with tracer.span(f"llm.{stage}") as span:
+                    result = await func(*args, **kwargs)
+                    outcome = outcome_of(result)
+                    span.set(outcome=outcome)
+                return result
+            finally:
+                LLM_STAGE_SECONDS.labels(stage, outcome).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
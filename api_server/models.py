@@ -185,6 +185,24 @@ class PerformanceMetrics(BaseModel):
         }
 
 
+# ============================================================================
+# Transcribe Segment
+# ============================================================================
+
+class TranscribeSegment(BaseModel):
+    """타임스탬프가 있는 인식 구간"""
+    start: float = Field(..., description="구간 시작 (초)")
+    end: float = Field(..., description="구간 끝 (초)")
+    text: str = Field(..., description="구간 텍스트")
+    
+    class Config:
+        example = {
+            "start": 0.0,
+            "end": 4.2,
+            "text": "안녕하세요 고객님"
+        }
+
+
 # ============================================================================
 # Transcribe Response (단건)
 # ============================================================================
@@ -196,6 +214,7 @@ class TranscribeResponse(BaseModel):
     language: str = Field(..., description="감지된 언어 코드")
     duration: Optional[float] = Field(None, description="오디오 길이 (초)")
     backend: str = Field(..., description="사용된 백엔드")
+    segments: Optional[List[TranscribeSegment]] = Field(None, description="타임스탬프가 있는 인식 구간")
     
     # 파일 정보
     file_path: Optional[str] = Field(None, description="처리한 파일 경로")
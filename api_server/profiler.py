@@ -0,0 +1,320 @@
+"""
+요청 시 실행하는 샘플링 프로파일러 (/admin/profile)
+
+- 지정한 시간 동안 sys._current_frames()로 모든 스레드 스택을 주기적으로 수집해
+  collapsed stack ("스레드;호출자;...;함수" → 샘플 수)으로 집계
+- 출력: 플레임 그래프 SVG / speedscope JSON / collapsed 텍스트 (flamegraph.pl, speedscope 호환)
+- 선택: tracemalloc 스냅샷 차이 (프로파일 구간 동안 늘어난 할당 위치 상위 N개)
+
+호출이 없을 때는 스레드/훅/tracemalloc 모두 동작하지 않으므로 상시 활성화해도 부하가 없습니다.
+샘플링은 별도 스레드에서 실행되어 이벤트 루프를 막지 않고, 한 번에 하나의 프로파일만 실행합니다.
+"""
+
+import asyncio
+import html
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 스택 맨 위(leaf)가 이 함수면 대기 중인 스레드로 보고 기본 집계에서 제외 (idle=True면 포함)
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+}
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+_PATH_PREFIXES = sorted(
+    {path for path in (sysconfig.get_paths().get("purelib"), sysconfig.get_paths().get("platlib"),
+                       sysconfig.get_paths().get("stdlib"), _PROJECT_ROOT) if path},
+    key=len, reverse=True
+)
+
+
+class ProfilerBusyError(RuntimeError):
+    """다른 프로파일이 실행 중"""
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):].lstrip(os.sep)
+    return filename
+
+
+class StackProfiler:
+    """sys._current_frames() 기반 벽시계(wall-clock) 샘플링 프로파일러"""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._labels: Dict[object, str] = {}  # code 객체 → 프레임 이름 (프로세스 수명 동안 재사용)
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(self, seconds: float, hz: int, include_idle: bool = False,
+                      trace_allocations: bool = False, top_allocations: int = 30) -> dict:
+        """
+        프로파일 실행
+
+        Args:
+            seconds: 샘플링 시간 (초)
+            hz: 초당 샘플 수
+            include_idle: 대기 중인 스레드 스택도 포함
+            trace_allocations: tracemalloc 스냅샷 차이 포함 (구간 동안 할당 속도 저하)
+            top_allocations: 할당 차이 상위 개수
+
+        Returns:
+            {"stacks": {collapsed stack: 샘플 수}, "samples", "seconds", "hz", "interval_ms",
+             "allocations": [...] (trace_allocations일 때)}
+
+        Raises:
+            ProfilerBusyError: 다른 프로파일이 실행 중
+        """
+        if self._lock.locked():
+            raise ProfilerBusyError("다른 프로파일이 실행 중입니다")
+        async with self._lock:
+            logger.info(f"[Profiler] 시작: {seconds}초 @ {hz}Hz (idle={include_idle}, tracemalloc={trace_allocations})")
+            started_tracing = False
+            before = None
+            if trace_allocations:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    started_tracing = True
+                before = tracemalloc.take_snapshot()
+            try:
+                result = await asyncio.to_thread(self._sample, seconds, hz, include_idle)
+                if trace_allocations:
+                    after = tracemalloc.take_snapshot()
+                    result["allocations"] = self._allocation_diff(before, after, top_allocations)
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+            logger.info(f"[Profiler] 완료: 샘플 {result['samples']}회, 스택 {len(result['stacks'])}종 "
+                        f"({result['seconds']:.1f}초)")
+            return result
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # 함수 단위로 합치도록 현재 줄이 아닌 함수 시작 줄 사용 (';'는 collapsed 구분자)
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    @staticmethod
+    def _is_idle(code) -> bool:
+        return (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+
+    def _sample(self, seconds: float, hz: int, include_idle: bool) -> dict:
+        """샘플링 루프 (전용 스레드에서 실행)"""
+        interval = 1.0 / hz
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        thread_names: Dict[int, str] = {}
+        names_refreshed = 0.0
+        samples = 0
+
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_tick = start
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now - names_refreshed >= 1.0:
+                thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                names_refreshed = now
+
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                if not include_idle and self._is_idle(frame.f_code):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(f"thread:{thread_names.get(ident, ident)}")
+                stacks[";".join(reversed(stack))] += 1
+            frame = None
+            samples += 1
+
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # 샘플링이 주기보다 오래 걸리면 밀린 틱은 건너뜀
+                next_tick = time.perf_counter()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "stacks": dict(stacks),
+            "samples": samples,
+            "seconds": round(elapsed, 3),
+            "hz": hz,
+            "interval_ms": round(elapsed / samples * 1000, 3) if samples else 0.0
+        }
+
+    @staticmethod
+    def _allocation_diff(before, after, top: int) -> List[dict]:
+        """tracemalloc 스냅샷 차이 (증가량 큰 순, 프로파일러/tracemalloc 자체 할당 제외)"""
+        filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        return [
+            {
+                "location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff
+            }
+            for stat in stats[:top]
+        ]
+
+
+# ============================================================================
+# 출력 형식
+# ============================================================================
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    """collapsed stack 텍스트 (flamegraph.pl / speedscope 입력, 샘플 수 내림차순)"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+
+def to_speedscope(result: dict, name: str = "stt-api") -> dict:
+    """speedscope JSON (https://www.speedscope.app, 스레드별 sampled 프로필)"""
+    frames: List[dict] = []
+    frame_index: Dict[str, int] = {}
+    by_thread: Dict[str, List[Tuple[List[int], int]]] = {}
+    for stack, count in result["stacks"].items():
+        thread, *names = stack.split(";")
+        indices = []
+        for frame_name in names:
+            index = frame_index.get(frame_name)
+            if index is None:
+                index = frame_index[frame_name] = len(frames)
+                frames.append({"name": frame_name})
+            indices.append(index)
+        by_thread.setdefault(thread, []).append((indices, count))
+
+    interval_ms = result["interval_ms"] or 1.0
+    profiles = []
+    for thread, entries in sorted(by_thread.items(), key=lambda item: -sum(count for _, count in item[1])):
+        weights = [count * interval_ms for _, count in entries]
+        profiles.append({
+            "type": "sampled",
+            "name": thread.split(":", 1)[-1],
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": round(sum(weights), 3),
+            "samples": [indices for indices, _ in entries],
+            "weights": weights
+        })
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{name} ({result['seconds']}s @ {result['hz']}Hz)",
+        "exporter": "stt-api /admin/profile",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": profiles
+    }
+
+
+def render_flamegraph_svg(result: dict, title: str = "stt-api", width: int = 1200, row_height: int = 16) -> str:
+    """
+    플레임 그래프 SVG (뿌리가 아래, 너비 = 샘플 비율, 마우스를 올리면 전체 이름/샘플 수)
+
+    tracemalloc 결과가 있으면 그래프 아래에 할당 증가 상위 목록을 덧붙입니다.
+    """
+    root = {"name": "all", "value": 0, "children": {}}
+    for stack, count in result["stacks"].items():
+        root["value"] += count
+        node = root
+        for frame_name in stack.split(";"):
+            node = node["children"].setdefault(frame_name, {"name": frame_name, "value": 0, "children": {}})
+            node["value"] += count
+
+    total = root["value"] or 1
+    min_width = 0.3  # 이보다 좁은 칸은 생략
+    rects = []
+    max_depth = 0
+
+    def place(node: dict, x: float, depth: int):
+        nonlocal max_depth
+        node_width = node["value"] / total * width
+        if node_width < min_width:
+            return
+        max_depth = max(max_depth, depth)
+        rects.append((node, x, depth, node_width))
+        child_x = x
+        for child in sorted(node["children"].values(), key=lambda child: child["name"]):
+            place(child, child_x, depth + 1)
+            child_x += child["value"] / total * width
+
+    place(root, 0.0, 0)
+
+    allocations = result.get("allocations") or []
+    header = 40
+    graph_height = (max_depth + 1) * row_height
+    footer = (len(allocations) + 2) * row_height if allocations else 0
+    height = header + graph_height + footer + 10
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">',
+        f'<rect width="100%" height="100%" fill="#f8f8f8"/>',
+        f'<text x="{width / 2}" y="18" text-anchor="middle" font-size="15">{html.escape(title)}</text>',
+        f'<text x="{width / 2}" y="34" text-anchor="middle" fill="#555">'
+        f'{result["samples"]} samples, {result["seconds"]}s @ {result["hz"]}Hz</text>'
+    ]
+    for node, x, depth, node_width in rects:
+        y = header + graph_height - (depth + 1) * row_height
+        # 이름 해시로 따뜻한 계열 색 (같은 함수는 항상 같은 색)
+        hue = zlib.crc32(node["name"].encode("utf-8")) % 55
+        name = html.escape(node["name"])
+        percent = node["value"] / total * 100
+        parts.append(
+            f'<g><title>{name} ({node["value"]} samples, {percent:.2f}%)</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{node_width:.2f}" height="{row_height - 1}" '
+            f'fill="hsl({hue},85%,{60 + hue % 10}%)" rx="2"/>'
+        )
+        max_chars = int((node_width - 6) / 6.6)
+        if max_chars >= 3:
+            text = node["name"] if len(node["name"]) <= max_chars else node["name"][:max_chars - 2] + ".."
+            parts.append(f'<text x="{x + 3:.2f}" y="{y + row_height - 4}">{html.escape(text)}</text>')
+        parts.append("</g>")
+
+    if allocations:
+        y = header + graph_height + row_height + 4
+        parts.append(f'<text x="4" y="{y}" font-weight="bold">tracemalloc: 할당 증가 상위 {len(allocations)}개</text>')
+        for item in allocations:
+            y += row_height
+            parts.append(
+                f'<text x="4" y="{y}">{item["size_diff_kb"]:+10.1f} KB  {item["count_diff"]:+8d}  '
+                f'{html.escape(item["location"])}</text>'
+            )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+# 전역 인스턴스 생성
+profiler = StackProfiler()
@@ -0,0 +1,211 @@
+"""
+/transcribe 응답 인코딩 (모델 직접 직렬화 + 필드 선택 + gzip/brotli 압축)
+
+긴 통화의 응답에는 원문 text, segments(같은 텍스트를 구간별로 다시), privacy_removal.text(개인정보 제거본),
+요소 탐지 문장이 함께 들어가므로 수백 KB~수 MB가 됩니다.
+
+- 직렬화: .dict() → json.dumps 대신 pydantic(v2) 직렬화기가 모델을 바로 UTF-8 JSON bytes로 변환
+- 필드 선택: 요청의 fields(포함) / exclude(제외)에 점 경로 지정 (예: "text,element_detection.detected_yn")
+  omit_original_text=true면 Privacy Removal 결과가 있을 때만 원문 text와 segments를 제외
+- 압축: 본문이 RESPONSE_COMPRESS_MIN_BYTES 이상이고 Accept-Encoding이 허용하면 br(brotli 설치 시) 또는 gzip
+  (큰 본문은 스레드에서 압축해 이벤트 루프를 막지 않음)
+"""
+
+import asyncio
+import gzip
+import logging
+import time
+from typing import Dict, List, Optional, Tuple, Union, get_args, get_origin
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from api_server import metrics
+
+try:
+    import brotli  # 선택 의존성 (없으면 gzip만 협상)
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 이 크기 이상의 본문은 스레드에서 압축 (bytes)
+_THREAD_MIN_BYTES = 256 * 1024
+
+JSON_MEDIA_TYPE = "application/json; charset=utf-8"
+
+
+def _unwrap(annotation) -> Tuple[object, bool]:
+    """Optional[...] / List[...]을 벗긴 타입과 리스트 여부"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    if get_origin(annotation) in (list, List):
+        return get_args(annotation)[0], True
+    return annotation, False
+
+
+def parse_field_paths(model_cls, spec: str) -> Optional[Dict]:
+    """
+    "a,b.c,segments.text" 형식을 pydantic include/exclude 트리로 변환
+
+    리스트 필드 아래 경로는 모든 항목에 적용 (segments.text → {"segments": {"__all__": {"text": True}}}).
+    모델 필드는 이름을 검증하고, Dict 필드 아래 키는 그대로 사용합니다.
+
+    Args:
+        model_cls: 응답 모델 클래스
+        spec: 쉼표로 구분한 점 경로
+
+    Returns:
+        include/exclude 트리 (빈 값이면 None)
+
+    Raises:
+        ValueError: 모델에 없는 필드
+    """
+    tree: Dict = {}
+    for path in (part.strip() for part in (spec or "").split(",")):
+        if not path:
+            continue
+        node, cls = tree, model_cls
+        names = path.split(".")
+        for index, name in enumerate(names):
+            annotation = None
+            if cls is not None:
+                if name not in cls.model_fields:
+                    raise ValueError(f"알 수 없는 필드: {path}")
+                annotation = cls.model_fields[name].annotation
+            if index == len(names) - 1:
+                node[name] = True
+                break
+            child = node.get(name)
+            if child is True:  # 상위 필드 전체가 이미 선택됨
+                break
+            child = node.setdefault(name, {})
+            inner, is_list = _unwrap(annotation)
+            if is_list:
+                child = child.setdefault("__all__", {})
+            node = child
+            cls = inner if isinstance(inner, type) and issubclass(inner, BaseModel) else None
+    return tree or None
+
+
+class FieldSelection:
+    """요청별 응답 필드 선택 (fields / exclude / omit_original_text)"""
+
+    def __init__(self, model_cls, fields: str = "", exclude: str = "", omit_original_text: bool = False):
+        self.include = parse_field_paths(model_cls, fields)
+        self.exclude = parse_field_paths(model_cls, exclude)
+        self.omit_original_text = omit_original_text
+
+    def resolve(self, response: BaseModel) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """응답 내용에 따라 최종 (include, exclude) 결정"""
+        exclude = self.exclude
+        if self.omit_original_text and getattr(response, "privacy_removal", None) is not None:
+            exclude = {**(exclude or {}), "text": True, "segments": True}
+        return self.include, exclude
+
+    def dump(self, response: BaseModel) -> Dict:
+        """선택한 필드만 담은 딕셔너리 (스트리밍 result 이벤트용)"""
+        include, exclude = self.resolve(response)
+        return response.model_dump(include=include, exclude=exclude)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding에서 사용할 압축 방식 선택 (q값이 같으면 br 우선)
+
+    Returns:
+        "br" / "gzip" / None (압축 안 함)
+    """
+    offers = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offers[token] = q
+
+    best = None
+    for encoding in (["br"] if brotli is not None else []) + ["gzip"]:
+        q = offers.get(encoding, offers.get("*", 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (encoding, q)
+    return best[0] if best else None
+
+
+class ResponseEncoder:
+    """JSON 응답 직렬화 + 압축"""
+
+    def __init__(self):
+        self.min_bytes = 4096
+        self.gzip_level = 1
+        self.brotli_quality = 4
+
+    def configure(self, min_bytes: int = 4096, gzip_level: int = 1, brotli_quality: int = 4):
+        """
+        압축 설정
+
+        Args:
+            min_bytes: 이 크기 이상의 본문만 압축 (bytes, 0이면 항상)
+            gzip_level: gzip 압축 레벨 (1~9, 텍스트 응답은 1에서 크기 대비 시간이 가장 유리)
+            brotli_quality: brotli 품질 (0~11, brotli 패키지가 있을 때만)
+        """
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        logger.info(f"[Response] 압축 기준 {min_bytes}bytes, gzip {gzip_level}, "
+                    f"brotli {brotli_quality if brotli is not None else '미설치'}")
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def render(self, model: BaseModel, request: Request, selection: Optional[FieldSelection] = None,
+                     status_code: int = 200, headers: Optional[Dict[str, str]] = None,
+                     indent: Optional[int] = None) -> Response:
+        """
+        모델을 JSON 응답으로 변환
+
+        Args:
+            model: 응답 모델 (TranscribeResponse 등)
+            request: 요청 (Accept-Encoding 확인)
+            selection: 필드 선택 (None이면 전체)
+            status_code: HTTP 상태 코드
+            headers: 추가 헤더 (Content-Disposition 등)
+            indent: 들여쓰기 (export=json 다운로드용, 기본: 한 줄)
+        """
+        start = time.perf_counter()
+        include, exclude = selection.resolve(model) if selection is not None else (None, None)
+        body = model.model_dump_json(include=include, exclude=exclude, indent=indent).encode("utf-8")
+        metrics.RESPONSE_ENCODE_SECONDS.labels("serialize").observe(time.perf_counter() - start)
+
+        headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+        raw_bytes = len(body)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", "")) \
+            if raw_bytes >= self.min_bytes else None
+        if encoding:
+            start = time.perf_counter()
+            if raw_bytes >= _THREAD_MIN_BYTES:
+                body = await asyncio.to_thread(self.compress, body, encoding)
+            else:
+                body = self.compress(body, encoding)
+            metrics.RESPONSE_ENCODE_SECONDS.labels(encoding).observe(time.perf_counter() - start)
+            headers["Content-Encoding"] = encoding
+
+        metrics.RESPONSE_BYTES.labels("raw").inc(raw_bytes)
+        metrics.RESPONSE_BYTES.labels("sent").inc(len(body))
+        logger.debug("[Response] %d bytes → %d bytes (%s)", raw_bytes, len(body), encoding or "identity")
+        return Response(content=body, status_code=status_code, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+# 전역 인스턴스 생성
+response_encoder = ResponseEncoder()
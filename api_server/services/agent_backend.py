@@ -10,6 +10,8 @@ import time
 import asyncio
 from typing import Optional, Dict, Any
 
+from api_server import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -170,6 +172,7 @@ class AgentBackend:
             Dummy Agent 응답
         """
         processing_time = time.time() - start_time
+        metrics.DUMMY_FALLBACKS.labels("agent").inc()
         
         return {
             'success': False,
@@ -216,7 +219,7 @@ class AgentBackend:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=metrics.http_trace_configs("agent")) as session:
                 async with session.post(
                     url,
                     json=payload,
@@ -289,7 +292,7 @@ class AgentBackend:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=metrics.http_trace_configs("agent")) as session:
                 async with session.post(
                     url,
                     json=payload,
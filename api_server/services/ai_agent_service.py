@@ -15,6 +15,8 @@ from typing import Optional, Dict, Any
 import os
 import time
 
+from api_server import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -176,7 +178,7 @@ class AIAgentService:
             
             logger.debug(f"[AIAgent] 외부 Agent 요청 전송: {self.agent_url}")
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=metrics.http_trace_configs("agent")) as session:
                 async with session.post(
                     self.agent_url,
                     json=payload,
@@ -250,7 +252,7 @@ class AIAgentService:
             
             logger.debug(f"[AIAgent] vLLM Fallback 요청 전송: {self.vllm_base_url}")
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=metrics.http_trace_configs("vllm")) as session:
                 async with session.post(
                     f"{self.vllm_base_url}/v1/chat/completions",
                     json=payload,
@@ -302,6 +304,7 @@ class AIAgentService:
     ) -> Dict[str, Any]:
         """Dummy Agent - 테스트용"""
         
+        metrics.DUMMY_FALLBACKS.labels("agent").inc()
         logger.info(f"[AIAgent] Dummy Agent로 응답 생성 (query 길이: {len(user_query)})")
         
         # Query의 핵심 키워드 추출
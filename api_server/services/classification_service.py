@@ -15,6 +15,8 @@ try:
 except ImportError:
     aiohttp = None
 
+from api_server.metrics import http_trace_configs
+
 logger = logging.getLogger(__name__)
 
 
@@ -235,7 +237,7 @@ class ClassificationService:
             vllm_endpoint = f"{self.vllm_base_url}/v1/chat/completions"
             logger.debug(f"[ClassificationService] vLLM 호출: {vllm_endpoint} (모델: {self.vllm_model})")
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=http_trace_configs("vllm")) as session:
                 async with session.post(
                     vllm_endpoint,
                     json=payload,
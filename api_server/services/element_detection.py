@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 
 from api_server.llm_clients import LLMClientFactory
 from api_server.config import FormDataConfig
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -220,11 +221,13 @@ class ElementDetectionService:
             }
             
             async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    agent_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
+                with tracer.span("http.agent", url=agent_url) as span:
+                    response = await client.post(
+                        agent_url,
+                        json=payload,
+                        headers=tracer.inject_headers({"Content-Type": "application/json"})
+                    )
+                    span.set(status_code=response.status_code)
             
             if response.status_code != 200:
                 logger.warning(f"[ElementDetection] 외부 API 실패 (status={response.status_code})")
@@ -17,6 +17,8 @@ from typing import Optional, Dict, Any, List
 from pathlib import Path
 from dotenv import load_dotenv
 
+from utils.tracing import tracer
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
@@ -110,12 +112,14 @@ class OpenAIClient:
             model = model_name or self.model_name
             logger.debug(f"OpenAI API 호출: model={model}, max_tokens={max_tokens}, temperature={temperature}")
             
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            with tracer.span("http.openai", model=model):
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    extra_headers=tracer.inject_headers()
+                )
             
             logger.debug(f"OpenAI 응답 수신: input_tokens={response.usage.prompt_tokens}, output_tokens={response.usage.completion_tokens}")
             
@@ -365,12 +369,14 @@ class QwenClient:
             logger.info(f"[Qwen] API 호출 시작: model={model}, base_url={self.api_base}")
             logger.debug(f"[Qwen] 요청 파라미터: max_tokens={max_tokens}, temperature={temperature}, prompt_len={len(prompt)}")
             
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            with tracer.span("http.vllm", url=self.api_base, model=model):
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    extra_headers=tracer.inject_headers()
+                )
             
             logger.info(f"[Qwen] 응답 수신 성공: input_tokens={response.usage.prompt_tokens}, output_tokens={response.usage.completion_tokens}")
             
@@ -0,0 +1,235 @@
+"""
+STT 엔진 시작 관리자
+
+서버 기동 시 목표 프리셋/백엔드를 먼저 결정한 뒤 해당 백엔드 하나만 로드한다.
+(기존: import 시점에 faster-whisper를 로드한 뒤 STT_PRESET=accuracy 적용으로 transformers를 다시 로드)
+
+- 로드는 FastAPI lifespan에서 백그라운드 스레드로 실행 → uvicorn은 즉시 연결을 받음
+- /health: 프로세스 생존 여부 (로드 중에도 200)
+- /ready: 모델 로드(+ 선택적 warm-up) 완료 후에만 200, 그 전에는 503
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Dict, Optional
+
+from api_server.constants import PRESET_SEGMENT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 시작 상태
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_WARMING_UP = "warming_up"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+# warm-up용 무음 길이 (초)
+WARMUP_SILENCE_SEC = 1.0
+WARMUP_SAMPLE_RATE = 16000
+
+
+def resolve_model_path() -> Path:
+    """
+    모델 경로 결정
+
+    Docker 환경은 /app/models, 로컬 개발은 프로젝트의 models/ 디렉토리를 사용한다.
+    """
+    docker_model_path = Path("/app/models/openai_whisper-large-v3-turbo")
+    local_model_path = Path(__file__).parent.parent / "models" / "openai_whisper-large-v3-turbo"
+    return docker_model_path if docker_model_path.exists() else local_model_path
+
+
+def resolve_startup_target() -> Dict:
+    """
+    환경변수로부터 시작 시 로드할 프리셋/백엔드/디바이스/컴퓨트 타입 결정
+
+    - STT_PRESET: speed / balanced / accuracy / custom (기본: accuracy)
+    - custom: STT_BACKEND, STT_DEVICE, STT_COMPUTE_TYPE 사용
+    - 알 수 없는 프리셋: 기본 순서 자동 선택 (faster-whisper → transformers → openai-whisper)
+
+    Returns:
+        {"preset": str, "backend": str | None, "device": str, "compute_type": str}
+    """
+    import torch
+
+    preset = os.getenv("STT_PRESET", "accuracy").lower().strip()
+    device = os.getenv("STT_DEVICE", "auto")
+
+    compute_type = os.getenv("STT_COMPUTE_TYPE")
+    if compute_type is None:
+        # device="auto"일 때 CUDA 가용성 확인
+        use_cuda = device == "cuda" or (device == "auto" and torch.cuda.is_available())
+        compute_type = "float16" if use_cuda else "float32"  # CPU는 float32가 더 안정적
+
+    if preset == "custom":
+        backend = os.getenv("STT_BACKEND")
+    elif preset in PRESET_SEGMENT_CONFIG:
+        backend = PRESET_SEGMENT_CONFIG[preset]["backend"]
+        compute_type = PRESET_SEGMENT_CONFIG[preset]["compute_type"]
+    else:
+        logger.warning(f"⚠️  알 수 없는 STT_PRESET='{preset}' - 백엔드 자동 선택")
+        preset = None
+        backend = None
+
+    return {
+        "preset": preset,
+        "backend": backend,
+        "device": device,
+        "compute_type": compute_type
+    }
+
+
+class StartupManager:
+    """STT 모델 단일 로드 및 준비 상태 관리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = STATE_PENDING
+        self.target: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+        self.warmup_enabled = os.getenv("STT_WARMUP", "false").lower() in ("1", "true", "yes")
+
+    def _set_state(self, state: str) -> None:
+        with self._lock:
+            self.state = state
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == STATE_READY
+
+    def load(self):
+        """
+        목표 백엔드 하나만 로드 (블로킹, lifespan에서 스레드로 실행)
+
+        Returns:
+            WhisperSTT 인스턴스 (실패 시 None)
+        """
+        from stt_engine import WhisperSTT
+
+        self.started_at = time.time()
+        self._set_state(STATE_LOADING)
+        model_path = resolve_model_path()
+        self.target = resolve_startup_target()
+        target = self.target
+
+        logger.info(f"STT 모델 로드 시작 (단일 백엔드)")
+        logger.info(f"  모델: openai_whisper-large-v3-turbo")
+        logger.info(f"  경로: {model_path}")
+        logger.info(f"  프리셋: {target['preset']}")
+        logger.info(f"  백엔드: {target['backend'] or '자동 선택'}")
+        logger.info(f"  디바이스 설정: {target['device']}")
+        logger.info(f"  Compute Type: {target['compute_type']}")
+
+        load_start = time.time()
+        try:
+            stt = WhisperSTT(
+                str(model_path),
+                device=target["device"],
+                compute_type=target["compute_type"],
+                auto_load=False
+            )
+
+            if target["preset"] == "custom":
+                result = stt.reload_backend(
+                    preset="custom",
+                    backend=target["backend"],
+                    device=stt.device,
+                    compute_type=target["compute_type"]
+                )
+            elif target["preset"]:
+                result = stt.reload_backend(preset=target["preset"])
+            else:
+                result = stt.reload_backend()
+
+            if result.get("status") != "success":
+                # 목표 백엔드 실패 시에만 기본 순서로 한 번 더 시도
+                logger.warning(f"⚠️  프리셋 적용 실패: {result.get('message')} - 백엔드 자동 선택으로 재시도")
+                result = stt.reload_backend()
+                if result.get("status") != "success":
+                    raise RuntimeError(result.get("message", "모든 백엔드 로드 실패"))
+
+            self.timings["load_sec"] = round(time.time() - load_start, 2)
+            logger.info(f"✅ STT 모델 로드 완료 ({self.timings['load_sec']}s)")
+            logger.info(f"   Backend: {result.get('current_backend')}")
+            logger.info(f"   Device: {result.get('device')}, Compute Type: {result.get('compute_type')}")
+            print(f"✅ STT 모델 로드 완료 (Backend: {result.get('current_backend')}, Device: {stt.device})")
+
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.timings["load_sec"] = round(time.time() - load_start, 2)
+            self._set_state(STATE_FAILED)
+            logger.error(f"❌ STT 모델 로드 실패: {self.error}")
+            if isinstance(e, FileNotFoundError):
+                logger.error(f"  확인 사항:")
+                logger.error(f"  1. 모델이 다운로드되었는가? (python3 download_model_hf.py)")
+                logger.error(f"  2. Docker 실행 시 마운트: docker run -v /path/to/models:/app/models ...")
+            print(f"❌ 모델 로드 실패: {e}")
+            return None
+
+        if self.warmup_enabled:
+            self._set_state(STATE_WARMING_UP)
+            self._warmup(stt)
+
+        self.timings["total_sec"] = round(time.time() - self.started_at, 2)
+        self._set_state(STATE_READY)
+        logger.info(f"✅ STT 엔진 준비 완료 (총 {self.timings['total_sec']}s)")
+        return stt
+
+    def _warmup(self, stt) -> None:
+        """무음 클립으로 추론 1회 실행 (첫 요청의 커널 초기화/캐시 지연 제거)"""
+        warmup_start = time.time()
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+                tmp_path = f.name
+            with wave.open(tmp_path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(WARMUP_SAMPLE_RATE)
+                wav.writeframes(b"\x00\x00" * int(WARMUP_SAMPLE_RATE * WARMUP_SILENCE_SEC))
+
+            stt.transcribe(tmp_path, language="ko")
+            self.timings["warmup_sec"] = round(time.time() - warmup_start, 2)
+            logger.info(f"🔥 warm-up 완료 ({self.timings['warmup_sec']}s)")
+        except Exception as e:
+            # warm-up 실패는 준비 상태를 막지 않음
+            logger.warning(f"⚠️  warm-up 실패 (무시): {type(e).__name__}: {e}")
+        finally:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def get_status(self) -> Dict:
+        """
+        시작 상태 조회
+
+        Returns:
+            {"state": str, "ready": bool, "target": {...}, "elapsed_sec": float, "timings": {...}, "error": str}
+        """
+        with self._lock:
+            status = {
+                "state": self.state,
+                "ready": self.state == STATE_READY,
+                "target": self.target,
+                "warmup": self.warmup_enabled,
+                "timings": dict(self.timings)
+            }
+        if self.started_at and self.state in (STATE_LOADING, STATE_WARMING_UP):
+            status["elapsed_sec"] = round(time.time() - self.started_at, 2)
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+# 전역 인스턴스 생성
+startup_manager = StartupManager()
@@ -5,17 +5,20 @@ STT Engine API - 향상된 Transcribe 엔드포인트
 """
 
 import logging
-from typing import Optional, List
+from typing import Callable, Optional, List
 from pathlib import Path
 import time
 import json
 import tempfile
 
 from fastapi import Form, Query, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from stt_utils import check_memory_available, check_audio_file
 from utils.performance_monitor import PerformanceMonitor
+from api_server import metrics
+from utils.tracing import tracer
+from utils.memory_governor import memory_governor
 from api_server.services.privacy_removal import get_privacy_removal_service
 from api_server.services.classification import get_classification_service
 from api_server.services.element_detection import get_element_detection_service
@@ -86,16 +89,52 @@ class TranscribeRequestParams:
         return steps
 
 
-async def validate_and_prepare_file(file_path: str) -> tuple[Path, dict, dict]:
+def _allowed_audio_dir() -> Path:
+    """file_path로 접근을 허용하는 디렉토리"""
+    return Path("/app").resolve() if Path("/app").exists() else Path.cwd().resolve()
+
+
+def audio_duration_hint(file_path: str) -> float:
+    """
+    승인 제어용 오디오 길이 (파일 헤더만 읽음, 디코딩하지 않음)
+    
+    허용 디렉토리 밖이거나 없는 파일은 0 (요청은 validate_and_prepare_file()에서 거절됨),
+    헤더를 읽을 수 없는 형식은 check_audio_file()과 같은 파일 크기 기반 추정값을 반환합니다.
+    
+    Returns:
+        오디오 길이 (초)
+    """
+    from utils.audio_frontend import TARGET_SAMPLE_RATE, audio_length_16k
+    
+    path = Path(file_path).resolve()
+    try:
+        path.relative_to(_allowed_audio_dir())
+        if not path.is_file():
+            return 0.0
+    except (ValueError, OSError):
+        return 0.0
+    try:
+        return audio_length_16k(str(path)) / TARGET_SAMPLE_RATE
+    except Exception:
+        return (path.stat().st_size / 2) / 16000
+
+
+@tracer.traced("validation")
+async def validate_and_prepare_file(file_path: str, required_mb: Optional[int] = 4000) -> tuple[Path, dict, dict]:
     """
     파일 검증 및 준비
     
+    Args:
+        file_path: 오디오 파일 경로
+        required_mb: 처리에 필요한 메모리 (MB). None이면 메모리 부족으로 거절하지 않고 현재 상태만 기록
+            (/transcribe는 승인 제어가 이미 예산 안에서 승인했으므로 503 + Retry-After는 admission에서만 발생)
+    
     Returns:
         (file_path_obj, file_check, memory_info)
     """
     # 1. 파일 경로 검증
     file_path_obj = Path(file_path).resolve()
-    allowed_dir = Path("/app").resolve() if Path("/app").exists() else Path.cwd().resolve()
+    allowed_dir = _allowed_audio_dir()
     
     logger.info(f"[API/Transcribe] 파일 경로 검증: {file_path}")
     
@@ -173,8 +212,8 @@ async def validate_and_prepare_file(file_path: str) -> tuple[Path, dict, dict]:
     # 3. 메모리 확인
     logger.debug(f"[API/Transcribe] 메모리 확인 중...")
     try:
-        memory_info = check_memory_available(logger=logger)
-        if memory_info['critical']:
+        memory_info = check_memory_available(required_mb=required_mb or 0, logger=logger)
+        if required_mb is not None and memory_info['critical']:
             logger.error(f"[API/Transcribe] 메모리 부족: {memory_info['message']}")
             raise HTTPException(
                 status_code=503,
@@ -206,18 +245,15 @@ async def perform_stt(stt_instance, file_path_obj: Path, language: str, is_strea
     Returns:
         STT 결과 딕셔너리
     """
-    import gc
     import torch
     
     logger.info(f"[API/Transcribe] STT 처리 시작: {file_path_obj.name}")
     
     try:
         if is_streaming:
-            # TODO: 스트리밍 모드 구현
+            # 세그먼트 단위 전송은 /transcribe가 stream_stt()로 처리, 여기서는 전체 결과만 반환
             logger.info(f"[API/Transcribe] 스트리밍 모드 사용")
-            result = stt_instance.transcribe(str(file_path_obj), language=language)
-        else:
-            result = stt_instance.transcribe(str(file_path_obj), language=language)
+        result = await stt_instance.transcribe_async(str(file_path_obj), language=language)
         
         logger.info(f"[API/Transcribe] ✅ STT 처리 완료: {len(result.get('text', ''))} 글자")
         return result
@@ -227,14 +263,90 @@ async def perform_stt(stt_instance, file_path_obj: Path, language: str, is_strea
         raise
     
     finally:
-        # 요청 핸들러 메모리 정리 (동시 요청 시 즉시 해제)
+        # 요청 핸들러 메모리 정리 (RSS가 기준을 넘었을 때만, utils/memory_governor.py)
+        memory_governor.checkpoint("request_end")
+
+
+
+async def stream_stt(stt_instance, file_path_obj: Path, language: str):
+    """
+    STT 처리 수행 (스트리밍)
+    
+    세그먼트가 디코딩되는 즉시 ("segment", {"start", "end", "text"})를 내보내고,
+    마지막에 ("result", STT 결과 딕셔너리)를 내보냅니다.
+    """
+    logger.info(f"[API/Transcribe] STT 스트리밍 시작: {file_path_obj.name}")
+    start_time = time.time()
+    first_segment_sec = None
+    
+    try:
+        async for kind, value in stt_instance.transcribe_stream(str(file_path_obj), language=language):
+            if kind == "segment" and first_segment_sec is None:
+                first_segment_sec = time.time() - start_time
+                logger.info(f"[API/Transcribe] 첫 세그먼트 전송: {first_segment_sec:.2f}초")
+            elif kind == "result":
+                value["first_segment_sec"] = round(first_segment_sec, 2) if first_segment_sec is not None else None
+                logger.info(f"[API/Transcribe] ✅ STT 스트리밍 완료: {len(value.get('text', ''))} 글자 "
+                            f"({time.time() - start_time:.2f}초)")
+            yield kind, value
+    
+    finally:
+        memory_governor.checkpoint("request_end")
+
+
+def format_stream_event(event: str, data, sse: bool = False) -> bytes:
+    """
+    스트리밍 응답 이벤트 직렬화
+    
+    Args:
+        event: 이벤트 이름 (start, segment, stt_done, privacy_removal, classification,
+               element_detection, result, error)
+        data: JSON 직렬화 가능한 값
+        sse: True면 Server-Sent Events 블록, False면 NDJSON 한 줄
+    
+    Returns:
+        - NDJSON: {"event": ..., "data": ...}\n
+        - SSE: event: ...\ndata: ...\n\n
+    """
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
+    return (json.dumps({"event": event, "data": data}, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class CleanupStreamingResponse(StreamingResponse):
+    """
+    응답 전송이 어떻게 끝나든 cleanup을 실행하는 StreamingResponse
+    
+    본문 생성기의 finally는 생성기가 시작된 경우에만 실행됩니다. 첫 청크 전에 클라이언트 연결이 끊기거나
+    응답 시작 전송이 실패하면 생성기는 시작되지 않으므로, 반드시 반납해야 하는 자원(승인 예약,
+    성능 모니터)은 여기서 정리합니다. cleanup은 중복 호출해도 안전해야 합니다.
+    """
+    
+    def __init__(self, content, cleanup: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self.cleanup = cleanup
+    
+    async def __call__(self, scope, receive, send) -> None:
         try:
-            gc.collect()
-        except Exception as e:
-            logger.debug(f"[API/Transcribe] gc.collect() 오류: {e}")
+            await super().__call__(scope, receive, send)
+        finally:
+            self.cleanup()
+
+
+def _reason_outcome(reason: Optional[str]) -> str:
+    """privacy/classification 결과의 사유 필드로 outcome 판정 (오류 시 "Error: ..."로 채워 반환)"""
+    return "failure" if (reason or "").startswith("Error:") else "success"
+
 
+def _element_detection_outcome(result: dict) -> str:
+    """요소 탐지 결과 outcome 판정 (Dummy fallback은 카운터도 증가)"""
+    if result.get("api_type") == "dummy":
+        metrics.DUMMY_FALLBACKS.labels("element_detection").inc()
+        return "dummy"
+    return "success" if result.get("success") else "failure"
 
 
+@metrics.timed_llm_stage("privacy_removal", lambda r: _reason_outcome(r.exist_reason) if r else "failure")
 async def perform_privacy_removal(
     text: str,
     prompt_type: str = "privacy_remover_default_v6",
@@ -349,6 +461,7 @@ async def perform_privacy_removal(
             text=text,
             privacy_types=[]
         )
+@metrics.timed_llm_stage("classification", lambda r: _reason_outcome(r.reason) if r else "failure")
 async def perform_classification(
     text: str,
     prompt_type: str,
@@ -405,7 +518,7 @@ def build_transcribe_response(
     file_check: Optional[dict],
     file_size_mb: float,
     memory_info: dict,
-    perf_metrics: dict,
+    perf_metrics,
     processing_time: float,
     privacy_result: Optional[PrivacyRemovalResult] = None,
     classification_result: Optional[ClassificationResult] = None,
@@ -433,13 +546,13 @@ def build_transcribe_response(
     
     # Performance Metrics
     perf_metrics_obj = None
-    if perf_metrics and isinstance(perf_metrics, dict):
-        # perf_metrics.to_dict() 또는 dict 형태
+    if perf_metrics:
+        # PerformanceMonitor.stop() 결과(to_dict) 또는 dict 형태
         perf_dict = perf_metrics if isinstance(perf_metrics, dict) else perf_metrics.to_dict()
         from api_server.models import PerformanceMetrics
         perf_metrics_obj = PerformanceMetrics(
-            cpu_percent=perf_dict.get('cpu_percent'),
-            memory_mb=perf_dict.get('memory_mb'),
+            cpu_percent=perf_dict.get('cpu_percent', perf_dict.get('cpu_percent_avg')),
+            memory_mb=perf_dict.get('memory_mb', perf_dict.get('ram_mb_peak')),
             gpu_percent=perf_dict.get('gpu_percent'),
         )
     
@@ -463,6 +576,7 @@ def build_transcribe_response(
         language=stt_result.get('language', 'unknown'),
         duration=duration,
         backend=stt_result.get('backend', 'unknown'),
+        segments=stt_result.get('segments'),
         file_path=str(file_path_obj) if file_path_obj else None,
         file_size_mb=file_size_mb,
         privacy_removal=privacy_result,
@@ -550,6 +664,7 @@ async def perform_incomplete_elements_check(
 
 
 
+@metrics.timed_llm_stage("element_detection", _element_detection_outcome)
 async def perform_element_detection(
     text: str,
     detection_types: list = None,
@@ -184,89 +184,94 @@ def create_speech_audio(filepath, text, language='ko'):
 BASE_DIR = Path(__file__).parent.absolute()
 audio_dir = BASE_DIR / "audio" / "samples"
 
-print("🎵 STT Engine 샘플 오디오 파일 생성\n")
 
-# 1. 기본 샘플 오디오 생성
-print("📝 [1단계] 기본 샘플 오디오 생성")
-print("-" * 50)
-samples = [
-    ("short_0.5s.wav", 0.5),
-    ("medium_3s.wav", 3.0),
-    ("long_10s.wav", 10.0),
-]
+def main():
+    """기본 샘플 + 텍스트 음성 샘플 생성 (--test: 생성 파일 검증)"""
+    print("🎵 STT Engine 샘플 오디오 파일 생성\n")
 
-for filename, duration in samples:
-    filepath = audio_dir / filename
-    create_audio_file(filepath, duration)
+    # 1. 기본 샘플 오디오 생성
+    print("📝 [1단계] 기본 샘플 오디오 생성")
+    print("-" * 50)
+    samples = [
+        ("short_0.5s.wav", 0.5),
+        ("medium_3s.wav", 3.0),
+        ("long_10s.wav", 10.0),
+    ]
 
-# 2. 텍스트 음성 변환
-print("\n📝 [2단계] 텍스트를 음성으로 변환")
-print("-" * 50)
+    for filename, duration in samples:
+        filepath = audio_dir / filename
+        create_audio_file(filepath, duration)
 
-# 명령줄 인자로 텍스트 받기
-if len(sys.argv) > 1:
-    custom_text = " ".join(sys.argv[1:])
-else:
-    # 기본 부당권유 판매 샘플
-    custom_text = "고객님의 상황과 상관없이 이 상품은 무조건 가입해야해. 완전 대박이야. 수익 완전 보장하니까 동의 없이 내가 고객님 비번으로 임의로 가입할께"
+    # 2. 텍스트 음성 변환
+    print("\n📝 [2단계] 텍스트를 음성으로 변환")
+    print("-" * 50)
 
-print(f"📢 텍스트: {custom_text}\n")
+    # 명령줄 인자로 텍스트 받기
+    if len(sys.argv) > 1:
+        custom_text = " ".join(sys.argv[1:])
+    else:
+        # 기본 부당권유 판매 샘플
+        custom_text = "고객님의 상황과 상관없이 이 상품은 무조건 가입해야해. 완전 대박이야. 수익 완전 보장하니까 동의 없이 내가 고객님 비번으로 임의로 가입할께"
 
-speech_file = audio_dir / "improper_sales_example.wav"
-success = create_speech_audio(speech_file, custom_text, language='ko')
+    print(f"📢 텍스트: {custom_text}\n")
 
-if success:
-    # 파일 정보 출력
-    file_size = speech_file.stat().st_size
-    print(f"\n📊 파일 정보:")
-    print(f"   - 경로: {speech_file}")
-    print(f"   - 크기: {file_size} bytes ({file_size/1024:.2f} KB)")
-    print(f"   - 텍스트 길이: {len(custom_text)}자")
+    speech_file = audio_dir / "improper_sales_example.wav"
+    success = create_speech_audio(speech_file, custom_text, language='ko')
 
-print(f"\n📁 저장 위치: {audio_dir}")
-print(f"\n✨ 샘플 오디오 생성 완료!")
-print("\n💡 사용 방법:")
-print("   docker run -v $(pwd)/audio/samples:/app/audio/samples stt-engine:latest")
-print("   curl -X POST http://localhost:8003/transcribe -F \"file=@audio/samples/improper_sales_example.wav\"")
+    if success:
+        # 파일 정보 출력
+        file_size = speech_file.stat().st_size
+        print(f"\n📊 파일 정보:")
+        print(f"   - 경로: {speech_file}")
+        print(f"   - 크기: {file_size} bytes ({file_size/1024:.2f} KB)")
+        print(f"   - 텍스트 길이: {len(custom_text)}자")
 
+    print(f"\n📁 저장 위치: {audio_dir}")
+    print(f"\n✨ 샘플 오디오 생성 완료!")
+    print("\n💡 사용 방법:")
+    print("   docker run -v $(pwd)/audio/samples:/app/audio/samples stt-engine:latest")
+    print("   curl -X POST http://localhost:8003/transcribe -F \"file=@audio/samples/improper_sales_example.wav\"")
 
-# ============================================================================
-# 테스트 모드
-# ============================================================================
-if "--test" in sys.argv:
-    print("\n" + "=" * 50)
-    print("🧪 테스트 모드 시작")
-    print("=" * 50)
-    
-    # 생성된 파일들 검증
-    test_files = [
-        ("short_0.5s.wav", 0),
-        ("medium_3s.wav", 0),
-        ("long_10s.wav", 0),
-        ("improper_sales_example.wav", 1000),  # 최소 1KB
-    ]
-    
-    print("\n📋 파일 검증:")
-    all_passed = True
-    
-    for filename, min_size in test_files:
-        filepath = audio_dir / filename
-        if filepath.exists():
-            size = filepath.stat().st_size
-            if size >= min_size:
-                print(f"✅ {filename:30s} {size:8d} bytes")
+
+    # ============================================================================
+    # 테스트 모드
+    # ============================================================================
+    if "--test" in sys.argv:
+        print("\n" + "=" * 50)
+        print("🧪 테스트 모드 시작")
+        print("=" * 50)
+
+        # 생성된 파일들 검증
+        test_files = [
+            ("short_0.5s.wav", 0),
+            ("medium_3s.wav", 0),
+            ("long_10s.wav", 0),
+            ("improper_sales_example.wav", 1000),  # 최소 1KB
+        ]
+
+        print("\n📋 파일 검증:")
+        all_passed = True
+
+        for filename, min_size in test_files:
+            filepath = audio_dir / filename
+            if filepath.exists():
+                size = filepath.stat().st_size
+                if size >= min_size:
+                    print(f"✅ {filename:30s} {size:8d} bytes")
+                else:
+                    print(f"❌ {filename:30s} {size:8d} bytes (최소: {min_size} bytes)")
+                    all_passed = False
             else:
-                print(f"❌ {filename:30s} {size:8d} bytes (최소: {min_size} bytes)")
+                print(f"❌ {filename:30s} (파일 없음)")
                 all_passed = False
+
+        print("\n" + "=" * 50)
+        if all_passed:
+            print("✅ 모든 테스트 통과!")
         else:
-            print(f"❌ {filename:30s} (파일 없음)")
-            all_passed = False
-    
-    print("\n" + "=" * 50)
-    if all_passed:
-        print("✅ 모든 테스트 통과!")
-    else:
-        print("❌ 일부 테스트 실패")
-    print("=" * 50)
+            print("❌ 일부 테스트 실패")
+        print("=" * 50)
 
 
+if __name__ == "__main__":
+    main()
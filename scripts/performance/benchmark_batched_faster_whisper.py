@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+faster-whisper 순차 디코딩 vs BatchedInferencePipeline 벤치마크 (긴 파일)
+
+같은 긴 오디오를 기존 순차 경로(batch_size=0)와 batch_size별 batched 경로로 인식하여 비교합니다.
+- 처리 시간, RTF(처리 시간 / 오디오 길이), 순차 대비 속도 향상
+- 세그먼트 수, 순차 결과 대비 CER(문자 오류율)
+
+모든 실행은 같은 beam_size(기본 5, 적응형 디코딩 없음)를 사용하여 디코딩 방식 차이만 비교합니다.
+
+사용 방법:
+  # 기본: audio/samples 파일을 이어 붙인 10분 오디오, balanced 프리셋
+  python3 scripts/performance/benchmark_batched_faster_whisper.py
+
+  # 실제 녹취 파일 + batch_size 지정
+  python3 scripts/performance/benchmark_batched_faster_whisper.py --audio /data/call.wav --batch-sizes 8 16 32
+
+  # speed 프리셋(int8), 결과 저장
+  python3 scripts/performance/benchmark_batched_faster_whisper.py --preset speed --output batched_report.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from compare_cpu_int8 import cer  # noqa: E402
+
+
+def build_long_audio(sample_dir: Path, duration_sec: float) -> Path:
+    """샘플 wav를 반복해 이어 붙여 duration_sec 길이의 16kHz mono wav 생성"""
+    import numpy as np
+    import soundfile as sf
+    from stt_engine import load_audio_16k
+
+    clips = [load_audio_16k(str(path)) for path in sorted(sample_dir.glob("*.wav"))]
+    if not clips:
+        raise FileNotFoundError(f"샘플 wav 없음: {sample_dir} (python3 scripts/generate_sample_audio.py로 생성)")
+    gap = np.zeros(int(0.5 * 16000), dtype=np.float32)
+
+    parts, total = [], 0
+    while total < duration_sec * 16000:
+        for clip in clips:
+            parts.extend([clip, gap])
+            total += len(clip) + len(gap)
+    audio = np.concatenate(parts)[:int(duration_sec * 16000)]
+
+    path = Path(tempfile.mkdtemp(prefix="stt_bench_")) / f"long_{int(duration_sec)}s.wav"
+    sf.write(str(path), audio, 16000)
+    return path
+
+
+def run(stt, audio_path: Path, duration: float, language: str, beam_size: int, batch_size: int) -> Dict:
+    """한 가지 batch_size로 인식"""
+    start = time.time()
+    result = stt.transcribe(str(audio_path), language=language, beam_size=beam_size, batch_size=batch_size)
+    elapsed = time.time() - start
+    if not result.get("success"):
+        raise RuntimeError(f"batch_size={batch_size} 인식 실패: {result.get('error')}")
+    return {
+        "batch_size": batch_size,
+        "elapsed_sec": round(elapsed, 2),
+        "rtf": round(elapsed / duration, 4),
+        "segments": len(result.get("segments") or []),
+        "text": result.get("text", "")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="faster-whisper 순차 vs batched 벤치마크")
+    parser.add_argument("--audio", default=None, help="긴 오디오 파일 (미지정 시 샘플을 이어 붙여 생성)")
+    parser.add_argument("--duration", type=float, default=600, help="생성할 오디오 길이 (초, --audio 미지정 시)")
+    parser.add_argument("--sample-dir", default=str(PROJECT_ROOT / "audio" / "samples"), help="샘플 오디오 디렉토리")
+    parser.add_argument("--preset", default="balanced", choices=["speed", "balanced"], help="faster-whisper 프리셋")
+    parser.add_argument("--device", default="auto", help="cuda / cpu / auto")
+    parser.add_argument("--model-path", default=None, help="모델 디렉토리 (기본: 서버와 동일한 경로)")
+    parser.add_argument("--language", default="ko", help="언어 코드 (기본: ko)")
+    parser.add_argument("--beam-size", type=int, default=5, help="모든 실행에 사용할 beam_size")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16], help="비교할 batch_size 목록")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    import soundfile as sf
+    from api_server.startup import resolve_model_path
+    from stt_engine import WhisperSTT
+
+    audio_path = Path(args.audio) if args.audio else build_long_audio(Path(args.sample_dir), args.duration)
+    info = sf.info(str(audio_path))
+    duration = info.frames / info.samplerate
+    model_path = Path(args.model_path) if args.model_path else resolve_model_path()
+
+    print(f"모델: {model_path}")
+    print(f"오디오: {audio_path} ({duration:.1f}초)")
+
+    stt = WhisperSTT(str(model_path), device=args.device, auto_load=False)
+    load = stt.reload_backend(preset=args.preset)
+    if load.get("status") != "success":
+        print(f"❌ {args.preset} 로드 실패: {load.get('message')}")
+        sys.exit(1)
+    print(f"백엔드: {load['current_backend']} (device={load['device']}, compute_type={load['compute_type']})")
+
+    # 첫 실행의 초기화 지연이 결과에 섞이지 않도록 짧게 한 번 실행
+    stt.transcribe(str(sorted(Path(args.sample_dir).glob("*.wav"))[0]), language=args.language, beam_size=1)
+
+    reports = [run(stt, audio_path, duration, args.language, args.beam_size, 0)]
+    for batch_size in args.batch_sizes:
+        reports.append(run(stt, audio_path, duration, args.language, args.beam_size, batch_size))
+    stt.unload()
+
+    sequential = reports[0]
+    print(f"\n{'mode':<14}{'elapsed(s)':>12}{'RTF':>10}{'speedup':>10}{'segments':>10}{'CER vs seq':>12}")
+    for report in reports:
+        report["speedup"] = round(sequential["elapsed_sec"] / report["elapsed_sec"], 2)
+        report["cer_vs_sequential"] = cer(sequential["text"], report["text"]) if report is not sequential else 0.0
+        mode = "sequential" if report["batch_size"] == 0 else f"batch={report['batch_size']}"
+        print(f"{mode:<14}{report['elapsed_sec']:>12}{report['rtf']:>10}{report['speedup']:>10}"
+              f"{report['segments']:>10}{report['cer_vs_sequential']:>12}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "audio": str(audio_path),
+            "duration_sec": round(duration, 2),
+            "preset": args.preset,
+            "backend": load,
+            "reports": reports
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
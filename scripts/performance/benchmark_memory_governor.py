@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+메모리 거버너 벤치마크 (세그먼트당 메모리 정리 비용: 무조건 gc.collect vs 거버너 훅)
+
+모델 없이 STT 세그먼트 루프를 흉내 냅니다.
+- 상주 힙: 모델/프레임워크 객체 그래프 대신 --heap-objects개의 컨테이너 객체 (full gc 비용을 결정)
+- 세그먼트: --segment-ms 동안 numpy 연산 + 임시 배열(특징 행렬 크기) 할당 + 순환 참조 객체 생성
+
+모드별로 세그먼트마다 실행한 정리 코드 시간(정리 비용)과 세그먼트 전체 시간, RSS를 비교합니다.
+- blanket : 세그먼트마다 gc.collect() (기존 stt_engine 동작)
+- governor: memory_governor.checkpoint("segment") (기준을 넘었을 때만 gc.collect + malloc_trim)
+- none    : 정리하지 않음 (Python 자동 세대별 gc만, 참고용)
+
+사용 방법:
+  python3 scripts/performance/benchmark_memory_governor.py
+
+  # 상주 힙 크기 / 세그먼트 수 조절, 결과 JSON 저장
+  python3 scripts/performance/benchmark_memory_governor.py --heap-objects 3000000 --segments 300 \\
+      --output /tmp/governor_bench.json
+
+  # 거버너 기준값 변경 (MEMORY_RSS_GROWTH_MB와 같은 의미)
+  python3 scripts/performance/benchmark_memory_governor.py --rss-growth-mb 128 --check-interval 0.5
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import psutil
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.memory_governor import MemoryGovernor  # noqa: E402
+
+MODES = ("blanket", "governor", "none")
+
+
+class _Node:
+    """순환 참조 객체 (세그먼트마다 생기는 디코더 중간 객체 대용)"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.peer = None
+
+
+def build_resident_heap(objects: int) -> list:
+    """모델/프레임워크 상주 객체 대용 (gc가 full collection마다 순회하는 컨테이너)"""
+    return [{"index": i, "children": [i]} for i in range(objects // 2)]
+
+
+def run_segment(rng: np.random.Generator, segment_ms: float, feature_shape: tuple, cycles: int) -> None:
+    """세그먼트 1개 처리 흉내 (CPU 연산 + 임시 배열 + 순환 참조 쓰레기)"""
+    features = rng.standard_normal(feature_shape, dtype=np.float32)
+    weights = rng.standard_normal((feature_shape[0], feature_shape[0]), dtype=np.float32)
+    deadline = time.perf_counter() + segment_ms / 1000
+    while time.perf_counter() < deadline:
+        features = np.tanh(weights @ features * 0.01)
+    for i in range(cycles):
+        a, b = _Node(np.empty(64, dtype=np.float32)), _Node(i)
+        a.peer, b.peer = b, a
+    del features, weights
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def run_mode(mode: str, args) -> Dict:
+    """모드 1개 측정 (모드마다 같은 난수 시드 / 같은 상주 힙)"""
+    governor = MemoryGovernor()
+    governor.configure(rss_high_mb=args.rss_high_mb, rss_growth_mb=args.rss_growth_mb,
+                       check_interval_sec=args.check_interval)
+    process = psutil.Process()
+    rng = np.random.default_rng(0)
+    feature_shape = (80, 3000 // args.feature_downsample)
+
+    gc.collect()
+    rss_start = process.memory_info().rss
+    reclaim_ms, segment_ms = [], []
+    peak_rss = rss_start
+    for _ in range(args.segments):
+        start = time.perf_counter()
+        run_segment(rng, args.segment_ms, feature_shape, args.cycles)
+        reclaim_start = time.perf_counter()
+        if mode == "blanket":
+            gc.collect()
+        elif mode == "governor":
+            governor.checkpoint("segment")
+        end = time.perf_counter()
+        reclaim_ms.append((end - reclaim_start) * 1000)
+        segment_ms.append((end - start) * 1000)
+        peak_rss = max(peak_rss, process.memory_info().rss)
+
+    stats = governor.status()["stats"]
+    return {
+        "mode": mode,
+        "segments": args.segments,
+        "reclaim_ms_mean": round(sum(reclaim_ms) / len(reclaim_ms), 3),
+        "reclaim_ms_p95": round(percentile(reclaim_ms, 0.95), 3),
+        "reclaim_ms_max": round(max(reclaim_ms), 3),
+        "segment_ms_mean": round(sum(segment_ms) / len(segment_ms), 3),
+        "rss_start_mb": round(rss_start / 1024 / 1024, 1),
+        "rss_peak_mb": round(peak_rss / 1024 / 1024, 1),
+        "rss_end_mb": round(process.memory_info().rss / 1024 / 1024, 1),
+        "governor_gc_runs": stats["gc_runs"] if mode == "governor" else None,
+        "governor_rss_freed_mb": stats["rss_freed_mb"] if mode == "governor" else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모리 거버너 벤치마크 (세그먼트당 정리 비용 비교)")
+    parser.add_argument("--heap-objects", type=int, default=2_000_000,
+                        help="상주 힙 컨테이너 객체 수 (full gc 비용 결정, 기본: 2,000,000)")
+    parser.add_argument("--segments", type=int, default=200, help="모드별 세그먼트 수 (기본: 200)")
+    parser.add_argument("--segment-ms", type=float, default=20.0, help="세그먼트 1개 연산 시간 (ms, 기본: 20)")
+    parser.add_argument("--cycles", type=int, default=2000, help="세그먼트마다 만드는 순환 참조 쌍 수")
+    parser.add_argument("--feature-downsample", type=int, default=1,
+                        help="특징 행렬 열 축소 배율 (기본 1 = 80x3000, Whisper 30초 입력 크기)")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES, help="측정할 모드")
+    parser.add_argument("--rss-high-mb", type=float, default=0.0, help="거버너 RSS high-water mark (MB)")
+    parser.add_argument("--rss-growth-mb", type=float, default=512.0, help="거버너 RSS 증가량 기준 (MB)")
+    parser.add_argument("--check-interval", type=float, default=1.0, help="거버너 확인 최소 간격 (초)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    print(f"상주 힙 생성: 컨테이너 {args.heap_objects:,}개 ...")
+    heap = build_resident_heap(args.heap_objects)
+    tracked = len(gc.get_objects())
+    full_gc_start = time.perf_counter()
+    gc.collect()
+    full_gc_ms = (time.perf_counter() - full_gc_start) * 1000
+    print(f"gc 추적 객체 {tracked:,}개, full gc 1회 {full_gc_ms:.1f}ms\n")
+
+    results = [run_mode(mode, args) for mode in args.modes]
+
+    print(f"{'모드':<10}{'정리 평균(ms)':>14}{'정리 p95':>10}{'정리 최대':>10}{'세그먼트 평균':>14}"
+          f"{'피크 RSS(MB)':>14}{'종료 RSS':>10}{'gc 실행':>8}")
+    for result in results:
+        gc_runs = result["segments"] if result["mode"] == "blanket" else (result["governor_gc_runs"] or 0)
+        print(f"{result['mode']:<10}{result['reclaim_ms_mean']:>14.3f}{result['reclaim_ms_p95']:>10.3f}"
+              f"{result['reclaim_ms_max']:>10.2f}{result['segment_ms_mean']:>14.2f}"
+              f"{result['rss_peak_mb']:>14.1f}{result['rss_end_mb']:>10.1f}{gc_runs:>8}")
+
+    by_mode = {result["mode"]: result for result in results}
+    if "blanket" in by_mode and "governor" in by_mode:
+        saved = by_mode["blanket"]["reclaim_ms_mean"] - by_mode["governor"]["reclaim_ms_mean"]
+        print(f"\n세그먼트당 회수한 지연: {saved:.2f}ms "
+              f"(세그먼트 평균 {by_mode['blanket']['segment_ms_mean']:.1f} → "
+              f"{by_mode['governor']['segment_ms_mean']:.1f}ms)")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "heap_objects": args.heap_objects, "gc_tracked_objects": tracked,
+            "full_gc_ms": round(full_gc_ms, 2), "results": results
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+    del heap
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+/transcribe 응답 인코딩 벤치마크 (기존 .dict() + JSONResponse vs 모델 직접 직렬화 + 필드 선택 + 압축)
+
+긴 통화 1건의 TranscribeResponse를 합성해 방식별 직렬화/압축 시간과 본문 크기를 비교합니다.
+- 원문 text, segments(같은 텍스트를 구간별로), privacy_removal.text(마스킹본), 요소 탐지 문장 포함
+- 텍스트는 어휘 목록에서 무작위로 만든 문장 (같은 문장 반복보다 압축률이 실제 통화에 가까움)
+
+방식:
+- dict_json     : response.dict() (= model_dump()) → JSONResponse (기존 /transcribe 응답)
+- dict_indent   : response.dict() → json.dumps(indent=2) (기존 export=json)
+- direct        : model_dump_json (response_encoder, 전체 필드)
+- direct_select : direct + exclude (--exclude, Web UI 분석 기본값과 같음)
+- direct_omit   : direct + omit_original_text (Privacy Removal 결과가 있으면 원문 text/segments 제외)
+각 방식에 gzip(및 brotli 설치 시 br) 압축 결과를 함께 표시합니다.
+
+API 서버 패키지(api_server)를 import하므로 STT API 실행 환경에서 실행합니다.
+
+사용 방법:
+  python3 scripts/performance/benchmark_response_encoding.py
+
+  # gzip 레벨별 비교
+  python3 scripts/performance/benchmark_response_encoding.py --gzip-level 6
+
+  # 통화 길이 / 반복 횟수 조절, 결과 JSON 저장
+  python3 scripts/performance/benchmark_response_encoding.py --minutes 120 --repeat 20 \\
+      --output /tmp/response_encoding.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from api_server.models import TranscribeResponse  # noqa: E402
+from api_server.response_encoding import FieldSelection, brotli, response_encoder  # noqa: E402
+
+WORDS = (
+    "고객님 안녕하세요 상담사 김민수입니다 오늘 문의하신 상품은 변액보험 연금저축 적립식 펀드 원금 보장 "
+    "수익률 해지 환급금 가입 기간 월 납입액 만기 수수료 중도 인출 세액 공제 혜택 설명 드리겠습니다 "
+    "네 맞습니다 혹시 궁금하신 점 있으시면 말씀해 주세요 확인해 보겠습니다 잠시만 기다려 주세요 "
+    "본인 확인을 위해 생년월일 말씀 부탁드립니다 손실 가능성 투자 위험 등급 적합성 진단 결과"
+).split()
+
+
+def make_sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + "."
+
+
+def build_response(minutes: float, seed: int = 0) -> TranscribeResponse:
+    """긴 통화 1건 분량의 합성 응답 (구간 약 4초)"""
+    rng = random.Random(seed)
+    segments, clock = [], 0.0
+    while clock < minutes * 60:
+        length = rng.uniform(2.0, 6.0)
+        segments.append({"start": round(clock, 2), "end": round(clock + length, 2), "text": make_sentence(rng)})
+        clock += length
+    text = " ".join(segment["text"] for segment in segments)
+    masked = text.replace("생년월일", "[개인정보]").replace("김민수", "[이름]")
+    sentences = [segment["text"] for segment in rng.sample(segments, min(40, len(segments)))]
+    return TranscribeResponse(
+        success=True, text=text, language="ko", duration=clock, backend="faster-whisper",
+        segments=segments, file_path="/app/web_ui/data/sample/long_call.wav", file_size_mb=clock * 0.03,
+        privacy_removal={"privacy_exist": "Y", "exist_reason": "이름, 생년월일", "text": masked},
+        element_detection={
+            "detected_yn": "Y",
+            "detected_sentences": sentences,
+            "detected_reasons": ["원금 보장 오인 유발"] * len(sentences),
+            "detected_keywords": ["원금 보장", "수익률"]
+        },
+        processing_steps={"stt": True, "privacy_removal": True, "classification": False,
+                          "element_detection": True},
+        processing_time_seconds=120.0
+    )
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> Dict:
+    """repeat회 실행한 평균/최소 시간 (ms)과 결과 크기"""
+    timings, body = [], b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"ms_mean": round(sum(timings) / len(timings), 3), "ms_min": round(min(timings), 3),
+            "bytes": len(body), "body": body}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/transcribe 응답 인코딩 벤치마크 (직렬화/필드 선택/압축)")
+    parser.add_argument("--minutes", type=float, default=60.0, help="합성 통화 길이 (분, 기본: 60)")
+    parser.add_argument("--repeat", type=int, default=10, help="방식별 반복 횟수 (기본: 10)")
+    parser.add_argument("--exclude", default="segments,memory_info,performance",
+                        help="direct_select에서 제외할 필드 (기본: Web UI STT_RESPONSE_EXCLUDE 기본값)")
+    parser.add_argument("--gzip-level", type=int, default=1, help="gzip 레벨 (기본: 1, RESPONSE_GZIP_LEVEL)")
+    parser.add_argument("--brotli-quality", type=int, default=4, help="brotli 품질 (기본: 4, RESPONSE_BROTLI_QUALITY)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    response = build_response(args.minutes)
+    print(f"합성 응답: {args.minutes:g}분, 구간 {len(response.segments)}개, 원문 {len(response.text):,}자\n")
+    response_encoder.configure(min_bytes=0, gzip_level=args.gzip_level, brotli_quality=args.brotli_quality)
+
+    select = FieldSelection(TranscribeResponse, exclude=args.exclude)
+    omit = FieldSelection(TranscribeResponse, omit_original_text=True)
+    modes = {
+        "dict_json": lambda: JSONResponse(content=response.model_dump()).body,
+        "dict_indent": lambda: json.dumps(response.model_dump(), ensure_ascii=False, indent=2).encode("utf-8"),
+        "direct": lambda: response.model_dump_json().encode("utf-8"),
+        "direct_select": lambda: response.model_dump_json(
+            include=select.resolve(response)[0], exclude=select.resolve(response)[1]).encode("utf-8"),
+        "direct_omit": lambda: response.model_dump_json(
+            include=omit.resolve(response)[0], exclude=omit.resolve(response)[1]).encode("utf-8"),
+    }
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+
+    results: List[Dict] = []
+    for mode, func in modes.items():
+        serialized = measure(func, args.repeat)
+        result = {"mode": mode, "serialize_ms": serialized["ms_mean"], "bytes": serialized["bytes"]}
+        for encoding in encodings:
+            body = serialized["body"]
+            compressed = measure(lambda: response_encoder.compress(body, encoding), args.repeat)
+            result[f"{encoding}_ms"] = compressed["ms_mean"]
+            result[f"{encoding}_bytes"] = compressed["bytes"]
+        results.append(result)
+
+    header = f"{'방식':<15}{'직렬화(ms)':>12}{'크기(KB)':>12}"
+    for encoding in encodings:
+        header += f"{encoding + '(ms)':>12}{encoding + '(KB)':>12}"
+    print(header)
+    for result in results:
+        line = f"{result['mode']:<15}{result['serialize_ms']:>12.2f}{result['bytes'] / 1024:>12.1f}"
+        for encoding in encodings:
+            line += f"{result[encoding + '_ms']:>12.2f}{result[encoding + '_bytes'] / 1024:>12.1f}"
+        print(line)
+
+    by_mode = {result["mode"]: result for result in results}
+    baseline, best = by_mode["dict_json"], by_mode["direct_select"]
+    print(f"\n기존 응답 {baseline['bytes'] / 1024:.1f}KB / {baseline['serialize_ms']:.2f}ms → "
+          f"direct_select + gzip {best['gzip_bytes'] / 1024:.1f}KB / "
+          f"{best['serialize_ms'] + best['gzip_ms']:.2f}ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "minutes": args.minutes, "segments": len(response.segments), "text_chars": len(response.text),
+            "results": results
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+STT 엔진 벤치마크 (고정 코퍼스 + 기준 결과 대비 회귀 판정)
+
+같은 코퍼스를 프리셋별 WhisperSTT(프로세스 내)로 인식하여 다음을 JSON으로 기록합니다.
+- RTF(처리 시간 합 / 오디오 길이 합), 파일별 지연 p50/p95
+- 피크 RSS (ResourceSampler 구간 최대값), 모델 로드 시간
+- tokens/s (출력 텍스트를 모델 토크나이저로 센 토큰 수 / 처리 시간)
+
+--baseline 파일이 있으면 프리셋별로 비교하여 허용치를 넘으면 종료 코드 1을 반환합니다.
+(CI/개발 PC에서 성능 회귀 확인용, --save-baseline으로 현재 결과를 기준으로 저장)
+
+기본 설정은 어느 개발 PC에서도 돌도록 CPU + tiny 체크포인트(CTranslate2)를 사용합니다.
+WhisperSTT는 <모델 디렉토리의 상위>/openai_whisper-large-v3-turbo 경로를 사용하므로
+tiny 모델도 그 이름의 폴더 아래 ctranslate2_model/에 둡니다 (--download-tiny가 자동 배치).
+
+사용 방법:
+  # 최초 1회: tiny 모델 다운로드 (models/bench/openai_whisper-large-v3-turbo/ctranslate2_model)
+  python3 scripts/performance/benchmark_stt.py --download-tiny --save-baseline
+
+  # 변경 후: 기준 결과와 비교 (회귀 시 종료 코드 1)
+  python3 scripts/performance/benchmark_stt.py
+
+  # 실제 모델 + 녹취 디렉토리, 허용치 지정
+  python3 scripts/performance/benchmark_stt.py --model-path models/openai_whisper-large-v3-turbo \\
+      --corpus-dir /data/calls --presets speed balanced --baseline gpu_baseline.json --max-rtf-increase 0.1
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from compare_cpu_int8 import AUDIO_EXTENSIONS, audio_duration, cer  # noqa: E402
+
+# tiny 체크포인트 기본 배치 위치
+DEFAULT_MODEL_PATH = PROJECT_ROOT / "models" / "bench" / "openai_whisper-large-v3-turbo"
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "stt_benchmark_cpu_tiny.json"
+TINY_CT2_REPO = "Systran/faster-whisper-tiny"
+TINY_HF_REPO = "openai/whisper-tiny"
+
+# 합성 코퍼스 (파일명, 길이 초) - generate_sample_audio.py의 결정적 신호 생성 함수 사용
+SYNTHETIC_CLIPS = [("short_0.5s.wav", 0.5), ("medium_3s.wav", 3.0), ("long_10s.wav", 10.0), ("long_30s.wav", 30.0)]
+SYNTHETIC_SPEECH_TEXT = "고객님의 상황과 상관없이 이 상품은 무조건 가입해야해. 완전 대박이야. 수익 완전 보장하니까 동의 없이 내가 고객님 비번으로 임의로 가입할께"
+
+# 회귀 허용치 기본값 (기준 대비 상대 변화)
+DEFAULT_THRESHOLDS = {
+    "max_rtf_increase": 0.15,          # RTF 15% 이상 증가
+    "max_p95_increase": 0.25,          # 파일 지연 p95 25% 이상 증가
+    "max_rss_increase": 0.10,          # 피크 RSS 10% 이상 증가
+    "max_tokens_per_sec_drop": 0.15,   # tokens/s 15% 이상 감소
+    "max_cer_vs_baseline": 0.05        # 기준 결과 텍스트 대비 CER (출력 변화)
+}
+
+
+def download_tiny_model(model_path: Path, with_transformers: bool) -> None:
+    """
+    tiny 체크포인트를 WhisperSTT가 읽는 구조로 다운로드
+
+    - CTranslate2 (speed/balanced): model_path/ctranslate2_model/
+    - transformers (accuracy/cpu_int8, with_transformers=True): model_path/
+    """
+    from huggingface_hub import snapshot_download
+
+    ct2_dir = model_path / "ctranslate2_model"
+    print(f"다운로드: {TINY_CT2_REPO} → {ct2_dir}")
+    snapshot_download(TINY_CT2_REPO, local_dir=str(ct2_dir))
+    if with_transformers:
+        print(f"다운로드: {TINY_HF_REPO} → {model_path}")
+        snapshot_download(TINY_HF_REPO, local_dir=str(model_path),
+                          allow_patterns=["*.json", "*.txt", "model.safetensors"])
+
+
+def build_synthetic_corpus(corpus_dir: Path) -> List[Path]:
+    """
+    합성 코퍼스 생성 (이미 있으면 재사용, 같은 코드로 생성하면 항상 같은 파일)
+
+    16kHz 신호 4개 + 44.1kHz 음성 유사 신호 1개 (리샘플 경로 포함)
+    """
+    from generate_sample_audio import create_audio_file, create_speech_audio
+
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    for filename, duration in SYNTHETIC_CLIPS:
+        path = corpus_dir / filename
+        if not path.exists():
+            create_audio_file(path, duration)
+    speech = corpus_dir / "speech_44k.wav"
+    if not speech.exists():
+        create_speech_audio(speech, SYNTHETIC_SPEECH_TEXT)
+    return sorted(p for p in corpus_dir.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+
+
+def corpus_fingerprint(audio_files: List[Path]) -> str:
+    """코퍼스 파일 내용 해시 (기준 결과와 같은 입력인지 확인용)"""
+    digest = hashlib.sha256()
+    for path in audio_files:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (numpy.percentile 기본 방식과 동일)"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def count_tokens(stt, text: str) -> Optional[int]:
+    """출력 텍스트의 토큰 수 (백엔드 토크나이저, 알 수 없으면 None)"""
+    if not text:
+        return 0
+    backend = stt.backend
+    tokenizer = getattr(backend, "hf_tokenizer", None)  # faster-whisper (tokenizers.Tokenizer)
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    processor = getattr(backend, "processor", None)  # transformers
+    if processor is not None:
+        return len(processor.tokenizer.encode(text, add_special_tokens=False))
+    return None
+
+
+def run_preset(preset: str, model_path: Path, device: str, audio_files: List[Path],
+               language: str, runs: int, warmup: int) -> Dict:
+    """
+    프리셋 하나로 코퍼스 전체 인식
+
+    Returns:
+        {"preset", "backend", "load_sec", "rtf", "p50_sec", "p95_sec", "peak_rss_mb", "tokens_per_sec", "files": {...}}
+    """
+    from stt_engine import WhisperSTT
+    from utils.performance_monitor import PerformanceMonitor, ResourceSampler
+
+    print(f"\n=== {preset} ===")
+    sampler = ResourceSampler(sample_interval=0.05, capacity=200000)
+    sampler.ensure_started()
+    monitor = PerformanceMonitor(sampler)
+    monitor.start()
+
+    stt = WhisperSTT(str(model_path), device=device, auto_load=False)
+    load_start = time.perf_counter()
+    load = stt.reload_backend(preset=preset)
+    load_sec = time.perf_counter() - load_start
+    if load.get("status") != "success":
+        sampler.stop()
+        raise RuntimeError(f"{preset} 로드 실패: {load.get('message')}")
+    print(f"로드: {load_sec:.2f}s (backend={load['current_backend']}, compute_type={load['compute_type']})")
+
+    # 첫 실행의 초기화 지연(스레드 풀, 커널 선택 등)이 결과에 섞이지 않도록 제외
+    for _ in range(warmup):
+        stt.transcribe(str(audio_files[0]), language=language)
+
+    files = {}
+    latencies = []
+    total_audio = total_elapsed = 0.0
+    total_tokens = 0
+    tokens_known = True
+    for path in audio_files:
+        duration = audio_duration(path)
+        elapsed_runs = []
+        text = ""
+        for _ in range(runs):
+            start = time.perf_counter()
+            output = stt.transcribe(str(path), language=language)
+            elapsed_runs.append(time.perf_counter() - start)
+            if not output.get("success", True) or output.get("error"):
+                raise RuntimeError(f"{path.name} 인식 실패 ({preset}): {output.get('error')}")
+            text = output.get("text", "")
+        latencies.extend(elapsed_runs)
+        median = percentile(elapsed_runs, 50)
+        tokens = count_tokens(stt, text)
+        if tokens is None:
+            tokens_known = False
+        else:
+            total_tokens += tokens
+        total_audio += duration
+        total_elapsed += median
+        files[path.name] = {
+            "duration_sec": round(duration, 2),
+            "p50_sec": round(median, 4),
+            "min_sec": round(min(elapsed_runs), 4),
+            "rtf": round(median / duration, 4) if duration else None,
+            "tokens": tokens,
+            "text": text
+        }
+        print(f"  {path.name}: {median:.3f}s (RTF {files[path.name]['rtf']}, tokens {tokens}) {text[:50]!r}")
+
+    stt.unload()
+    del stt
+    gc.collect()
+    metrics = monitor.stop()
+    sampler.stop()
+
+    return {
+        "preset": preset,
+        "backend": load["current_backend"],
+        "compute_type": load["compute_type"],
+        "device": load["device"],
+        "load_sec": round(load_sec, 3),
+        "rtf": round(total_elapsed / total_audio, 4) if total_audio else None,
+        "p50_sec": round(percentile(latencies, 50), 4),
+        "p95_sec": round(percentile(latencies, 95), 4),
+        "peak_rss_mb": round(metrics.ram_mb_peak, 1),
+        "tokens_per_sec": round(total_tokens / total_elapsed, 2) if tokens_known and total_elapsed else None,
+        "files": files
+    }
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, thresholds: Dict) -> List[Dict]:
+    """
+    프리셋별 기준 결과 비교
+
+    Returns:
+        [{"preset", "metric", "baseline", "current", "change", "limit", "regressed"}, ...]
+        (change = 기준 대비 상대 변화, limit = 허용 변화 - 감소가 나쁜 지표는 음수)
+    """
+    checks = []
+    baseline_reports = {report["preset"]: report for report in baseline.get("reports", [])}
+
+    def check(preset, metric, base, current, limit, higher_is_worse=True):
+        if base in (None, 0) or current is None:
+            return
+        change = (current - base) / base
+        checks.append({
+            "preset": preset, "metric": metric, "baseline": base, "current": current,
+            "change": round(change, 4), "limit": limit if higher_is_worse else -limit,
+            "regressed": change > limit if higher_is_worse else -change > limit
+        })
+
+    for report in results["reports"]:
+        base = baseline_reports.get(report["preset"])
+        if base is None:
+            continue
+        preset = report["preset"]
+        check(preset, "rtf", base.get("rtf"), report["rtf"], thresholds["max_rtf_increase"])
+        check(preset, "p95_sec", base.get("p95_sec"), report["p95_sec"], thresholds["max_p95_increase"])
+        check(preset, "peak_rss_mb", base.get("peak_rss_mb"), report["peak_rss_mb"], thresholds["max_rss_increase"])
+        check(preset, "tokens_per_sec", base.get("tokens_per_sec"), report["tokens_per_sec"],
+              thresholds["max_tokens_per_sec_drop"], higher_is_worse=False)
+
+        cers = []
+        for name, item in report["files"].items():
+            base_item = base.get("files", {}).get(name)
+            if base_item is not None:
+                value = cer(base_item.get("text", ""), item["text"])
+                if value is not None:
+                    cers.append(value)
+        if cers:
+            mean_cer = round(sum(cers) / len(cers), 4)
+            checks.append({
+                "preset": preset, "metric": "cer_vs_baseline", "baseline": 0.0, "current": mean_cer,
+                "change": mean_cer, "limit": thresholds["max_cer_vs_baseline"],
+                "regressed": mean_cer > thresholds["max_cer_vs_baseline"]
+            })
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 엔진 벤치마크 (RTF / 지연 / 메모리 / tokens/s + 회귀 판정)")
+    parser.add_argument("--model-path", default=str(DEFAULT_MODEL_PATH),
+                        help="모델 디렉토리 (이름은 openai_whisper-large-v3-turbo, 기본: tiny 벤치 모델)")
+    parser.add_argument("--download-tiny", action="store_true", help="tiny 체크포인트 다운로드 후 실행")
+    parser.add_argument("--corpus-dir", default=None,
+                        help="오디오 디렉토리 (미지정 시 합성 코퍼스, 예: audio/samples)")
+    parser.add_argument("--presets", nargs="+", default=["speed", "balanced"], help="측정할 프리셋")
+    parser.add_argument("--device", default="cpu", help="cpu / cuda / auto (기본: cpu)")
+    parser.add_argument("--language", default="ko", help="언어 코드 (기본: ko)")
+    parser.add_argument("--runs", type=int, default=3, help="파일당 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 워밍업 실행 횟수")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: 임시 디렉토리)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="기준 결과 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장 (비교 생략)")
+    for key, value in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, default=None,
+                            help=f"허용치 (기본: 기준 파일 값 또는 {value})")
+    args = parser.parse_args()
+
+    model_path = Path(args.model_path)
+    if args.download_tiny:
+        from stt_engine import TRANSFORMERS_AVAILABLE
+        download_tiny_model(model_path, with_transformers=TRANSFORMERS_AVAILABLE and any(
+            preset in ("accuracy", "cpu_int8") for preset in args.presets))
+    if not (model_path / "ctranslate2_model").exists() and not (model_path / "config.json").exists():
+        print(f"❌ 모델 없음: {model_path} (--download-tiny 또는 --model-path 지정)")
+        sys.exit(2)
+    if model_path.name != "openai_whisper-large-v3-turbo":
+        print(f"⚠️  WhisperSTT는 {model_path.parent / 'openai_whisper-large-v3-turbo'}를 로드합니다 (폴더 이름 확인)")
+
+    if args.corpus_dir:
+        corpus_dir = Path(args.corpus_dir)
+        audio_files = sorted(p for p in corpus_dir.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+    else:
+        corpus_dir = Path(tempfile.gettempdir()) / "stt_bench_corpus"
+        audio_files = build_synthetic_corpus(corpus_dir)
+    if not audio_files:
+        print(f"❌ 오디오 파일 없음: {corpus_dir}")
+        sys.exit(2)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else None
+    thresholds = {**DEFAULT_THRESHOLDS, **((baseline or {}).get("thresholds") or {})}
+    for key in DEFAULT_THRESHOLDS:
+        if getattr(args, key) is not None:
+            thresholds[key] = getattr(args, key)
+
+    fingerprint = corpus_fingerprint(audio_files)
+    print(f"모델: {model_path}")
+    print(f"코퍼스: {len(audio_files)}개 ({corpus_dir}, fingerprint {fingerprint})")
+    print(f"CPU: {platform.processor() or platform.machine()} x {os.cpu_count()}, runs={args.runs}, warmup={args.warmup}")
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"platform": platform.platform(), "machine": platform.machine(),
+                 "cpu_count": os.cpu_count(), "python": platform.python_version()},
+        "model_path": str(model_path),
+        "corpus": {"dir": str(corpus_dir), "files": [p.name for p in audio_files], "fingerprint": fingerprint},
+        "runs": args.runs,
+        "thresholds": thresholds,
+        "reports": [run_preset(preset, model_path, args.device, audio_files, args.language, args.runs, args.warmup)
+                    for preset in args.presets]
+    }
+
+    print(f"\n{'preset':<12}{'backend':<16}{'RTF':>8}{'p50(s)':>9}{'p95(s)':>9}{'RSS(MB)':>10}{'tok/s':>9}{'load(s)':>9}")
+    for report in results["reports"]:
+        print(f"{report['preset']:<12}{report['backend']:<16}{report['rtf']:>8}{report['p50_sec']:>9}{report['p95_sec']:>9}"
+              f"{report['peak_rss_mb']:>10}{str(report['tokens_per_sec']):>9}{report['load_sec']:>9}")
+
+    exit_code = 0
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n기준 결과 저장: {baseline_path}")
+    elif baseline is None:
+        print(f"\n기준 결과 없음: {baseline_path} (--save-baseline으로 생성, 비교 생략)")
+    else:
+        if baseline.get("corpus", {}).get("fingerprint") != fingerprint:
+            print("\n⚠️  기준 결과와 코퍼스가 다릅니다 (비교 결과 참고용)")
+        if baseline.get("host", {}).get("cpu_count") != os.cpu_count():
+            print("⚠️  기준 결과와 CPU 수가 다릅니다 (같은 장비에서 만든 기준과 비교 권장)")
+        checks = compare_to_baseline(results, baseline, thresholds)
+        results["comparison"] = {"baseline": str(baseline_path), "checks": checks}
+        print(f"\n=== 기준 대비 ({baseline_path.name}) ===")
+        for item in checks:
+            mark = "❌" if item["regressed"] else "✅"
+            print(f"{mark} {item['preset']:<10}{item['metric']:<18}{item['baseline']:>10} → {item['current']:<10}"
+                  f"({item['change']:+.1%}, 허용 {item['limit']:+.0%})")
+        if any(item["regressed"] for item in checks):
+            exit_code = 1
+            print("\n❌ 성능 회귀 감지")
+        else:
+            print("\n✅ 회귀 없음")
+
+    output = Path(args.output) if args.output else Path(tempfile.gettempdir()) / f"stt_bench_{int(time.time())}.json"
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"결과 저장: {output}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+CPU fp32(accuracy) vs 동적 int8 양자화(cpu_int8) transformers 비교 스크립트
+
+같은 샘플 오디오를 두 프리셋으로 인식하여 처리량과 정확도 차이를 비교합니다.
+- 처리량: 모델 로드 시간, 파일별 처리 시간, RTF(처리 시간 / 오디오 길이), 모델 로드로 늘어난 RSS
+- 정확도: fp32 결과를 기준으로 한 int8 결과의 CER(문자 오류율)
+          <오디오 이름>.txt 정답 파일이 있으면 각 프리셋의 정답 대비 CER도 계산
+
+사용 방법:
+  # 기본 (audio/samples의 모든 wav, 언어 ko)
+  python3 scripts/performance/compare_cpu_int8.py
+
+  # 디렉토리/반복 횟수/결과 파일 지정
+  python3 scripts/performance/compare_cpu_int8.py --audio-dir audio/samples --runs 3 --output int8_report.json
+
+  # cpu_int8 두 번째 실행에서 디스크 캐시 로드 시간 확인
+  python3 scripts/performance/compare_cpu_int8.py --presets cpu_int8 cpu_int8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg"}
+
+
+def edit_distance(ref: str, hyp: str) -> int:
+    """문자 단위 Levenshtein 거리"""
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1]
+
+
+def cer(ref: str, hyp: str) -> Optional[float]:
+    """문자 오류율 (공백 제외, 기준 텍스트가 비어 있으면 None)"""
+    ref = "".join(ref.split())
+    hyp = "".join(hyp.split())
+    if not ref:
+        return None
+    return round(edit_distance(ref, hyp) / len(ref), 4)
+
+
+def rss_mb() -> float:
+    import psutil
+    return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+
+
+def audio_duration(path: Path) -> float:
+    import soundfile as sf
+    info = sf.info(str(path))
+    return info.frames / info.samplerate
+
+
+def run_preset(preset: str, model_path: Path, audio_files: List[Path], language: str, runs: int) -> Dict:
+    """
+    프리셋 하나로 모든 오디오 인식
+
+    Returns:
+        {"preset": str, "load_sec": float, "model_rss_mb": float, "files": {name: {...}}, "rtf": float}
+    """
+    from stt_engine import WhisperSTT
+
+    print(f"\n=== {preset} ===")
+    stt = WhisperSTT(str(model_path), device="cpu", auto_load=False)
+    rss_before = rss_mb()
+    load_start = time.time()
+    result = stt.reload_backend(preset=preset)
+    load_sec = round(time.time() - load_start, 2)
+    if result.get("status") != "success":
+        raise RuntimeError(f"{preset} 로드 실패: {result.get('message')}")
+    print(f"로드: {load_sec}s (backend={result['current_backend']}, compute_type={result['compute_type']})")
+
+    files = {}
+    total_audio = 0.0
+    total_elapsed = 0.0
+    for path in audio_files:
+        duration = audio_duration(path)
+        elapsed_runs = []
+        text = ""
+        for _ in range(runs):
+            start = time.time()
+            output = stt.transcribe(str(path), language=language)
+            elapsed_runs.append(time.time() - start)
+            if output.get("error"):
+                raise RuntimeError(f"{path.name} 인식 실패 ({preset}): {output['error']}")
+            text = output.get("text", "")
+        elapsed = min(elapsed_runs)
+        total_audio += duration
+        total_elapsed += elapsed
+        files[path.name] = {
+            "duration_sec": round(duration, 2),
+            "elapsed_sec": round(elapsed, 3),
+            "rtf": round(elapsed / duration, 3) if duration else None,
+            "text": text
+        }
+        print(f"  {path.name}: {elapsed:.2f}s (RTF {files[path.name]['rtf']}) {text[:60]!r}")
+
+    report = {
+        "preset": preset,
+        "load_sec": load_sec,
+        "model_rss_mb": round(rss_mb() - rss_before, 1),
+        "rtf": round(total_elapsed / total_audio, 3) if total_audio else None,
+        "files": files
+    }
+    stt.unload()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="transformers fp32 vs 동적 int8 양자화 CPU 비교")
+    parser.add_argument("--audio-dir", default=str(PROJECT_ROOT / "audio" / "samples"), help="샘플 오디오 디렉토리")
+    parser.add_argument("--model-path", default=None, help="모델 디렉토리 (기본: 서버와 동일한 경로)")
+    parser.add_argument("--language", default="ko", help="언어 코드 (기본: ko)")
+    parser.add_argument("--runs", type=int, default=1, help="파일당 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--presets", nargs="+", default=["accuracy", "cpu_int8"], help="비교할 프리셋 (첫 번째가 기준)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    from api_server.startup import resolve_model_path
+
+    model_path = Path(args.model_path) if args.model_path else resolve_model_path()
+    audio_dir = Path(args.audio_dir)
+    audio_files = sorted(p for p in audio_dir.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+    if not audio_files:
+        print(f"❌ 오디오 파일 없음: {audio_dir} (python3 scripts/generate_sample_audio.py로 생성)")
+        sys.exit(1)
+
+    print(f"모델: {model_path}")
+    print(f"오디오: {len(audio_files)}개 ({audio_dir})")
+    print(f"CPU 스레드: {os.cpu_count()}")
+
+    reports = [run_preset(preset, model_path, audio_files, args.language, args.runs) for preset in args.presets]
+    baseline = reports[0]
+
+    # 정확도 비교: 기준 프리셋 대비 CER + 정답 파일 대비 CER
+    for report in reports:
+        for name, item in report["files"].items():
+            if report is not baseline:
+                item["cer_vs_baseline"] = cer(baseline["files"][name]["text"], item["text"])
+            reference_file = audio_dir / f"{Path(name).stem}.txt"
+            if reference_file.exists():
+                item["cer_vs_reference"] = cer(reference_file.read_text(encoding="utf-8"), item["text"])
+
+    print("\n=== 요약 ===")
+    print(f"{'preset':<12}{'load(s)':>10}{'RTF':>10}{'speedup':>10}{'RSS(MB)':>10}{'CER vs ' + baseline['preset']:>22}")
+    for report in reports:
+        speedup = round(baseline["rtf"] / report["rtf"], 2) if report["rtf"] else None
+        report["speedup_vs_baseline"] = speedup
+        cers = [item["cer_vs_baseline"] for item in report["files"].values() if item.get("cer_vs_baseline") is not None]
+        mean_cer = round(sum(cers) / len(cers), 4) if cers else None
+        report["mean_cer_vs_baseline"] = mean_cer
+        print(f"{report['preset']:<12}{report['load_sec']:>10}{report['rtf']:>10}{speedup:>10}{report['model_rss_mb']:>10}"
+              f"{'-' if mean_cer is None else mean_cer:>22}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"model_path": str(model_path), "reports": reports},
+                                                ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
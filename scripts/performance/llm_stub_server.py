@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+OpenAI 호환 LLM 스텁 서버 (부하 테스트용, vLLM 대체)
+
+vLLM/외부 Agent 없이 후처리 단계(privacy_removal / classification / element_detection)의
+동시성·지연을 재현합니다. 응답 본문은 세 단계 파서가 모두 읽을 수 있는 JSON 하나입니다.
+
+엔드포인트:
+- POST /v1/chat/completions, /v1/completions (stream=true면 SSE 청크)
+- POST /agent (외부 Agent 텍스트 형식: {"parameters": {"user_query": ...}})
+- GET  /v1/models, /health
+- GET  /stub/stats (요청 수, 실패 수, 동시 처리 피크, 대기/처리 시간 평균), POST /stub/reset
+
+지연 모델 (요청마다):
+  응답 시간 = 슬롯 대기(--max-concurrency) + 첫 토큰 지연(--ttft) + 출력 토큰 수 / --tokens-per-sec
+  --ttft 형식: fixed:MS | uniform:MIN,MAX | normal:MEAN,STD | lognormal:MEDIAN,SIGMA (단위 ms)
+
+장애 주입 (요청마다 확률):
+  --error-rate (HTTP 500), --timeout-rate (--hang-sec 동안 응답 없음), --malformed-rate (JSON이 아닌 본문)
+
+사용 방법:
+  python3 scripts/performance/llm_stub_server.py --port 8001 --ttft lognormal:300,0.5 --tokens-per-sec 40 \\
+      --output-tokens 120 --max-concurrency 8 --error-rate 0.02
+
+  # STT API를 스텁으로 연결
+  VLLM_BASE_URL=http://localhost:8001 VLLM_API_BASE=http://localhost:8001/v1 \\
+      ELEMENT_DETECTION_AGENT_URL=http://localhost:8001/agent python3 api_server.py
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+
+# 세 후처리 파서가 모두 읽는 응답 (privacy: privacy_exist, classification: code/confidence, 요소 탐지: detected_yn)
+STUB_CONTENT = {
+    "privacy_exist": "N",
+    "exist_reason": "",
+    "code": "CLASS_GENERAL",
+    "category": "일반",
+    "confidence": 90,
+    "reason": "stub",
+    "detected_yn": "N",
+    "detected_sentences": [],
+    "detected_reasons": [],
+    "detected_keywords": []
+}
+
+
+def parse_distribution(spec: str):
+    """
+    지연 분포 문자열 → 샘플 함수 (초 단위 반환)
+
+    Args:
+        spec: fixed:MS | uniform:MIN,MAX | normal:MEAN,STD | lognormal:MEDIAN,SIGMA
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",")] if params else []
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(rng.gauss(values[0], values[1]), 0.0) / 1000
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"지원하지 않는 분포: {spec}")
+
+
+class StubState:
+    """스텁 설정 + 통계"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.ttft = parse_distribution(args.ttft)
+        self.slots = asyncio.Semaphore(args.max_concurrency) if args.max_concurrency > 0 else None
+        self.reset()
+
+    def reset(self):
+        self.stats = {"requests": 0, "completed": 0, "errors": 0, "timeouts": 0, "malformed": 0,
+                      "in_flight": 0, "in_flight_peak": 0, "queue_wait_sec_total": 0.0, "service_sec_total": 0.0,
+                      "output_tokens_total": 0, "by_path": {}}
+
+    def snapshot(self):
+        stats = dict(self.stats)
+        completed = max(stats["completed"], 1)
+        stats["queue_wait_sec_avg"] = round(stats["queue_wait_sec_total"] / completed, 4)
+        stats["service_sec_avg"] = round(stats["service_sec_total"] / completed, 4)
+        return stats
+
+
+def output_token_count(state: StubState, body: dict) -> int:
+    """출력 토큰 수 (--output-tokens, 요청 max_tokens가 더 작으면 그 값)"""
+    limit = body.get("max_tokens") or state.args.output_tokens
+    return max(1, min(state.args.output_tokens, int(limit)))
+
+
+async def simulate(state: StubState, request: web.Request, body: dict):
+    """
+    슬롯 대기 + 장애 주입 + 지연 재현
+
+    Returns:
+        (출력 토큰 수, 첫 토큰 지연 초) 또는 장애 응답(web.Response)
+    """
+    stats = state.stats
+    stats["requests"] += 1
+    stats["by_path"][request.path] = stats["by_path"].get(request.path, 0) + 1
+
+    roll = state.rng.random()
+    if roll < state.args.error_rate:
+        stats["errors"] += 1
+        return web.json_response({"error": {"message": "stub injected error", "type": "server_error"}}, status=500)
+    roll -= state.args.error_rate
+    if roll < state.args.timeout_rate:
+        stats["timeouts"] += 1
+        await asyncio.sleep(state.args.hang_sec)
+        return web.json_response({"error": {"message": "stub injected timeout"}}, status=504)
+
+    return output_token_count(state, body), state.ttft(state.rng)
+
+
+def completion_payload(state: StubState, request: web.Request, body: dict, tokens: int, chat: bool) -> dict:
+    """OpenAI 형식 응답 (vLLMClient가 chat 엔드포인트에서도 choices[0].text를 읽으므로 둘 다 채움)"""
+    content = json.dumps(STUB_CONTENT, ensure_ascii=False)
+    if state.rng.random() < state.args.malformed_rate:
+        state.stats["malformed"] += 1
+        content = "stub malformed response (not json)"
+    prompt_text = body.get("prompt") or "".join(str(m.get("content", "")) for m in body.get("messages", []))
+    choice = {"index": 0, "finish_reason": "stop", "text": content}
+    if chat:
+        choice["message"] = {"role": "assistant", "content": content}
+    return {
+        "id": f"stub-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion" if chat else "text_completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [choice],
+        "usage": {"prompt_tokens": len(prompt_text) // 2, "completion_tokens": tokens,
+                  "total_tokens": len(prompt_text) // 2 + tokens}
+    }
+
+
+@asynccontextmanager
+async def stub_slot(state: StubState):
+    """동시 처리 슬롯 (--max-concurrency) 획득 + 대기/처리 시간, 동시 처리 피크 기록"""
+    stats = state.stats
+    queued_at = time.perf_counter()
+    if state.slots is not None:
+        await state.slots.acquire()
+    stats["in_flight"] += 1
+    stats["in_flight_peak"] = max(stats["in_flight_peak"], stats["in_flight"])
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats["in_flight"] -= 1
+        stats["queue_wait_sec_total"] += started_at - queued_at
+        stats["service_sec_total"] += time.perf_counter() - started_at
+        if state.slots is not None:
+            state.slots.release()
+
+
+async def handle_completion(request: web.Request) -> web.StreamResponse:
+    state: StubState = request.app["state"]
+    body = await request.json()
+    chat = request.path.endswith("/chat/completions")
+    stats = state.stats
+
+    async with stub_slot(state):
+        outcome = await simulate(state, request, body)
+        if isinstance(outcome, web.Response):
+            return outcome
+        tokens, ttft = outcome
+        token_interval = 1.0 / state.args.tokens_per_sec
+
+        if body.get("stream"):
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            await asyncio.sleep(ttft)
+            payload = completion_payload(state, request, body, tokens, chat)
+            content = payload["choices"][0]["text"]
+            step = max(1, len(content) // tokens)
+            for i in range(0, len(content), step):
+                piece = content[i:i + step]
+                choice = {"index": 0, "delta": {"content": piece}} if chat else {"index": 0, "text": piece}
+                chunk = {"id": payload["id"], "object": payload["object"] + ".chunk", "model": payload["model"],
+                         "choices": [choice]}
+                await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                await asyncio.sleep(token_interval)
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        else:
+            await asyncio.sleep(ttft + tokens * token_interval)
+            response = web.json_response(completion_payload(state, request, body, tokens, chat))
+
+        stats["completed"] += 1
+        stats["output_tokens_total"] += tokens
+        return response
+
+
+async def handle_agent(request: web.Request) -> web.Response:
+    """외부 Agent 텍스트 형식 (agent_backend._call_text_only)"""
+    state: StubState = request.app["state"]
+    body = await request.json()
+    async with stub_slot(state):
+        outcome = await simulate(state, request, body)
+        if isinstance(outcome, web.Response):
+            return outcome
+        tokens, ttft = outcome
+        await asyncio.sleep(ttft + tokens / state.args.tokens_per_sec)
+        state.stats["completed"] += 1
+        state.stats["output_tokens_total"] += tokens
+        return web.json_response({
+            "response": json.dumps(STUB_CONTENT, ensure_ascii=False),
+            "chat_thread_id": body.get("chat_thread_id") or uuid.uuid4().hex
+        })
+
+
+async def handle_models(request: web.Request) -> web.Response:
+    return web.json_response({"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "stub"}]})
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+async def handle_stats(request: web.Request) -> web.Response:
+    return web.json_response(request.app["state"].snapshot())
+
+
+async def handle_reset(request: web.Request) -> web.Response:
+    request.app["state"].reset()
+    return web.json_response({"status": "reset"})
+
+
+def build_app(args) -> web.Application:
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app["state"] = StubState(args)
+    app.router.add_post("/v1/chat/completions", handle_completion)
+    app.router.add_post("/v1/completions", handle_completion)
+    app.router.add_post("/chat/completions", handle_completion)
+    app.router.add_post("/completions", handle_completion)
+    app.router.add_post("/agent", handle_agent)
+    app.router.add_get("/v1/models", handle_models)
+    app.router.add_get("/health", handle_health)
+    app.router.add_get("/stub/stats", handle_stats)
+    app.router.add_post("/stub/reset", handle_reset)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 LLM 스텁 서버 (부하 테스트용)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001, help="포트 (기본: vLLM과 같은 8001)")
+    parser.add_argument("--ttft", default="lognormal:300,0.4", help="첫 토큰 지연 분포 (ms)")
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0, help="요청당 출력 토큰 속도")
+    parser.add_argument("--output-tokens", type=int, default=100, help="응답 출력 토큰 수 (요청 max_tokens가 상한)")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="동시 처리 슬롯 (0 = 무제한, vLLM max_num_seqs 흉내)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 비율")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답 지연(--hang-sec) 후 504 비율")
+    parser.add_argument("--hang-sec", type=float, default=120.0, help="timeout 주입 시 대기 시간 (초)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="JSON이 아닌 본문 비율")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (재현용)")
+    args = parser.parse_args()
+
+    parse_distribution(args.ttft)  # 형식 오류를 시작 전에 확인
+    print(f"🧪 LLM 스텁: http://{args.host}:{args.port} (ttft={args.ttft}, {args.tokens_per_sec} tok/s, "
+          f"output={args.output_tokens} tok, slots={args.max_concurrency or '∞'}, "
+          f"error={args.error_rate}, timeout={args.timeout_rate}, malformed={args.malformed_rate})")
+    web.run_app(build_app(args), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
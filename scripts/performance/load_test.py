@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+STT API 부하 테스트 (/transcribe, /transcribe_batch)
+
+동시성 단계별로 closed-loop 요청을 보내고 다음을 보고합니다.
+- 처리량 (요청/초, 오디오 초/초), 상태 코드별 건수
+- 요청 지연 p50/p90/p95/p99/max
+- 단계별 소요 시간: 실행 전후 /metrics 히스토그램 차이로 계산
+  (슬롯 대기, 오디오 디코딩, STT 디코딩, LLM 단계별, HTTP 커넥션 대기)
+- LLM 스텁 통계 (--stub-url): 요청 수, 동시 처리 피크, 스텁 슬롯 대기 평균
+
+요청 구성(--mix)은 "단계+단계:가중치" 목록입니다. 단계: stt, privacy, classification, detection
+  예: --mix "stt:0.5,stt+privacy:0.3,stt+privacy+classification+detection:0.2"
+--stt-text를 주면 STT 없이 텍스트 입력으로 LLM 단계만 측정합니다.
+
+MAX_CONCURRENT_SLOTS / LLM 동시 처리 한도 결정 예:
+  # 1) LLM 스텁 실행 (vLLM 대신, max_num_seqs=8 흉내)
+  python3 scripts/performance/llm_stub_server.py --port 8001 --max-concurrency 8
+
+  # 2) STT API를 스텁으로 연결해 실행 (MAX_CONCURRENT_SLOTS 후보값)
+  VLLM_BASE_URL=http://localhost:8001 VLLM_API_BASE=http://localhost:8001/v1 MAX_CONCURRENT_SLOTS=4 python3 api_server.py
+
+  # 3) 동시성 단계별 측정
+  python3 scripts/performance/load_test.py --file-path /app/audio/samples/long_10s.wav \\
+      --concurrency 1 2 4 8 16 --requests 40 --mix "stt:0.5,stt+privacy+classification+detection:0.5" \\
+      --stub-url http://localhost:8001 --output load_report.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+STAGES = ("stt", "privacy", "classification", "detection")
+
+# /metrics에서 단계별 시간으로 읽을 히스토그램 (표시 이름, 메트릭 이름, label 조건)
+STAGE_METRICS = [
+    ("slot_wait", "stt_queue_wait_seconds", {"source": "transcribe"}),
+    ("audio_decode", "stt_audio_decode_seconds", {}),
+    ("stt_decode", "stt_decode_seconds", {}),
+    ("privacy_removal", "stt_llm_stage_seconds", {"stage": "privacy_removal"}),
+    ("classification", "stt_llm_stage_seconds", {"stage": "classification"}),
+    ("element_detection", "stt_llm_stage_seconds", {"stage": "element_detection"}),
+    ("http_pool_wait", "stt_http_client_pool_wait_seconds", {"phase": "queue"}),
+]
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_mix(spec: str) -> List[Tuple[Tuple[str, ...], float]]:
+    """--mix 문자열 → [(단계 tuple, 가중치)]"""
+    mix = []
+    for item in spec.split(","):
+        stages, _, weight = item.strip().partition(":")
+        names = tuple(name.strip() for name in stages.split("+") if name.strip())
+        unknown = [name for name in names if name not in STAGES]
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {unknown} (사용 가능: {', '.join(STAGES)})")
+        mix.append((names, float(weight or 1)))
+    return mix
+
+
+def parse_metrics(text: str) -> List[Tuple[str, Dict[str, str], float]]:
+    """Prometheus 텍스트 → [(이름, labels, 값)]"""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples.append((name, dict(_LABEL.findall(labels or "")), float(value)))
+    return samples
+
+
+def histogram_totals(samples, name: str, where: Dict[str, str]) -> Tuple[float, float]:
+    """조건에 맞는 series의 (_sum 합, _count 합)"""
+    total = count = 0.0
+    for sample_name, labels, value in samples:
+        if any(labels.get(k) != v for k, v in where.items()):
+            continue
+        if sample_name == f"{name}_sum":
+            total += value
+        elif sample_name == f"{name}_count":
+            count += value
+    return total, count
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return round(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower), 4)
+
+
+def build_form(args, stages: Tuple[str, ...], file_paths: List[str]) -> aiohttp.FormData:
+    """단계 조합 → 엔드포인트 Form"""
+    form = aiohttp.FormData()
+    form.add_field("language", args.language)
+    if args.preset:
+        form.add_field("preset", args.preset)
+    if args.endpoint == "transcribe_batch":
+        form.add_field("file_paths", json.dumps(file_paths, ensure_ascii=False))
+    elif args.stt_text:
+        form.add_field("stt_text", args.stt_text)
+    else:
+        form.add_field("file_path", file_paths[0])
+    if "privacy" in stages:
+        form.add_field("privacy_removal", "true")
+        form.add_field("privacy_llm_type", args.llm_type)
+    if "classification" in stages:
+        form.add_field("classification", "true")
+        form.add_field("classification_llm_type", args.llm_type)
+    if "detection" in stages and args.endpoint == "transcribe":
+        form.add_field("element_detection", "true")
+        form.add_field("detection_api_type", args.detection_api_type)
+    return form
+
+
+async def fetch_text(session: aiohttp.ClientSession, url: str) -> Optional[str]:
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            return await response.text() if response.status == 200 else None
+    except Exception:
+        return None
+
+
+async def run_level(args, session: aiohttp.ClientSession, concurrency: int, mix, rng: random.Random) -> Dict:
+    """동시성 한 단계 실행"""
+    base = args.url.rstrip("/")
+    if args.stub_url:
+        try:
+            await session.post(f"{args.stub_url.rstrip('/')}/stub/reset")
+        except Exception:
+            pass
+    before = await fetch_text(session, f"{base}/metrics")
+
+    stages_list = [stages for stages, _ in mix]
+    weights = [weight for _, weight in mix]
+    results = []
+    issued = 0
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def next_job() -> Optional[Tuple[str, ...]]:
+        nonlocal issued
+        if deadline is not None:
+            if time.perf_counter() >= deadline:
+                return None
+        elif issued >= args.requests:
+            return None
+        issued += 1
+        return rng.choices(stages_list, weights)[0]
+
+    async def worker(worker_id: int):
+        file_index = worker_id
+        while True:
+            stages = next_job()
+            if stages is None:
+                return
+            files = [args.file_path[(file_index + i) % len(args.file_path)] for i in range(args.batch_size)] \
+                if args.file_path else []
+            file_index += 1
+            started = time.perf_counter()
+            status, error, audio_sec = 0, None, 0.0
+            try:
+                async with session.post(f"{base}/{args.endpoint}", data=build_form(args, stages, files),
+                                        timeout=aiohttp.ClientTimeout(total=args.timeout)) as response:
+                    status = response.status
+                    body = await response.read()
+                    if status == 200:
+                        try:
+                            payload = json.loads(body)
+                            audio_sec = float(payload.get("duration") or 0.0)
+                        except ValueError:
+                            pass
+                    else:
+                        error = body[:200].decode("utf-8", "replace")
+            except asyncio.TimeoutError:
+                error = "client timeout"
+            except aiohttp.ClientError as e:
+                error = f"{type(e).__name__}: {e}"
+            results.append({"stages": "+".join(stages) or "none", "status": status,
+                            "latency": time.perf_counter() - started, "audio_sec": audio_sec, "error": error})
+
+    level_start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall = time.perf_counter() - level_start
+    after = await fetch_text(session, f"{base}/metrics")
+
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] for r in ok]
+    status_counts: Dict[str, int] = {}
+    for r in results:
+        key = str(r["status"]) if r["status"] else "error"
+        status_counts[key] = status_counts.get(key, 0) + 1
+
+    by_mix = {}
+    for r in ok:
+        by_mix.setdefault(r["stages"], []).append(r["latency"])
+
+    report = {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "ok": len(ok),
+        "status": status_counts,
+        "wall_sec": round(wall, 2),
+        "throughput_rps": round(len(ok) / wall, 3) if wall else None,
+        "audio_sec_per_sec": round(sum(r["audio_sec"] for r in ok) / wall, 2) if wall else None,
+        "latency": {"p50": percentile(latencies, 50), "p90": percentile(latencies, 90),
+                    "p95": percentile(latencies, 95), "p99": percentile(latencies, 99),
+                    "max": round(max(latencies), 4) if latencies else None},
+        "latency_by_mix": {name: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+                           for name, values in by_mix.items()},
+        "errors": list({r["error"] for r in results if r["error"]})[:5]
+    }
+
+    if before is not None and after is not None:
+        samples_before, samples_after = parse_metrics(before), parse_metrics(after)
+        stages = {}
+        for label, name, where in STAGE_METRICS:
+            sum_before, count_before = histogram_totals(samples_before, name, where)
+            sum_after, count_after = histogram_totals(samples_after, name, where)
+            count = count_after - count_before
+            if count > 0:
+                total = sum_after - sum_before
+                stages[label] = {"count": int(count), "total_sec": round(total, 3), "mean_sec": round(total / count, 4)}
+        request_time = sum(latencies)
+        for item in stages.values():
+            item["share_of_request_time"] = round(item["total_sec"] / request_time, 3) if request_time else None
+        report["stages"] = stages
+    else:
+        report["stages"] = None
+
+    if args.stub_url:
+        stub = await fetch_text(session, f"{args.stub_url.rstrip('/')}/stub/stats")
+        report["llm_stub"] = json.loads(stub) if stub else None
+    return report
+
+
+def print_report(report: Dict) -> None:
+    latency = report["latency"]
+    print(f"\n--- concurrency={report['concurrency']} ---")
+    print(f"요청 {report['requests']} (성공 {report['ok']}, 상태 {report['status']}), {report['wall_sec']}s, "
+          f"{report['throughput_rps']} req/s, 오디오 {report['audio_sec_per_sec']} s/s")
+    print(f"지연 p50={latency['p50']} p90={latency['p90']} p95={latency['p95']} p99={latency['p99']} max={latency['max']}")
+    for name, item in report["latency_by_mix"].items():
+        print(f"  [{name}] {item['count']}건 p50={item['p50']} p95={item['p95']}")
+    if report["stages"]:
+        print(f"  {'stage':<18}{'count':>7}{'mean(s)':>10}{'total(s)':>10}{'share':>8}")
+        for name, item in report["stages"].items():
+            share = item["share_of_request_time"]
+            print(f"  {name:<18}{item['count']:>7}{item['mean_sec']:>10}{item['total_sec']:>10}"
+                  f"{'-' if share is None else f'{share:.0%}':>8}")
+    elif report["stages"] is None:
+        print("  (단계별 시간 없음: /metrics 조회 실패)")
+    stub = report.get("llm_stub")
+    if stub:
+        print(f"  LLM 스텁: 요청 {stub['requests']}, 동시 처리 피크 {stub['in_flight_peak']}, "
+              f"슬롯 대기 평균 {stub['queue_wait_sec_avg']}s, 처리 평균 {stub['service_sec_avg']}s, "
+              f"오류 {stub['errors']}/타임아웃 {stub['timeouts']}/형식 오류 {stub['malformed']}")
+    for error in report["errors"]:
+        print(f"  ⚠️  {error}")
+
+
+async def main_async(args) -> List[Dict]:
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    connector = aiohttp.TCPConnector(limit=max(args.concurrency) + 4)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        health = await fetch_text(session, f"{args.url.rstrip('/')}/health")
+        if health is None:
+            print(f"❌ STT API 응답 없음: {args.url}/health")
+            sys.exit(2)
+        slots = json.loads(health).get("slots", {})
+        print(f"STT API: {args.url} (slots max={slots.get('max')}), endpoint=/{args.endpoint}, mix={args.mix}")
+
+        reports = []
+        for concurrency in args.concurrency:
+            report = await run_level(args, session, concurrency, mix, rng)
+            print_report(report)
+            reports.append(report)
+        return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT API 부하 테스트 (동시성 단계별 처리량/지연/단계별 시간)")
+    parser.add_argument("--url", default="http://localhost:8003", help="STT API 주소")
+    parser.add_argument("--endpoint", default="transcribe", choices=["transcribe", "transcribe_batch"])
+    parser.add_argument("--file-path", nargs="*", default=[], help="서버 기준 오디오 경로 (여러 개면 순환)")
+    parser.add_argument("--stt-text", default=None, help="텍스트 입력 (STT 생략, /transcribe 전용)")
+    parser.add_argument("--batch-size", type=int, default=1, help="/transcribe_batch 요청당 파일 수")
+    parser.add_argument("--mix", default="stt:1", help="단계 조합 가중치 (예: stt:0.7,stt+privacy:0.3)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="동시성 단계")
+    parser.add_argument("--requests", type=int, default=40, help="단계별 요청 수 (--duration 미지정 시)")
+    parser.add_argument("--duration", type=float, default=None, help="단계별 실행 시간 (초)")
+    parser.add_argument("--preset", default=None, help="STT 프리셋 (speed/balanced/accuracy/cpu_int8)")
+    parser.add_argument("--language", default="ko")
+    parser.add_argument("--llm-type", default="vllm", help="privacy/classification LLM 타입 (기본: vllm)")
+    parser.add_argument("--detection-api-type", default="vllm", help="요소 탐지 방식 (vllm/ai_agent/fallback)")
+    parser.add_argument("--timeout", type=float, default=600, help="요청 타임아웃 (초)")
+    parser.add_argument("--stub-url", default=None, help="LLM 스텁 주소 (단계별 리셋 + 통계 수집)")
+    parser.add_argument("--seed", type=int, default=42, help="요청 구성 난수 시드")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if not args.file_path and not args.stt_text:
+        parser.error("--file-path 또는 --stt-text 중 하나는 필요합니다")
+    if args.stt_text and args.endpoint == "transcribe_batch":
+        parser.error("--stt-text는 /transcribe 전용입니다")
+
+    reports = asyncio.run(main_async(args))
+
+    print(f"\n{'conc':>5}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'ok':>6}{'slot_wait':>11}{'llm(avg)':>10}")
+    for report in reports:
+        stages = report["stages"] or {}
+        llm = [stages[name]["mean_sec"] for name in ("privacy_removal", "classification", "element_detection")
+               if name in stages]
+        slot_wait = stages.get("slot_wait", {}).get("mean_sec")
+        print(f"{report['concurrency']:>5}{report['throughput_rps']:>9}{str(report['latency']['p50']):>9}"
+              f"{str(report['latency']['p95']):>9}{str(report['latency']['p99']):>9}{report['ok']:>6}"
+              f"{str(slot_wait):>11}{str(round(sum(llm), 3)) if llm else '-':>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "reports": reports}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
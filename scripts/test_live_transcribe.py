@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+실시간 음성인식 WebSocket(/ws/transcribe) 재생 테스트 클라이언트
+
+audio/ 의 녹음 파일을 실제 통화처럼 실시간 속도로 프레임 단위 전송하고,
+서버가 보내는 partial/final 결과를 오디오 재생 시점 대비 지연과 함께 출력합니다.
+
+사용 방법:
+  # 기본: audio/samples/long_10s.wav, 20ms PCM 프레임, 실시간 속도
+  python3 scripts/test_live_transcribe.py
+
+  # Opus 인코딩 (PyAV 필요), 다른 서버
+  python3 scripts/test_live_transcribe.py audio/samples/long_10s.wav --encoding opus --url ws://10.0.0.5:8003/ws/transcribe
+
+  # 2배속 재생 (backpressure 확인), speed 프리셋
+  python3 scripts/test_live_transcribe.py --speed 2 --preset speed
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SAMPLE_RATE = 16000
+
+
+def pcm_frames(audio: np.ndarray, frame_ms: int) -> Iterator[bytes]:
+    """16kHz float32 → pcm_s16le 프레임"""
+    size = SAMPLE_RATE * frame_ms // 1000
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    for start in range(0, len(pcm), size):
+        yield pcm[start:start + size].tobytes()
+
+
+def opus_frames(audio: np.ndarray, frame_ms: int) -> Iterator[bytes]:
+    """16kHz float32 → Opus 패킷 (48kHz mono, 프레임당 패킷 1개)"""
+    import av
+
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=48000)
+    encoder = av.CodecContext.create("libopus", "w")
+    encoder.sample_rate = 48000
+    encoder.layout = "mono"
+    encoder.format = "s16"
+    encoder.options = {"frame_duration": str(frame_ms)}
+    encoder.open()
+
+    frame = av.AudioFrame.from_ndarray(audio.reshape(1, -1).astype(np.float32), format="flt", layout="mono")
+    frame.sample_rate = SAMPLE_RATE
+    frame.pts = 0
+
+    size = 48000 * frame_ms // 1000
+    samples = np.concatenate([r.to_ndarray().reshape(-1) for f in (frame, None) for r in resampler.resample(f)])
+    pts = 0
+    for start in range(0, len(samples), size):
+        chunk = samples[start:start + size]
+        if len(chunk) < size:
+            chunk = np.pad(chunk, (0, size - len(chunk)))
+        opus_frame = av.AudioFrame.from_ndarray(chunk.reshape(1, -1), format="s16", layout="mono")
+        opus_frame.sample_rate = 48000
+        opus_frame.pts = pts
+        pts += size
+        for packet in encoder.encode(opus_frame):
+            yield bytes(packet)
+    for packet in encoder.encode(None):
+        yield bytes(packet)
+
+
+async def replay(args):
+    import aiohttp
+    from stt_engine import load_audio_16k
+
+    audio = load_audio_16k(args.audio)
+    duration = len(audio) / SAMPLE_RATE
+    encoding = "opus" if args.encoding == "opus" else "pcm_s16le"
+    frames = list(opus_frames(audio, args.frame_ms) if encoding == "opus" else pcm_frames(audio, args.frame_ms))
+
+    params = {"encoding": encoding, "sample_rate": str(SAMPLE_RATE), "channels": "1", "language": args.language}
+    if args.preset:
+        params["preset"] = args.preset
+
+    print(f"오디오: {args.audio} ({duration:.1f}초, {len(frames)} 프레임, {encoding}, {args.speed}배속)")
+    print(f"서버: {args.url}\n")
+
+    async with aiohttp.ClientSession() as session:
+        async with session.ws_connect(args.url, params=params, max_msg_size=0) as ws:
+            ready = await ws.receive_json()
+            if ready.get("type") != "ready":
+                print(f"❌ 연결 실패: {ready}")
+                return 1
+            print(f"세션: {ready['session_id']} (preset={ready.get('preset')})")
+
+            start = time.time()
+            sent = {"audio_sec": 0.0}
+
+            async def sender():
+                interval = args.frame_ms / 1000
+                for index, frame in enumerate(frames):
+                    # 실시간 속도 유지: index번째 프레임은 start + index*interval/speed 에 전송
+                    delay = start + index * interval / args.speed - time.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await ws.send_bytes(frame)
+                    sent["audio_sec"] = min((index + 1) * interval, duration)
+                await ws.send_str(json.dumps({"type": "end"}))
+
+            sender_task = asyncio.create_task(sender())
+            result = None
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                data = json.loads(msg.data)
+                elapsed = time.time() - start
+                kind = data.get("type")
+                if kind in ("partial", "final"):
+                    # 지연: 현재까지 보낸 오디오 시점 - 해당 단어 끝 시각
+                    lag = sent["audio_sec"] - data["end"] if data.get("end") is not None else None
+                    lag_text = f"lag {lag:4.1f}s" if lag is not None else "lag   -  "
+                    marker = "✓" if kind == "final" else "…"
+                    print(f"[{elapsed:6.2f}s] {marker} {kind:<7} {lag_text}  {data['text']}")
+                elif kind == "backpressure":
+                    print(f"[{elapsed:6.2f}s] ⚠ backpressure (대기 {data['lag_sec']}초)")
+                elif kind == "error":
+                    print(f"[{elapsed:6.2f}s] ❌ {data['message']}")
+                elif kind == "end":
+                    result = data
+                    break
+            await sender_task
+
+    total = time.time() - start
+    print(f"\n총 소요: {total:.2f}초 (오디오 {duration:.1f}초)")
+    if result:
+        print(f"최종 텍스트: {result['text']}")
+        print(f"통계: {json.dumps(result.get('stats', {}), ensure_ascii=False)}")
+    return 0 if result else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실시간 음성인식 WebSocket 재생 테스트")
+    parser.add_argument("audio", nargs="?", default=str(PROJECT_ROOT / "audio" / "samples" / "long_10s.wav"),
+                        help="재생할 오디오 파일")
+    parser.add_argument("--url", default="ws://localhost:8003/ws/transcribe", help="WebSocket 주소")
+    parser.add_argument("--encoding", default="pcm", choices=["pcm", "opus"], help="전송 인코딩")
+    parser.add_argument("--frame-ms", type=int, default=20, choices=[10, 20, 40, 60], help="프레임 길이 (ms)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (1.0 = 실시간)")
+    parser.add_argument("--language", default="ko", help="언어 코드 (기본: ko)")
+    parser.add_argument("--preset", default=None, help="모델 프리셋 (기본: 서버 기본 모델)")
+    args = parser.parse_args()
+
+    if not Path(args.audio).exists():
+        print(f"❌ 오디오 파일 없음: {args.audio} (python3 scripts/generate_sample_audio.py로 생성)")
+        sys.exit(1)
+    sys.exit(asyncio.run(replay(args)))
+
+
+if __name__ == "__main__":
+    main()
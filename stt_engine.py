@@ -15,59 +15,40 @@ STT 모듈 - 3가지 백엔드 자동 선택
 
 import os
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, Dict, List, Optional
 import tarfile
 import logging
-import logging.handlers
 import json
 import numpy as np
 import threading
-import gc
+
+from utils.tracing import tracer
+from utils.logging_pipeline import log_pipeline, lazy
+from utils.memory_governor import memory_governor
 
 # 로깅 설정 (환경변수 LOG_LEVEL로 조절 가능)
+# 콘솔/파일 출력은 리스너 스레드에서 처리 (utils/logging_pipeline.py, 요청 스레드는 큐에 넣기만 함)
+# LOG_JSON: 콘솔/파일을 JSON 1줄 형식으로 출력 (기본: false)
+# LOG_QUEUE_SIZE: 출력 대기 레코드 수 한도 (기본: 10000, 초과분은 버림)
+# LOG_RATE_LIMITS: 로거별 초당 최대 INFO/DEBUG 레코드 수 (예: stt_engine=20,*=200, 기본: 제한 없음)
+# LOG_LEVELS: 로거별 레벨 (예: stt_engine=DEBUG,httpx=WARNING)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # 기본값: INFO
 LOG_FORMAT = '[%(asctime)s] %(levelname)s - %(message)s'
 
-# 로그 디렉토리 생성
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
-
-# 루트 로거 설정
-root_logger = logging.getLogger()
-root_logger.setLevel(getattr(logging, LOG_LEVEL))
-
-# 콘솔 핸들러 (중복 정리 + 1개만 유지)
-console_handlers = [
-    h for h in root_logger.handlers
-    if isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
-]
-if len(console_handlers) == 0:
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    root_logger.addHandler(console_handler)
-else:
-    console_handlers[0].setFormatter(logging.Formatter(LOG_FORMAT))
-    for extra_handler in console_handlers[1:]:
-        root_logger.removeHandler(extra_handler)
-
-# 파일 핸들러 (stt_engine.log 중복 정리 + 1개만 유지)
-stt_file_handlers = [
-    h for h in root_logger.handlers
-    if isinstance(h, logging.handlers.RotatingFileHandler)
-    and Path(getattr(h, "baseFilename", "")).name == "stt_engine.log"
-]
-if len(stt_file_handlers) == 0:
-    file_handler = logging.handlers.RotatingFileHandler(
-        LOG_DIR / "stt_engine.log",
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-    root_logger.addHandler(file_handler)
-else:
-    stt_file_handlers[0].setFormatter(logging.Formatter(LOG_FORMAT))
-    for extra_handler in stt_file_handlers[1:]:
-        root_logger.removeHandler(extra_handler)
+# 로그 디렉토리 생성 (LOG_DIR: 로그 디렉토리, 기본: 현재 디렉토리의 logs)
+LOG_DIR = Path(os.getenv("LOG_DIR", "logs"))
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+log_pipeline.configure(
+    file_name="stt_engine.log",
+    level=LOG_LEVEL,
+    log_format=LOG_FORMAT,
+    json_format=os.getenv("LOG_JSON", "false").lower() == "true",
+    queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+    rate_limits=os.getenv("LOG_RATE_LIMITS", ""),
+    levels=os.getenv("LOG_LEVELS", ""),
+    log_dir=str(LOG_DIR)
+)
 
 # 모듈 로거
 logger = logging.getLogger(__name__)
@@ -328,10 +309,74 @@ def auto_extract_model_if_needed(models_dir: str = "models") -> Path:
     return model_folder
 
 
+def load_audio_16k(audio_path: str):
+    """
+    음성 파일을 Whisper 입력 형식(16kHz mono 1D contiguous float32)으로 로드
+    
+    블록 단위로 읽으며 채널 병합 + polyphase 리샘플 (utils/audio_frontend.py)
+    
+    Args:
+        audio_path: 음성 파일 경로
+    
+    Returns:
+        numpy.ndarray (float32, 16kHz mono)
+    """
+    from utils.audio_frontend import load_audio_16k as load_audio_blocks
+    
+    return load_audio_blocks(audio_path)
+
+
+def compression_ratio(text: str) -> float:
+    """텍스트 zlib 압축률 (Whisper 기준, 같은 구절 반복/환각일수록 높음)"""
+    import zlib
+
+    data = text.encode("utf-8")
+    if not data:
+        return 0.0
+    return len(data) / len(zlib.compress(data))
+
+
+def _segment_to_dict(segment) -> Dict:
+    """faster-whisper Segment → {"start", "end", "text"} (text는 이어 붙이기 위해 앞 공백 유지)"""
+    return {"start": round(segment.start, 2), "end": round(segment.end, 2), "text": segment.text}
+
+
+def low_confidence_reason(text: str, avg_logprob: Optional[float], decoding: Dict,
+                          no_speech_prob: Optional[float] = None) -> Optional[str]:
+    """
+    세그먼트 디코딩 결과가 적응형 디코딩 기준을 넘는지 확인
+
+    Args:
+        text: 디코딩된 텍스트
+        avg_logprob: 토큰 평균 log 확률 (알 수 없으면 None)
+        decoding: 디코딩 설정 (DEFAULT_DECODING_CONFIG 형식)
+        no_speech_prob: 무음 확률 (faster-whisper만 제공)
+
+    Returns:
+        재디코딩 사유 문자열 (기준 통과 시 None)
+    """
+    ratio = compression_ratio(text)
+    if ratio > decoding["compression_ratio_threshold"]:
+        return f"compression_ratio={ratio:.2f}"
+    if avg_logprob is not None and avg_logprob < decoding["logprob_threshold"]:
+        return f"avg_logprob={avg_logprob:.2f}"
+    if no_speech_prob is not None and text.strip() and no_speech_prob > decoding["no_speech_threshold"]:
+        return f"no_speech_prob={no_speech_prob:.2f}"
+    return None
+
+
+class TranscriptionCancelled(Exception):
+    """스트리밍 소비자가 중단되어 진행 중인 변환을 다음 세그먼트 시점에 중단"""
+
+
 class WhisperSTT:
     """faster-whisper / OpenAI Whisper 자동 선택 STT 클래스"""
     
-    def __init__(self, model_path: str, device: str = "cpu", compute_type: str = "float16"):
+    # transcribe() 완료마다 (엔진, 결과, 소요 시간 초)로 호출할 콜백 (API 서버 메트릭 기록 등)
+    result_observers: List[Callable[["WhisperSTT", Dict, float], None]] = []
+    
+    def __init__(self, model_path: str, device: str = "cpu", compute_type: str = "float16",
+                 auto_load: bool = True):
         """
         Whisper STT 초기화
         
@@ -339,6 +384,7 @@ class WhisperSTT:
             model_path: 모델 경로 (예: "models")
             device: 사용할 디바이스 ('cpu', 'cuda', 또는 'auto')
             compute_type: 계산 타입 ('float32', 'float16', 'int8')
+            auto_load: False면 백엔드를 로드하지 않음 (이후 reload_backend()로 원하는 백엔드 1개만 로드)
         
         Raises:
             FileNotFoundError: 모델을 찾을 수 없음
@@ -368,6 +414,12 @@ class WhisperSTT:
         self.compute_type = compute_type
         self.backend = None
         self.preset = None  # 현재 선택된 프리셋 저장용
+        self.worker_pool = None  # CPU 워커 풀 (STT_CPU_WORKERS > 0 + transformers + CPU)
+        self.batched_pipeline = None  # faster-whisper BatchedInferencePipeline (batch_size > 1일 때 생성)
+        # transformers / openai-whisper 모델 사용 직렬화 (transcribe()는 스레드에서 동시에 호출되고,
+        # transformers는 파일마다 model.to(cuda) / model.cpu()로 장치를 옮김)
+        # faster-whisper(CTranslate2)는 동시 호출을 자체 처리하고 장치를 옮기지 않으므로 잠그지 않음
+        self.model_lock = threading.Lock()
         
         # Custom preset용 세그먼트 설정 저장소
         self.custom_segment_config = {
@@ -388,6 +440,11 @@ class WhisperSTT:
         print(f"     - transformers: {TRANSFORMERS_AVAILABLE}")
         print(f"     - openai-whisper: {WHISPER_AVAILABLE}\n")
         
+        if not auto_load:
+            # 프리셋이 정해진 경우 기본 순서 로드를 건너뛰어 모델을 두 번 로드하지 않음
+            logger.info("⏸️  백엔드 로드 지연 (auto_load=False) - reload_backend()로 로드")
+            return
+        
         # 1️⃣ faster-whisper 시도 (CTranslate2 모델, 가장 빠름)
         if FASTER_WHISPER_AVAILABLE:
             self._try_faster_whisper()
@@ -549,8 +606,8 @@ class WhisperSTT:
                 str(ct2_model_dir),
                 device=self.device,
                 compute_type=self.compute_type,
-                num_workers=4,
-                cpu_threads=4,
+                num_workers=int(os.getenv("FW_NUM_WORKERS", "4")),
+                cpu_threads=int(os.getenv("FW_CPU_THREADS", "4")),
                 download_root=None,
                 local_files_only=True
             )
@@ -645,15 +702,23 @@ class WhisperSTT:
             
             # 로컬 캐시에서 로드 (HF 허브 접근 방지)
             processor = WhisperProcessor.from_pretrained(str(model_path), local_files_only=True)
-            model = WhisperForConditionalGeneration.from_pretrained(str(model_path), local_files_only=True)
-            
+
+            # cpu_int8 프리셋: Linear 레이어 동적 int8 양자화 (디스크 캐시 사용)
+            if self.compute_type == "int8" and self.device == "cpu":
+                model = self._load_int8_transformers_model(model_path)
+            else:
+                if self.compute_type == "int8":
+                    logger.warning(f"⚠️  transformers int8 동적 양자화는 CPU 전용 → {self.device}에서는 float32로 로드")
+                model = WhisperForConditionalGeneration.from_pretrained(str(model_path), local_files_only=True)
+
             # GPU로 이동
             if self.device == "cuda" and torch.cuda.is_available():
                 model = model.to(self.device)
-            
+
             # 평가 모드
             model.eval()
-            
+            self._apply_generate_options(model)
+
             self.backend = type('TransformersBackend', (), {
                 'processor': processor,
                 'model': model,
@@ -667,6 +732,8 @@ class WhisperSTT:
             print(f"      타입: WhisperForConditionalGeneration")
             print(f"      파일: {'SafeTensors' if has_safetensors else 'PyTorch'}")
             
+            self._maybe_start_worker_pool()
+            
         except FileNotFoundError as e:
             print(f"   ⚠️  로컬 캐시 실패: {e}")
             print(f"      시도: Hugging Face 허브에서 다운로드...")
@@ -701,16 +768,151 @@ class WhisperSTT:
             print(f"   ❌ transformers 로드 실패: {type(e).__name__}")
             print(f"      에러: {str(e)[:150]}")
     
-    def _transcribe_with_transformers(self, audio_path: str, language: Optional[str] = None) -> Dict:
+    def _load_int8_transformers_model(self, model_path: Path):
+        """
+        Linear 레이어를 동적 int8 양자화한 transformers 모델 로드 (CPU 전용)
+
+        양자화 결과는 디스크에 캐시하여 다음 기동 시 fp32 로드 + 양자화를 건너뜁니다.
+        - 캐시 위치: STT_QUANT_CACHE_DIR (기본: 모델 디렉토리/.int8_cache)
+        - 캐시 키: 모델 파일 크기/수정 시각 + torch 버전 (모델 교체/torch 업그레이드 시 자동 무효화)
+
+        Args:
+            model_path: Hugging Face 형식 모델 디렉토리
+
+        Returns:
+            양자화된 WhisperForConditionalGeneration
+        """
+        from transformers import WhisperForConditionalGeneration
+        import torch
+        import time
+
+        weights_file = model_path / "model.safetensors"
+        if not weights_file.exists():
+            weights_file = model_path / "pytorch_model.bin"
+        stat = weights_file.stat()
+        cache_dir = Path(os.getenv("STT_QUANT_CACHE_DIR", str(model_path / ".int8_cache")))
+        cache_file = cache_dir / f"whisper_int8_dynamic_{stat.st_size}_{int(stat.st_mtime)}_torch{torch.__version__.split('+')[0]}.pt"
+
+        if cache_file.exists():
+            try:
+                start = time.time()
+                # 이 프로세스가 직접 저장한 캐시만 읽으므로 전체 모듈 역직렬화(weights_only=False) 사용
+                model = torch.load(str(cache_file), map_location="cpu", weights_only=False)
+                print(f"   ✅ int8 양자화 캐시 로드 ({time.time() - start:.1f}s): {cache_file.name}")
+                return model
+            except Exception as e:
+                logger.warning(f"⚠️  int8 양자화 캐시 로드 실패 (다시 양자화): {type(e).__name__}: {e}")
+
+        start = time.time()
+        model = WhisperForConditionalGeneration.from_pretrained(str(model_path), local_files_only=True)
+        model.eval()
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        print(f"   ✅ Linear 레이어 동적 int8 양자화 완료 ({time.time() - start:.1f}s)")
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in cache_dir.glob("whisper_int8_dynamic_*.pt"):
+                stale.unlink()
+            tmp_file = cache_file.with_suffix(".tmp")
+            torch.save(model, str(tmp_file))
+            os.replace(tmp_file, cache_file)
+            logger.info(f"[transformers] int8 양자화 캐시 저장: {cache_file}")
+        except OSError as e:
+            # 모델 디렉토리가 읽기 전용 마운트인 경우 등 → 캐시 없이 진행
+            logger.warning(f"⚠️  int8 양자화 캐시 저장 실패 (STT_QUANT_CACHE_DIR 확인): {e}")
+
+        return model
+
+    def _apply_generate_options(self, model, in_worker: bool = False) -> None:
+        """
+        generate() 가속 옵션 적용 (환경변수로 활성화, 기본 off)
+
+        - STT_TRANSFORMERS_STATIC_CACHE=true: 고정 크기 KV 캐시 (디코딩 단계마다 캐시 재할당 방지)
+        - STT_TRANSFORMERS_COMPILE=true: model.forward를 torch.compile (첫 추론 시 컴파일 지연 발생)
+
+        CPU 워커 풀 사용 시 컴파일된 함수는 프로세스 간 전달이 불가능하므로 각 워커에서 컴파일합니다.
+        """
+        import torch
+
+        if os.getenv("STT_TRANSFORMERS_STATIC_CACHE", "false").lower() in ("1", "true", "yes"):
+            model.generation_config.cache_implementation = "static"
+            logger.info(f"[transformers] static KV 캐시 사용")
+
+        if os.getenv("STT_TRANSFORMERS_COMPILE", "false").lower() not in ("1", "true", "yes"):
+            return
+        from stt_worker_pool import STT_CPU_WORKERS
+        if not in_worker and STT_CPU_WORKERS > 0 and self.device == "cpu":
+            return
+        try:
+            model.forward = torch.compile(model.forward, dynamic=True)
+            logger.info(f"[transformers] torch.compile 적용 (model.forward)")
+        except Exception as e:
+            logger.warning(f"⚠️  torch.compile 적용 실패 (eager 모드로 동작): {type(e).__name__}: {e}")
+
+    def _maybe_start_worker_pool(self) -> None:
+        """CPU 전용 노드에서 transformers 워커 프로세스 풀 시작 (STT_CPU_WORKERS > 0)"""
+        from stt_worker_pool import CPUWorkerPool, STT_CPU_WORKERS, STT_CPU_WORKER_THREADS
+        
+        if STT_CPU_WORKERS <= 0 or self.device != "cpu":
+            return
+        try:
+            pool = CPUWorkerPool(STT_CPU_WORKERS, STT_CPU_WORKER_THREADS)
+            pool.start(self.backend.model, self.backend.processor, self.preset, self.custom_segment_config)
+            self.worker_pool = pool
+            print(f"   ✅ CPU 워커 풀 시작: {STT_CPU_WORKERS}개 프로세스 (가중치 공유 메모리)")
+        except Exception as e:
+            # 풀 시작 실패 시 기존 in-process 방식으로 동작
+            logger.warning(f"⚠️  CPU 워커 풀 시작 실패 (in-process로 동작): {type(e).__name__}: {e}")
+            self.worker_pool = None
+    
+    @classmethod
+    def for_transformers_worker(cls, model, processor, preset: Optional[str], custom_segment_config: Dict) -> "WhisperSTT":
+        """
+        CPU 워커 프로세스용 인스턴스 생성 (모델 경로 확인/로드 없이 공유된 모델 사용)
+        
+        Args:
+            model: 공유 메모리에 올라간 WhisperForConditionalGeneration
+            processor: WhisperProcessor
+            preset: 세그먼트 설정에 사용할 프리셋
+            custom_segment_config: custom 프리셋 세그먼트 설정
+        """
+        stt = cls.__new__(cls)
+        stt.model_path = None
+        stt.device = "cpu"
+        stt.compute_type = "float32"
+        stt.preset = preset
+        stt.custom_segment_config = dict(custom_segment_config)
+        stt.worker_pool = None
+        stt.batched_pipeline = None
+        stt.model_lock = threading.Lock()
+        stt.faster_whisper_available = False
+        stt.whisper_available = False
+        stt.transformers_available = True
+        stt.backend = type('TransformersBackend', (), {
+            'processor': processor,
+            'model': model,
+            'device': "cpu",
+            'transcribe': stt._transcribe_with_transformers,
+            '_backend_type': 'transformers'
+        })()
+        stt._apply_generate_options(model, in_worker=True)
+        return stt
+    
+    def _transcribe_with_transformers(self, audio_path: str, language: Optional[str] = None,
+                                      audio=None, on_segment: Optional[Callable[[Dict], None]] = None) -> Dict:
         """
         transformers를 사용한 음성 인식 (세그먼트 처리)
         
         Whisper는 최대 30초 음성만 처리 가능하므로,
         긴 음성은 30초 단위로 나눠서 처리 후 결합합니다.
+        
+        Args:
+            audio_path: 음성 파일 경로 (audio가 주어지면 로그 표시용)
+            language: 언어 코드
+            audio: 이미 로드된 16kHz mono float32 배열 (CPU 워커 풀에서 공유 메모리로 전달, 파일 검증/로드 생략)
+            on_segment: 세그먼트 디코딩마다 호출할 콜백 (스트리밍 응답용)
         """
-        import torch
-        import numpy as np
-        import gc
+        import time
         from stt_utils import check_memory_available
         
         # 기본값: 한국어 (명시하지 않으면 "ko" 사용)
@@ -730,6 +932,14 @@ class WhisperSTT:
         try:
             from stt_utils import check_memory_available, check_audio_file
             
+            if audio is not None:
+                # 부모 프로세스에서 검증/로드/리샘플 완료된 오디오
+                sr = 16000
+                duration_seconds = len(audio) / sr
+                return self._transcribe_audio_with_transformers(
+                    audio, sr, duration_seconds, language_to_use, start_memory, on_segment=on_segment
+                )
+            
             # 1. 파일 검증
             logger.debug(f"[transformers] 파일 검증 중...")
             file_check = check_audio_file(audio_path, logger=logger)
@@ -763,47 +973,14 @@ class WhisperSTT:
             
             logger.info(f"✓ 메모리 확인 완료 (사용 가능: {memory_check['available_mb']:.0f}MB)")
             
-            # 3. 음성 로드 (scipy 사용 - librosa의 pkg_resources 의존성 제거)
+            # 3. 음성 로드 (블록 단위 polyphase 리샘플 - librosa의 pkg_resources 의존성 제거)
             logger.info(f"[transformers] 음성 파일 로드 중: {Path(audio_path).name}")
             try:
-                from scipy.io import wavfile as wav_file
-                import soundfile as sf
-                
-                # soundfile이 있으면 사용 (더 안정적)
-                try:
-                    audio, sr = sf.read(audio_path, dtype='float32')
-                    logger.debug(f"[transformers] soundfile로 오디오 로드 완료")
-                    # ⚠️ soundfile은 스테레오를 (samples, channels)로 반환할 수 있음
-                    # Whisper processor에는 반드시 mono 1D float32를 전달해야 함
-                    if hasattr(audio, 'ndim') and audio.ndim > 1:
-                        logger.info(f"[transformers] 채널 병합(soundfile): shape={audio.shape} → mono")
-                        audio = audio.mean(axis=1)
-                except ImportError:
-                    # soundfile 없으면 scipy 사용
-                    sr, audio = wav_file.read(audio_path)
-                    audio = audio.astype('float32')
-                    # 스테레오일 경우 모노로 변환
-                    if len(audio.shape) > 1:
-                        audio = audio.mean(axis=1)
-                    logger.debug(f"[transformers] scipy로 오디오 로드 완료")
-                
-                # 16kHz로 리샘플
-                if sr != 16000:
-                    logger.info(f"[transformers] 리샘플링: {sr}Hz → 16000Hz")
-                    from scipy import signal
-                    num_samples = int(len(audio) * 16000 / sr)
-                    audio = signal.resample(audio, num_samples)
-                    sr = 16000
-
-                # Whisper 입력 안정화: 1D contiguous float32 보장
-                audio = np.asarray(audio, dtype=np.float32)
-                if audio.ndim > 1:
-                    logger.warning(f"[transformers] 비정상 다차원 오디오 감지: shape={audio.shape}, mono로 변환")
-                    audio = audio.mean(axis=1)
-                if audio.ndim != 1:
-                    raise ValueError(f"지원하지 않는 오디오 shape: {audio.shape}")
-                audio = np.ascontiguousarray(audio)
-                
+                decode_start = time.time()
+                audio = load_audio_16k(audio_path)
+                audio_decode_sec = time.time() - decode_start
+                tracer.record_span("audio.load", decode_start, audio_sec=round(len(audio) / 16000, 2))
+                sr = 16000
                 duration_seconds = len(audio) / sr
                 logger.info(f"✓ 음성 로드 완료 (길이: {duration_seconds:.1f}초, 샘플: {len(audio):,}, SR: {sr}Hz)")
             except ModuleNotFoundError as e:
@@ -831,13 +1008,167 @@ class WhisperSTT:
                     "backend": "transformers"
                 }
             
-            # 🔒 파일 처리 전 강제 메모리 정리 (파일 간 누적 메모리 방지)
-            logger.info(f"[transformers] 파일 처리 시작 전 메모리 강제 정리...")
-            gc.collect()
+            result = self._transcribe_audio_with_transformers(
+                audio, sr, duration_seconds, language_to_use, start_memory, on_segment=on_segment
+            )
+            result["audio_decode_sec"] = round(audio_decode_sec, 3)
+            return result
+        
+        except MemoryError as e:
+            error_msg = f"transformers transcription failed: 메모리 부족"
+            logger.error(f"❌ {error_msg}")
+            return {
+                "text": "",
+                "error": error_msg,
+                "backend": "transformers",
+                "memory_error": True
+            }
+        except Exception as e:
+            error_msg = f"transformers transcription failed: {type(e).__name__}: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            logger.error("Traceback:", exc_info=True)
+            return {
+                "text": "",
+                "error": error_msg,
+                "backend": "transformers"
+            }
+
+    
+    def _get_decoding_config(self) -> Dict:
+        """
+        현재 프리셋의 적응형 디코딩 설정 (DEFAULT_DECODING_CONFIG + 프리셋 "decoding" 항목)
+
+        custom 프리셋은 custom_segment_config["decoding"]으로 덮어씁니다.
+        """
+        from api_server.constants import DEFAULT_DECODING_CONFIG, PRESET_SEGMENT_CONFIG
+
+        if self.preset == "custom":
+            overrides = self.custom_segment_config.get("decoding", {})
+        else:
+            overrides = PRESET_SEGMENT_CONFIG.get(self.preset or "accuracy", {}).get("decoding", {})
+        return {**DEFAULT_DECODING_CONFIG, **overrides}
+
+    def _get_batch_size(self) -> int:
+        """
+        현재 프리셋의 faster-whisper batch_size (PRESET_SEGMENT_CONFIG "batch_size", custom은 custom_segment_config)
+
+        0 또는 1이면 기존 순차 디코딩을 사용합니다.
+        """
+        from api_server.constants import PRESET_SEGMENT_CONFIG
+
+        if self.preset == "custom":
+            return int(self.custom_segment_config.get("batch_size", 0))
+        return int(PRESET_SEGMENT_CONFIG.get(self.preset or "accuracy", {}).get("batch_size", 0))
+
+    def _get_batched_pipeline(self):
+        """faster-whisper BatchedInferencePipeline (로드된 WhisperModel 공유, 최초 사용 시 생성)"""
+        if self.batched_pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            self.batched_pipeline = BatchedInferencePipeline(model=self.backend)
+            logger.info(f"[faster-whisper] BatchedInferencePipeline 생성")
+        return self.batched_pipeline
+
+    def _generate_with_logprob(self, input_features, language: str, **generate_kwargs):
+        """
+        model.generate() 1회 실행 + 토큰 평균 log 확률 계산
+
+        Returns:
+            (predicted_ids, text, avg_logprob) - avg_logprob 계산 불가 시 None
+        """
+        model = self.backend.model
+        outputs = model.generate(
+            input_features,
+            language=language,
+            length_penalty=1.0,
+            # === 반복 방지 ===
+            repetition_penalty=1.2,
+            no_repeat_ngram_size=2,
+            max_length=448,
+            return_dict_in_generate=True,
+            output_scores=True,
+            **generate_kwargs
+        )
+        predicted_ids = outputs.sequences if hasattr(outputs, "sequences") else outputs
+
+        avg_logprob = None
+        try:
+            transition_scores = model.compute_transition_scores(
+                outputs.sequences, outputs.scores, getattr(outputs, "beam_indices", None), normalize_logits=True
+            )[0]
+            finite = transition_scores[transition_scores.isfinite()]
+            if finite.numel() > 0:
+                avg_logprob = float(finite.mean())
+        except Exception as e:
+            logger.debug(f"[transformers] 평균 log 확률 계산 실패 (신뢰도 검사 생략): {type(e).__name__}: {e}")
+
+        text = self.backend.processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+        return predicted_ids, text, avg_logprob
+
+    def _generate_adaptive(self, input_features, language: str, decoding: Dict):
+        """
+        적응형 디코딩: greedy 우선, 신뢰도 기준 미달 세그먼트만 beam → temperature 샘플링 순으로 재디코딩
+
+        Args:
+            input_features: processor 출력 (모델 dtype/device로 변환된 상태)
+            language: 언어 코드
+            decoding: _get_decoding_config() 결과
+
+        Returns:
+            (predicted_ids, strategy) - strategy: "greedy" | "beam" | "temperature"
+        """
+        if not decoding["adaptive"]:
+            ids, _, _ = self._generate_with_logprob(
+                input_features, language, num_beams=decoding["beam_size"], early_stopping=True
+            )
+            return ids, "beam"
+
+        ids, text, avg_logprob = self._generate_with_logprob(input_features, language, num_beams=1, do_sample=False)
+        reason = low_confidence_reason(text, avg_logprob, decoding)
+        if reason is None:
+            return ids, "greedy"
+
+        logger.info(f"[transformers] 낮은 신뢰도 ({reason}) → beam_size={decoding['beam_size']}로 재디코딩")
+        best = (ids, avg_logprob if avg_logprob is not None else float("-inf"), "greedy")
+        ids, text, avg_logprob = self._generate_with_logprob(
+            input_features, language, num_beams=decoding["beam_size"], early_stopping=True
+        )
+        reason = low_confidence_reason(text, avg_logprob, decoding)
+        if reason is None:
+            return ids, "beam"
+        if avg_logprob is not None and avg_logprob > best[1]:
+            best = (ids, avg_logprob, "beam")
+
+        for temperature in decoding["temperatures"]:
+            logger.info(f"[transformers] beam 결과도 기준 미달 ({reason}) → temperature={temperature} 샘플링")
+            ids, text, avg_logprob = self._generate_with_logprob(
+                input_features, language, num_beams=1, do_sample=True, temperature=temperature
+            )
+            reason = low_confidence_reason(text, avg_logprob, decoding)
+            if reason is None:
+                return ids, "temperature"
+            if avg_logprob is not None and avg_logprob > best[1]:
+                best = (ids, avg_logprob, "temperature")
+
+        # 모든 후보가 기준 미달이면 평균 log 확률이 가장 높은 결과 사용
+        return best[0], best[2]
+
+    def _transcribe_audio_with_transformers(self, audio, sr: int, duration_seconds: float,
+                                            language_to_use: str, start_memory: dict,
+                                            on_segment: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        로드된 오디오(16kHz mono float32)를 세그먼트 단위로 추론 후 결합
+        
+        _transcribe_with_transformers()(파일 경로)와 CPU 워커 풀(공유 메모리 배열)이 함께 사용합니다.
+        on_segment가 주어지면 세그먼트 디코딩이 끝날 때마다 {"start", "end", "text"}로 호출합니다.
+        """
+        import time
+        import torch
+        from stt_utils import check_memory_available
+        
+        try:
+            # 🔒 파일 처리 전 메모리 정리 (파일 간 누적 메모리가 기준을 넘었을 때만, utils/memory_governor.py)
+            memory_governor.checkpoint("file_start")
             if self.device == "cuda":
-                torch.cuda.synchronize()
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
                 # 모델을 GPU로 복원 (CPU에서 내려온 경우)
                 logger.info(f"[transformers] 모델 GPU 로드: model.to(cuda)")
                 try:
@@ -890,30 +1221,29 @@ class WhisperSTT:
             start_idx = 0
             segment_idx = 0
             total_segments = (len(audio) + hop_length - 1) // hop_length
+            decoding = self._get_decoding_config()
+            decoding_stats = {}  # 디코딩 방식별 세그먼트 수 (greedy / beam / temperature)
+            segment_list = []  # [{"start", "end", "text"}] (청크 단위 타임스탬프)
             
             logger.info(f"[transformers] 세그먼트 처리 시작 (총 {total_segments}개 세그먼트)")
             
-            # 📊 세그먼트 루프 시작 전 메모리 정리 (파일 간 누적 메모리 방지)
-            logger.info(f"[transformers] 루프 시작 전 메모리 강제 정리...")
-            gc.collect()
-            if self.device == "cuda":
-                torch.cuda.synchronize()  # GPU 작업 완료 대기
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()  # 정리 완료 대기
             pre_loop_memory = check_memory_available()
             logger.info(f"[transformers] 루프 시작 전 메모리: {pre_loop_memory['available_mb']}MB ({pre_loop_memory['used_percent']:.1f}%)")
             
             while start_idx < len(audio):
+                chunk_start = time.time()
                 try:
                     # 세그먼트 추출
                     end_idx = min(start_idx + max_samples, len(audio))
                     segment = audio[start_idx:end_idx]
                     segment_duration = len(segment) / sr
                     
-                    logger.info(f"[transformers] 세그먼트 {segment_idx+1}/{total_segments}: {start_idx//sr:.1f}~{end_idx//sr:.1f}초 ({segment_duration:.1f}초)")
+                    # 세그먼트당 로그는 %-스타일 인자로 (레벨이 꺼져 있으면 문자열을 만들지 않음, 진행 로그는 10건 중 1건만)
+                    logger.info("[transformers] 세그먼트 %d/%d: %.1f~%.1f초 (%.1f초)", segment_idx + 1, total_segments,
+                                start_idx / sr, end_idx / sr, segment_duration, extra={"sample": 10})
                     
                     # 프로세싱 (메모리 체크)
-                    logger.debug(f"[transformers] 세그먼트 {segment_idx} 프로세싱 중...")
+                    logger.debug("[transformers] 세그먼트 %d 프로세싱 중...", segment_idx)
                     try:
                         # ⚠️ CRITICAL: 임시 변수 사용으로 메모리 누수 방지
                         processor_output = self.backend.processor(
@@ -924,7 +1254,7 @@ class WhisperSTT:
                         input_features = processor_output.input_features
                         del processor_output  # 즉시 삭제 (메모리 누수 방지)
                         del segment  # segment도 삭제
-                        logger.debug(f"✓ 프로세싱 완료 (input_features shape: {input_features.shape})")
+                        logger.debug("✓ 프로세싱 완료 (input_features shape: %s)", lazy(tuple, input_features.shape))
                     except MemoryError:
                         error_msg = f"transformers transcription failed: 메모리 부족 - 세그먼트 {segment_idx} 처리 중"
                         logger.error(f"❌ {error_msg}", exc_info=True)
@@ -947,41 +1277,21 @@ class WhisperSTT:
                     
                     # 모델의 dtype에 맞추기 (float32 → float16)
                     model_dtype = self.backend.model.dtype
-                    logger.debug(f"[transformers] 모델 dtype: {model_dtype}, device: {self.device}")
+                    logger.debug("[transformers] 모델 dtype: %s, device: %s", lazy(str, model_dtype), self.device)
                     input_features = input_features.to(model_dtype)
                     
                     if self.device == "cuda":
                         input_features = input_features.to(self.device)
                         torch.cuda.synchronize()  # 동기화 지점
                     
-                    # 추론 (language 지정)
-                    logger.debug(f"[transformers] 세그먼트 {segment_idx} 추론 시작 (num_beams=1)...")
+                    # 추론 (language 지정): greedy 우선, 신뢰도 낮으면 beam/temperature로 재디코딩
+                    logger.debug("[transformers] 세그먼트 %d 추론 시작 (%s preset, greedy 우선)...", segment_idx, current_preset)
                     try:
                         with torch.no_grad():
-                            # 프리셋별 generate 파라미터 조정
-                            if current_preset == "speed":
-                                num_beams_val = 1
-                                logger.debug(f"[transformers] generate() 호출 (speed preset, num_beams=1)")
-                            else:
-                                num_beams_val = 1  # accuracy preset도 1로 설정 (안정성 우선)
-                                logger.debug(f"[transformers] generate() 호출 ({current_preset} preset, num_beams=1)")
-                            
-                            logger.debug(f"[transformers] model.generate() 호출 중...")
-                            predicted_ids = self.backend.model.generate(
-                                input_features, 
-                                language=language_to_use,
-                                # === 안정성 우선 ===
-                                num_beams=num_beams_val,
-                                early_stopping=True,
-                                length_penalty=1.0,
-                                temperature=0.0,
-                                # === 반복 방지 ===
-                                repetition_penalty=1.2,
-                                # === 선택사항 ===
-                                max_length=448,
-                                no_repeat_ngram_size=2
-                            )
-                            logger.info(f"✓ 추론 완료 (predicted_ids shape: {predicted_ids.shape})")
+                            predicted_ids, strategy = self._generate_adaptive(input_features, language_to_use, decoding)
+                            decoding_stats[strategy] = decoding_stats.get(strategy, 0) + 1
+                            logger.debug("✓ 추론 완료 (predicted_ids shape: %s, 디코딩: %s)",
+                                         lazy(tuple, predicted_ids.shape), strategy)
                     except RuntimeError as e:
                         if "out of memory" in str(e).lower() or "cuda" in str(e).lower():
                             error_msg = f"transformers transcription failed: GPU 메모리 부족 - 세그먼트 {segment_idx} 추론 중"
@@ -1008,38 +1318,38 @@ class WhisperSTT:
                         }
                     
                     # 디코딩
-                    logger.info(f"[transformers] 세그먼트 {segment_idx} 디코딩 중...")
+                    logger.debug("[transformers] 세그먼트 %d 디코딩 중...", segment_idx)
                     transcription = self.backend.processor.batch_decode(
                         predicted_ids, 
                         skip_special_tokens=True
                     )
-                    logger.info(f"✓ 디코딩 완료")
+                    logger.debug("✓ 디코딩 완료")
                     
                     text = transcription[0] if transcription else ""
                     if text.strip():
                         all_texts.append(text)
-                        logger.info(f"[TRANSCRIBE] 세그먼트 {segment_idx}: '{text[:60]}...'")
+                        segment_list.append({
+                            "start": round(start_idx / sr, 2), "end": round(end_idx / sr, 2), "text": text.strip()
+                        })
+                        if on_segment:
+                            on_segment(segment_list[-1])
+                        logger.debug("[TRANSCRIBE] 세그먼트 %d: '%s...'", segment_idx, text[:60])
                     else:
-                        logger.info(f"[TRANSCRIBE] 세그먼트 {segment_idx}: (무음)")
+                        logger.debug("[TRANSCRIBE] 세그먼트 %d: (무음)", segment_idx)
+                    tracer.record_span("stt.chunk", chunk_start, index=segment_idx, audio_start=round(start_idx / sr, 2),
+                                       audio_end=round(end_idx / sr, 2), decoding=strategy)
                     
                     # 메모리 정리 (Lock 제외 - 세그먼트 루프 내에서는 경합 피함)
-                    logger.debug(f"[transformers] 세그먼트 {segment_idx} 메모리 정리 중...")
+                    logger.debug("[transformers] 세그먼트 %d 메모리 정리 중...", segment_idx)
                     del input_features, predicted_ids
-                    gc.collect()  # Python 메모리만 정리 (빠름)
-                    
-                    # 🔒 GPU 캐시 정리 (3개 세그먼트마다 - 메모리 누수 방지와 성능 균형)
-                    # accuracy: 15초 → 3개 = 45초
-                    # balanced/speed: 30초 → 3개 = 90초
-                    if self.device == "cuda" and segment_idx % 3 == 0:
-                        torch.cuda.synchronize()  # GPU 작업 완료 대기
-                        torch.cuda.empty_cache()
-                        torch.cuda.synchronize()  # 정리 완료 대기
+                    # 🔒 RSS / CUDA 캐시가 기준을 넘었을 때만 정리 (세그먼트마다 full gc를 돌리지 않음)
+                    memory_governor.checkpoint("segment")
                     
                     # 📊 메모리 상태 모니터링 (매 3개 세그먼트마다)
                     if segment_idx % 3 == 0:  # 3개 세그먼트마다 체크
                         current_memory = check_memory_available()
-                        logger.debug(f"[transformers] 세그먼트 {segment_idx} 후 메모리: "
-                                    f"{current_memory['available_mb']}MB ({current_memory['used_percent']:.1f}%)")
+                        logger.debug("[transformers] 세그먼트 %d 후 메모리: %sMB (%.1f%%)", segment_idx,
+                                     current_memory['available_mb'], current_memory['used_percent'])
                         
                         # 메모리가 위험 수준이면 경고
                         if current_memory['critical']:
@@ -1071,7 +1381,9 @@ class WhisperSTT:
                 "language": language_to_use,
                 "backend": "transformers",
                 "duration": duration_seconds,
-                "segments_processed": segment_idx
+                "segments_processed": segment_idx,
+                "segments": segment_list,
+                "decoding": decoding_stats
             }
             
             try:
@@ -1081,11 +1393,7 @@ class WhisperSTT:
                 del audio, all_texts, full_text
                 logger.debug(f"[transformers] 로컬 변수 삭제 완료")
                 
-                # 2단계: Python 메모리 강제 정리
-                gc.collect()
-                logger.debug(f"[transformers] gc.collect() 완료")
-                
-                # 3단계: GPU 메모리 정리 (model.cpu() + CUDA cache)
+                # 2단계: GPU 메모리 반환 (model.cpu() + CUDA 캐시) / CPU는 Python 힙만 기준 초과 시 정리
                 if self.device == "cuda":
                     # ✅ model.cpu()로 GPU에서 CPU로 모델 이동
                     try:
@@ -1094,12 +1402,10 @@ class WhisperSTT:
                         logger.debug(f"[transformers] model.cpu() 완료")
                     except Exception as e:
                         logger.warning(f"⚠️  모델 CPU 이동 실패: {e}")
-                    
-                    # ✅ CUDA 캐시 정리
-                    torch.cuda.synchronize()
-                    torch.cuda.empty_cache()
-                    torch.cuda.synchronize()
-                    logger.debug(f"[transformers] CUDA 캐시 정리 완료")
+                    # model.cpu()로 비운 VRAM은 기준과 관계없이 반환 (gc는 RSS 기준을 넘었을 때만)
+                    memory_governor.reclaim("file_end", python=False)
+                else:
+                    memory_governor.checkpoint("file_end")
                 
                 logger.debug(f"[transformers] 동시 처리 메모리 정리 완료")
                 
@@ -1217,9 +1523,6 @@ class WhisperSTT:
     
     def _transcribe_with_whisper(self, audio_path: str, language: Optional[str] = None) -> Dict:
         """OpenAI Whisper를 사용한 음성 인식"""
-        import torch
-        import gc
-        
         # 기본값: 한국어 (명시하지 않으면 "ko" 사용)
         language_to_use = language or "ko"
         
@@ -1240,10 +1543,8 @@ class WhisperSTT:
             detected_language = result.get("language", "unknown")
             logger.info(f"  결과: {len(text)} 글자, 언어: {detected_language}")
             
-            # 메모리 정리
-            gc.collect()
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
+            # 메모리 정리 (기준을 넘었을 때만)
+            memory_governor.checkpoint("file_end")
             
             return {
                 "success": True,
@@ -1254,10 +1555,8 @@ class WhisperSTT:
         except Exception as e:
             logger.error(f"❌ openai-whisper 변환 실패: {type(e).__name__}: {e}", exc_info=True)
             
-            # 메모리 정리
-            gc.collect()
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
+            # 메모리 정리 (기준을 넘었을 때만)
+            memory_governor.checkpoint("file_end")
             
             return {
                 "success": False,
@@ -1362,9 +1661,62 @@ class WhisperSTT:
                 "transformers": TRANSFORMERS_AVAILABLE,
                 "openai-whisper": WHISPER_AVAILABLE
             },
-            "loaded": True
+            "loaded": True,
+            "worker_pool": self.worker_pool.get_stats() if self.worker_pool is not None else None
         }
     
+    def unload(self) -> None:
+        """
+        현재 백엔드를 언로드하고 메모리를 정리합니다.
+        
+        reload_backend()의 재로드 전 단계 및 blue/green 전환 후 이전 엔진 정리에 사용합니다.
+        """
+        
+        if self.worker_pool is not None:
+            self.worker_pool.stop()
+            self.worker_pool = None
+        self.batched_pipeline = None
+        
+        if self.backend is not None:
+            logger.info(f"🔄 기존 백엔드 언로드 중...")
+            try:
+                # 메모리 명시적 해제
+                if hasattr(self.backend, 'model'):
+                    try:
+                        del self.backend.model
+                    except:
+                        pass
+                if hasattr(self.backend, 'processor'):
+                    try:
+                        del self.backend.processor
+                    except:
+                        pass
+                if hasattr(self.backend, '_transformers_model'):
+                    try:
+                        del self.backend._transformers_model
+                    except:
+                        pass
+                
+                del self.backend
+                self.backend = None
+                
+                # 모든 플래그 초기화 (이전 상태 제거)
+                self.faster_whisper_available = False
+                self.transformers_available = False
+                self.whisper_available = False
+                
+                # 메모리 정리 (모델을 버린 직후이므로 기준과 관계없이 강제)
+                memory_governor.reclaim("backend_unload")
+                
+                logger.info(f"✓ 기존 백엔드 언로드 완료 + 플래그 초기화")
+            except Exception as e:
+                logger.warning(f"⚠️  기존 백엔드 언로드 중 오류: {e}")
+                # 강제 초기화
+                self.backend = None
+                self.faster_whisper_available = False
+                self.transformers_available = False
+                self.whisper_available = False
+    
     def reload_backend(self, backend: Optional[str] = None, 
                        compute_type: Optional[str] = None,
                        device: Optional[str] = None,
@@ -1382,7 +1734,7 @@ class WhisperSTT:
                     - "openai-whisper": OpenAI Whisper 사용
                     - None (기본값): 기본 순서대로 자동 선택
             
-            compute_type: 정확도/속도 설정 (faster-whisper만 적용)
+            compute_type: 정확도/속도 설정 (faster-whisper, transformers는 CPU int8만 적용)
                     - "int8" (기본): 양자화, 가장 빠름, 정확도 조금 낮음
                     - "float16": 중간, 정확도 좋음
                     - "float32": 최대 정확도, 가장 느림
@@ -1396,6 +1748,7 @@ class WhisperSTT:
                     - "speed": faster-whisper + int8 (가장 빠름)
                     - "balanced": faster-whisper + float16 (균형)
                     - "accuracy": transformers + float32 (최고 정확도) ⭐ 권장
+                    - "cpu_int8": transformers + 동적 int8 양자화 (CPU 전용)
                     - "custom": backend/compute_type/device를 사용자 지정값으로 사용
             
             chunk_duration: (custom preset용) 청크 크기 (초, 기본: 30)
@@ -1429,8 +1782,6 @@ class WhisperSTT:
                 overlap_duration=2      # 2초 오버랩
             )
         """
-        import gc
-        
         # ✅ Custom preset용 세그먼트 설정 저장
         if chunk_duration is not None or overlap_duration is not None:
             if chunk_duration is not None:
@@ -1465,7 +1816,8 @@ class WhisperSTT:
                 presets = {
                     "speed": {"backend": "faster-whisper", "compute_type": "int8", "device": self.device},
                     "balanced": {"backend": "faster-whisper", "compute_type": "float16", "device": self.device},
-                    "accuracy": {"backend": "transformers", "compute_type": "float32", "device": self.device}
+                    "accuracy": {"backend": "transformers", "compute_type": "float32", "device": self.device},
+                    "cpu_int8": {"backend": "transformers", "compute_type": "int8", "device": "cpu"}
                 }
                 
                 if preset not in presets:
@@ -1505,8 +1857,12 @@ class WhisperSTT:
                 logger.info(f"📋 백엔드 기반 자동 프리셋 설정: {backend_lower}")
                 
                 if backend_lower == "transformers":
-                    self.preset = "accuracy"  # transformers → accuracy preset
-                    logger.info(f"   → transformers 감지: accuracy preset 적용")
+                    if compute_type and compute_type.lower() == "int8":
+                        self.preset = "cpu_int8"
+                        logger.info(f"   → transformers + int8 감지: cpu_int8 preset 적용")
+                    else:
+                        self.preset = "accuracy"  # transformers → accuracy preset
+                        logger.info(f"   → transformers 감지: accuracy preset 적용")
                 elif backend_lower == "faster-whisper":
                     # compute_type이 있으면 그에 맞는 프리셋, 없으면 balanced
                     if compute_type and compute_type.lower() == "int8":
@@ -1528,50 +1884,7 @@ class WhisperSTT:
                 logger.info(f"      device={device}")
         
         # 기존 백엔드 언로드 (메모리 정리)
-        if self.backend is not None:
-            logger.info(f"🔄 기존 백엔드 언로드 중...")
-            try:
-                # 메모리 명시적 해제
-                if hasattr(self.backend, 'model'):
-                    try:
-                        del self.backend.model
-                    except:
-                        pass
-                if hasattr(self.backend, 'processor'):
-                    try:
-                        del self.backend.processor
-                    except:
-                        pass
-                if hasattr(self.backend, '_transformers_model'):
-                    try:
-                        del self.backend._transformers_model
-                    except:
-                        pass
-                
-                del self.backend
-                self.backend = None
-                
-                # 모든 플래그 초기화 (이전 상태 제거)
-                self.faster_whisper_available = False
-                self.transformers_available = False
-                self.whisper_available = False
-                
-                # GPU 메모리 정리
-                gc.collect()
-                try:
-                    import torch
-                    torch.cuda.empty_cache()
-                except:
-                    pass
-                
-                logger.info(f"✓ 기존 백엔드 언로드 완료 + 플래그 초기화")
-            except Exception as e:
-                logger.warning(f"⚠️  기존 백엔드 언로드 중 오류: {e}")
-                # 강제 초기화
-                self.backend = None
-                self.faster_whisper_available = False
-                self.transformers_available = False
-                self.whisper_available = False
+        self.unload()
         
         # 옵션 적용
         if device:
@@ -1730,6 +2043,28 @@ class WhisperSTT:
             stt.reload_backend("transformers")
             result = stt.transcribe("audio.wav", language="ko")
         """
+        import time
+        
+        cancel_event = kwargs.pop("cancel_event", None)
+        start = time.time()
+        with tracer.span("stt.transcribe", preset=self.preset or "default") as span:
+            result = self._transcribe_file(audio_path, language, backend, cancel_event=cancel_event, **kwargs)
+            span.set(backend=result.get("backend", "unknown"), success=bool(result.get("success")),
+                     audio_sec=result.get("duration") or 0.0)
+        elapsed = time.time() - start
+        if cancel_event is not None and cancel_event.is_set():
+            # 스트리밍 소비자 중단으로 멈춘 변환 (Dummy fallback이 아님)
+            result["cancelled"] = True
+        for observer in WhisperSTT.result_observers:
+            try:
+                observer(self, result, elapsed)
+            except Exception as e:
+                logger.debug(f"[STT] result observer 오류: {type(e).__name__}: {e}")
+        return result
+    
+    def _transcribe_file(self, audio_path: str, language: Optional[str] = None, backend: Optional[str] = None,
+                         cancel_event=None, **kwargs) -> Dict:
+        """transcribe() 본체 (현재 백엔드로 변환, 실패 시 Dummy 응답, cancel_event는 CPU 워커 풀로 전달)"""
         audio_path_str = str(audio_path)
         
         try:
@@ -1763,7 +2098,14 @@ class WhisperSTT:
             elif backend_name == "transformers" or backend_type == 'TransformersBackend':
                 logger.info(f"[STT] transformers 백엔드로 변환 시작")
                 try:
-                    result = self._transcribe_with_transformers(audio_path_str, language)
+                    if self.worker_pool is not None:
+                        result = self.worker_pool.transcribe(audio_path_str, language,
+                                                             on_segment=kwargs.get("on_segment"),
+                                                             cancel_event=cancel_event)
+                    else:
+                        with self.model_lock:
+                            result = self._transcribe_with_transformers(audio_path_str, language,
+                                                                        on_segment=kwargs.get("on_segment"))
                 except ValueError as e:
                     # Preset 설정 오류
                     logger.error(f"[STT] Preset 설정 오류: {e}")
@@ -1776,7 +2118,8 @@ class WhisperSTT:
                     }
             elif backend_name == "openai-whisper" or backend_type == 'WhisperBackend':
                 logger.info(f"[STT] openai-whisper 백엔드로 변환 시작")
-                result = self._transcribe_with_whisper(audio_path_str, language)
+                with self.model_lock:
+                    result = self._transcribe_with_whisper(audio_path_str, language)
             else:
                 logger.info(f"[STT] 제네릭 백엔드 객체로 변환 시도 (타입: {backend_type})")
                 if hasattr(self.backend, 'transcribe'):
@@ -1832,6 +2175,141 @@ class WhisperSTT:
                 reason=f"{type(e).__name__}: {str(e)}"
             )
     
+    async def transcribe_async(self, audio_path: str, language: Optional[str] = None, **kwargs) -> Dict:
+        """
+        transcribe()의 비동기 버전 (API 엔드포인트용)
+        
+        항상 스레드에서 실행해 이벤트 루프를 막지 않습니다 (transcribe_stream()과 같은 방식).
+        CPU 워커 풀이 있으면 동시 요청이 워커 수만큼 병렬 처리되고, 없으면 transformers / openai-whisper는
+        model_lock으로 엔진당 한 요청씩 디코딩합니다.
+        """
+        import asyncio
+        return await asyncio.to_thread(self.transcribe, audio_path, language, **kwargs)
+    
+    async def transcribe_stream(self, audio_path: str, language: Optional[str] = None, **kwargs):
+        """
+        transcribe()의 스트리밍 버전 (비동기 생성기)
+        
+        변환을 스레드에서 실행하고, 세그먼트가 디코딩되는 즉시 ("segment", {"start", "end", "text"})를
+        내보낸 뒤 마지막에 ("result", transcribe() 결과)를 내보냅니다.
+        소비자가 중간에 중단하면(클라이언트 연결 종료 등) 다음 세그먼트 시점에 변환을 멈추고,
+        스레드가 끝날 때까지 기다린 뒤 반환하므로 호출자가 잡은 엔진 lease가 먼저 풀리지 않습니다.
+        
+        예시:
+            async for kind, value in stt.transcribe_stream("audio.wav", language="ko"):
+                if kind == "segment":
+                    print(value["start"], value["text"])
+        """
+        import asyncio
+        import threading
+        
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+        
+        def on_segment(segment: Dict) -> None:
+            if cancelled.is_set():
+                raise TranscriptionCancelled("스트리밍 소비자 중단")
+            loop.call_soon_threadsafe(events.put_nowait, ("segment", segment))
+        
+        task = asyncio.ensure_future(
+            asyncio.to_thread(self.transcribe, audio_path, language, on_segment=on_segment,
+                              cancel_event=cancelled, **kwargs)
+        )
+        # 스레드의 세그먼트 전달(call_soon_threadsafe)이 완료 알림보다 먼저 큐에 들어감
+        task.add_done_callback(lambda _: events.put_nowait(("done", None)))
+        try:
+            while True:
+                kind, value = await events.get()
+                if kind == "done":
+                    break
+                yield kind, value
+            yield "result", task.result()
+        finally:
+            if not task.done():
+                cancelled.set()
+                logger.info(f"[STT] 스트리밍 중단: 진행 중인 변환 종료 대기 ({Path(str(audio_path)).name})")
+                try:
+                    await asyncio.shield(task)
+                except Exception:
+                    pass
+    
+    def transcribe_window(self, audio, language: Optional[str] = None, prompt: Optional[str] = None) -> Dict:
+        """
+        메모리의 짧은 오디오 구간을 greedy로 한 번 디코딩 (실시간 WebSocket 세션용)
+        
+        파일 검증/메모리 확인/적응형 재디코딩을 생략해 지연을 줄입니다.
+        faster-whisper / openai-whisper는 단어 단위 타임스탬프를 반환하고,
+        transformers는 구간 텍스트를 공백 단위로 나눠 반환합니다 (타임스탬프 None →
+        실시간 세션의 partial/final start/end도 None이라 클라이언트가 해당 오디오 위치로 이동할 수 없음).
+        transformers / openai-whisper는 파일 변환과 같은 model_lock 안에서 디코딩하고,
+        transformers는 파일 변환이 끝나며 model.cpu()로 내린 모델을 먼저 self.device로 올립니다.
+        
+        Args:
+            audio: 16kHz mono float32 배열 (Whisper 입력 한도 30초 이내)
+            language: 언어 코드 (기본: ko)
+            prompt: 이전에 확정된 텍스트 (문맥 유지용 initial prompt, transformers는 무시)
+        
+        Returns:
+            {"words": [{"start", "end", "word"}], "backend": str} - 시각은 구간 시작 기준 초
+        
+        Raises:
+            RuntimeError: 지원하지 않는 백엔드
+        """
+        import torch
+        
+        language_to_use = (language or "ko").lower()
+        if language_to_use == "korean":
+            language_to_use = "ko"
+        backend_type = type(self.backend).__name__
+        backend_name = getattr(self.backend, "_backend_type", backend_type)
+        
+        if backend_name == "faster-whisper" or backend_type == "WhisperModel":
+            segments, _ = self.backend.transcribe(
+                audio,
+                language=language_to_use,
+                beam_size=1,
+                best_of=1,
+                temperature=0.0,
+                word_timestamps=True,
+                initial_prompt=prompt or None,
+                condition_on_previous_text=False
+            )
+            words = [
+                {"start": round(word.start, 2), "end": round(word.end, 2), "word": word.word.strip()}
+                for segment in segments for word in (segment.words or [])
+            ]
+            return {"words": [w for w in words if w["word"]], "backend": "faster-whisper"}
+        
+        if backend_name == "transformers" or backend_type == "TransformersBackend":
+            input_features = self.backend.processor(audio, sampling_rate=16000, return_tensors="pt").input_features
+            input_features = input_features.to(self.backend.model.dtype)
+            with self.model_lock:
+                if self.device == "cuda":
+                    self.backend.model.to(self.device)
+                    input_features = input_features.to(self.device)
+                with torch.no_grad():
+                    _, text, _ = self._generate_with_logprob(input_features, language_to_use, num_beams=1,
+                                                             do_sample=False)
+            return {
+                "words": [{"start": None, "end": None, "word": word} for word in text.split()],
+                "backend": "transformers"
+            }
+        
+        if backend_name == "openai-whisper" or backend_type == "WhisperBackend":
+            with self.model_lock:
+                result = self.backend.model.transcribe(
+                    audio, language=language_to_use, temperature=0.0, word_timestamps=True,
+                    initial_prompt=prompt or None, condition_on_previous_text=False
+                )
+            words = [
+                {"start": round(word["start"], 2), "end": round(word["end"], 2), "word": word["word"].strip()}
+                for segment in result.get("segments", []) for word in segment.get("words", [])
+            ]
+            return {"words": [w for w in words if w["word"]], "backend": "openai-whisper"}
+        
+        raise RuntimeError(f"실시간 디코딩을 지원하지 않는 백엔드: {backend_type}")
+    
     def _create_dummy_response(self, audio_path: str, language: Optional[str] = None, reason: str = "알 수 없는 오류") -> Dict:
         """
         Dummy STT 응답 생성
@@ -1865,8 +2343,7 @@ class WhisperSTT:
         turbo 모델은 128 mel-bins을 필요로 합니다.
         """
         import locale
-        import torch
-        import gc
+        import time
         
         logger.info(f"[faster-whisper] 변환 시작 (파일: {Path(audio_path).name})")
         
@@ -1896,35 +2373,79 @@ class WhisperSTT:
                 language_to_use = language_to_use.lower()
                 logger.info(f"[faster-whisper] 언어 설정: {language_to_use}")
             
-            logger.info(f"[faster-whisper] 모델 설정: beam_size={kwargs.get('beam_size', 5)}, "
-                        f"best_of={kwargs.get('best_of', 5)}, "
-                        f"patience={kwargs.get('patience', 1)}, "
-                        f"temperature={kwargs.get('temperature', 0)}")
-            
-            logger.debug(f"[faster-whisper] transcribe() 호출: language={language_to_use}")
-            
-            segments, info = self.backend.transcribe(
-                audio_path,
-                language=language_to_use,
-                beam_size=kwargs.get("beam_size", 5),
-                best_of=kwargs.get("best_of", 5),
-                patience=kwargs.get("patience", 1),
-                temperature=kwargs.get("temperature", 0)
-            )
+            # 오디오 디코딩 (faster-whisper가 내부에서 하던 decode_audio를 먼저 수행해 시간을 따로 기록)
+            from faster_whisper.audio import decode_audio
+            sampling_rate = getattr(getattr(self.backend, "feature_extractor", None), "sampling_rate", 16000)
+            decode_start = time.time()
+            audio = decode_audio(audio_path, sampling_rate=sampling_rate)
+            audio_decode_sec = time.time() - decode_start
+            tracer.record_span("audio.load", decode_start, audio_sec=round(len(audio) / sampling_rate, 2))
+            logger.info(f"[faster-whisper] 오디오 디코딩: {len(audio) / sampling_rate:.1f}초 분량 ({audio_decode_sec:.2f}초)")
+            
+            decoding = self._get_decoding_config()
+            decoding_stats = None
+            batch_size = kwargs.get("batch_size", self._get_batch_size())
+            on_segment = kwargs.get("on_segment")
+            if decoding["adaptive"] and "beam_size" not in kwargs:
+                # greedy 우선, 신뢰도 낮은 세그먼트만 beam/temperature로 재디코딩
+                segment_list, info, decoding_stats = self._transcribe_faster_whisper_adaptive(
+                    audio, language_to_use, decoding, batch_size, on_segment=on_segment
+                )
+            else:
+                beam_size = kwargs.get("beam_size", decoding["beam_size"])
+                best_of = kwargs.get("best_of", decoding["best_of"])
+                logger.info(f"[faster-whisper] 모델 설정: beam_size={beam_size}, "
+                            f"best_of={best_of}, "
+                            f"patience={kwargs.get('patience', 1)}, "
+                            f"temperature={kwargs.get('temperature', 0)}, "
+                            f"batch_size={batch_size}")
+                
+                logger.debug(f"[faster-whisper] transcribe() 호출: language={language_to_use}")
+                
+                if batch_size > 1:
+                    # VAD로 나눈 구간을 batch_size개씩 묶어 CTranslate2에서 한 번에 디코딩
+                    segments, info = self._get_batched_pipeline().transcribe(
+                        audio,
+                        language=language_to_use,
+                        batch_size=batch_size,
+                        beam_size=beam_size,
+                        best_of=best_of,
+                        patience=kwargs.get("patience", 1),
+                        temperature=kwargs.get("temperature", 0)
+                    )
+                else:
+                    segments, info = self.backend.transcribe(
+                        audio,
+                        language=language_to_use,
+                        beam_size=beam_size,
+                        best_of=best_of,
+                        patience=kwargs.get("patience", 1),
+                        temperature=kwargs.get("temperature", 0)
+                    )
+                
+                # 모든 세그먼트 수집 (타임스탬프 유지, 생성기에서 나오는 즉시 on_segment로 전달)
+                # 생성기는 세그먼트를 꺼낼 때 디코딩하므로 직전 세그먼트 이후 시간 = 해당 세그먼트 디코딩 시간
+                segment_list = []
+                chunk_start = time.time()
+                for segment in segments:
+                    segment_list.append(_segment_to_dict(segment))
+                    tracer.record_span("stt.chunk", chunk_start, index=len(segment_list) - 1,
+                                       audio_start=round(segment.start, 2), audio_end=round(segment.end, 2))
+                    if on_segment:
+                        on_segment({**segment_list[-1], "text": segment_list[-1]["text"].strip()})
+                    chunk_start = time.time()
+            
+            text = "".join(segment["text"] for segment in segment_list)
             
             logger.info(f"✓ faster-whisper 변환 완료")
             
-            # 모든 세그먼트 수집
-            text = "".join([segment.text for segment in segments])
             detected_language = info.language if info else language_to_use or "unknown"
             
             logger.info(f"  결과: {len(text)} 글자, 감지된 언어: {detected_language}")
             logger.debug(f"  변환된 텍스트 (처음 200자): {text[:200]}")
             
-            # 메모리 정리
-            gc.collect()
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
+            # 메모리 정리 (기준을 넘었을 때만)
+            memory_governor.checkpoint("file_end")
             
             return {
                 "success": True,
@@ -1932,7 +2453,11 @@ class WhisperSTT:
                 "audio_path": audio_path,
                 "language": detected_language,
                 "duration": info.duration if info else None,
-                "backend": "faster-whisper"
+                "backend": "faster-whisper",
+                "batch_size": batch_size,
+                "segments": [{**segment, "text": segment["text"].strip()} for segment in segment_list],
+                "decoding": decoding_stats,
+                "audio_decode_sec": round(audio_decode_sec, 3)
             }
         except Exception as e:
             error_msg = str(e)[:200]
@@ -1948,10 +2473,8 @@ class WhisperSTT:
             elif "model.bin" in error_msg.lower():
                 logger.error(f"   분석: model.bin 로드 오류 - CTranslate2 변환 실패 가능")
             
-            # 메모리 정리
-            gc.collect()
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
+            # 메모리 정리 (기준을 넘었을 때만)
+            memory_governor.checkpoint("file_end")
             
             return {
                 "success": False,
@@ -1961,6 +2484,124 @@ class WhisperSTT:
                 "requested_language": language_to_use
             }
     
+    def _transcribe_faster_whisper_adaptive(self, audio, language: str, decoding: Dict, batch_size: int = 0,
+                                            on_segment: Optional[Callable[[Dict], None]] = None):
+        """
+        faster-whisper 적응형 디코딩
+
+        1) 전체 오디오를 greedy(beam_size=1, temperature=0)로 디코딩
+           (batch_size > 1이면 BatchedInferencePipeline으로 VAD 구간을 묶어 디코딩)
+        2) 기준 미달 세그먼트를 인접한 것끼리 묶어(최대 30초) 해당 구간만 다시 디코딩
+           (beam_size + faster-whisper 내장 temperature fallback)
+        3) 재디코딩 결과가 기준을 통과하거나 평균 log 확률이 더 높을 때만 교체
+
+        greedy 세그먼트 생성기를 끝까지 모으지 않고 순서대로 처리하므로,
+        기준을 통과한 세그먼트와 확정된 재디코딩 구간은 디코딩되는 즉시 on_segment로 전달됩니다.
+
+        Args:
+            audio: decode_audio()로 디코딩한 float32 배열 (모델 샘플레이트)
+            language: 언어 코드
+            decoding: _get_decoding_config() 결과
+            batch_size: greedy 단계 batch 크기 (0/1이면 순차)
+            on_segment: 세그먼트 확정 시 호출할 콜백 ({"start", "end", "text"})
+
+        Returns:
+            (segments, info, stats)
+            - segments: [{"start", "end", "text"}] (재디코딩 구간은 하나의 세그먼트로 합쳐짐)
+            - stats: {"segments", "fallback_segments", "fallback_regions", "replaced_regions", ...}
+        """
+        import time
+
+        sampling_rate = getattr(getattr(self.backend, "feature_extractor", None), "sampling_rate", 16000)
+
+        start = time.time()
+        if batch_size > 1:
+            segments, info = self._get_batched_pipeline().transcribe(
+                audio, language=language, batch_size=batch_size, beam_size=1, best_of=1, temperature=0.0
+            )
+        else:
+            segments, info = self.backend.transcribe(audio, language=language, beam_size=1, best_of=1, temperature=0.0)
+
+        segment_list = []
+        counts = {"segments": 0, "fallback_segments": 0, "fallback_regions": 0, "replaced_regions": 0}
+        fallback_sec = 0.0
+
+        def emit(item: Dict):
+            segment_list.append(item)
+            if on_segment:
+                on_segment({**item, "text": item["text"].strip()})
+
+        def flush(region: List):
+            """기준 미달 구간 재디코딩 후 (교체 또는 원본) 세그먼트 확정"""
+            nonlocal fallback_sec
+            if not region:
+                return
+            counts["fallback_regions"] += 1
+            first, last = region[0], region[-1]
+            clip = audio[int(first.start * sampling_rate):int(last.end * sampling_rate)]
+            if len(clip) > 0:
+                redo_start = time.time()
+                redo, _ = self.backend.transcribe(
+                    clip,
+                    language=language,
+                    beam_size=decoding["beam_size"],
+                    best_of=decoding["best_of"],
+                    temperature=[0.0] + list(decoding["temperatures"]),
+                    log_prob_threshold=decoding["logprob_threshold"],
+                    compression_ratio_threshold=decoding["compression_ratio_threshold"],
+                    condition_on_previous_text=False
+                )
+                redo = list(redo)
+                fallback_sec += time.time() - redo_start
+                tracer.record_span("stt.redecode", redo_start, audio_start=round(first.start, 2),
+                                   audio_end=round(last.end, 2), segments=len(region))
+                new_text = "".join(segment.text for segment in redo)
+                new_logprob = float(np.mean([segment.avg_logprob for segment in redo])) if redo else None
+                old_logprob = float(np.mean([segment.avg_logprob for segment in region]))
+
+                if low_confidence_reason(new_text, new_logprob, decoding) is None or \
+                        (new_logprob is not None and new_logprob > old_logprob):
+                    counts["replaced_regions"] += 1
+                    emit({"start": round(first.start, 2), "end": round(last.end, 2), "text": new_text})
+                    region.clear()
+                    return
+            for segment in region:
+                emit(_segment_to_dict(segment))
+            region.clear()
+
+        # 인접한 기준 미달 세그먼트를 한 구간으로 묶음 (Whisper 입력 한도 30초)
+        region = []
+        chunk_start = time.time()
+        for i, segment in enumerate(segments):
+            tracer.record_span("stt.chunk", chunk_start, index=i, audio_start=round(segment.start, 2),
+                               audio_end=round(segment.end, 2))
+            counts["segments"] += 1
+            reason = low_confidence_reason(segment.text, segment.avg_logprob, decoding,
+                                           getattr(segment, "no_speech_prob", None))
+            if not reason:
+                flush(region)
+                emit(_segment_to_dict(segment))
+                chunk_start = time.time()
+                continue
+            logger.debug(f"[faster-whisper] 세그먼트 {i} ({segment.start:.1f}~{segment.end:.1f}초) 기준 미달: {reason}")
+            counts["fallback_segments"] += 1
+            if region and segment.end - region[0].start > 30:
+                flush(region)
+            region.append(segment)
+            chunk_start = time.time()
+        flush(region)
+
+        stats = {
+            **counts,
+            "greedy_sec": round(time.time() - start - fallback_sec, 2),
+            "fallback_sec": round(fallback_sec, 2)
+        }
+        logger.info(f"[faster-whisper] 적응형 디코딩: 세그먼트 {stats['segments']}개 중 {stats['fallback_segments']}개 재디코딩 "
+                    f"({stats['fallback_regions']}개 구간, {stats['replaced_regions']}개 교체, "
+                    f"greedy {stats['greedy_sec']}s{' (batch ' + str(batch_size) + ')' if batch_size > 1 else ''} "
+                    f"+ fallback {stats['fallback_sec']}s)")
+        return segment_list, info, stats
+
     def _transcribe_whisper(self, audio_path: str, language: Optional[str] = None, **kwargs) -> Dict:
         """OpenAI Whisper로 변환"""
         result = self.model.transcribe(
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+CPU 전용 노드용 transformers 멀티 프로세스 워커 풀
+
+transformers 백엔드는 프로세스 안에서 GIL 아래 실행되므로 동시 요청이 늘어도 처리량이 늘지 않는다.
+워커 프로세스를 미리 띄워 요청을 나눠 처리한다.
+
+- 가중치: 부모가 한 번 로드한 뒤 model.share_memory()로 공유 메모리(mmap)에 올리고,
+  워커는 같은 페이지를 매핑 (워커 수만큼 RAM이 늘지 않음)
+  (cpu_int8 프리셋의 양자화된 Linear 가중치는 packed 형식이라 공유되지 않고 워커마다 복사됨, fp32 대비 약 1/4 크기)
+- 코어 고정: 사용 가능한 코어를 워커 수로 나눠 sched_setaffinity + torch intra-op 스레드 수 설정
+- 디스패치: 부모가 유휴 워커에게 요청을 하나씩 배정(워커별 작업 큐) + 결과 큐, 오디오는 SharedMemory로 전달
+- 워커가 비정상 종료하면 배정된 요청은 (시작 보고 전이어도) 실패 처리하고 워커를 다시 띄움
+- 요청 제한 시간(STT_CPU_WORKER_TIMEOUT)을 넘기면 실패 처리하고 멈춘 워커는 종료 후 재시작
+- cancel_event가 설정되면 대기 중인 요청은 배정 취소, 처리 중인 요청은 다음 세그먼트 시점에 중단
+- 스트리밍 요청은 워커가 청크마다 세그먼트를 결과 큐로 보내고, 수신 스레드가 요청별 콜백을 호출
+
+faster-whisper(CTranslate2)는 가중치를 자체 메모리로 읽어 프로세스 간 공유가 불가능하고
+GIL 밖에서 멀티 스레드로 동작하므로 이 풀의 대상이 아니다 (FW_CPU_THREADS / FW_NUM_WORKERS로 조정).
+
+사용 예:
+    STT_CPU_WORKERS=4 STT_DEVICE=cpu STT_PRESET=accuracy python3 api_server.py
+"""
+
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 워커 수 (0이면 사용 안 함)
+STT_CPU_WORKERS = int(os.getenv("STT_CPU_WORKERS", "0"))
+
+# 워커당 intra-op 스레드 수 (0이면 할당된 코어 수)
+STT_CPU_WORKER_THREADS = int(os.getenv("STT_CPU_WORKER_THREADS", "0"))
+
+# 워커 시작 대기 시간 (초)
+WORKER_START_TIMEOUT_SEC = float(os.getenv("STT_CPU_WORKER_START_TIMEOUT", "300"))
+
+# 요청당 최대 대기 시간 (초, 대기열 + 처리)
+WORKER_REQUEST_TIMEOUT_SEC = float(os.getenv("STT_CPU_WORKER_TIMEOUT", "1800"))
+
+# 결과 대기 중 취소/제한 시간 확인 주기 (초)
+_WAIT_POLL_SEC = 0.5
+
+
+def _attach_shared_memory(name: str):
+    """부모가 만든 SharedMemory에 연결 (세그먼트 삭제는 부모가 담당)"""
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: track 인자 없음. spawn 워커는 부모의 resource_tracker를 공유하므로
+        # 중복 등록은 무시되고, 부모의 unlink()가 등록을 해제함 (여기서 unregister하면 부모 쪽에서 KeyError)
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(worker_id: int, cores: List[int], threads: int, model, processor,
+                 preset: Optional[str], custom_segment_config: Dict, task_queue, result_queue,
+                 cancel_event) -> None:
+    """워커 프로세스 진입점"""
+    import numpy as np
+    import torch
+
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+    from stt_engine import TranscriptionCancelled, WhisperSTT
+    stt = WhisperSTT.for_transformers_worker(model, processor, preset, custom_segment_config)
+    result_queue.put(("ready", worker_id, os.getpid(), None))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        request_id, shm_name, num_samples, language, audio_name, stream = task
+
+        # 세그먼트마다 취소 확인 (부모가 cancel_event 설정), 스트리밍이면 세그먼트 전달
+        def on_segment(segment, request_id=request_id, stream=stream):
+            if cancel_event.is_set():
+                raise TranscriptionCancelled("요청 취소")
+            if stream:
+                result_queue.put(("segment", worker_id, request_id, segment))
+
+        shm = None
+        try:
+            shm = _attach_shared_memory(shm_name)
+            audio = np.ndarray((num_samples,), dtype=np.float32, buffer=shm.buf)
+            result = stt._transcribe_with_transformers(audio_name, language, audio=audio, on_segment=on_segment)
+            del audio
+        except Exception as e:
+            result = {
+                "text": "",
+                "error": f"transformers worker failed: {type(e).__name__}: {str(e)[:200]}",
+                "backend": "transformers"
+            }
+        finally:
+            if shm is not None:
+                shm.close()
+
+        result["worker_id"] = worker_id
+        result_queue.put(("done", worker_id, request_id, result))
+
+
+class CPUWorkerPool:
+    """transformers 모델을 공유하는 CPU 워커 프로세스 풀"""
+
+    def __init__(self, num_workers: int, threads_per_worker: int = 0):
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self._ctx = None
+        self._result_queue = None
+        self._processes: Dict[int, object] = {}
+        self._task_queues: Dict[int, object] = {}  # worker_id → 작업 큐 (재시작 시 새로 생성)
+        self._cancel_events: Dict[int, object] = {}  # worker_id → 처리 중 요청 취소 신호
+        self._core_groups: List[List[int]] = []
+        self._worker_args = None
+        self._pending: Dict[int, Future] = {}
+        self._segment_callbacks: Dict[int, Callable[[Dict], None]] = {}
+        self._backlog: Deque[Tuple[int, tuple]] = deque()  # 배정 대기 (request_id, task)
+        self._assigned: Dict[int, int] = {}  # worker_id → request_id
+        self._ready: Dict[int, int] = {}  # worker_id → pid
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+        self._stopping = False
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "cancelled": 0,
+                       "restarts": 0}
+
+    @staticmethod
+    def _split_cores(num_workers: int) -> List[List[int]]:
+        """사용 가능한 코어를 워커 수만큼 연속 구간으로 분할"""
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+        per_worker = max(1, len(cores) // num_workers)
+        groups = []
+        for i in range(num_workers):
+            group = cores[i * per_worker:(i + 1) * per_worker]
+            groups.append(group or [cores[i % len(cores)]])
+        return groups
+
+    def start(self, model, processor, preset: Optional[str], custom_segment_config: Dict) -> None:
+        """
+        가중치를 공유 메모리로 옮기고 워커 프로세스 시작 (모든 워커 준비까지 대기)
+
+        Raises:
+            RuntimeError: 워커가 제한 시간 안에 준비되지 않음
+        """
+        import torch.multiprocessing as mp
+
+        start = time.time()
+        # 파라미터 storage를 공유 메모리로 이동 (이후 워커로 전달 시 복사 없이 핸들만 전달)
+        model.share_memory()
+
+        # fork는 torch 스레드 풀과 충돌할 수 있으므로 spawn 사용
+        self._ctx = mp.get_context("spawn")
+        self._result_queue = self._ctx.Queue()
+        self._core_groups = self._split_cores(self.num_workers)
+        self._worker_args = (model, processor, preset, dict(custom_segment_config))
+
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        self._reader = threading.Thread(target=self._read_results, name="stt-worker-pool-reader", daemon=True)
+        self._reader.start()
+
+        deadline = time.time() + WORKER_START_TIMEOUT_SEC
+        while len(self._ready) < self.num_workers:
+            if time.time() > deadline:
+                self.stop()
+                raise RuntimeError(f"CPU 워커 시작 시간 초과 ({len(self._ready)}/{self.num_workers} 준비)")
+            time.sleep(0.2)
+
+        logger.info(
+            f"[WorkerPool] CPU 워커 {self.num_workers}개 준비 완료 ({time.time() - start:.1f}s, "
+            f"코어 할당: {self._core_groups})"
+        )
+
+    def _spawn(self, worker_id: int) -> None:
+        cores = self._core_groups[worker_id]
+        threads = self.threads_per_worker or len(cores)
+        # 죽은 워커가 남긴 작업/취소 신호를 물려받지 않도록 큐와 이벤트는 새로 생성
+        task_queue = self._ctx.Queue()
+        cancel_event = self._ctx.Event()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, cores, threads, *self._worker_args, task_queue, self._result_queue, cancel_event),
+            name=f"stt-cpu-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._task_queues[worker_id] = task_queue
+        self._cancel_events[worker_id] = cancel_event
+        logger.info(f"[WorkerPool] 워커 {worker_id} 시작 (pid={process.pid}, 코어={cores}, 스레드={threads})")
+
+    def _dispatch_locked(self) -> None:
+        """유휴 워커에게 대기 중인 요청 배정 (self._lock 보유 상태에서 호출)"""
+        for worker_id in list(self._ready):
+            if not self._backlog:
+                return
+            if worker_id in self._assigned:
+                continue
+            request_id, task = self._backlog.popleft()
+            self._assigned[worker_id] = request_id
+            self._cancel_events[worker_id].clear()
+            self._task_queues[worker_id].put(task)
+
+    def _read_results(self) -> None:
+        """결과 큐 수신 + 워커 생존 확인 (백그라운드 스레드)"""
+        last_check = time.monotonic()
+        while not self._stopping:
+            if time.monotonic() - last_check >= 1.0:
+                self._check_workers()
+                last_check = time.monotonic()
+            try:
+                kind, worker_id, value, result = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            if kind == "segment":
+                callback = self._segment_callbacks.get(value)
+                if callback is not None:
+                    try:
+                        callback(result)
+                    except Exception as e:
+                        # 소비자 중단(클라이언트 연결 종료 등): 이후 세그먼트는 버리고 최종 결과만 전달
+                        logger.debug(f"[WorkerPool] 요청 {value} 세그먼트 콜백 해제: {type(e).__name__}")
+                        self._segment_callbacks.pop(value, None)
+                continue
+
+            with self._lock:
+                if kind == "ready":
+                    self._ready[worker_id] = value
+                elif kind == "done":
+                    if self._assigned.get(worker_id) == value:
+                        self._assigned.pop(worker_id)
+                    future = self._pending.pop(value, None)
+                    self._segment_callbacks.pop(value, None)
+                    self._stats["completed"] += 1
+                    if future is not None and not future.done():
+                        future.set_result(result)
+                self._dispatch_locked()
+
+    def _check_workers(self) -> None:
+        """비정상 종료한 워커에 배정된 요청 실패 처리 후 재시작"""
+        with self._lock:
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive() or self._stopping:
+                    continue
+                logger.error(f"[WorkerPool] 워커 {worker_id} 비정상 종료 (exitcode={process.exitcode}) → 재시작")
+                self._ready.pop(worker_id, None)
+                request_id = self._assigned.pop(worker_id, None)
+                self._fail_locked(
+                    request_id, f"transformers worker {worker_id} crashed (exitcode={process.exitcode})"
+                )
+                self._stats["restarts"] += 1
+                self._spawn(worker_id)
+
+    def _fail_locked(self, request_id: Optional[int], error: str) -> None:
+        """요청 실패 처리 (대기 중인 future에 오류 결과 전달)"""
+        if request_id is None:
+            return
+        future = self._pending.pop(request_id, None)
+        self._segment_callbacks.pop(request_id, None)
+        if future is not None and not future.done():
+            self._stats["failed"] += 1
+            future.set_result({"text": "", "error": error, "backend": "transformers"})
+
+    def transcribe(self, audio_path: str, language: Optional[str] = None,
+                   on_segment: Optional[Callable[[Dict], None]] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        워커에서 음성 인식 (호출 스레드는 결과까지 대기, GIL 해제 상태로 대기)
+
+        Args:
+            audio_path: 음성 파일 경로
+            language: 언어 코드
+            on_segment: 청크 디코딩마다 호출할 콜백 (결과 수신 스레드에서 호출됨)
+            cancel_event: 설정되면 배정 전 요청은 취소, 처리 중 요청은 다음 세그먼트 시점에 중단
+
+        Returns:
+            _transcribe_with_transformers()와 같은 형식의 결과 (+ worker_id)
+            제한 시간 초과/워커 비정상 종료/취소 시 error 포함
+        """
+        from multiprocessing import shared_memory
+        from stt_utils import check_audio_file
+        from utils.audio_frontend import audio_length_16k, load_audio_16k
+
+        file_check = check_audio_file(audio_path, logger=logger)
+        if not file_check['valid']:
+            return {
+                "text": "",
+                "error": f"transformers transcription failed: 파일 검증 실패 - {file_check['errors'][0]}",
+                "backend": "transformers"
+            }
+
+        # 공유 메모리에 바로 디코딩 (별도 배열 복사 없음)
+        length = audio_length_16k(audio_path)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, length * 4))
+        try:
+            import numpy as np
+            decode_start = time.time()
+            num_samples = len(load_audio_16k(audio_path, out=np.ndarray((length,), dtype=np.float32, buffer=shm.buf)))
+            audio_decode_sec = time.time() - decode_start
+
+            request_id = next(self._ids)
+            future: Future = Future()
+            task = (request_id, shm.name, num_samples, language, Path(audio_path).name, on_segment is not None)
+            with self._lock:
+                self._pending[request_id] = future
+                if on_segment is not None:
+                    self._segment_callbacks[request_id] = on_segment
+                self._stats["submitted"] += 1
+                self._backlog.append((request_id, task))
+                self._dispatch_locked()
+
+            result = self._wait(request_id, future, cancel_event)
+            result["audio_decode_sec"] = round(audio_decode_sec, 3)
+            return result
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _wait(self, request_id: int, future: Future, cancel_event: Optional[threading.Event]) -> Dict:
+        """결과 대기 (취소 전달, 제한 시간을 넘기면 실패 처리하고 처리 중인 워커 종료)"""
+        deadline = time.monotonic() + WORKER_REQUEST_TIMEOUT_SEC
+        cancel_sent = False
+        while True:
+            try:
+                return future.result(timeout=_WAIT_POLL_SEC)
+            except FutureTimeoutError:
+                pass
+
+            with self._lock:
+                if future.done():
+                    continue
+                worker_id = next((w for w, r in self._assigned.items() if r == request_id), None)
+
+                if cancel_event is not None and cancel_event.is_set() and not cancel_sent:
+                    if worker_id is None:
+                        self._remove_backlog_locked(request_id)
+                        self._stats["cancelled"] += 1
+                        self._fail_locked(request_id, "transformers worker request cancelled")
+                        continue
+                    # 처리 중: 다음 세그먼트 시점에 중단하고 done 결과를 보냄
+                    self._cancel_events[worker_id].set()
+                    self._stats["cancelled"] += 1
+                    cancel_sent = True
+
+                if time.monotonic() < deadline:
+                    continue
+                self._stats["timeouts"] += 1
+                logger.error(f"[WorkerPool] 요청 {request_id} 제한 시간 초과 ({WORKER_REQUEST_TIMEOUT_SEC:g}초)")
+                if worker_id is None:
+                    self._remove_backlog_locked(request_id)
+                else:
+                    # 처리 중인 워커는 멈춘 것으로 보고 배정에서 제외 후 종료 → _check_workers()가 재시작
+                    self._ready.pop(worker_id, None)
+                    self._assigned.pop(worker_id, None)
+                    self._processes[worker_id].terminate()
+                self._fail_locked(request_id, f"transformers worker timeout ({WORKER_REQUEST_TIMEOUT_SEC:g}s)")
+
+    def _remove_backlog_locked(self, request_id: int) -> None:
+        for item in self._backlog:
+            if item[0] == request_id:
+                self._backlog.remove(item)
+                return
+
+    def stop(self) -> None:
+        """워커 종료"""
+        self._stopping = True
+        for task_queue in self._task_queues.values():
+            try:
+                task_queue.put(None)
+            except Exception:
+                pass
+        for process in self._processes.values():
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        with self._lock:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result({"text": "", "error": "worker pool stopped", "backend": "transformers"})
+            self._pending.clear()
+            self._segment_callbacks.clear()
+            self._backlog.clear()
+            self._assigned.clear()
+        self._processes.clear()
+        self._task_queues.clear()
+        self._cancel_events.clear()
+        logger.info(f"[WorkerPool] CPU 워커 종료")
+
+    def get_stats(self) -> Dict:
+        """
+        워커 풀 상태 조회
+
+        Returns:
+            {"workers": int, "ready": int, "busy": int, "queued": int, "cores": [...], ...}
+        """
+        with self._lock:
+            return {
+                "workers": self.num_workers,
+                "ready": len(self._ready),
+                "busy": len(self._assigned),
+                "queued": len(self._backlog),
+                "cores": self._core_groups,
+                **self._stats
+            }
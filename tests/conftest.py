@@ -0,0 +1,14 @@
+"""
+테스트 공통 설정
+
+api_server/app.py, stt_engine.py, Web UI 모듈은 import 시점에 로그/데이터 디렉토리를 만들고 파일을 쓰므로
+테스트 모듈이 import되기 전에 임시 디렉토리로 지정한다 (저장소 안에 logs/, web_ui/data/가 생기지 않도록).
+"""
+
+import os
+import tempfile
+
+_TEST_ROOT = tempfile.mkdtemp(prefix="stt_engine_tests_")
+
+os.environ.setdefault("LOG_DIR", os.path.join(_TEST_ROOT, "logs"))
+os.environ.setdefault("DATA_DIR", os.path.join(_TEST_ROOT, "data"))
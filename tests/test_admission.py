@@ -0,0 +1,289 @@
+"""
+AdmissionController 테스트
+
+비용 예측 기반 승인 제어(승인/대기/반납/Retry-After/aging/backfill)와
+스트리밍 응답 예약 반납의 유닛 테스트
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import api_server.transcribe_endpoint as transcribe_endpoint
+from api_server.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    RequestCost,
+    parse_priority,
+)
+from api_server.transcribe_endpoint import CleanupStreamingResponse, validate_and_prepare_file
+
+
+def make_controller(budget_mb=1000.0, max_wait_sec=60.0, max_queue=4, aging_sec=30.0):
+    controller = AdmissionController()
+    controller.configure(budget_mb=budget_mb, max_wait_sec=max_wait_sec, max_queue=max_queue,
+                         aging_sec=aging_sec)
+    return controller
+
+
+def cost(memory_mb, service_sec=10.0):
+    return RequestCost(memory_mb, service_sec, service_sec, "balanced", [])
+
+
+class TestParsePriority:
+    """parse_priority 테스트"""
+
+    def test_named_levels(self):
+        assert parse_priority("high") == 0
+        assert parse_priority(" Normal ") == 5
+        assert parse_priority("low") == 9
+
+    def test_numeric_clamped(self):
+        assert parse_priority("3") == 3
+        assert parse_priority("42") == 9
+        assert parse_priority("-1") == 0
+
+    def test_unknown_is_normal(self):
+        assert parse_priority(None) == 5
+        assert parse_priority("urgent") == 5
+
+
+class TestEstimate:
+    """estimate 비용 예측 테스트"""
+
+    def test_longer_audio_costs_more(self):
+        controller = make_controller()
+        short = controller.estimate(60, "balanced")
+        long = controller.estimate(3600, "balanced")
+        assert long.memory_mb > short.memory_mb
+        assert long.service_sec > short.service_sec
+
+    def test_llm_stages_add_cost(self):
+        controller = make_controller()
+        base = controller.estimate(60, "balanced")
+        staged = controller.estimate(60, "balanced", stages=["privacy_removal", "classification"])
+        assert staged.memory_mb == pytest.approx(base.memory_mb + 2 * controller.llm_stage_mb)
+        assert staged.service_sec == pytest.approx(base.service_sec + 2 * controller.llm_stage_sec)
+
+    def test_observed_rtf_updates_service_time(self):
+        controller = make_controller()
+        before = controller.estimate(600, "balanced").service_sec
+        stt = type("STT", (), {"preset": "balanced"})()
+        controller.observe_stt(stt, {"duration": 600}, elapsed=600)  # RTF 1.0
+        assert controller.estimate(600, "balanced").service_sec > before
+
+
+class TestAdmitRelease:
+    """admit / release 테스트"""
+
+    def test_admit_within_budget(self):
+        async def scenario():
+            controller = make_controller()
+            first = await controller.admit(cost(400))
+            second = await controller.admit(cost(400))
+            assert controller.reserved_mb == pytest.approx(800)
+            controller.release(first)
+            controller.release(second)
+            assert controller.reserved_mb == pytest.approx(0)
+
+        asyncio.run(scenario())
+
+    def test_release_is_idempotent(self):
+        async def scenario():
+            controller = make_controller()
+            ticket = await controller.admit(cost(400))
+            other = await controller.admit(cost(400))
+            controller.release(ticket)
+            controller.release(ticket)
+            assert controller.reserved_mb == pytest.approx(400)
+            controller.release(other)
+
+        asyncio.run(scenario())
+
+    def test_queued_until_release(self):
+        async def scenario():
+            controller = make_controller()
+            running = await controller.admit(cost(800, service_sec=5))
+            waiter = asyncio.create_task(controller.admit(cost(800, service_sec=5)))
+            await asyncio.sleep(0)
+            assert controller.waiting == 1 and not waiter.done()
+
+            controller.release(running)
+            ticket = await asyncio.wait_for(waiter, 1)
+            assert controller.waiting == 0
+            assert controller.reserved_mb == pytest.approx(800)
+            controller.release(ticket)
+
+        asyncio.run(scenario())
+
+    def test_oversized_request_runs_alone(self):
+        async def scenario():
+            controller = make_controller()
+            ticket = await controller.admit(cost(5000))
+            assert ticket.reserved_mb == pytest.approx(controller.budget_mb)
+            controller.release(ticket)
+
+        asyncio.run(scenario())
+
+    def test_cancelled_waiter_leaves_queue(self):
+        async def scenario():
+            controller = make_controller()
+            running = await controller.admit(cost(800, service_sec=5))
+            waiter = asyncio.create_task(controller.admit(cost(800, service_sec=5)))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            assert controller.waiting == 0
+            controller.release(running)
+            assert controller.reserved_mb == pytest.approx(0)
+
+        asyncio.run(scenario())
+
+
+class TestRejection:
+    """거절 / Retry-After 테스트"""
+
+    def test_expected_wait_exceeds_limit(self):
+        async def scenario():
+            controller = make_controller(max_wait_sec=5)
+            running = await controller.admit(cost(800, service_sec=30))
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await controller.admit(cost(800, service_sec=30))
+            # 실행 중 요청의 예상 종료(약 30초 뒤)까지 기다리라고 안내
+            assert 25 <= excinfo.value.retry_after <= 31
+            assert controller.waiting == 0
+            controller.release(running)
+
+        asyncio.run(scenario())
+
+    def test_queue_full(self):
+        async def scenario():
+            controller = make_controller(max_queue=1)
+            running = await controller.admit(cost(800, service_sec=5))
+            waiter = asyncio.create_task(controller.admit(cost(800, service_sec=5)))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await controller.admit(cost(800, service_sec=5))
+            assert excinfo.value.retry_after >= 1
+            assert controller.waiting == 1
+            controller.release(running)
+            controller.release(await waiter)
+
+        asyncio.run(scenario())
+
+
+class TestOrdering:
+    """우선순위 / backfill 테스트"""
+
+    def test_priority_order(self):
+        async def scenario():
+            controller = make_controller()
+            running = await controller.admit(cost(800, service_sec=5))
+            low = asyncio.create_task(controller.admit(cost(800, service_sec=5), priority=9))
+            await asyncio.sleep(0)
+            high = asyncio.create_task(controller.admit(cost(800, service_sec=5), priority=0))
+            await asyncio.sleep(0)
+
+            controller.release(running)
+            first = await asyncio.wait_for(high, 1)
+            assert not low.done()
+            controller.release(first)
+            controller.release(await asyncio.wait_for(low, 1))
+
+        asyncio.run(scenario())
+
+    def test_aging_promotes_old_request(self):
+        async def scenario():
+            controller = make_controller(aging_sec=1)
+            running = await controller.admit(cost(800, service_sec=5))
+            low = asyncio.create_task(controller.admit(cost(800, service_sec=5), priority=9))
+            await asyncio.sleep(0)
+            low_ticket = controller._waiting[0]
+            low_ticket.enqueued_at -= 20  # 20초 대기 → 우선순위 9 - 20 < 0
+            high = asyncio.create_task(controller.admit(cost(800, service_sec=5), priority=0))
+            await asyncio.sleep(0)
+
+            controller.release(running)
+            first = await asyncio.wait_for(low, 1)
+            assert first is low_ticket and not high.done()
+            controller.release(first)
+            controller.release(await asyncio.wait_for(high, 1))
+
+        asyncio.run(scenario())
+
+    def test_short_request_backfills(self):
+        async def scenario():
+            controller = make_controller()
+            running = await controller.admit(cost(600, service_sec=30))
+            big = asyncio.create_task(controller.admit(cost(800, service_sec=30)))
+            await asyncio.sleep(0)
+            # 맨 앞(big)은 30초 뒤에야 시작 → 그 전에 끝나는 작은 요청은 바로 승인
+            small = await asyncio.wait_for(controller.admit(cost(200, service_sec=5)), 1)
+            assert not big.done()
+            assert controller.status()["stats"]["backfilled"] == 1
+            controller.release(small)
+            controller.release(running)
+            controller.release(await asyncio.wait_for(big, 1))
+
+        asyncio.run(scenario())
+
+
+class TestStreamingRelease:
+    """스트리밍 응답 예약 반납 테스트"""
+
+    def test_cleanup_runs_when_body_never_starts(self):
+        """응답 시작 전송이 실패해 본문 생성기가 시작되지 않아도 예약 반납"""
+        async def scenario():
+            controller = make_controller()
+            ticket = await controller.admit(cost(400))
+            ticket.detach()
+
+            async def body():
+                try:
+                    yield b"{}\n"
+                finally:
+                    controller.release(ticket)
+
+            async def receive():
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                raise OSError("connection reset")
+
+            response = CleanupStreamingResponse(body(), cleanup=lambda: controller.release(ticket))
+            with pytest.raises(Exception):
+                await response({"type": "http"}, receive, send)
+            assert ticket.released
+            assert controller.reserved_mb == pytest.approx(0)
+
+        asyncio.run(scenario())
+
+
+class TestAdmittedMemoryGate:
+    """승인된 요청의 파일 검증 단계 메모리 확인 테스트"""
+
+    @pytest.fixture
+    def audio_path(self, tmp_path, monkeypatch):
+        path = tmp_path / "call.wav"
+        path.write_bytes(b"\0" * 64)
+        monkeypatch.setattr(transcribe_endpoint, "_allowed_audio_dir", lambda: tmp_path.resolve())
+        monkeypatch.setattr(transcribe_endpoint, "check_audio_file",
+                            lambda *args, **kwargs: {"valid": True, "errors": [], "warnings": []})
+        monkeypatch.setattr(transcribe_endpoint, "check_memory_available", lambda *args, **kwargs: {
+            "critical": True, "available_mb": 10, "used_percent": 99, "message": "메모리 부족"
+        })
+        return path
+
+    def test_admitted_request_not_rejected_again(self, audio_path):
+        """required_mb=None (승인 제어 통과)이면 메모리 부족이어도 거절하지 않음"""
+        path, _, memory_info = asyncio.run(validate_and_prepare_file(str(audio_path), required_mb=None))
+        assert path == audio_path.resolve()
+        assert memory_info["available_mb"] == 10
+
+    def test_legacy_gate_still_rejects(self, audio_path):
+        """승인 제어를 거치지 않는 경로(batch)는 기존 메모리 확인 유지"""
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(validate_and_prepare_file(str(audio_path), required_mb=4000))
+        assert exc_info.value.status_code == 503
@@ -0,0 +1,109 @@
+"""
+분석 결과 keyset 페이지네이션 테스트
+
+get_results_keyset의 커서 이동과 기존 get_results / get_result_detail과의 값 일치 유닛 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Web UI 모듈은 web_ui/를 패키지 루트로 사용
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_ui"))
+
+from app.models.database import AnalysisJob, AnalysisResult, Base  # noqa: E402
+from app.services.analysis_service import AnalysisService  # noqa: E402
+
+# (status, stt_metadata, improper_detection_results)
+RESULT_CASES = [
+    ("completed", {"confidence": 0.8}, {"detected_yn": "Y", "category": "부당권유"}),
+    ("completed", {"confidence": 0.9}, {"detected_yn": "N"}),
+    ("failed", {"error": "timeout"}, None),
+    ("processing", None, {"detected_sentences": []}),
+    ("completed", None, {}),
+    ("pending", None, None),
+    ("completed", {"language": "ko"}, {"detected_yn": "N", "category": "정상"}),
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(AnalysisJob(job_id="job-1", emp_id="E001", folder_path="2026-10-19",
+                            file_ids=[f"call{i}.wav" for i in range(len(RESULT_CASES))]))
+    for index, (status, metadata, detection) in enumerate(RESULT_CASES):
+        session.add(AnalysisResult(
+            job_id="job-1", file_id=f"call{index}.wav", status=status,
+            stt_text="상담 내용 " * (index * 50), stt_metadata=metadata, improper_detection_results=detection
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def collect_pages(db, page_size):
+    pages, cursor = [], None
+    while True:
+        page = AnalysisService.get_results_keyset("job-1", "E001", cursor=cursor, page_size=page_size, db=db)
+        pages.append(page)
+        if not page["has_more"]:
+            return pages
+        cursor = page["next_cursor"]
+
+
+class TestKeysetCursor:
+    """커서 이동 테스트"""
+
+    @pytest.mark.parametrize("page_size", [1, 3, 7, 20])
+    def test_pages_cover_all_rows_once(self, db, page_size):
+        pages = collect_pages(db, page_size)
+        filenames = [row["filename"] for page in pages for row in page["results"]]
+        assert filenames == [f"call{i}.wav" for i in range(len(RESULT_CASES))]
+        assert all(len(page["results"]) <= page_size for page in pages)
+        assert pages[-1]["next_cursor"] is None
+
+    def test_next_cursor_is_last_id(self, db):
+        page = AnalysisService.get_results_keyset("job-1", "E001", page_size=3, db=db)
+        assert page["has_more"] is True
+        assert page["next_cursor"] == page["results"][-1]["id"]
+
+    def test_total_count_approximate(self, db):
+        page = AnalysisService.get_results_keyset("job-1", "E001", page_size=3, include_total=True, db=db)
+        assert page["total_count"] == len(RESULT_CASES)
+        assert page["total_is_approximate"] is True
+
+    def test_other_employee_rejected(self, db):
+        with pytest.raises(ValueError):
+            AnalysisService.get_results_keyset("job-1", "E999", db=db)
+
+    def test_preview_truncated(self, db):
+        from config import RESULT_PREVIEW_CHARS
+
+        rows = collect_pages(db, 20)[0]["results"]
+        long_row = rows[-1]
+        assert len(long_row["stt_preview"]) <= RESULT_PREVIEW_CHARS
+        assert long_row["stt_length"] == len("상담 내용 " * ((len(RESULT_CASES) - 1) * 50))
+        assert long_row["stt_truncated"] is (long_row["stt_length"] > RESULT_PREVIEW_CHARS)
+
+
+class TestRowParity:
+    """기존 목록 / 상세 응답과 같은 값"""
+
+    def test_matches_legacy_and_detail(self, db):
+        legacy = AnalysisService.get_results("job-1", "E001", page_size=20, db=db)["results"]
+        keyset = collect_pages(db, 20)[0]["results"]
+        assert len(legacy) == len(keyset) == len(RESULT_CASES)
+        for old, new in zip(legacy, keyset):
+            detail = AnalysisService.get_result_detail("job-1", new["id"], "E001", db)
+            for key in ("filename", "status", "confidence", "risk_level"):
+                assert old[key] == new[key] == detail[key], (key, old["filename"])
+
+    def test_detection_summary(self, db):
+        rows = collect_pages(db, 20)[0]["results"]
+        assert (rows[0]["detected_yn"], rows[0]["category"]) == ("Y", "부당권유")
+        assert (rows[5]["detected_yn"], rows[5]["category"]) == (None, None)
@@ -0,0 +1,107 @@
+"""
+audio_frontend 테스트
+
+스트리밍 polyphase 리샘플러와 파일 블록 읽기(iter_audio_16k / load_audio_16k)의 유닛 테스트
+"""
+
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+
+sf = pytest.importorskip("soundfile")
+
+from utils.audio_frontend import (
+    StreamingResampler,
+    audio_length_16k,
+    iter_audio_16k,
+    load_audio_16k,
+)
+
+
+def one_shot(samples, sample_rate):
+    """블록 분할 없이 한 번에 리샘플한 기준 결과"""
+    resampler = StreamingResampler(sample_rate)
+    return np.concatenate([resampler.process(samples), resampler.flush()])
+
+
+def write_sine(path, sample_rate, seconds=3.0, channels=1):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    data = 0.3 * np.sin(2 * np.pi * 440 * t)
+    if channels > 1:
+        data = np.stack([data * (channel + 1) / channels for channel in range(channels)], axis=1)
+    sf.write(str(path), data, sample_rate, subtype="PCM_16")
+    return sf.read(str(path), dtype="float32", always_2d=True)[0]
+
+
+class TestStreamingResampler:
+    """StreamingResampler 클래스 테스트"""
+
+    @pytest.mark.parametrize("sample_rate", [8000, 44100, 48000])
+    def test_matches_resample_poly(self, sample_rate):
+        """한 번에 넣은 결과는 resample_poly와 같은 필터 (float32 오차 범위)"""
+        samples = np.random.default_rng(0).uniform(-0.3, 0.3, sample_rate * 2).astype(np.float32)
+        resampler = StreamingResampler(sample_rate)
+        expected = resample_poly(samples.astype(np.float64), resampler.up, resampler.down)
+        result = one_shot(samples, sample_rate)
+        assert len(result) == len(expected)
+        np.testing.assert_allclose(result, expected, atol=1e-4)
+
+    @pytest.mark.parametrize("block_size", [1, 7, 160, 4096])
+    def test_block_size_independent(self, block_size):
+        """블록 크기와 무관하게 같은 결과"""
+        samples = np.random.default_rng(1).uniform(-0.3, 0.3, 8000).astype(np.float32)
+        resampler = StreamingResampler(8000)
+        chunks = [resampler.process(samples[i:i + block_size]) for i in range(0, len(samples), block_size)]
+        result = np.concatenate(chunks + [resampler.flush()])
+        np.testing.assert_array_equal(result, one_shot(samples, 8000))
+
+    def test_reused_input_buffer(self):
+        """process() 후 호출자가 같은 버퍼를 덮어써도 필터 이력이 유지됨"""
+        samples = np.random.default_rng(2).uniform(-0.3, 0.3, 8000).astype(np.float32)
+        resampler = StreamingResampler(8000)
+        buffer = np.empty(1000, dtype=np.float32)
+        chunks = []
+        for i in range(0, len(samples), len(buffer)):
+            buffer[:] = samples[i:i + len(buffer)]
+            chunks.append(resampler.process(buffer))
+        result = np.concatenate(chunks + [resampler.flush()])
+        np.testing.assert_array_equal(result, one_shot(samples, 8000))
+
+    def test_same_rate_passthrough(self):
+        """16kHz 입력은 그대로 통과"""
+        samples = np.arange(100, dtype=np.float32)
+        resampler = StreamingResampler(16000)
+        np.testing.assert_array_equal(resampler.process(samples), samples)
+        assert len(resampler.flush()) == 0
+
+
+class TestFileInput:
+    """파일 블록 읽기 테스트 (sf.blocks가 out= 버퍼를 재사용)"""
+
+    @pytest.mark.parametrize("sample_rate", [8000, 44100])
+    def test_mono_file_small_blocks(self, tmp_path, sample_rate):
+        """mono 비 16kHz 파일을 작은 블록으로 읽어도 한 번에 리샘플한 결과와 같음"""
+        path = tmp_path / "mono.wav"
+        data = write_sine(path, sample_rate)
+        result = np.concatenate(list(iter_audio_16k(str(path), block_frames=4096)))
+        np.testing.assert_array_equal(result, one_shot(data[:, 0], sample_rate))
+
+    def test_stereo_file_downmix(self, tmp_path):
+        """stereo 파일은 채널 평균 후 리샘플"""
+        path = tmp_path / "stereo.wav"
+        data = write_sine(path, 8000, channels=2)
+        mono = (data[:, 0] + data[:, 1]) * np.float32(0.5)
+        result = np.concatenate(list(iter_audio_16k(str(path), block_frames=4096)))
+        np.testing.assert_array_equal(result, one_shot(mono, 8000))
+
+    def test_load_audio_16k_length(self, tmp_path):
+        """load_audio_16k 길이는 헤더 기준 예상 길이와 같고 공유 버퍼(out=)에도 채울 수 있음"""
+        path = tmp_path / "mono.wav"
+        data = write_sine(path, 8000)
+        expected = one_shot(data[:, 0], 8000)
+        assert audio_length_16k(str(path)) == len(expected)
+
+        out = np.zeros(len(expected) + 10, dtype=np.float32)
+        audio = load_audio_16k(str(path), block_frames=4096, out=out)
+        np.testing.assert_array_equal(audio, expected)
+        np.testing.assert_array_equal(out[:len(expected)], expected)
@@ -0,0 +1,171 @@
+"""
+blob 저장소 참조 카운트 / 저장 용량 테스트
+
+BlobService의 참조 카운트(중복 공유, 커밋 후 파일 삭제, 마지막 해제와의 경합)와
+FileService 업로드/삭제의 물리 사용량 기준 할당량 유닛 테스트
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Web UI 모듈은 web_ui/를 패키지 루트로 사용
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_ui"))
+
+import app.services.blob_service as blob_service  # noqa: E402
+from app.models.database import Base, Employee, StoredBlob  # noqa: E402
+from app.services.blob_service import BlobService  # noqa: E402
+from app.services.file_service import FileService  # noqa: E402
+from app.utils import file_utils  # noqa: E402
+
+AUDIO = b"RIFF" + b"\x01" * 2044
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_service, "BLOB_DIR", tmp_path / "uploads" / ".blobs")
+    monkeypatch.setattr(file_utils, "UPLOAD_DIR", tmp_path / "uploads")
+    return tmp_path
+
+
+@pytest.fixture
+def session_factory(storage):
+    # 두 세션이 같은 DB를 보도록 파일 기반 SQLite 사용
+    engine = create_engine(f"sqlite:///{storage / 'test.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add(Employee(emp_id="E001", name="상담원", storage_quota=3 * len(AUDIO), storage_used=0))
+        session.commit()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def temp_upload(data=AUDIO):
+    return BlobService.write_temp(io.BytesIO(data))
+
+
+def ref_count(db, content_hash):
+    db.expire_all()
+    blob = db.query(StoredBlob).filter(StoredBlob.content_hash == content_hash).first()
+    return blob.ref_count if blob else 0
+
+
+def upload(db, folder, data=AUDIO, filename="call.wav"):
+    return FileService.upload_file("E001", UploadFile(file=io.BytesIO(data), filename=filename), folder, db)
+
+
+def usage(db):
+    db.expire_all()
+    return db.query(Employee).filter(Employee.emp_id == "E001").one().storage_used
+
+
+class TestReferenceCount:
+    """참조 카운트 / 물리 파일 수명 테스트"""
+
+    def test_duplicate_content_shares_blob(self, db):
+        tmp1, content_hash, size = temp_upload()
+        tmp2, _, _ = temp_upload()
+        BlobService.acquire(tmp1, content_hash, size, db)
+        BlobService.acquire(tmp2, content_hash, size, db)
+        db.commit()
+
+        assert ref_count(db, content_hash) == 2
+        assert BlobService.get_blob_path(content_hash).read_bytes() == AUDIO
+        assert not tmp1.exists() and not tmp2.exists()
+
+    def test_file_removed_only_after_commit(self, db):
+        tmp, content_hash, size = temp_upload()
+        BlobService.acquire(tmp, content_hash, size, db)
+        db.commit()
+
+        assert BlobService.release(content_hash, db) == size
+        blob_path = BlobService.get_blob_path(content_hash)
+        assert blob_path.exists()
+        db.commit()
+        assert not blob_path.exists()
+        assert ref_count(db, content_hash) == 0
+
+    def test_rollback_keeps_file(self, db):
+        tmp, content_hash, size = temp_upload()
+        BlobService.acquire(tmp, content_hash, size, db)
+        db.commit()
+
+        BlobService.release(content_hash, db)
+        db.rollback()
+        db.commit()
+        assert BlobService.get_blob_path(content_hash).exists()
+        assert ref_count(db, content_hash) == 1
+
+    def test_acquire_races_last_release(self, db, session_factory, monkeypatch):
+        """조회 직후 다른 세션이 마지막 참조를 해제·커밋해도 새 blob으로 다시 등록"""
+        tmp, content_hash, size = temp_upload()
+        BlobService.acquire(tmp, content_hash, size, db)
+        db.commit()
+
+        original_add_ref = BlobService._add_ref
+        calls = []
+
+        def add_ref_after_release(blob, session):
+            if not calls:
+                with session_factory() as other:
+                    BlobService.release(content_hash, other)
+                    other.commit()
+            calls.append(blob)
+            return original_add_ref(blob, session)
+
+        monkeypatch.setattr(BlobService, "_add_ref", staticmethod(add_ref_after_release))
+        tmp, _, _ = temp_upload()
+        BlobService.acquire(tmp, content_hash, size, db)
+        db.commit()
+
+        assert ref_count(db, content_hash) == 1
+        assert BlobService.get_blob_path(content_hash).read_bytes() == AUDIO
+        assert not tmp.exists()
+
+
+class TestQuota:
+    """물리 사용량 기준 할당량 테스트"""
+
+    def test_duplicate_upload_charged_once(self, db):
+        upload(db, "폴더1")
+        upload(db, "폴더2")
+        assert usage(db) == len(AUDIO)
+
+        FileService.delete_file("E001", "call.wav", "폴더1", db)
+        assert usage(db) == len(AUDIO)
+        FileService.delete_file("E001", "call.wav", "폴더2", db)
+        assert usage(db) == 0
+
+    def test_last_delete_removes_blob(self, db):
+        upload(db, "폴더1")
+        content_hash = db.query(StoredBlob).one().content_hash
+        FileService.delete_file("E001", "call.wav", "폴더1", db)
+        assert not BlobService.get_blob_path(content_hash).exists()
+
+    def test_over_quota_rejected(self, db):
+        upload(db, "폴더1", data=AUDIO * 2)
+        with pytest.raises(HTTPException) as exc_info:
+            upload(db, "폴더2", data=AUDIO * 2 + b"\x02")
+        assert exc_info.value.status_code == 413
+        assert usage(db) == 2 * len(AUDIO)
+        assert db.query(StoredBlob).count() == 1
+        assert not list((Path(blob_service.BLOB_DIR) / "tmp").iterdir())
+
+    def test_upload_without_db_skips_blob_store(self, storage):
+        upload(None, "폴더1")
+        assert (storage / "uploads" / "E001" / "폴더1" / "call.wav").read_bytes() == AUDIO
+        assert not any(p.is_file() for p in Path(blob_service.BLOB_DIR).rglob("*") if p.parent.name != "tmp")
+        assert not list((Path(blob_service.BLOB_DIR) / "tmp").iterdir())
@@ -0,0 +1,173 @@
+"""
+EngineManager 테스트
+
+프리셋별 엔진 lease / lazy load / 메모리 예산 LRU 제거의 유닛 테스트
+(실제 모델 대신 로드/언로드만 기록하는 테스트용 엔진 사용)
+"""
+
+import asyncio
+
+import pytest
+
+from api_server import engine_manager as engine_manager_module
+from api_server.constants import PRESET_SEGMENT_CONFIG
+from api_server.engine_manager import EngineManager, EngineUnavailableError
+
+
+class FakeEngine:
+    """WhisperSTT 대역 (EngineManager가 사용하는 속성만)"""
+
+    def __init__(self, preset=None, compute_type="float32"):
+        self.preset = preset
+        self.compute_type = compute_type
+        self.device = "cpu"
+        self.model_path = "/models/fake"
+        self.custom_segment_config = {}
+        self.unloaded = False
+
+    def unload(self):
+        self.unloaded = True
+
+    def _get_current_backend_name(self):
+        return "fake"
+
+
+def make_manager(monkeypatch, budget_mb, wait_sec=1.0):
+    monkeypatch.setattr(engine_manager_module, "ENGINE_MEMORY_BUDGET_MB", budget_mb)
+    monkeypatch.setattr(engine_manager_module, "ENGINE_SWAP_WAIT_SEC", wait_sec)
+    manager = EngineManager()
+    manager.built = []
+
+    def build_engine(base, backend, compute_type, device, preset):
+        engine = FakeEngine(preset, PRESET_SEGMENT_CONFIG[preset]["compute_type"])
+        manager.built.append(engine)
+        return engine, {"status": "success"}
+
+    manager._build_engine = build_engine
+    manager.install(FakeEngine())  # 기본 엔진 float32 3300MB
+    return manager
+
+
+async def settle():
+    """언로드 태스크(asyncio.to_thread) 완료 대기"""
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+class TestLease:
+    """lease / lazy load 테스트"""
+
+    def test_default_engine(self, monkeypatch):
+        async def scenario():
+            manager = make_manager(monkeypatch, budget_mb=10000)
+            async with manager.lease() as engine:
+                assert engine is manager.current
+                assert manager.get_status()["in_flight"] == 1
+            assert manager.get_status()["in_flight"] == 0
+
+        asyncio.run(scenario())
+
+    def test_preset_loaded_once_for_concurrent_requests(self, monkeypatch):
+        async def scenario():
+            manager = make_manager(monkeypatch, budget_mb=10000)
+
+            async def use():
+                async with manager.lease("speed") as engine:
+                    await asyncio.sleep(0.01)
+                    return engine
+
+            engines = await asyncio.gather(*(use() for _ in range(5)))
+            assert len(manager.built) == 1
+            assert all(engine is manager.built[0] for engine in engines)
+            assert manager.get_status()["lazy_loads"] == 1
+
+        asyncio.run(scenario())
+
+    def test_budget_cannot_fit(self, monkeypatch):
+        """기본 엔진만으로 예산이 차면 즉시 EngineUnavailableError"""
+        async def scenario():
+            manager = make_manager(monkeypatch, budget_mb=3500)
+            with pytest.raises(EngineUnavailableError):
+                async with manager.lease("balanced"):
+                    pass
+
+        asyncio.run(scenario())
+
+
+class TestEviction:
+    """메모리 예산 LRU 제거 테스트"""
+
+    def test_idle_lru_engine_evicted(self, monkeypatch):
+        async def scenario():
+            # 기본(3300) + balanced(1800) + speed(1100)는 예산 초과 → 가장 오래된 유휴 엔진 제거
+            manager = make_manager(monkeypatch, budget_mb=3300 + 1800 + 1100 + 500)
+            async with manager.lease("balanced"):
+                pass
+            async with manager.lease("speed"):
+                pass
+            async with manager.lease("balanced"):
+                pass  # balanced가 최근 사용 → speed가 LRU
+            async with manager.lease("cpu_int8"):
+                pass
+            await settle()
+
+            status = manager.get_status()
+            assert {engine["key"] for engine in status["engines"]} == {"default", "balanced", "cpu_int8"}
+            assert status["evictions"] == 1
+            speed = next(engine for engine in manager.built if engine.preset == "speed")
+            assert speed.unloaded
+
+        asyncio.run(scenario())
+
+    def test_default_engine_never_evicted(self, monkeypatch):
+        async def scenario():
+            manager = make_manager(monkeypatch, budget_mb=3300 + 1800 + 500)
+            async with manager.lease("balanced"):
+                pass
+            async with manager.lease("speed"):
+                pass
+            await settle()
+            keys = {engine["key"] for engine in manager.get_status()["engines"]}
+            assert keys == {"default", "speed"}
+            assert not manager.current.unloaded
+
+        asyncio.run(scenario())
+
+    def test_in_use_engine_waits_for_release(self, monkeypatch):
+        """사용 중인 엔진은 제거하지 않고 반납을 기다린 뒤 제거"""
+        async def scenario():
+            manager = make_manager(monkeypatch, budget_mb=3300 + 1800 + 500, wait_sec=5.0)
+            release = asyncio.Event()
+
+            async def hold_balanced():
+                async with manager.lease("balanced"):
+                    await release.wait()
+
+            holder = asyncio.create_task(hold_balanced())
+            await asyncio.sleep(0.01)
+            speed_lease = manager.lease("speed")
+            waiter = asyncio.create_task(speed_lease.__aenter__())
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            assert not any(engine.preset == "speed" for engine in manager.built)
+
+            release.set()
+            await holder
+            engine = await asyncio.wait_for(waiter, 1)
+            assert engine.preset == "speed"
+            await speed_lease.__aexit__(None, None, None)
+            await settle()
+            balanced = next(e for e in manager.built if e.preset == "balanced")
+            assert balanced.unloaded
+
+        asyncio.run(scenario())
+
+    def test_in_use_engine_wait_timeout(self, monkeypatch):
+        async def scenario():
+            manager = make_manager(monkeypatch, budget_mb=3300 + 1800 + 500, wait_sec=0.1)
+            async with manager.lease("balanced"):
+                with pytest.raises(EngineUnavailableError):
+                    async with manager.lease("speed"):
+                        pass
+
+        asyncio.run(scenario())
@@ -0,0 +1,126 @@
+"""
+Range 응답 테스트
+
+Web UI 오디오 스트리밍의 Range 헤더 파싱과 206 / 304 / 416 / If-Range 처리 유닛 테스트
+"""
+
+import importlib.util
+from email.utils import formatdate
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Web UI는 별도 패키지 루트(web_ui/)를 사용하므로 모듈 파일을 직접 로드
+_MODULE_PATH = Path(__file__).parent.parent / "web_ui" / "app" / "utils" / "range_response.py"
+_spec = importlib.util.spec_from_file_location("web_ui_range_response", _MODULE_PATH)
+range_response = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(range_response)
+
+parse_range_header = range_response.parse_range_header
+
+
+class TestParseRangeHeader:
+    """parse_range_header 테스트"""
+
+    def test_closed_range(self):
+        assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+
+    def test_open_range(self):
+        assert parse_range_header("bytes=500-", 1000) == (500, 999)
+
+    def test_suffix_range(self):
+        assert parse_range_header("bytes=-100", 1000) == (900, 999)
+
+    def test_suffix_larger_than_file(self):
+        assert parse_range_header("bytes=-5000", 1000) == (0, 999)
+
+    def test_end_clamped_to_file_size(self):
+        assert parse_range_header("bytes=900-5000", 1000) == (900, 999)
+
+    def test_whitespace_and_unit_case(self):
+        assert parse_range_header("Bytes= 10-19", 1000) == (10, 19)
+
+    @pytest.mark.parametrize("header", ["items=0-10", "bytes=0-10,20-30", "bytes=10"])
+    def test_unsupported_returns_none(self, header):
+        """지원하지 않는 단위/다중 범위는 전체 응답"""
+        assert parse_range_header(header, 1000) is None
+
+    @pytest.mark.parametrize("header", ["bytes=abc-", "bytes=abc-10", "bytes=-", "bytes=--5", "bytes=1.5-2",
+                                        "bytes=20-10"])
+    def test_invalid_returns_none(self, header):
+        """형식이 잘못된 Range는 무시하고 전체 응답 (RFC 9110)"""
+        assert parse_range_header(header, 1000) is None
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=1500-1600", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        """형식은 맞지만 파일 밖 범위는 416"""
+        with pytest.raises(ValueError):
+            parse_range_header(header, 1000)
+
+
+class TestBuildRangeResponse:
+    """build_range_response 테스트 (200 / 206 / 304 / 416 / If-Range)"""
+
+    @pytest.fixture
+    def audio_file(self, tmp_path):
+        path = tmp_path / "call.wav"
+        path.write_bytes(bytes(range(256)) * 40)  # 10240 bytes
+        return path
+
+    @pytest.fixture
+    def client(self, audio_file):
+        app = FastAPI()
+
+        @app.get("/audio")
+        def audio(request: Request):
+            return range_response.build_range_response(request, audio_file, "audio/wav", filename="통화.wav")
+
+        return TestClient(app)
+
+    def test_full_response(self, client, audio_file):
+        response = client.get("/audio")
+        assert response.status_code == 200
+        assert response.content == audio_file.read_bytes()
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-length"] == str(audio_file.stat().st_size)
+
+    def test_partial_response(self, client, audio_file):
+        response = client.get("/audio", headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.content == audio_file.read_bytes()[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{audio_file.stat().st_size}"
+        assert response.headers["content-length"] == "100"
+
+    def test_invalid_range_ignored(self, client, audio_file):
+        response = client.get("/audio", headers={"Range": "bytes=abc-"})
+        assert response.status_code == 200
+        assert response.content == audio_file.read_bytes()
+
+    def test_unsatisfiable_range(self, client, audio_file):
+        response = client.get("/audio", headers={"Range": "bytes=999999-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{audio_file.stat().st_size}"
+
+    def test_not_modified(self, client):
+        etag = client.get("/audio").headers["etag"]
+        response = client.get("/audio", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_if_range_matching_etag(self, client):
+        etag = client.get("/audio").headers["etag"]
+        response = client.get("/audio", headers={"Range": "bytes=0-9", "If-Range": etag})
+        assert response.status_code == 206
+
+    def test_if_range_matching_date(self, client, audio_file):
+        last_modified = formatdate(audio_file.stat().st_mtime, usegmt=True)
+        response = client.get("/audio", headers={"Range": "bytes=0-9", "If-Range": last_modified})
+        assert response.status_code == 206
+
+    def test_if_range_stale_returns_full(self, client, audio_file):
+        """파일이 바뀌어 If-Range가 맞지 않으면 전체 파일(200)"""
+        response = client.get("/audio", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        assert response.status_code == 200
+        assert response.content == audio_file.read_bytes()
@@ -0,0 +1,165 @@
+"""
+응답 인코딩 테스트
+
+/transcribe 응답의 필드 선택(fields / exclude / omit_original_text), Accept-Encoding 협상,
+압축 응답 생성의 유닛 테스트
+"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+from starlette.requests import Request
+
+from api_server import response_encoding
+from api_server.models import TranscribeResponse
+from api_server.response_encoding import (
+    FieldSelection,
+    ResponseEncoder,
+    negotiate_encoding,
+    parse_field_paths,
+)
+
+
+def make_response(privacy_removal=True):
+    return TranscribeResponse(
+        success=True, text="원문 텍스트 " * 200, language="ko", duration=12.0, backend="faster-whisper",
+        segments=[{"start": 0.0, "end": 6.0, "text": "원문"}, {"start": 6.0, "end": 12.0, "text": "텍스트"}],
+        file_size_mb=0.4,
+        privacy_removal={"privacy_exist": "Y", "exist_reason": "이름", "text": "[이름] 텍스트"}
+        if privacy_removal else None,
+        element_detection={"detected_yn": "N", "detected_sentences": []},
+        processing_steps={"stt": True, "privacy_removal": privacy_removal},
+        processing_time_seconds=3.0
+    )
+
+
+def make_request(accept_encoding=None):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    return Request({"type": "http", "method": "POST", "path": "/transcribe", "headers": headers})
+
+
+class TestParseFieldPaths:
+    """parse_field_paths 테스트"""
+
+    def test_empty(self):
+        assert parse_field_paths(TranscribeResponse, "") is None
+        assert parse_field_paths(TranscribeResponse, " , ") is None
+
+    def test_top_level_fields(self):
+        assert parse_field_paths(TranscribeResponse, "success, text") == {"success": True, "text": True}
+
+    def test_nested_model_field(self):
+        assert parse_field_paths(TranscribeResponse, "processing_steps.stt") == \
+            {"processing_steps": {"stt": True}}
+
+    def test_list_field_applies_to_all_items(self):
+        assert parse_field_paths(TranscribeResponse, "segments.text") == \
+            {"segments": {"__all__": {"text": True}}}
+
+    def test_dict_field_keys_not_validated(self):
+        assert parse_field_paths(TranscribeResponse, "element_detection.detected_yn") == \
+            {"element_detection": {"detected_yn": True}}
+
+    def test_whole_field_wins_over_subpath(self):
+        assert parse_field_paths(TranscribeResponse, "segments,segments.text") == {"segments": True}
+
+    @pytest.mark.parametrize("spec", ["unknown", "processing_steps.unknown", "segments.speaker"])
+    def test_unknown_field(self, spec):
+        with pytest.raises(ValueError, match="알 수 없는 필드"):
+            parse_field_paths(TranscribeResponse, spec)
+
+
+class TestFieldSelection:
+    """FieldSelection 테스트"""
+
+    def test_include(self):
+        selection = FieldSelection(TranscribeResponse, fields="success,processing_steps.stt")
+        assert selection.dump(make_response()) == {"success": True, "processing_steps": {"stt": True}}
+
+    def test_exclude(self):
+        dumped = FieldSelection(TranscribeResponse, exclude="segments,text").dump(make_response())
+        assert "segments" not in dumped and "text" not in dumped
+        assert dumped["privacy_removal"]["text"] == "[이름] 텍스트"
+
+    def test_omit_original_text_with_privacy_removal(self):
+        dumped = FieldSelection(TranscribeResponse, omit_original_text=True).dump(make_response())
+        assert "text" not in dumped and "segments" not in dumped
+        assert "privacy_removal" in dumped
+
+    def test_omit_original_text_without_privacy_removal(self):
+        """Privacy Removal 결과가 없으면 원문 유지"""
+        dumped = FieldSelection(TranscribeResponse, omit_original_text=True).dump(make_response(False))
+        assert "text" in dumped and "segments" in dumped
+
+
+class TestNegotiateEncoding:
+    """negotiate_encoding 테스트"""
+
+    @pytest.fixture
+    def without_brotli(self, monkeypatch):
+        monkeypatch.setattr(response_encoding, "brotli", None)
+
+    @pytest.fixture
+    def with_brotli(self, monkeypatch):
+        monkeypatch.setattr(response_encoding, "brotli", object())
+
+    @pytest.mark.parametrize("header, expected", [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("*;q=0.5, gzip;q=0", None),
+        ("GZIP;q=0.8", "gzip"),
+        ("gzip;q=abc", None),
+    ])
+    def test_without_brotli(self, without_brotli, header, expected):
+        assert negotiate_encoding(header) == expected
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br", "br"),
+        ("*", "br"),
+    ])
+    def test_with_brotli(self, with_brotli, header, expected):
+        assert negotiate_encoding(header) == expected
+
+
+class TestResponseEncoder:
+    """ResponseEncoder.render 테스트"""
+
+    @pytest.fixture
+    def encoder(self, monkeypatch):
+        monkeypatch.setattr(response_encoding, "brotli", None)
+        encoder = ResponseEncoder()
+        encoder.configure(min_bytes=1024, gzip_level=1)
+        return encoder
+
+    def test_gzip_above_threshold(self, encoder):
+        response = asyncio.run(encoder.render(make_response(), make_request("gzip")))
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        body = json.loads(gzip.decompress(response.body))
+        assert body == json.loads(make_response().model_dump_json())
+
+    def test_identity_without_accept_encoding(self, encoder):
+        response = asyncio.run(encoder.render(make_response(), make_request()))
+        assert "content-encoding" not in response.headers
+        assert json.loads(response.body)["success"] is True
+
+    def test_small_body_not_compressed(self, encoder):
+        selection = FieldSelection(TranscribeResponse, fields="success")
+        response = asyncio.run(encoder.render(make_response(), make_request("gzip"), selection))
+        assert "content-encoding" not in response.headers
+        assert json.loads(response.body) == {"success": True}
+
+    def test_extra_headers_and_indent(self, encoder):
+        response = asyncio.run(encoder.render(
+            make_response(), make_request(), headers={"Content-Disposition": "attachment"}, indent=2
+        ))
+        assert response.headers["content-disposition"] == "attachment"
+        assert response.body.startswith(b"{\n  ")
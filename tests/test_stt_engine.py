@@ -0,0 +1,126 @@
+"""
+WhisperSTT 모델 접근 직렬화 테스트
+
+스레드에서 동시에 호출되는 transcribe_async() / transcribe_window()가 같은 transformers 모델을
+엔진당 한 요청씩 사용하고, 실시간 디코딩 전에 모델을 장치로 올리는지 검증하는 유닛 테스트
+(모델 대신 가짜 백엔드 사용)
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+from stt_engine import WhisperSTT
+
+
+class ConcurrencyProbe:
+    """동시에 모델을 사용 중인 호출 수의 최댓값 기록"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, result):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return result
+
+
+class FakeFeatures:
+    """processor 출력 (장치 이동 기록)"""
+
+    def __init__(self, devices):
+        self.input_features = self
+        self.devices = devices
+
+    def to(self, target):
+        self.devices.append(target)
+        return self
+
+
+class FakeModel:
+    """model.to() / model.cpu() 호출로 현재 장치를 추적"""
+
+    dtype = "float32"
+
+    def __init__(self):
+        self.device = "cpu"
+
+    def to(self, device):
+        self.device = device
+        return self
+
+    def cpu(self):
+        self.device = "cpu"
+        return self
+
+
+def make_stt(device="cpu"):
+    """모델 로드 없이 transformers 백엔드를 가진 인스턴스 생성"""
+    stt = WhisperSTT.__new__(WhisperSTT)
+    stt.device = device
+    stt.preset = None
+    stt.worker_pool = None
+    stt.model_lock = threading.Lock()
+    devices = []
+    stt.backend = type('TransformersBackend', (), {
+        'model': FakeModel(),
+        'processor': staticmethod(lambda audio, sampling_rate, return_tensors: FakeFeatures(devices)),
+        '_backend_type': 'transformers'
+    })()
+    return stt
+
+
+class TestModelLock:
+    """엔진당 모델 접근 직렬화 테스트"""
+
+    def test_transcribe_async_serializes_in_process_transformers(self, tmp_path, monkeypatch):
+        audio_path = tmp_path / "call.wav"
+        audio_path.write_bytes(b"RIFF")
+        stt = make_stt()
+        probe = ConcurrencyProbe()
+        monkeypatch.setattr(stt, "_transcribe_with_transformers",
+                            lambda path, language, on_segment=None: probe({"success": True, "text": "ok"}))
+
+        async def run():
+            ticks = []
+
+            async def ticker():
+                # 변환 중에도 이벤트 루프가 다른 작업을 처리하는지 확인
+                for _ in range(10):
+                    ticks.append(probe.active)
+                    await asyncio.sleep(0.01)
+
+            results = await asyncio.gather(
+                *(stt.transcribe_async(str(audio_path), language="ko") for _ in range(3)), ticker()
+            )
+            return results[:3], ticks
+
+        results, ticks = asyncio.run(run())
+        assert [result["text"] for result in results] == ["ok"] * 3
+        assert probe.peak == 1
+        assert any(ticks)
+
+    def test_window_moves_model_to_device_under_lock(self, monkeypatch):
+        """파일 변환 후 model.cpu()로 내려간 모델도 실시간 디코딩 전에 cuda로 다시 올림"""
+        stt = make_stt(device="cuda")
+        stt.backend.model.cpu()
+        seen = []
+
+        def generate(input_features, language, num_beams, do_sample):
+            seen.append((stt.model_lock.locked(), stt.backend.model.device, input_features.devices[-1]))
+            return None, "안녕하세요 고객님", None
+
+        monkeypatch.setattr(stt, "_generate_with_logprob", generate)
+        result = stt.transcribe_window(np.zeros(16000, dtype=np.float32), language="ko")
+
+        assert seen == [(True, "cuda", "cuda")]
+        assert [word["word"] for word in result["words"]] == ["안녕하세요", "고객님"]
+        assert all(word["start"] is None and word["end"] is None for word in result["words"])
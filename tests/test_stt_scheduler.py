@@ -0,0 +1,269 @@
+"""
+STTScheduler 테스트
+
+Web UI의 STT API 요청 스케줄러(WFQ 공정 분배 + AIMD 동시 요청 한도) 유닛 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Web UI 모듈은 web_ui/를 패키지 루트로 사용
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_ui"))
+
+from app.services import stt_scheduler as scheduler_module  # noqa: E402
+from app.services.stt_scheduler import STTScheduler  # noqa: E402
+
+
+@pytest.fixture
+def make_scheduler(monkeypatch):
+    def factory(limit=1, capacity=8, backoff=0.5, small_job_files=5, small_job_weight=4.0):
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_MIN_INFLIGHT", 1)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_MAX_INFLIGHT", capacity)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_INITIAL_LIMIT", limit)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_BACKOFF", backoff)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_SMALL_JOB_FILES", small_job_files)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_SMALL_JOB_WEIGHT", small_job_weight)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_CAPACITY_POLL_SEC", 1e9)
+        scheduler = STTScheduler()
+        scheduler._last_capacity_poll = time.monotonic()  # STT API 슬롯 조회 생략
+        return scheduler
+    return factory
+
+
+async def run_in_order(scheduler, requests):
+    """
+    슬롯 1개를 잡아둔 상태에서 요청을 모두 대기열에 넣고 배정 순서 반환
+
+    Args:
+        requests: [(이름, emp_id, job_id, job_size), ...] (넣는 순서)
+    """
+    order = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot("blocker", "job-blocker", 100):
+            await release.wait()
+
+    async def request(name, emp_id, job_id, job_size):
+        async with scheduler.slot(emp_id, job_id, job_size):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    blocking = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = []
+    for item in requests:
+        tasks.append(asyncio.create_task(request(*item)))
+        await asyncio.sleep(0)
+    assert scheduler.get_stats()["queued"] == len(requests)
+
+    release.set()
+    await asyncio.gather(blocking, *tasks)
+    return order
+
+
+class TestFairQueueing:
+    """가중 공정 큐잉 테스트"""
+
+    def test_employees_share_equally(self, make_scheduler):
+        """먼저 많이 넣은 사번이 있어도 사번끼리 번갈아 배정"""
+        scheduler = make_scheduler(limit=1)
+        requests = [(f"a{i}", "A", "job-a", 100) for i in range(4)] + \
+                   [(f"b{i}", "B", "job-b", 100) for i in range(2)]
+        order = asyncio.run(run_in_order(scheduler, requests))
+        assert order == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+    def test_small_job_weighted(self, make_scheduler):
+        """같은 사번의 작은 작업(재실행 등)은 큰 작업 뒤에서 오래 기다리지 않음"""
+        scheduler = make_scheduler(limit=1, small_job_files=5, small_job_weight=4.0)
+        requests = [(f"big{i}", "A", "job-big", 100) for i in range(3)] + \
+                   [(f"small{i}", "A", "job-small", 3) for i in range(3)]
+        order = asyncio.run(run_in_order(scheduler, requests))
+        assert order == ["big0", "small0", "small1", "small2", "big1", "big2"]
+
+    def test_limit_bounds_in_flight(self, make_scheduler):
+        scheduler = make_scheduler(limit=2)
+
+        async def scenario():
+            peak = 0
+
+            async def request(index):
+                nonlocal peak
+                async with scheduler.slot("A", "job", 100):
+                    peak = max(peak, scheduler.get_stats()["in_flight"])
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(request(i) for i in range(6)))
+            return peak
+
+        assert asyncio.run(scenario()) == 2
+        stats = scheduler.get_stats()
+        assert stats["in_flight"] == 0 and stats["queued"] == 0 and stats["flows"] == []
+
+    def test_cancelled_waiter_leaves_queue(self, make_scheduler):
+        scheduler = make_scheduler(limit=1)
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def blocker():
+                async with scheduler.slot("A", "job", 100):
+                    await release.wait()
+
+            async def waiter():
+                async with scheduler.slot("B", "job", 100):
+                    pass
+
+            blocking = asyncio.create_task(blocker())
+            await asyncio.sleep(0)
+            waiting = asyncio.create_task(waiter())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            assert scheduler.get_stats()["queued"] == 0
+            release.set()
+            await blocking
+
+        asyncio.run(scenario())
+        assert scheduler.get_stats()["in_flight"] == 0
+
+
+class TestAIMD:
+    """동시 요청 한도 조정 테스트"""
+
+    @staticmethod
+    def complete(scheduler, result):
+        async def scenario():
+            async with scheduler.slot("A", "job", 100) as ticket:
+                ticket.report(result)
+
+        asyncio.run(scenario())
+
+    def test_overload_halves_limit_once(self, make_scheduler):
+        scheduler = make_scheduler(limit=4, backoff=0.5)
+        self.complete(scheduler, {"api_status": 503})
+        assert scheduler.get_stats()["limit"] == 2.0
+        # 직후의 과부하 응답은 같은 혼잡으로 보고 한 번만 감소
+        self.complete(scheduler, {"api_status": 429})
+        assert scheduler.get_stats()["limit"] == 2.0
+        assert scheduler.get_stats()["overloads"] == 2
+
+    def test_limit_never_below_minimum(self, make_scheduler):
+        scheduler = make_scheduler(limit=1, backoff=0.5)
+        self.complete(scheduler, {"api_status": "timeout"})
+        assert scheduler.get_stats()["limit"] == 1.0
+
+    def test_success_increases_up_to_capacity(self, make_scheduler):
+        scheduler = make_scheduler(limit=2, capacity=3)
+        self.complete(scheduler, {"api_status": 200, "api_elapsed_sec": 10.0, "duration_sec": 60.0})
+        assert scheduler.get_stats()["limit"] == 2.5
+        for _ in range(10):
+            self.complete(scheduler, {"api_status": 200, "api_elapsed_sec": 10.0, "duration_sec": 60.0})
+        assert scheduler.get_stats()["limit"] == 3.0
+
+    def test_latency_spike_decreases(self, make_scheduler):
+        scheduler = make_scheduler(limit=4)
+        self.complete(scheduler, {"api_status": 200, "api_elapsed_sec": 6.0, "duration_sec": 60.0})
+        limit = scheduler.get_stats()["limit"]
+        # 초당 처리 시간이 최저값의 수 배로 증가 → 0.9배 감소
+        self.complete(scheduler, {"api_status": 200, "api_elapsed_sec": 120.0, "duration_sec": 60.0})
+        stats = scheduler.get_stats()
+        assert stats["latency_backoffs"] == 1
+        assert stats["limit"] == pytest.approx(limit * 0.9, abs=0.01)
+
+
+class TestOverloadRequeue:
+    """과부하 응답 시 슬롯 반납 후 재대기 테스트"""
+
+    def test_slot_released_during_backoff(self, make_scheduler):
+        scheduler = make_scheduler(limit=1)
+        order = []
+
+        async def scenario():
+            async def retried():
+                async with scheduler.slot("A", "job-a", 100) as ticket:
+                    order.append("A-1")
+                    ticket.report({"success": False, "api_status": 503, "retry_after": 0.05})
+                    assert ticket.overloaded
+                    await ticket.requeue(0)
+                    order.append("A-2")
+                    ticket.report({"success": True, "api_status": 200, "api_elapsed_sec": 1.0})
+
+            async def other():
+                await asyncio.sleep(0.01)
+                async with scheduler.slot("B", "job-b", 100):
+                    order.append("B")
+
+            await asyncio.gather(retried(), other())
+
+        asyncio.run(scenario())
+        stats = scheduler.get_stats()
+        assert order == ["A-1", "B", "A-2"]
+        assert stats["requeued"] == 1 and stats["overloads"] == 1
+        assert stats["in_flight"] == 0 and stats["flows"] == []
+
+    def test_backoff_without_retry_after(self, make_scheduler, monkeypatch):
+        scheduler = make_scheduler(limit=1)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_RETRY_BASE_SEC", 5.0)
+        monkeypatch.setattr(scheduler_module, "STT_SCHEDULER_RETRY_MAX_SEC", 30.0)
+        delays = []
+
+        async def fake_requeue(ticket, delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(scheduler, "_requeue", fake_requeue)
+
+        async def scenario():
+            async with scheduler.slot("A", "job", 100) as ticket:
+                ticket.report({"api_status": "timeout"})
+                for attempt in range(4):
+                    await ticket.requeue(attempt)
+                ticket.report({"api_status": 429, "retry_after": 7})
+                await ticket.requeue(0)
+
+        asyncio.run(scenario())
+        assert delays == [5.0, 10.0, 20.0, 30.0, 7]
+
+    def test_cancel_during_backoff(self, make_scheduler):
+        scheduler = make_scheduler(limit=1)
+
+        async def scenario():
+            async def retried():
+                async with scheduler.slot("A", "job", 100) as ticket:
+                    ticket.report({"api_status": 503, "retry_after": 10})
+                    await ticket.requeue(0)
+
+            task = asyncio.create_task(retried())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(scenario())
+        stats = scheduler.get_stats()
+        assert stats["in_flight"] == 0 and stats["flows"] == []
+
+
+class TestSTTServiceFailure:
+    """스케줄 경로의 STT API 실패 응답 테스트 (Dummy 응답 없음)"""
+
+    def test_overload_failure_carries_retry_after(self):
+        from app.services.stt_service import stt_service
+
+        result = asyncio.run(stt_service._failure_response(
+            False, "ko", "/tmp/a.wav", "stt_overloaded", "busy", 503, 0.2,
+            retry_after=stt_service._parse_retry_after("12")
+        ))
+        assert result == {"success": False, "error": "stt_overloaded", "message": "busy",
+                          "retry_after": 12.0, "api_status": 503, "api_elapsed_sec": 0.2}
+
+    @pytest.mark.parametrize("value", [None, "", "Wed, 21 Oct 2015 07:28:00 GMT"])
+    def test_unparsable_retry_after(self, value):
+        from app.services.stt_service import stt_service
+
+        assert stt_service._parse_retry_after(value) is None
@@ -0,0 +1,209 @@
+"""
+CPUWorkerPool 테스트
+
+워커별 배정, 시작 보고 전 비정상 종료, 요청 제한 시간, 취소 전달의 유닛 테스트
+(워커 프로세스 대신 스레드로 동작하는 가짜 multiprocessing context 사용)
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+import stt_worker_pool  # noqa: E402
+from stt_worker_pool import CPUWorkerPool  # noqa: E402
+
+
+class FakeProcess:
+    """워커 프로세스 대신 behaviour(worker_id, task_queue, result_queue, cancel_event, process)를 스레드로 실행"""
+
+    _pids = iter(range(1000, 10000))
+
+    def __init__(self, target, args, name=None, daemon=None, behaviour=None):
+        self.worker_id = args[0]
+        self.task_queue, self.result_queue, self.cancel_event = args[-3:]
+        self.behaviour = behaviour
+        self.pid = next(self._pids)
+        self.exitcode = None
+        self.alive = False
+        self.terminated = False
+
+    def start(self):
+        self.alive = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        self.result_queue.put(("ready", self.worker_id, self.pid, None))
+        try:
+            self.behaviour(self)
+        finally:
+            self.alive = False
+            self.exitcode = self.exitcode if self.exitcode is not None else 0
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.terminated = True
+        self.exitcode = -15
+        self.task_queue.put(None)
+
+    def join(self, timeout=None):
+        pass
+
+
+class FakeContext:
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.processes = []
+
+    Queue = staticmethod(queue.Queue)
+    Event = staticmethod(threading.Event)
+
+    def Process(self, target, args, name=None, daemon=None):
+        process = FakeProcess(target, args, name, daemon, behaviour=self.behaviour)
+        self.processes.append(process)
+        return process
+
+
+def echo(process):
+    """정상 워커: 작업마다 바로 결과 반환"""
+    while True:
+        task = process.task_queue.get()
+        if task is None or process.terminated:
+            return
+        process.result_queue.put(("done", process.worker_id, task[0], {"success": True, "text": f"req-{task[0]}"}))
+
+
+@pytest.fixture
+def audio_path(tmp_path):
+    path = tmp_path / "call.wav"
+    sf.write(str(path), np.zeros(1600, dtype=np.float32), 16000, subtype="PCM_16")
+    return str(path)
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    pools = []
+    monkeypatch.setattr(stt_worker_pool, "_WAIT_POLL_SEC", 0.02)
+
+    def factory(behaviour, num_workers=1, timeout_sec=30.0):
+        monkeypatch.setattr(stt_worker_pool, "WORKER_REQUEST_TIMEOUT_SEC", timeout_sec)
+        pool = CPUWorkerPool(num_workers)
+        pool._ctx = FakeContext(behaviour)
+        pool._result_queue = queue.Queue()
+        pool._core_groups = [[0]] * num_workers
+        pool._worker_args = (None, None, None, {})
+        for worker_id in range(num_workers):
+            pool._spawn(worker_id)
+        pool._reader = threading.Thread(target=pool._read_results, daemon=True)
+        pool._reader.start()
+        deadline = time.time() + 5
+        while len(pool._ready) < num_workers and time.time() < deadline:
+            time.sleep(0.01)
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.stop()
+
+
+class TestDispatch:
+    """워커별 배정 테스트"""
+
+    def test_requests_processed(self, make_pool, audio_path):
+        pool = make_pool(echo, num_workers=2)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.transcribe(audio_path))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert sorted(result["text"] for result in results) == [f"req-{i}" for i in range(1, 6)]
+        stats = pool.get_stats()
+        assert stats["completed"] == 5 and stats["busy"] == 0 and stats["queued"] == 0
+
+    def test_crash_before_start_fails_request(self, make_pool, audio_path):
+        """작업을 받은 직후 (시작 보고 전) 죽은 워커의 요청도 실패로 끝나고 워커는 재시작"""
+        crashed = []
+
+        def crash_once(process):
+            task = process.task_queue.get()
+            if task is None:
+                return
+            if not crashed:
+                crashed.append(task[0])
+                process.exitcode = -9
+                return
+            process.result_queue.put(("done", process.worker_id, task[0], {"success": True, "text": "ok"}))
+            echo(process)
+
+        pool = make_pool(crash_once)
+        result = pool.transcribe(audio_path)
+        assert "crashed" in result["error"]
+        assert pool.get_stats()["restarts"] == 1
+
+        deadline = time.time() + 5
+        while not pool._ready and time.time() < deadline:
+            time.sleep(0.01)
+        assert pool.transcribe(audio_path)["text"] == "ok"
+
+
+class TestTimeoutAndCancel:
+    """제한 시간 / 취소 테스트"""
+
+    @staticmethod
+    def stuck(process):
+        """작업을 받고 응답하지 않는 워커 (terminate 시 종료)"""
+        while True:
+            task = process.task_queue.get()
+            if task is None:
+                return
+
+    def test_timeout_terminates_stuck_worker(self, make_pool, audio_path):
+        pool = make_pool(self.stuck, timeout_sec=0.2)
+        result = pool.transcribe(audio_path)
+        assert "timeout" in result["error"]
+        deadline = time.time() + 5
+        while pool.get_stats()["restarts"] == 0 and time.time() < deadline:
+            time.sleep(0.05)
+        stats = pool.get_stats()
+        assert stats["timeouts"] == 1 and stats["restarts"] == 1
+        assert pool._ctx.processes[0].terminated
+
+    def test_cancel_queued_request(self, make_pool, audio_path):
+        pool = make_pool(self.stuck)
+        threading.Thread(target=pool.transcribe, args=(audio_path,), daemon=True).start()
+        deadline = time.time() + 5
+        while not pool._assigned and time.time() < deadline:
+            time.sleep(0.01)
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        result = pool.transcribe(audio_path, cancel_event=cancel_event)
+        assert "cancelled" in result["error"]
+        assert pool.get_stats()["queued"] == 0
+
+    def test_cancel_forwarded_to_running_worker(self, make_pool, audio_path):
+        def until_cancelled(process):
+            while True:
+                task = process.task_queue.get()
+                if task is None:
+                    return
+                while not process.cancel_event.wait(0.01):
+                    if process.terminated:
+                        return
+                process.result_queue.put(("done", process.worker_id, task[0], {"text": "", "error": "cancelled"}))
+
+        pool = make_pool(until_cancelled)
+        cancel_event = threading.Event()
+        threading.Timer(0.1, cancel_event.set).start()
+        result = pool.transcribe(audio_path, cancel_event=cancel_event)
+        assert result["error"] == "cancelled"
+        assert pool.get_stats()["cancelled"] == 1
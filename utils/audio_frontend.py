@@ -0,0 +1,199 @@
+"""
+오디오 입력 전처리 (스트리밍 polyphase 리샘플 + 채널 병합)
+
+파일 전체를 한 번에 읽어 FFT 리샘플(scipy.signal.resample)하는 대신
+고정 크기 블록 단위로 읽고, 채널을 바로 mono로 합친 뒤 polyphase FIR 필터로 16kHz로 변환한다.
+
+- 메모리: 블록 크기 + 필터 길이만큼의 버퍼만 사용 (통화 길이와 무관)
+- 정수 PCM은 libsndfile이 float32로 바로 변환 (float64 중간 배열 없음)
+- 결과는 입력 블록 크기와 무관하게 비트 단위로 동일
+  (출력 샘플마다 같은 입력 구간/같은 필터 계수/같은 합산 순서로 계산)
+"""
+
+import logging
+from math import ceil, gcd
+from typing import Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16000
+
+# 파일 읽기 블록 크기 (입력 프레임 수, 48kHz 기준 약 1.4초)
+BLOCK_FRAMES = 65536
+
+
+def design_filter(up: int, down: int) -> np.ndarray:
+    """
+    polyphase 저역통과 필터 (scipy.signal.resample_poly와 같은 Kaiser 창 설계)
+
+    반길이를 down의 배수로 맞춰 필터 지연이 정수 개 출력 샘플이 되도록 한다.
+
+    Returns:
+        float32 FIR 계수 (길이 2 * half + 1, 보간 이득 up 포함)
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half = down * ceil(10 * max_rate / down)
+    taps = firwin(2 * half + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+    return taps.astype(np.float32)
+
+
+def downmix(block: np.ndarray) -> np.ndarray:
+    """(frames, channels) float32 → mono float32 (채널 평균, float32 누적)"""
+    if block.ndim == 1:
+        return block
+    if block.shape[1] == 1:
+        return block[:, 0]
+    mono = block[:, 0].copy()
+    for channel in range(1, block.shape[1]):
+        mono += block[:, channel]
+    mono *= np.float32(1.0 / block.shape[1])
+    return mono
+
+
+class StreamingResampler:
+    """
+    블록 단위 polyphase 리샘플러
+
+    process()에 임의 길이 블록을 넣으면 지금까지 확정된 출력 샘플을 반환하고,
+    입력이 끝나면 flush()로 나머지를 받는다. 전체 출력 길이는 ceil(입력 길이 * up / down).
+    넘겨받은 블록은 복사해서 보관하므로 호출자는 process() 후 블록 버퍼를 재사용해도 된다.
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int = TARGET_SAMPLE_RATE):
+        divisor = gcd(orig_sr, target_sr)
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self.up = target_sr // divisor
+        self.down = orig_sr // divisor
+        self.taps = design_filter(self.up, self.down) if self.up != self.down else np.ones(1, dtype=np.float32)
+        self._half = (len(self.taps) - 1) // 2
+        self._delay = self._half // self.down  # 필터 지연 (출력 샘플 수)
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0  # 버퍼 첫 샘플의 입력 인덱스 (항상 down의 배수)
+        self._received = 0      # 받은 입력 샘플 수
+        self._next = self._delay  # 다음에 낼 필터 출력 인덱스 (지연 포함)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """mono float32 블록 추가 → 새로 확정된 출력 샘플"""
+        from scipy.signal import upfirdn
+
+        if self.up == self.down:
+            return block
+        block = np.asarray(block, dtype=np.float32)
+        self._received += len(block)
+        # 호출자가 블록 버퍼를 재사용할 수 있으므로(sf.blocks의 out=) 보관할 때는 항상 복사
+        self._buffer = np.concatenate([self._buffer, block]) if len(self._buffer) else block.copy()
+
+        end = self._buffer_start + len(self._buffer)
+        # 출력 g는 업샘플 위치 g*down까지의 입력만 사용 → 위치 end*up - 1 이하면 확정
+        last = (end * self.up - 1) // self.down
+        if last < self._next:
+            return np.zeros(0, dtype=np.float32)
+
+        # 버퍼 시작이 down의 배수이므로 세그먼트 출력 i는 전체 출력 buffer_start*up/down + i와 같다
+        offset = self._buffer_start * self.up // self.down
+        filtered = upfirdn(self.taps, self._buffer, up=self.up, down=self.down)
+        out = filtered[self._next - offset:last - offset + 1]
+        self._next = last + 1
+
+        # 다음 출력이 쓰는 가장 앞 입력: (next*down - (len(taps)-1)) / up, down의 배수로 내림
+        keep_from = max((self._next * self.down - (len(self.taps) - 1)) // self.up, 0)
+        keep_from = max(keep_from // self.down * self.down, self._buffer_start)
+        self._buffer = self._buffer[keep_from - self._buffer_start:]
+        self._buffer_start = keep_from
+        return out.astype(np.float32, copy=False)
+
+    def flush(self) -> np.ndarray:
+        """입력 종료: 필터 꼬리를 0으로 채워 남은 출력 반환"""
+        if self.up == self.down:
+            return np.zeros(0, dtype=np.float32)
+        total = -(-self._received * self.up // self.down)  # ceil
+        remaining = total + self._delay - self._next
+        if remaining <= 0:
+            return np.zeros(0, dtype=np.float32)
+        pad = ceil((self._half + 1) / self.up) + 1
+        received = self._received
+        out = self.process(np.zeros(pad, dtype=np.float32))
+        self._received = received
+        return out[:remaining]
+
+
+def iter_audio_16k(audio_path: str, block_frames: int = BLOCK_FRAMES) -> Iterator[np.ndarray]:
+    """
+    음성 파일을 16kHz mono float32 블록으로 순차 반환 (파일 전체를 메모리에 올리지 않음)
+
+    Args:
+        audio_path: 음성 파일 경로 (libsndfile 지원 형식)
+        block_frames: 한 번에 읽을 입력 프레임 수
+
+    Yields:
+        numpy.ndarray (float32, 16kHz mono, 길이는 블록마다 다름)
+    """
+    import soundfile as sf
+
+    with sf.SoundFile(audio_path) as f:
+        resampler = StreamingResampler(f.samplerate) if f.samplerate != TARGET_SAMPLE_RATE else None
+        if f.channels > 1:
+            logger.info(f"[audio] 채널 병합: {f.channels}ch → mono")
+        if resampler is not None:
+            logger.info(f"[audio] 리샘플링: {f.samplerate}Hz → {TARGET_SAMPLE_RATE}Hz "
+                        f"(polyphase {resampler.up}/{resampler.down}, {len(resampler.taps)} taps)")
+
+        out = np.empty((block_frames, f.channels), dtype=np.float32)
+        for block in f.blocks(dtype="float32", always_2d=True, out=out):
+            mono = downmix(block)
+            if resampler is None:
+                yield mono.copy()
+                continue
+            samples = resampler.process(mono)
+            if len(samples):
+                yield samples
+        if resampler is not None:
+            tail = resampler.flush()
+            if len(tail):
+                yield tail
+
+
+def audio_length_16k(audio_path: str) -> int:
+    """파일 헤더 기준 16kHz 출력 샘플 수 (미리 버퍼를 할당할 때 사용)"""
+    import soundfile as sf
+
+    info = sf.info(audio_path)
+    divisor = gcd(info.samplerate, TARGET_SAMPLE_RATE)
+    up, down = TARGET_SAMPLE_RATE // divisor, info.samplerate // divisor
+    return -(-info.frames * up // down)
+
+
+def load_audio_16k(audio_path: str, block_frames: int = BLOCK_FRAMES, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    음성 파일 전체를 16kHz mono float32 배열로 로드
+
+    출력 배열을 파일 정보로 미리 한 번 할당하고 블록 단위로 채우므로
+    출력 외 추가 메모리는 블록 크기만큼만 사용한다.
+
+    Args:
+        audio_path: 음성 파일 경로
+        block_frames: 한 번에 읽을 입력 프레임 수
+        out: 결과를 쓸 float32 배열 (길이 >= audio_length_16k(), 예: 공유 메모리)
+
+    Returns:
+        numpy.ndarray (float32, 16kHz mono, 1D contiguous)
+    """
+    length = audio_length_16k(audio_path)
+    audio = np.empty(length, dtype=np.float32) if out is None else out[:length]
+
+    filled = 0
+    for block in iter_audio_16k(audio_path, block_frames):
+        block = block[:length - filled]
+        audio[filled:filled + len(block)] = block
+        filled += len(block)
+    if filled != length:
+        # 헤더의 프레임 수와 실제 디코딩 길이가 다른 파일 (일부 압축 형식)
+        logger.warning(f"[audio] 예상 길이와 다름: {length} → {filled} 샘플")
+        audio = audio[:filled]
+    return audio
@@ -0,0 +1,401 @@
+"""
+비동기 로깅 파이프라인 (QueueHandler → 리스너 스레드)
+
+- 요청/추론 스레드는 레코드를 큐에 넣기만 하고, 포매팅(텍스트/JSON)과 파일 쓰기는 리스너 스레드에서 처리
+  (큐가 가득 차면 기다리지 않고 버림 → dropped)
+- 지연 포매팅: %-스타일 인자가 불변 값이거나 lazy(...)면 메시지 조립도 리스너 스레드에서 수행
+- 로거별 초당 레코드 수 제한 (LOG_RATE_LIMITS, WARNING 이상은 항상 통과)
+  + 호출 위치별 샘플링 (extra={"sample": N} → N건 중 1건만 기록)
+- 실행 중 로거별 레벨 변경 (set_level, ttl 지나면 원래 레벨로 복구)
+- 구조화 JSON 레코드 (LOG_JSON=true, 현재 trace_id 포함)
+
+STT API와 Web UI가 함께 사용 (Web UI 이미지에는 Dockerfile이 복사)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.tracing import tracer
+
+# 레코드 기본 속성 (그 외 속성은 extra로 보고 JSON에 포함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "trace_id"}
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None), bytes)
+_exception_formatter = logging.Formatter()
+
+
+class lazy:
+    """
+    출력될 때만 계산되는 로그 인자 (레벨이 꺼져 있거나 제한/샘플링에 걸리면 호출되지 않음)
+
+    예: logger.debug("상세 결과: %s", lazy(json.dumps, details, indent=2))
+    리스너 스레드에서 계산되므로 인자로 넘긴 객체는 로그 호출 후 변경하지 마세요.
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+
+def parse_spec(spec: str) -> Dict[str, str]:
+    """'stt_engine=DEBUG,httpx=WARNING' 형식 → {"stt_engine": "DEBUG", "httpx": "WARNING"}"""
+    result = {}
+    for item in (spec or "").split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep and name.strip() and value.strip():
+            result[name.strip()] = value.strip()
+    return result
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드 1건 → JSON 1줄 (ts, level, logger, msg, thread, module, line, trace_id, extra, exc)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+            "module": record.module,
+            "line": record.lineno
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            data["trace_id"] = trace_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = record.stack_info
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    로거별 초당 레코드 수 제한 (토큰 버킷) + 호출 위치별 샘플링
+
+    WARNING 이상은 제한하지 않습니다. 제한으로 버려진 레코드 수는 다음에 통과한 레코드에
+    suppressed 속성으로 붙어 "(+N건 생략)"으로 출력됩니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._limits: Dict[str, float] = {}
+        self._rates: Dict[str, Optional[float]] = {}  # 로거 이름 → 적용 한도 (접두사 매칭 캐시)
+        self._buckets: Dict[str, list] = {}  # 로거 이름 → [토큰, 마지막 갱신 시각, 생략 수]
+        self._sample_counts: Dict[tuple, int] = {}
+        self.suppressed = 0
+        self.sampled_out = 0
+
+    def set_limits(self, limits: Dict[str, float]):
+        with self._lock:
+            self._limits = {name: float(rate) for name, rate in limits.items() if float(rate) > 0}
+            self._rates.clear()
+            self._buckets.clear()
+
+    @property
+    def limits(self) -> Dict[str, float]:
+        return dict(self._limits)
+
+    def _rate_for(self, name: str) -> Optional[float]:
+        if name not in self._rates:
+            # 가장 긴 접두사 우선 ("stt_engine" 한도는 "stt_engine.x"에도 적용, "*"는 전체 기본값)
+            rate = self._limits.get("*")
+            best = -1
+            for prefix, limit in self._limits.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                    rate, best = limit, len(prefix)
+            self._rates[name] = rate
+        return self._rates[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        every = getattr(record, "sample", None)
+        if every and every > 1:
+            key = (record.pathname, record.lineno)
+            with self._lock:
+                count = self._sample_counts.get(key, 0)
+                self._sample_counts[key] = count + 1
+                if count % every:
+                    self.sampled_out += 1
+                    return False
+
+        if not self._limits:
+            return True
+        with self._lock:
+            rate = self._rate_for(record.name)
+            if rate is None:
+                return True
+            now = time.monotonic()
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [rate, now, 0]
+            bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class _PipelineQueueHandler(logging.handlers.QueueHandler):
+    """호출 스레드에서는 최소한의 준비만 하고 큐에 넣는 핸들러 (큐가 가득 차면 버림)"""
+
+    def __init__(self, log_queue: queue.Queue, pipeline: "LogPipeline"):
+        super().__init__(log_queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 호출 스레드에서만 알 수 있는 값(trace 컨텍스트, 예외 정보)은 여기서 확정
+        record = copy.copy(record)
+        span = tracer.current()
+        if span is not None:
+            record.trace_id = span.trace_id
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        if record.args and not self._deferrable(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed}건 생략)"
+        return record
+
+    @staticmethod
+    def _deferrable(args) -> bool:
+        """메시지 조립을 리스너 스레드로 미뤄도 되는 인자인지 (불변 값 / lazy)"""
+        if isinstance(args, dict):
+            return False
+        return all(isinstance(arg, _IMMUTABLE_TYPES) or isinstance(arg, lazy) for arg in args)
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+    def emit(self, record: logging.LogRecord):
+        if self.pipeline.running:
+            super().emit(record)
+        else:
+            # 리스너 종료 후(프로세스 종료 중)에는 직접 출력
+            for handler in self.pipeline.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class _PipelineListener(logging.handlers.QueueListener):
+    """리스너 스레드: 미뤄 둔 메시지 조립을 핸들러에 넘기기 전에 한 번만 수행"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class LogPipeline:
+    """루트 로거 → QueueHandler → QueueListener(콘솔/파일 핸들러) 구성과 실행 중 레벨 변경"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._queue: Optional[queue.Queue] = None
+        self._queue_handler: Optional[_PipelineQueueHandler] = None
+        self._listener: Optional[_PipelineListener] = None
+        self._handlers: Dict[str, logging.Handler] = {}
+        self._formats: Dict[str, Optional[str]] = {}
+        self._overrides: Dict[str, int] = {}  # 레벨을 바꾼 로거 → 원래 레벨
+        self._timers: Dict[str, threading.Timer] = {}
+        self.rate_filter = RateLimitFilter()
+        self.json_format = False
+        self.dropped = 0
+        self.running = False
+        atexit.register(self.stop)
+
+    @property
+    def handlers(self):
+        return list(self._handlers.values())
+
+    def configure(self, file_name: Optional[str] = None, level: str = "INFO", log_format: str = "%(message)s",
+                  json_format: bool = False, queue_size: int = 10000, rate_limits: str = "",
+                  levels: str = "", log_dir: str = "logs"):
+        """
+        루트 로거를 파이프라인으로 구성 (여러 번 호출해도 핸들러 중복 없음, 파일만 추가)
+
+        Args:
+            file_name: log_dir 아래 로그 파일 (10MB × 5개 교체)
+            level: 루트 로그 레벨
+            log_format: 텍스트 형식 (json_format=False일 때)
+            json_format: 콘솔/파일을 JSON 1줄 형식으로 출력
+            queue_size: 큐 최대 레코드 수 (초과분은 버림)
+            rate_limits: 'stt_engine=50,*=200' (로거별 초당 최대 레코드 수)
+            levels: 'stt_engine=DEBUG,httpx=WARNING' (로거별 레벨)
+        """
+        with self._lock:
+            root = logging.getLogger()
+            root.setLevel(getattr(logging, level.upper(), logging.INFO))
+            self.json_format = json_format
+
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=queue_size)
+                self._queue_handler = _PipelineQueueHandler(self._queue, self)
+                self._queue_handler.addFilter(self.rate_filter)
+
+            if "console" not in self._handlers:
+                self._handlers["console"] = logging.StreamHandler()
+                self._formats["console"] = log_format
+            if file_name and file_name not in self._handlers:
+                Path(log_dir).mkdir(parents=True, exist_ok=True)
+                self._handlers[file_name] = logging.handlers.RotatingFileHandler(
+                    Path(log_dir) / file_name,
+                    maxBytes=10*1024*1024,  # 10MB
+                    backupCount=5,
+                    encoding="utf-8"
+                )
+                self._formats[file_name] = log_format
+            self._apply_formatters()
+
+            if rate_limits:
+                self.rate_filter.set_limits({name: float(rate) for name, rate in parse_spec(rate_limits).items()})
+            for name, value in parse_spec(levels).items():
+                self.set_level(name, value)
+
+            # 직접 추가된 콘솔/파일 핸들러는 파이프라인으로 대체
+            for handler in list(root.handlers):
+                if type(handler) in (logging.StreamHandler, logging.FileHandler, logging.handlers.RotatingFileHandler):
+                    root.removeHandler(handler)
+            if self._queue_handler not in root.handlers:
+                root.addHandler(self._queue_handler)
+            self._restart_listener()
+
+    def add_file(self, logger_name: str, file_name: str, log_format: str, log_dir: str = "logs"):
+        """특정 로거(와 하위 로거)의 레코드만 별도 파일에 기록 (예: performance.log)"""
+        with self._lock:
+            if file_name in self._handlers:
+                return
+            Path(log_dir).mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                Path(log_dir) / file_name,
+                maxBytes=10*1024*1024,  # 10MB
+                backupCount=5,
+                encoding="utf-8"
+            )
+            handler.addFilter(logging.Filter(logger_name))
+            self._handlers[file_name] = handler
+            self._formats[file_name] = log_format
+            self._apply_formatters()
+            self._restart_listener()
+
+    def _apply_formatters(self):
+        for key, handler in self._handlers.items():
+            handler.setFormatter(JsonFormatter() if self.json_format else logging.Formatter(self._formats[key]))
+
+    def _restart_listener(self):
+        if self._listener is not None:
+            self._listener.stop()
+        self._listener = _PipelineListener(self._queue, *self._handlers.values(), respect_handler_level=True)
+        self._listener.start()
+        self.running = True
+
+    def stop(self):
+        """남은 레코드를 모두 출력하고 리스너 종료 (프로세스 종료 시 자동 호출)"""
+        with self._lock:
+            if self._listener is not None and self.running:
+                self.running = False
+                self._listener.stop()
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+    def set_level(self, name: str, level: str, ttl: Optional[float] = None) -> str:
+        """
+        로거 레벨 변경 (실행 중 DEBUG 켜기 등)
+
+        Args:
+            name: 로거 이름 ("root" 또는 "" = 루트, 하위 로거는 별도 레벨이 없으면 상속)
+            level: DEBUG / INFO / WARNING / ERROR / CRITICAL / NOTSET
+            ttl: 지정 시 ttl초 후 원래 레벨로 복구
+
+        Returns:
+            적용된 레벨 이름
+
+        Raises:
+            ValueError: 알 수 없는 레벨
+        """
+        level_no = logging.getLevelName(level.upper())
+        if not isinstance(level_no, int):
+            raise ValueError(f"알 수 없는 로그 레벨: {level}")
+        name = "" if name in ("", "root") else name
+        target = logging.getLogger(name)
+        with self._lock:
+            self._overrides.setdefault(name, target.level)
+            target.setLevel(level_no)
+            timer = self._timers.pop(name, None)
+            if timer is not None:
+                timer.cancel()
+            if ttl:
+                timer = threading.Timer(ttl, self.reset_level, args=(name,))
+                timer.daemon = True
+                timer.start()
+                self._timers[name] = timer
+        return logging.getLevelName(level_no)
+
+    def reset_level(self, name: str):
+        """set_level 이전 레벨로 복구"""
+        name = "" if name in ("", "root") else name
+        with self._lock:
+            timer = self._timers.pop(name, None)
+            if timer is not None:
+                timer.cancel()
+            if name in self._overrides:
+                logging.getLogger(name).setLevel(self._overrides.pop(name))
+
+    def status(self) -> dict:
+        """현재 레벨/큐 상태 (/admin/logging)"""
+        with self._lock:
+            levels = {"root": logging.getLevelName(logging.getLogger().level)}
+            for name in self._overrides:
+                if name:
+                    levels[name] = logging.getLevelName(logging.getLogger(name).level)
+            return {
+                "levels": levels,
+                "ttl_pending": sorted(name or "root" for name in self._timers),
+                "json": self.json_format,
+                "rate_limits": self.rate_filter.limits,
+                "queue_size": self._queue.qsize() if self._queue is not None else 0,
+                "dropped": self.dropped,
+                "rate_limited": self.rate_filter.suppressed,
+                "sampled_out": self.rate_filter.sampled_out
+            }
+
+
+# 전역 인스턴스 생성
+log_pipeline = LogPipeline()
@@ -0,0 +1,225 @@
+"""
+적응형 메모리 거버너
+
+세그먼트/파일/요청 경계마다 무조건 실행하던 gc.collect(), torch.cuda.empty_cache()를
+checkpoint(stage) 훅으로 대체합니다. 훅은 프로세스 RSS와 CUDA 할당자 상태를 확인해
+high-water mark를 넘었을 때만 정리하고, 정리할 때마다 실제로 회수한 양과 소요 시간을 기록합니다.
+
+- Python 힙: RSS > max(MEMORY_RSS_HIGH_MB, 직전 정리 후 RSS + MEMORY_RSS_GROWTH_MB) → gc.collect() + malloc_trim(0)
+- CUDA 캐시: 예약 - 사용(재사용 대기 블록) > MEMORY_CUDA_CACHE_HIGH_MB → torch.cuda.empty_cache()
+- 확인 자체도 MEMORY_CHECK_INTERVAL_SEC 간격으로만 수행 (세그먼트마다 호출해도 부담 없음)
+
+백엔드 언로드처럼 반드시 비워야 하는 경우는 reclaim(stage)로 강제 정리합니다.
+"""
+
+import ctypes
+import gc
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def _load_malloc_trim() -> Optional[Callable]:
+    """glibc malloc_trim (해제된 힙 페이지를 OS에 반환, glibc가 아니면 None)"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return ctypes.CDLL("libc.so.6").malloc_trim
+    except (OSError, AttributeError):
+        return None
+
+
+class MemoryGovernor:
+    """RSS / CUDA 할당자 상태 기반으로 필요할 때만 메모리를 정리"""
+
+    def __init__(self):
+        self.rss_high_mb = 0.0
+        self.rss_growth_mb = 512.0
+        self.cuda_cache_high_mb = 1024.0
+        self.check_interval_sec = 1.0
+        self.trim_enabled = True
+        self.observers: List[Callable[[Dict], None]] = []  # 정리 이벤트 수신 (메트릭 기록 등)
+
+        self._lock = threading.Lock()
+        self._process = None
+        self._malloc_trim = _load_malloc_trim()
+        self._cuda = None  # None = 아직 확인 안 함
+        self._last_check = 0.0
+        self._baseline_rss = None  # 직전 정리 후 RSS (bytes)
+        self._events = deque(maxlen=50)
+        self._stats = {
+            "checks": 0, "gc_runs": 0, "cuda_empties": 0,
+            "rss_freed_mb": 0.0, "cuda_freed_mb": 0.0, "reclaim_sec": 0.0
+        }
+
+    def configure(self, rss_high_mb: float = 0.0, rss_growth_mb: float = 512.0, cuda_cache_high_mb: float = 1024.0,
+                  check_interval_sec: float = 1.0, trim_enabled: bool = True):
+        """
+        기준값 설정
+
+        Args:
+            rss_high_mb: RSS high-water mark (MB, 0이면 증가량 기준만 사용)
+            rss_growth_mb: 직전 정리 후 RSS 증가량 기준 (MB)
+            cuda_cache_high_mb: CUDA 재사용 대기 캐시 기준 (MB)
+            check_interval_sec: checkpoint 확인 최소 간격 (초)
+            trim_enabled: gc 후 malloc_trim(0) 실행 여부
+        """
+        self.rss_high_mb = rss_high_mb
+        self.rss_growth_mb = rss_growth_mb
+        self.cuda_cache_high_mb = cuda_cache_high_mb
+        self.check_interval_sec = check_interval_sec
+        self.trim_enabled = trim_enabled
+        logger.info(f"[Memory] 거버너 설정: RSS high={rss_high_mb:g}MB, 증가 기준={rss_growth_mb:g}MB, "
+                    f"CUDA 캐시 기준={cuda_cache_high_mb:g}MB, 확인 간격={check_interval_sec:g}초, "
+                    f"malloc_trim={'사용' if trim_enabled and self._malloc_trim else '사용 안 함'}")
+
+    def _rss(self) -> int:
+        if self._process is None:
+            import psutil
+            self._process = psutil.Process()
+        return self._process.memory_info().rss
+
+    def _torch_cuda(self):
+        """이미 로드된 torch에 CUDA가 있으면 torch.cuda (거버너가 torch를 새로 import하지 않음)"""
+        if self._cuda is None:
+            torch = sys.modules.get("torch")
+            if torch is None:
+                return None
+            try:
+                self._cuda = torch.cuda if torch.cuda.is_available() else False
+            except Exception:
+                self._cuda = False
+        return self._cuda or None
+
+    def checkpoint(self, stage: str) -> Optional[Dict]:
+        """
+        정리 지점 (기준을 넘었을 때만 정리)
+
+        Args:
+            stage: 호출 위치 label (segment / file_start / file_end / request_end 등)
+
+        Returns:
+            정리했으면 이벤트 딕셔너리, 아니면 None
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval_sec:
+            return None
+        # 다른 스레드가 확인/정리 중이면 기다리지 않고 넘어감
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            self._last_check = now
+            self._stats["checks"] += 1
+            return self._run(stage, force=False)
+        finally:
+            self._lock.release()
+
+    def reclaim(self, stage: str, python: bool = True) -> Optional[Dict]:
+        """
+        강제 정리 (백엔드 언로드 등 큰 객체를 버린 직후)
+
+        Args:
+            stage: 호출 위치 label
+            python: False면 CUDA 캐시만 강제로 반환하고 gc는 기준을 넘었을 때만 (model.cpu() 직후 등)
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            return self._run(stage, force=True, force_gc=python)
+
+    def _run(self, stage: str, force: bool, force_gc: bool = True) -> Optional[Dict]:
+        rss_before = self._rss()
+        if self._baseline_rss is None:
+            self._baseline_rss = rss_before
+        threshold = max(self.rss_high_mb * MB, self._baseline_rss + self.rss_growth_mb * MB)
+
+        cuda = self._torch_cuda()
+        cuda_cached = 0
+        if cuda is not None:
+            cuda_cached = cuda.memory_reserved() - cuda.memory_allocated()
+
+        run_gc = (force and force_gc) or rss_before > threshold
+        run_cuda = cuda is not None and (force or cuda_cached > self.cuda_cache_high_mb * MB)
+        if not run_gc and not run_cuda:
+            return None
+
+        reasons = []
+        if force:
+            reasons.append("forced" if force_gc else "forced (cuda)")
+        if run_gc and not (force and force_gc):
+            reasons.append(f"rss {rss_before / MB:.0f}MB > {threshold / MB:.0f}MB")
+        if run_cuda and not force:
+            reasons.append(f"cuda cache {cuda_cached / MB:.0f}MB > {self.cuda_cache_high_mb:g}MB")
+
+        start = time.perf_counter()
+        event = {"stage": stage, "reason": ", ".join(reasons), "ts": time.time(),
+                 "rss_before_mb": round(rss_before / MB, 1)}
+
+        if run_gc:
+            gc_start = time.perf_counter()
+            event["gc_objects"] = gc.collect()
+            if self.trim_enabled and self._malloc_trim is not None:
+                self._malloc_trim(0)
+            event["gc_ms"] = round((time.perf_counter() - gc_start) * 1000, 2)
+            rss_after = self._rss()
+            event["rss_after_mb"] = round(rss_after / MB, 1)
+            event["rss_freed_mb"] = round((rss_before - rss_after) / MB, 1)
+            self._baseline_rss = rss_after
+            self._stats["gc_runs"] += 1
+            self._stats["rss_freed_mb"] += max(rss_before - rss_after, 0) / MB
+
+        if run_cuda:
+            cuda_start = time.perf_counter()
+            reserved_before = cuda.memory_reserved()
+            cuda.empty_cache()
+            event["cuda_ms"] = round((time.perf_counter() - cuda_start) * 1000, 2)
+            event["cuda_freed_mb"] = round((reserved_before - cuda.memory_reserved()) / MB, 1)
+            self._stats["cuda_empties"] += 1
+            self._stats["cuda_freed_mb"] += max(event["cuda_freed_mb"], 0)
+
+        event["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._stats["reclaim_sec"] += event["duration_ms"] / 1000
+        self._events.append(event)
+
+        logger.info(f"[Memory] {stage} 정리 ({event['reason']}): "
+                    + (f"gc {event['gc_objects']}개, RSS {event['rss_before_mb']:.0f}→{event['rss_after_mb']:.0f}MB "
+                       f"({event['rss_freed_mb']:+.1f}MB 회수) " if run_gc else "")
+                    + (f"CUDA 캐시 {event['cuda_freed_mb']:.0f}MB 반환 " if run_cuda else "")
+                    + f"{event['duration_ms']:.1f}ms")
+        for observer in self.observers:
+            try:
+                observer(event)
+            except Exception as e:
+                logger.debug(f"[Memory] observer 오류: {type(e).__name__}: {e}")
+        return event
+
+    def status(self) -> Dict:
+        """누적 통계 + 최근 정리 이벤트 (/admin/memory)"""
+        rss = self._rss()
+        cuda = self._torch_cuda()
+        return {
+            "rss_mb": round(rss / MB, 1),
+            "baseline_rss_mb": round((self._baseline_rss or rss) / MB, 1),
+            "cuda_reserved_mb": round(cuda.memory_reserved() / MB, 1) if cuda is not None else None,
+            "cuda_allocated_mb": round(cuda.memory_allocated() / MB, 1) if cuda is not None else None,
+            "config": {
+                "rss_high_mb": self.rss_high_mb,
+                "rss_growth_mb": self.rss_growth_mb,
+                "cuda_cache_high_mb": self.cuda_cache_high_mb,
+                "check_interval_sec": self.check_interval_sec,
+                "malloc_trim": bool(self.trim_enabled and self._malloc_trim)
+            },
+            "stats": {key: round(value, 3) if isinstance(value, float) else value
+                      for key, value in self._stats.items()},
+            "recent": list(self._events)
+        }
+
+
+# 전역 인스턴스 생성
+memory_governor = MemoryGovernor()
@@ -0,0 +1,317 @@
+"""
+Prometheus 텍스트 형식 메트릭 (외부 의존성 없음)
+
+Counter / Gauge / Histogram과 /metrics 응답용 렌더러.
+
+- 기록(inc/observe)은 스레드별 샤드에 쓰므로 락이 없음
+  (스레드가 처음 기록할 때만 샤드 등록에 락 1회, 이후 dict 조회 + 리스트 원소 덧셈)
+- 조회(render)는 모든 샤드를 dict.copy()로 읽어 합산 (GIL 아래 원자적, 기록 스레드를 막지 않음)
+- Gauge는 set() 또는 조회 시점 콜백(set_function)으로 값을 정함
+
+STT API와 Web UI가 함께 사용 (Web UI 이미지에는 Dockerfile이 복사)
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 지연 시간 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_local = threading.local()
+_shards: List[dict] = []
+_shards_lock = threading.Lock()
+
+
+def _shard() -> dict:
+    """현재 스레드의 샤드 {(metric id, label 값): 셀}"""
+    try:
+        return _local.cells
+    except AttributeError:
+        cells = {}
+        with _shards_lock:
+            _shards.append(cells)
+        _local.cells = cells
+        return cells
+
+
+def _snapshot() -> List[dict]:
+    with _shards_lock:
+        shards = list(_shards)
+    return [cells.copy() for cells in shards]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Registry:
+    """메트릭 모음 (/metrics 응답 단위)"""
+
+    def __init__(self):
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            if any(m.name == metric.name for m in self._metrics):
+                raise ValueError(f"중복 메트릭 이름: {metric.name}")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (0.0.4)"""
+        shards = _snapshot()
+        lines = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect(shards))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values, **kwargs):
+        """label 값으로 고정된 자식 (자주 쓰는 조합은 모듈 변수로 잡아 두면 조회 비용도 없음)"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: label {self.labelnames} 필요, {values} 전달")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._make_child(values))
+        return child
+
+    def _make_child(self, values):
+        raise NotImplementedError
+
+    def _series(self, shards: List[dict]) -> Dict[Tuple[str, ...], list]:
+        """샤드 합산 {label 값: 셀 합계}"""
+        totals: Dict[Tuple[str, ...], list] = {}
+        for cells in shards:
+            for (metric_id, values), cell in cells.items():
+                if metric_id is not self:
+                    continue
+                total = totals.get(values)
+                if total is None:
+                    totals[values] = list(cell)
+                else:
+                    for i, v in enumerate(cell):
+                        total[i] += v
+        return totals
+
+
+class _CounterChild:
+    __slots__ = ("_key",)
+
+    def __init__(self, metric, values):
+        self._key = (metric, values)
+
+    def inc(self, amount: float = 1.0) -> None:
+        cells = _shard()
+        cell = cells.get(self._key)
+        if cell is None:
+            cell = cells[self._key] = [0.0]
+        cell[0] += amount
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (이름은 _total로 끝나게)"""
+
+    kind = "counter"
+
+    def _make_child(self, values):
+        return _CounterChild(self, values)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def collect(self, shards):
+        series = self._series(shards)
+        for values in list(self._children):
+            total = series.get(values, [0.0])[0]
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(total)}"
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 (set() 또는 조회 시점 콜백)"""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._function: Optional[Callable] = None
+
+    def _make_child(self, values):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable) -> None:
+        """
+        조회 시점에 값을 계산할 콜백 등록
+
+        Args:
+            function: label이 없으면 float, 있으면 {label 값 tuple: float} 반환
+        """
+        self._function = function
+
+    def collect(self, shards):
+        if self._function is not None:
+            try:
+                result = self._function()
+            except Exception:
+                return
+            items = result.items() if isinstance(result, dict) else [((), result)]
+            for values, value in items:
+                if value is None:
+                    continue
+                values = values if isinstance(values, tuple) else (values,)
+                yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(float(value))}"
+            return
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(float(child.value))}"
+
+
+class _HistogramChild:
+    __slots__ = ("_key", "_bounds", "_size")
+
+    def __init__(self, metric, values):
+        self._key = (metric, values)
+        self._bounds = metric.buckets
+        self._size = len(metric.buckets) + 3  # 버킷별 개수 + (+Inf) + sum + count
+
+    def observe(self, value: float) -> None:
+        cells = _shard()
+        cell = cells.get(self._key)
+        if cell is None:
+            cell = cells[self._key] = [0.0] * self._size
+        cell[bisect_left(self._bounds, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    @contextmanager
+    def time(self):
+        """with 블록 실행 시간 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _make_child(self, values):
+        return _HistogramChild(self, values)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def collect(self, shards):
+        series = self._series(shards)
+        bounds = self.buckets + (math.inf,)
+        for values in list(self._children):
+            cell = series.get(values)
+            if cell is None:
+                cell = [0.0] * (len(bounds) + 2)
+            cumulative = 0.0
+            for bound, count in zip(bounds, cell):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(cell[-2])}"
+            yield f"{self.name}_count{labels} {_format_value(cell[-1])}"
+
+
+def aiohttp_trace_config(histogram: Histogram, target: str):
+    """
+    aiohttp 커넥션 획득 시간 기록용 TraceConfig
+
+    ClientSession(trace_configs=[...])에 넣으면 histogram.labels(target, phase)에 기록합니다.
+    - phase="queue": 커넥터 한도(limit/limit_per_host)로 풀에서 대기한 시간 (대기가 있을 때만)
+    - phase="connect": 새 커넥션 생성(DNS + TCP/TLS) 시간 (재사용 시 기록 없음)
+    """
+    import aiohttp
+
+    queue = histogram.labels(target, "queue")
+    connect = histogram.labels(target, "connect")
+
+    async def on_queued_start(session, context, params):
+        context.pool_queue_start = time.perf_counter()
+
+    async def on_queued_end(session, context, params):
+        queue.observe(time.perf_counter() - context.pool_queue_start)
+
+    async def on_create_start(session, context, params):
+        context.pool_connect_start = time.perf_counter()
+
+    async def on_create_end(session, context, params):
+        connect.observe(time.perf_counter() - context.pool_connect_start)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    trace_config.on_connection_create_start.append(on_create_start)
+    trace_config.on_connection_create_end.append(on_create_end)
+    return trace_config
@@ -1,17 +1,31 @@
 """
 성능 모니터링 유틸
 CPU/RAM/GPU 사용률을 측정하고 통계를 계산합니다.
+
+프로세스당 샘플러 스레드 1개(ResourceSampler)가 고정 크기 링 버퍼에 주기적으로 기록하고,
+요청별 PerformanceMonitor는 시작/종료 시각만 기억했다가 그 구간의 min/avg/max를 읽습니다.
+(요청마다 스레드/NVML 초기화/샘플 리스트를 만들지 않음)
 """
 
+import os
 import psutil
 import time
 import threading
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# 샘플링 주기 (초)
+PERF_SAMPLE_INTERVAL_SEC = float(os.getenv("PERF_SAMPLE_INTERVAL_SEC", "0.5"))
+
+# 링 버퍼 크기 (샘플 수, 기본 7200 = 0.5초 주기로 1시간)
+# 이보다 오래된 구간은 남아 있는 샘플만으로 통계 계산
+PERF_SAMPLE_BUFFER_SIZE = int(os.getenv("PERF_SAMPLE_BUFFER_SIZE", "7200"))
+
 
 @dataclass
 class PerformanceMetrics:
@@ -24,169 +38,235 @@ class PerformanceMetrics:
     gpu_vram_mb_peak: float         # 피크 GPU VRAM (MB)
     gpu_percent: float              # GPU 유틸리티 (%)
     processing_time_sec: float      # 처리 시간 (초)
-    
+    cpu_percent_min: float = 0.0    # 최소 CPU 사용률 (%)
+    ram_mb_min: float = 0.0         # 최소 RAM 사용량 (MB)
+    sample_count: int = 0           # 구간 내 샘플 수
+
     def to_dict(self):
         """딕셔너리로 변환"""
         return {
             'cpu_percent_avg': round(self.cpu_percent_avg, 2),
             'cpu_percent_max': round(self.cpu_percent_max, 2),
+            'cpu_percent_min': round(self.cpu_percent_min, 2),
             'ram_mb_avg': round(self.ram_mb_avg, 2),
             'ram_mb_peak': round(self.ram_mb_peak, 2),
+            'ram_mb_min': round(self.ram_mb_min, 2),
             'gpu_vram_mb_current': round(self.gpu_vram_mb_current, 2),
             'gpu_vram_mb_peak': round(self.gpu_vram_mb_peak, 2),
             'gpu_percent': round(self.gpu_percent, 2),
-            'processing_time_sec': round(self.processing_time_sec, 2)
+            'processing_time_sec': round(self.processing_time_sec, 2),
+            'sample_count': self.sample_count
         }
 
 
-class PerformanceMonitor:
-    """성능 모니터링 클래스"""
-    
-    def __init__(self, sample_interval: float = 0.5, process_pid: Optional[int] = None):
+class ResourceSampler:
+    """
+    프로세스 전역 리소스 샘플러
+
+    백그라운드 스레드 1개가 sample_interval마다 (시각, CPU%, RSS, GPU VRAM, VRAM%)를
+    numpy 링 버퍼에 기록합니다. NVML은 스레드 시작 시 한 번만 초기화합니다.
+    """
+
+    # 링 버퍼 열
+    TS, CPU, RAM, VRAM, VRAM_PERCENT = range(5)
+
+    def __init__(self, sample_interval: float = PERF_SAMPLE_INTERVAL_SEC, capacity: int = PERF_SAMPLE_BUFFER_SIZE):
         """
         Args:
             sample_interval: 샘플링 주기 (초)
-            process_pid: 모니터링할 프로세스 PID (None이면 현재 프로세스)
+            capacity: 링 버퍼 크기 (샘플 수)
         """
         self.sample_interval = sample_interval
-        self.process = psutil.Process(process_pid)
-        
-        # 샘플 데이터
-        self.cpu_samples = []
-        self.ram_samples = []
-        self.gpu_vram_samples = []
-        
-        # 모니터링 상태
-        self._monitoring = False
-        self._monitor_thread = None
-        self._start_time = None
-        self._end_time = None
-        
-        # GPU 정보
-        self._gpu_available = self._check_gpu_availability()
-    
-    def _check_gpu_availability(self) -> bool:
-        """GPU 사용 가능 여부 확인"""
+        self.capacity = max(capacity, 2)
+        self.process = psutil.Process()
+
+        self._samples = np.zeros((self.capacity, 5), dtype=np.float64)
+        self._count = 0  # 지금까지 기록한 샘플 수 (다음 위치 = count % capacity)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._nvml = None
+        self._gpu_handles = []
+
+    def ensure_started(self) -> None:
+        """샘플러 스레드 시작 (이미 실행 중이면 무시, fork된 자식 프로세스에서는 새로 시작)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self.process = psutil.Process()
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+            logger.info(f"[ResourceSampler] 시작 (주기 {self.sample_interval}초, 버퍼 {self.capacity}개)")
+
+    def stop(self) -> None:
+        """샘플러 스레드 종료"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _init_gpu(self) -> None:
+        """NVML 초기화 + 장치 핸들 캐시 (실패 시 GPU 지표 0)"""
         try:
             import pynvml
             pynvml.nvmlInit()
-            self._gpu_device_count = pynvml.nvmlDeviceGetCount()
-            return self._gpu_device_count > 0
+            self._gpu_handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+            self._nvml = pynvml
         except Exception as e:
             logger.warning(f"GPU 초기화 실패: {e}")
-            self._gpu_device_count = 0
-            return False
-    
-    def _get_gpu_memory_info(self) -> dict:
-        """GPU 메모리 정보 조회"""
-        if not self._gpu_available:
-            return {
-                'vram_mb': 0,
-                'percent': 0
-            }
-        
+            self._gpu_handles = []
+            self._nvml = None
+
+    def _read_gpu(self):
+        """(사용 VRAM MB, VRAM 사용률 %) - 모든 GPU 합계"""
+        if not self._gpu_handles:
+            return 0.0, 0.0
+        used = total = 0
+        for handle in self._gpu_handles:
+            mem_info = self._nvml.nvmlDeviceGetMemoryInfo(handle)
+            used += mem_info.used
+            total += mem_info.total
+        return used / (1024 * 1024), (used / total * 100) if total else 0.0
+
+    def _run(self):
+        """백그라운드 샘플링 루프"""
+        self._init_gpu()
+        self.process.cpu_percent(interval=None)  # 첫 호출은 기준점 (항상 0 반환)
         try:
-            import pynvml
-            pynvml.nvmlInit()
-            
-            total_vram_mb = 0
-            used_vram_mb = 0
-            
-            # 모든 GPU의 메모리 합계
-            for i in range(self._gpu_device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                total_vram_mb += mem_info.total / (1024 * 1024)
-                used_vram_mb += mem_info.used / (1024 * 1024)
-            
-            gpu_percent = (used_vram_mb / total_vram_mb * 100) if total_vram_mb > 0 else 0
-            
+            while not self._stop_event.wait(self.sample_interval):
+                try:
+                    cpu_percent = self.process.cpu_percent(interval=None)
+                    ram_mb = self.process.memory_info().rss / (1024 * 1024)
+                    vram_mb, vram_percent = self._read_gpu()
+                except Exception as e:
+                    logger.error(f"모니터링 중 오류: {e}")
+                    continue
+                with self._lock:
+                    self._samples[self._count % self.capacity] = (time.time(), cpu_percent, ram_mb, vram_mb, vram_percent)
+                    self._count += 1
+        finally:
+            if self._nvml is not None:
+                try:
+                    self._nvml.nvmlShutdown()
+                except Exception:
+                    pass
+
+    def _ordered_segments(self):
+        """링 버퍼를 시간순 두 조각(view)으로 반환 (lock 안에서 호출)"""
+        if self._count <= self.capacity:
+            return [self._samples[:self._count]]
+        head = self._count % self.capacity
+        return [self._samples[head:], self._samples[:head]]
+
+    def window(self, start: float, end: float) -> Dict[str, float]:
+        """
+        [start, end] 구간 샘플 통계
+
+        구간 안에 샘플이 없으면(샘플링 주기보다 짧은 요청) end 직전의 최신 샘플 1개를 사용합니다.
+
+        Returns:
+            {"count", "cpu_min", "cpu_avg", "cpu_max", "ram_min", "ram_avg", "ram_max",
+             "vram_last", "vram_max", "vram_percent_last"} (샘플이 전혀 없으면 count=0, 나머지 0)
+        """
+        with self._lock:
+            parts = []
+            latest = None
+            for segment in self._ordered_segments():
+                ts = segment[:, self.TS]
+                lo = np.searchsorted(ts, start, side="left")
+                hi = np.searchsorted(ts, end, side="right")
+                if hi > lo:
+                    parts.append(segment[lo:hi])
+                if hi > 0:
+                    latest = segment[hi - 1]
+            if parts:
+                rows = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            elif latest is not None:
+                rows = latest.reshape(1, -1).copy()
+            else:
+                rows = None
+            if rows is None:
+                return {"count": 0, "cpu_min": 0.0, "cpu_avg": 0.0, "cpu_max": 0.0,
+                        "ram_min": 0.0, "ram_avg": 0.0, "ram_max": 0.0,
+                        "vram_last": 0.0, "vram_max": 0.0, "vram_percent_last": 0.0}
+            cpu, ram, vram = rows[:, self.CPU], rows[:, self.RAM], rows[:, self.VRAM]
             return {
-                'vram_mb': used_vram_mb,
-                'total_vram_mb': total_vram_mb,
-                'percent': gpu_percent
+                "count": len(rows),
+                "cpu_min": float(cpu.min()), "cpu_avg": float(cpu.mean()), "cpu_max": float(cpu.max()),
+                "ram_min": float(ram.min()), "ram_avg": float(ram.mean()), "ram_max": float(ram.max()),
+                "vram_last": float(vram[-1]), "vram_max": float(vram.max()),
+                "vram_percent_last": float(rows[-1, self.VRAM_PERCENT])
             }
-        except Exception as e:
-            logger.warning(f"GPU 메모리 조회 실패: {e}")
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """가장 최근 샘플 (아직 없으면 None)"""
+        with self._lock:
+            if self._count == 0:
+                return None
+            row = self._samples[(self._count - 1) % self.capacity]
             return {
-                'vram_mb': 0,
-                'total_vram_mb': 0,
-                'percent': 0
+                "timestamp": float(row[self.TS]),
+                "cpu_percent": float(row[self.CPU]),
+                "ram_mb": float(row[self.RAM]),
+                "gpu_vram_mb": float(row[self.VRAM]),
+                "gpu_vram_percent": float(row[self.VRAM_PERCENT])
             }
-    
-    def _monitoring_loop(self):
-        """백그라운드 모니터링 루프"""
-        while self._monitoring:
-            try:
-                # CPU 사용률
-                cpu_percent = self.process.cpu_percent(interval=None)
-                self.cpu_samples.append(cpu_percent)
-                
-                # RAM 사용량 (MB)
-                mem_info = self.process.memory_info()
-                ram_mb = mem_info.rss / (1024 * 1024)
-                self.ram_samples.append(ram_mb)
-                
-                # GPU VRAM
-                if self._gpu_available:
-                    gpu_info = self._get_gpu_memory_info()
-                    self.gpu_vram_samples.append(gpu_info['vram_mb'])
-                
-                time.sleep(self.sample_interval)
-            except Exception as e:
-                logger.error(f"모니터링 중 오류: {e}")
-                break
-    
+
+
+class PerformanceMonitor:
+    """
+    요청 단위 성능 측정 (전역 ResourceSampler 구간 조회)
+
+    start()/stop()은 시각만 기록하므로 요청당 추가 스레드나 샘플 저장이 없습니다.
+    """
+
+    def __init__(self, sampler: Optional[ResourceSampler] = None):
+        """
+        Args:
+            sampler: 사용할 샘플러 (None이면 전역 resource_sampler)
+        """
+        self.sampler = sampler or resource_sampler
+        self._start_time = None
+        self._end_time = None
+
     def start(self):
         """성능 모니터링 시작"""
+        self.sampler.ensure_started()
         self._start_time = time.time()
-        self._monitoring = True
-        self.cpu_samples = []
-        self.ram_samples = []
-        self.gpu_vram_samples = []
-        
-        # 모니터링 스레드 시작
-        self._monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-        self._monitor_thread.start()
-        
         logger.debug("성능 모니터링 시작")
-    
+
     def stop(self) -> PerformanceMetrics:
-        """성능 모니터링 종료 및 결과 반환"""
+        """성능 모니터링 종료 및 결과 반환 (start() 없이 호출하면 직전 샘플 1개 기준, 처리 시간 0)"""
         self._end_time = time.time()
-        self._monitoring = False
-        
-        if self._monitor_thread:
-            self._monitor_thread.join(timeout=2)
-        
-        processing_time = self._end_time - self._start_time
-        
-        # 통계 계산
-        cpu_avg = sum(self.cpu_samples) / len(self.cpu_samples) if self.cpu_samples else 0
-        cpu_max = max(self.cpu_samples) if self.cpu_samples else 0
-        
-        ram_avg = sum(self.ram_samples) / len(self.ram_samples) if self.ram_samples else 0
-        ram_peak = max(self.ram_samples) if self.ram_samples else 0
-        
-        gpu_vram_current = self.gpu_vram_samples[-1] if self.gpu_vram_samples else 0
-        gpu_vram_peak = max(self.gpu_vram_samples) if self.gpu_vram_samples else 0
-        
-        # GPU 유틸리티
-        gpu_info = self._get_gpu_memory_info()
-        gpu_percent = gpu_info['percent']
-        
+        if self._start_time is None:
+            self.sampler.ensure_started()
+        start = self._start_time if self._start_time is not None else self._end_time
+        stats = self.sampler.window(start, self._end_time)
+
         metrics = PerformanceMetrics(
-            cpu_percent_avg=cpu_avg,
-            cpu_percent_max=cpu_max,
-            ram_mb_avg=ram_avg,
-            ram_mb_peak=ram_peak,
-            gpu_vram_mb_current=gpu_vram_current,
-            gpu_vram_mb_peak=gpu_vram_peak,
-            gpu_percent=gpu_percent,
-            processing_time_sec=processing_time
+            cpu_percent_avg=stats["cpu_avg"],
+            cpu_percent_max=stats["cpu_max"],
+            ram_mb_avg=stats["ram_avg"],
+            ram_mb_peak=stats["ram_max"],
+            gpu_vram_mb_current=stats["vram_last"],
+            gpu_vram_mb_peak=stats["vram_max"],
+            gpu_percent=stats["vram_percent_last"],
+            processing_time_sec=self._end_time - start,
+            cpu_percent_min=stats["cpu_min"],
+            ram_mb_min=stats["ram_min"],
+            sample_count=stats["count"]
         )
-        
-        logger.debug(f"성능 모니터링 종료 (CPU avg: {cpu_avg:.2f}%, "
-                    f"RAM peak: {ram_peak:.2f}MB, GPU VRAM peak: {gpu_vram_peak:.2f}MB)")
-        
+
+        logger.debug(f"성능 모니터링 종료 (CPU avg: {metrics.cpu_percent_avg:.2f}%, "
+                    f"RAM peak: {metrics.ram_mb_peak:.2f}MB, GPU VRAM peak: {metrics.gpu_vram_mb_peak:.2f}MB)")
+
         return metrics
+
+
+# 전역 인스턴스 생성
+resource_sampler = ResourceSampler()
@@ -0,0 +1,527 @@
+"""
+요청 추적 (trace / span, 외부 의존성 없음)
+
+Web UI → STT API → LLM 호출을 하나의 trace ID로 묶어 단계별 소요 시간(span 트리)을 기록합니다.
+
+- 전파: W3C traceparent 헤더 (00-<trace ID 32자>-<span ID 16자>-01)
+  + X-Request-ID (trace ID, vLLM/외부 Agent 로그와 대조용)
+- 현재 span은 contextvars로 전달 (asyncio 태스크, asyncio.to_thread 스레드에 자동 복사)
+- 종료된 span은 최근 trace 버퍼(/debug/trace/{id} 조회)에 쌓고,
+  백그라운드 스레드가 JSONL 파일 / OTLP HTTP(JSON) 수집기로 내보냄
+  (요청 경로에서는 큐에 넣기만 하며, 큐가 가득 차면 버리고 dropped 증가)
+- record_span()은 현재 trace가 없으면 아무것도 하지 않으므로 엔진/DB 같은 공용 경로에 두어도 됨
+
+STT API와 Web UI가 함께 사용 (Web UI 이미지에는 Dockerfile이 복사)
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+REQUEST_ID_HEADER = "X-Request-ID"
+TRACE_ID_HEADER = "X-Trace-Id"  # 응답 헤더 (클라이언트가 /debug/trace/{id} 조회에 사용)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("trace_current_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def is_trace_id(value: str) -> bool:
+    """32자리 16진수 trace ID 여부 (/debug/trace/{id} 입력 검증)"""
+    return len(value) == 32 and all(c in "0123456789abcdef" for c in value.lower())
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    traceparent 헤더 → (trace ID, 부모 span ID)
+
+    Returns:
+        형식이 틀리거나 ID가 전부 0이면 None
+    """
+    if not value:
+        return None
+    parts = value.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        if int(parts[1], 16) == 0 or int(parts[2], 16) == 0:
+            return None
+    except ValueError:
+        return None
+    return parts[1], parts[2]
+
+
+class Span:
+    """진행 중인 구간 (Tracer.finish()에서 dict로 기록)"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration", "attributes", "status", "_t0")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.duration = None
+        self.attributes = attributes
+        self.status = "ok"
+        self._t0 = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class _SpanScope:
+    """span 구간 (with / async with 모두 지원, 진입 동안 현재 span으로 설정)"""
+
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self._tracer = tracer
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # 다른 컨텍스트에서 종료 (스트리밍 응답 생성기 등): 현재 span만 기록 종료
+            pass
+        self._tracer.finish(self._span, exc)
+        return False
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+class Tracer:
+    """
+    span 기록 + 최근 trace 버퍼 + 내보내기
+
+    Args:
+        service: 서비스 이름 (span 기록과 OTLP resource의 service.name)
+        max_traces: 메모리에 보관할 최근 trace 수 (초과 시 오래된 것부터 제거)
+        max_spans_per_trace: trace 1개에 보관할 최대 span 수 (긴 오디오의 청크 span 상한)
+    """
+
+    def __init__(self, service: str = "stt", max_traces: int = 500, max_spans_per_trace: int = 2000):
+        self.service = service
+        self.enabled = True
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self.export_file: Optional[str] = None
+        self.export_max_bytes = 100 * 1024 * 1024
+        self.otlp_endpoint: Optional[str] = None
+        self.dropped = 0
+        self._traces: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._exporter: Optional[threading.Thread] = None
+        self._last_export_error = 0.0
+
+    def configure(self, service: Optional[str] = None, enabled: bool = True, export_file: Optional[str] = None,
+                  otlp_endpoint: Optional[str] = None, max_traces: Optional[int] = None,
+                  export_max_mb: Optional[float] = None) -> None:
+        """
+        서버 시작 시 1회 설정
+
+        Args:
+            service: 서비스 이름
+            enabled: False면 span을 기록하지 않음 (헤더 전파는 유지)
+            export_file: JSONL 내보내기 경로 (None/빈 문자열이면 사용 안 함)
+            otlp_endpoint: OTLP HTTP 수집기 주소 (예: http://otel-collector:4318, /v1/traces로 POST)
+            max_traces: 최근 trace 버퍼 크기
+            export_max_mb: JSONL 파일 최대 크기 (초과 시 .1로 교체)
+        """
+        if service:
+            self.service = service
+        self.enabled = enabled
+        if max_traces:
+            self.max_traces = max_traces
+        if export_max_mb:
+            self.export_max_bytes = int(export_max_mb * 1024 * 1024)
+        self.export_file = export_file or None
+        self.otlp_endpoint = otlp_endpoint.rstrip("/") if otlp_endpoint else None
+        if self.export_file:
+            os.makedirs(os.path.dirname(os.path.abspath(self.export_file)), exist_ok=True)
+        if enabled and (self.export_file or self.otlp_endpoint) and self._exporter is None:
+            self._queue = queue.Queue(maxsize=10000)
+            self._exporter = threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True)
+            self._exporter.start()
+        logger.info(f"[Trace] 설정: service={self.service}, enabled={enabled}, "
+                    f"file={self.export_file}, otlp={self.otlp_endpoint}")
+
+    # ---- span 기록 ----
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        """현재 span (없으면 None)"""
+        return _current_span.get()
+
+    def start_span(self, name: str, parent: Union[Span, Tuple[str, str], None] = None, **attributes) -> Span:
+        """
+        span 시작 (현재 span으로 설정하지 않음, 끝나면 finish() 호출)
+
+        Args:
+            name: span 이름
+            parent: 부모 span / 원격 부모 (trace ID, span ID) / None (현재 span, 없으면 새 trace)
+        """
+        if parent is None:
+            parent = _current_span.get()
+        if isinstance(parent, Span):
+            return Span(name, parent.trace_id, parent.span_id, attributes)
+        if parent:
+            return Span(name, parent[0], parent[1], attributes)
+        return Span(name, _new_id(16), None, attributes)
+
+    def finish(self, span: Span, error: Optional[BaseException] = None) -> None:
+        """span 종료 후 기록"""
+        if span.duration is None:
+            span.duration = time.perf_counter() - span._t0
+        if error is not None:
+            span.status = "error"
+            span.attributes["error"] = f"{type(error).__name__}: {error}"[:300]
+        if self.enabled:
+            self._store(self._to_record(span))
+
+    def span(self, name: str, parent: Union[Span, Tuple[str, str], None] = None, **attributes) -> _SpanScope:
+        """
+        with / async with 구간을 span으로 기록 (예외는 status=error로 기록 후 그대로 전파)
+
+        예시:
+            with tracer.span("validation", file=name) as span:
+                ...
+                span.set(size_mb=12.3)
+        """
+        return _SpanScope(self, self.start_span(name, parent, **attributes))
+
+    def traced(self, name: str):
+        """함수 호출 구간을 span으로 기록하는 데코레이터 (sync / async 함수)"""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_span(self, name: str, start: float, end: Optional[float] = None, **attributes) -> None:
+        """
+        이미 끝난 구간을 현재 span의 자식으로 기록 (현재 trace가 없으면 무시)
+
+        Args:
+            name: span 이름
+            start: 시작 시각 (time.time())
+            end: 종료 시각 (기본: 지금)
+        """
+        parent = _current_span.get()
+        if parent is None or not self.enabled:
+            return
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+        span.start = start
+        span.duration = max((time.time() if end is None else end) - start, 0.0)
+        self._store(self._to_record(span))
+
+    def inject_headers(self, headers: Optional[dict] = None) -> dict:
+        """현재 span을 부모로 하는 전파 헤더 추가 (현재 trace가 없으면 그대로 반환)"""
+        headers = {} if headers is None else headers
+        span = _current_span.get()
+        if span is not None:
+            headers[TRACEPARENT_HEADER] = span.traceparent
+            headers[REQUEST_ID_HEADER] = span.trace_id
+        return headers
+
+    # ---- 조회 ----
+
+    def get_trace(self, trace_id: str) -> List[dict]:
+        """최근 버퍼에서 trace의 span 목록 (없으면 빈 리스트)"""
+        with self._lock:
+            return list(self._traces.get(trace_id.lower(), ()))
+
+    def recent(self, limit: int = 20, min_duration_ms: float = 0.0) -> List[dict]:
+        """최근 trace 요약 (가장 긴 루트 span 기준, 최신순)"""
+        with self._lock:
+            items = [(trace_id, list(spans)) for trace_id, spans in reversed(self._traces.items())]
+        summaries = []
+        for trace_id, spans in items:
+            span_ids = {span["span_id"] for span in spans}
+            roots = [span for span in spans if span["parent_id"] not in span_ids] or spans
+            root = max(roots, key=lambda span: span["duration_ms"])
+            if root["duration_ms"] < min_duration_ms:
+                continue
+            summaries.append({
+                "trace_id": trace_id,
+                "root": root["name"],
+                "start": root["start"],
+                "duration_ms": root["duration_ms"],
+                "status": "error" if any(span["status"] == "error" for span in spans) else "ok",
+                "spans": len(spans)
+            })
+            if len(summaries) >= limit:
+                break
+        return summaries
+
+    # ---- 내부 ----
+
+    def _to_record(self, span: Span) -> dict:
+        return {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "service": self.service,
+            "start": round(span.start, 6),
+            "duration_ms": round(span.duration * 1000, 3),
+            "status": span.status,
+            "attributes": span.attributes
+        }
+
+    def _store(self, record: dict) -> None:
+        trace_id = record["trace_id"]
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            if spans is None:
+                spans = self._traces[trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            else:
+                self._traces.move_to_end(trace_id)
+            if len(spans) < self.max_spans_per_trace:
+                spans.append(record)
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def _export_loop(self) -> None:
+        """1초 또는 512개 단위로 모아 내보냄"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + 1.0
+            while len(batch) < 512:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                if self.export_file:
+                    self._write_jsonl(batch)
+                if self.otlp_endpoint:
+                    self._post_otlp(batch)
+            except Exception as e:
+                # 수집기 장애가 로그를 채우지 않도록 1분에 1번만 경고
+                now = time.monotonic()
+                if now - self._last_export_error >= 60:
+                    self._last_export_error = now
+                    logger.warning(f"[Trace] 내보내기 실패 ({len(batch)}개 span 버림): {type(e).__name__}: {e}")
+
+    def _write_jsonl(self, batch: List[dict]) -> None:
+        path = self.export_file
+        try:
+            if os.path.getsize(path) >= self.export_max_bytes:
+                os.replace(path, path + ".1")
+        except OSError:
+            pass
+        with open(path, "a", encoding="utf-8") as f:
+            for record in batch:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def _post_otlp(self, batch: List[dict]) -> None:
+        body = json.dumps(to_otlp(batch, self.service), default=str).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.otlp_endpoint}/v1/traces", data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(records: List[dict], service: str) -> dict:
+    """span 기록 → OTLP/HTTP JSON (ExportTraceServiceRequest)"""
+    spans = []
+    for record in records:
+        start_ns = int(record["start"] * 1e9)
+        span = {
+            "traceId": record["trace_id"],
+            "spanId": record["span_id"],
+            "name": record["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(record["duration_ms"] * 1e6)),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in record["attributes"].items()],
+            "status": {"code": 2 if record["status"] == "error" else 1}
+        }
+        if record["parent_id"]:
+            span["parentSpanId"] = record["parent_id"]
+        spans.append(span)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+            "scopeSpans": [{"scope": {"name": "stt_engine.tracing"}, "spans": spans}]
+        }]
+    }
+
+
+def aiohttp_trace_config(tracer: Tracer, name: str):
+    """
+    aiohttp 요청마다 span 기록 + 전파 헤더 추가 (ClientSession(trace_configs=[...])용)
+
+    현재 trace가 없는 요청(헬스 체크 등)은 기록하지 않습니다.
+
+    Args:
+        tracer: 기록할 Tracer
+        name: span 이름 (예: http.vllm)
+    """
+    import aiohttp
+
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        if _current_span.get() is None:
+            ctx.trace_span = None
+            return
+        span = tracer.start_span(name, method=params.method, url=str(params.url.with_query(None)))
+        params.headers[TRACEPARENT_HEADER] = span.traceparent
+        params.headers[REQUEST_ID_HEADER] = span.trace_id
+        ctx.trace_span = span
+
+    async def on_request_end(session, ctx, params):
+        span = getattr(ctx, "trace_span", None)
+        if span is not None:
+            span.set(status_code=params.response.status)
+            tracer.finish(span)
+
+    async def on_request_exception(session, ctx, params):
+        span = getattr(ctx, "trace_span", None)
+        if span is not None:
+            tracer.finish(span, params.exception)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+# ---- /debug/trace/{id} 표시 ----
+
+def build_tree(spans: List[dict]) -> List[dict]:
+    """span 목록 → 부모/자식 트리 (부모가 없는 span은 루트, 자식은 시작 순)"""
+    nodes = {span["span_id"]: {**span, "children": []} for span in spans}
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"])
+        (parent["children"] if parent is not None else roots).append(node)
+    for node in nodes.values():
+        node["children"].sort(key=lambda child: child["start"])
+    roots.sort(key=lambda node: node["start"])
+    return roots
+
+
+def critical_path(roots: List[dict]) -> List[dict]:
+    """가장 긴 루트부터 가장 늦게 끝난 자식을 따라 내려간 경로 (전체 지연을 결정한 구간)"""
+    path = []
+    nodes = roots
+    while nodes:
+        node = max(nodes, key=lambda n: n["start"] + n["duration_ms"] / 1000) if path else \
+            max(nodes, key=lambda n: n["duration_ms"])
+        path.append({"name": node["name"], "service": node["service"], "duration_ms": node["duration_ms"]})
+        nodes = node["children"]
+    return path
+
+
+def trace_view(trace_id: str, spans: List[dict]) -> dict:
+    """
+    /debug/trace/{id} JSON 응답
+
+    Returns:
+        {"trace_id", "span_count", "duration_ms", "services", "critical_path", "tree"}
+    """
+    roots = build_tree(spans)
+    if spans:
+        start = min(span["start"] for span in spans)
+        end = max(span["start"] + span["duration_ms"] / 1000 for span in spans)
+        duration_ms = round((end - start) * 1000, 3)
+    else:
+        duration_ms = 0.0
+    return {
+        "trace_id": trace_id,
+        "span_count": len(spans),
+        "duration_ms": duration_ms,
+        "services": sorted({span["service"] for span in spans}),
+        "critical_path": critical_path(roots),
+        "tree": roots
+    }
+
+
+def render_text(spans: List[dict], width: int = 40) -> str:
+    """span 목록 → 텍스트 워터폴 (시작 오프셋, 소요 시간, 막대, 들여쓴 이름)"""
+    if not spans:
+        return "(span 없음)\n"
+    origin = min(span["start"] for span in spans)
+    total = max(span["start"] + span["duration_ms"] / 1000 for span in spans) - origin or 1e-9
+    lines = [f"{'offset(ms)':>11} {'dur(ms)':>10}  {'':{width}}  span"]
+
+    def walk(node: dict, depth: int):
+        offset = node["start"] - origin
+        begin = int(offset / total * width)
+        length = max(1, int(node["duration_ms"] / 1000 / total * width))
+        bar = " " * begin + "█" * min(length, width - begin)
+        attributes = " ".join(f"{key}={value}" for key, value in node["attributes"].items())
+        marker = " ❌" if node["status"] == "error" else ""
+        lines.append(f"{offset * 1000:11.1f} {node['duration_ms']:10.1f}  {bar:{width}}  "
+                     f"{'  ' * depth}{node['name']} [{node['service']}]{marker} {attributes}".rstrip())
+        for child in node["children"]:
+            walk(child, depth + 1)
+
+    for root in build_tree(spans):
+        walk(root, 0)
+    return "\n".join(lines) + "\n"
+
+
+# 전역 인스턴스 생성 (서버 시작 시 tracer.configure()로 서비스 이름/내보내기 설정)
+tracer = Tracer()
@@ -0,0 +1,54 @@
+"""
+Web UI 메트릭 정의 (/metrics, Prometheus 텍스트 형식)
+
+- 히스토그램: STT 스케줄러 대기, DB 쓰기 지연, STT API 커넥션 대기
+- 게이지: 스케줄러 처리 중/대기/한도, 프로세스 RSS (조회 시점 콜백)
+"""
+
+import os
+
+from utils import tracing
+from utils.metrics import Gauge, Histogram, aiohttp_trace_config
+
+# 커넥션 대기 버킷 (초)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# DB 쓰기 버킷 (초)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "web_stt_scheduler_wait_seconds", "STT 스케줄러 슬롯 대기 시간 (초)"
+)
+DB_WRITE_SECONDS = Histogram(
+    "web_db_write_seconds", "DB 쓰기 쿼리 실행 시간 (초)", ["operation"], buckets=DB_BUCKETS
+)
+HTTP_CLIENT_POOL_WAIT_SECONDS = Histogram(
+    "web_http_client_pool_wait_seconds", "STT API 커넥션 대기/생성 시간 (초)", ["target", "phase"],
+    buckets=POOL_WAIT_BUCKETS
+)
+
+SCHEDULER_IN_FLIGHT = Gauge("web_stt_scheduler_in_flight", "STT API로 보낸 처리 중 요청 수")
+SCHEDULER_QUEUED = Gauge("web_stt_scheduler_queued", "스케줄러 대기 요청 수")
+SCHEDULER_LIMIT = Gauge("web_stt_scheduler_limit", "스케줄러 동시 요청 한도 (적응형)")
+PROCESS_MEMORY_BYTES = Gauge("web_process_resident_memory_bytes", "Web UI 프로세스 RSS (bytes)")
+
+# STT API 호출 세션 공용 (aiohttp TraceConfig는 여러 세션에서 재사용 가능)
+# 커넥션 대기 히스토그램 + 요청 span (http.stt_api) / traceparent 헤더 전파
+STT_API_TRACE_CONFIGS = [
+    aiohttp_trace_config(HTTP_CLIENT_POOL_WAIT_SECONDS, "stt_api"),
+    tracing.aiohttp_trace_config(tracing.tracer, "http.stt_api")
+]
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss_bytes():
+    """현재 프로세스 RSS (/proc/self/statm, 없으면 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+PROCESS_MEMORY_BYTES.set_function(process_rss_bytes)
@@ -1,6 +1,7 @@
 """
 SQLAlchemy ORM 모델 정의
-Phase 1: 인증, 파일 관리, 분석 시스템을 위한 5개 테이블
+Phase 1: 인증, 파일 관리, 분석 시스템을 위한 테이블
+(stored_blobs: 중복 업로드 파일을 콘텐츠 해시 기준으로 공유)
 """
 
 from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Text, create_engine
@@ -46,14 +47,36 @@ class FileUpload(Base):
     filename = Column(String(500), nullable=False)
     file_size_mb = Column(Float)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String(64), ForeignKey("stored_blobs.content_hash"), index=True)
+    # 콘텐츠 SHA256 해시 (stored_blobs 참조, 레거시 업로드는 NULL)
     
     # 관계 설정
     employee = relationship("Employee", back_populates="file_uploads")
+    blob = relationship("StoredBlob", back_populates="file_uploads")
     
     def __repr__(self):
         return f"<FileUpload(emp_id='{self.emp_id}', filename='{self.filename}', folder='{self.folder_path}')>"
 
 
+class StoredBlob(Base):
+    """콘텐츠 주소 기반 파일 저장소 테이블 (중복 업로드 공유)"""
+    __tablename__ = "stored_blobs"
+    
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)
+    # SHA256 해시: UPLOAD_DIR/.blobs/{hash[:2]}/{hash} 경로의 실제 파일
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, default=0)
+    # 이 blob을 참조하는 file_uploads 레코드 수 (0이 되면 물리 파일 삭제)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # 관계 설정
+    file_uploads = relationship("FileUpload", back_populates="blob")
+    
+    def __repr__(self):
+        return f"<StoredBlob(content_hash='{self.content_hash[:12]}', size={self.size_bytes}, refs={self.ref_count})>"
+
+
 class AnalysisJob(Base):
     """분석 작업 정보 테이블"""
     __tablename__ = "analysis_jobs"
@@ -4,11 +4,16 @@ Phase 3: 분석 시작, 진행률, 결과 조회
 """
 
 from fastapi import APIRouter, HTTPException, Request, Depends, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import Optional
+from urllib.parse import quote
 import traceback
 import logging
 
 from app.services.analysis_service import AnalysisService
+from app.services.export_service import ExportService, VALID_STATUS_FILTERS, VALID_RISK_FILTERS
+from app.services.stt_scheduler import stt_scheduler
 from app.utils.db import get_db, SessionLocal
 from app.models.analysis_schemas import (
     AnalysisStartRequest, AnalysisStartResponse, AnalysisProgressResponse, AnalysisResultListResponse
@@ -122,25 +127,33 @@ async def get_progress(
 async def get_results(
     job_id: str,
     request: Request,
-    page: int = 1,
+    cursor: Optional[int] = None,
+    page: Optional[int] = None,
     page_size: int = 20,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
     """
-    분석 결과 조회 (페이지네이션 지원)
+    분석 결과 목록 조회 (keyset 페이지네이션)
+    
+    목록에는 파일명/상태/위험도/STT 미리보기만 포함되며,
+    STT 전문과 탐지 결과 전체는 /results/{job_id}/{result_id}로 조회한다.
     
     Args:
         job_id: 분석 작업 ID
-        page: 페이지 번호 (기본값: 1)
-        page_size: 페이지 크기 (기본값: 20)
+        cursor: 이전 응답의 next_cursor (없으면 처음부터)
+        page: (호환용) 지정 시 기존 OFFSET 방식 전체 결과 응답
+        page_size: 페이지 크기 (기본값: 20, 최대 100)
+        include_total: 전체 개수(근사값) 포함 여부
     
     Returns:
         {
             "job_id": str,
-            "page": int,
             "page_size": int,
-            "total_count": int,
-            "total_pages": int,
+            "cursor": int | None,
+            "next_cursor": int | None,
+            "has_more": bool,
+            "total_count": int,      # include_total=true 일 때만
             "results": [...]
         }
     """
@@ -151,19 +164,135 @@ async def get_results(
     
     try:
         # 페이지 범위 검증
-        if page < 1:
-            page = 1
         if page_size < 1 or page_size > 100:
             page_size = 20
         
-        result = AnalysisService.get_results(job_id, emp_id, page, page_size, db)
-        return result
+        if page is not None:
+            return AnalysisService.get_results(job_id, emp_id, max(page, 1), page_size, db)
+        
+        return AnalysisService.get_results_keyset(
+            job_id, emp_id, cursor, page_size, include_total, db
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/results/{job_id}/{result_id}")
+async def get_result_detail(
+    job_id: str,
+    result_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    분석 결과 상세 조회 (STT 전문, 탐지 결과 전체)
+    
+    Args:
+        job_id: 분석 작업 ID
+        result_id: 분석 결과 ID (목록 응답의 id)
+    
+    Returns:
+        분석 결과 dict
+    """
+    # 세션에서 사번 추출
+    emp_id = request.session.get("emp_id")
+    if not emp_id:
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다")
+    
+    try:
+        return AnalysisService.get_result_detail(job_id, result_id, emp_id, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/export/{job_id}")
+async def export_results(
+    job_id: str,
+    request: Request,
+    format: str = "xlsx",
+    status: str = "all",
+    risk: str = "all",
+    db: Session = Depends(get_db)
+):
+    """
+    분석 결과 내보내기 (CSV / XLSX 스트리밍 다운로드)
+    
+    페이지 단위가 아닌 작업 전체 결과를 화면과 같은 필터로 내보낸다.
+    행을 순차적으로 변환해 보내므로 결과 수와 무관하게 다운로드가 즉시 시작된다.
+    
+    Args:
+        job_id: 분석 작업 ID
+        format: 'xlsx' 또는 'csv'
+        status: 상태 필터 (all / pending / processing / completed / failed)
+        risk: 위험도 필터 (all / safe / danger)
+    
+    Returns:
+        StreamingResponse (CSV는 클라이언트가 지원하면 gzip 전송)
+    """
+    # 세션에서 사번 추출
+    emp_id = request.session.get("emp_id")
+    if not emp_id:
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다")
+    
+    export_format = format.lower()
+    if export_format not in ("csv", "xlsx"):
+        raise HTTPException(status_code=400, detail="지원하지 않는 형식입니다 (csv, xlsx)")
+    if status not in VALID_STATUS_FILTERS or risk not in VALID_RISK_FILTERS:
+        raise HTTPException(status_code=400, detail="잘못된 필터 값입니다")
+    
+    try:
+        job = ExportService.get_job(job_id, emp_id, db)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    folder_name = job.folder_path.replace("/", "_")
+    filename = f"analysis_results_{folder_name}_{datetime.now().strftime('%Y-%m-%d')}.{export_format}"
+    headers = {
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+        "Cache-Control": "no-store"
+    }
+    
+    logger.info(f"[Export] 결과 내보내기: job_id={job_id}, format={export_format}, status={status}, risk={risk}")
+    rows = ExportService.iter_rows(job_id, status, risk)
+    
+    if export_format == "csv":
+        compress = "gzip" in request.headers.get("accept-encoding", "").lower()
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+        return StreamingResponse(
+            ExportService.stream_csv(rows, compress=compress),
+            media_type="text/csv; charset=utf-8",
+            headers=headers
+        )
+    
+    return StreamingResponse(
+        ExportService.stream_xlsx(rows),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers=headers
+    )
+
+
+@router.get("/scheduler")
+async def get_scheduler_status(request: Request):
+    """
+    STT API 요청 스케줄러 상태 조회
+    
+    Returns:
+        {"limit": float, "in_flight": int, "queued": int, "capacity": int, "flows": [...]}
+    """
+    # 세션에서 사번 추출
+    emp_id = request.session.get("emp_id")
+    if not emp_id:
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다")
+    
+    return stt_scheduler.get_stats()
+
+
 @router.post("/rerun", status_code=202)
 async def rerun_analysis(
     request: Request,
@@ -4,16 +4,29 @@ Phase 2: 파일 업로드, 조회, 삭제 등의 REST API
 """
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Depends, Query
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pathlib import Path
 import logging
-import os
 
 from app.services.file_service import FileService
+from app.services.audio_preview_service import AudioPreviewService
+from app.utils import file_utils
 from app.utils.db import get_db
+from app.utils.range_response import build_range_response
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# 확장자별 Content-Type
+AUDIO_MEDIA_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.m4a': 'audio/mp4',
+    '.flac': 'audio/flac',
+    '.ogg': 'audio/ogg'
+}
+
 router = APIRouter(
     prefix="/api/files",
     tags=["files"],
@@ -130,6 +143,43 @@ async def delete_file_handler(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _resolve_audio_path(
+    emp_id: str,
+    folder_path: str,
+    filename: str,
+    request: Request
+) -> Path:
+    """
+    오디오 요청 공통 검증 (세션, 본인 파일 여부, 경로 traversal, 존재 여부)
+    
+    Returns:
+        Path: 검증된 파일 경로
+    
+    Raises:
+        HTTPException: 401 / 403 / 400 / 404
+    """
+    session_emp_id = request.session.get("emp_id")
+    if not session_emp_id:
+        logger.warning(f"[Audio] 세션 없음 - 로그인 필요")
+        raise HTTPException(status_code=401, detail="로그인이 필요합니다")
+    
+    # 본인 파일만 접근 가능
+    if session_emp_id != emp_id:
+        logger.warning(f"[Audio] 접근 권한 없음 - 요청 emp_id={emp_id}, 세션 emp_id={session_emp_id}")
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
+    
+    try:
+        file_path = file_utils.validate_file_path(emp_id, folder_path, filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not file_path.is_file():
+        logger.warning(f"[Audio] 파일을 찾을 수 없음: {emp_id}/{folder_path}/{filename}")
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    
+    return file_path
+
+
 @router.get("/audio/{emp_id}/{folder_path}/{filename}")
 async def get_audio_file(
     emp_id: str,
@@ -138,7 +188,10 @@ async def get_audio_file(
     request: Request
 ):
     """
-    오디오 파일 스트리밍
+    오디오 파일 스트리밍 (HTTP Range / 206 Partial Content 지원)
+    
+    탐색(seek) 시 브라우저가 필요한 구간만 요청하며,
+    ETag/Last-Modified로 재요청 시 304 응답을 받는다.
     
     Args:
         emp_id: 사원번호
@@ -146,55 +199,16 @@ async def get_audio_file(
         filename: 파일명
     
     Returns:
-        FileResponse: 오디오 파일
+        StreamingResponse: 오디오 파일 (전체 또는 요청 범위)
     """
     try:
-        # 로깅
-        logger.info(f"[Audio] 오디오 파일 요청: emp_id={emp_id}, folder_path={folder_path}, filename={filename}")
-        
-        # 세션 확인
-        session_emp_id = request.session.get("emp_id")
-        if not session_emp_id:
-            logger.warning(f"[Audio] 세션 없음 - 로그인 필요")
-            raise HTTPException(status_code=401, detail="로그인이 필요합니다")
-        
-        # 본인 파일만 접근 가능
-        if session_emp_id != emp_id:
-            logger.warning(f"[Audio] 접근 권한 없음 - 요청 emp_id={emp_id}, 세션 emp_id={session_emp_id}")
-            raise HTTPException(status_code=403, detail="접근 권한이 없습니다")
-        
-        # 파일 경로 구성
-        base_path = os.path.join("data", "uploads", emp_id, folder_path)
-        file_path = os.path.join(base_path, filename)
-        logger.info(f"[Audio] 파일 경로: base_path={base_path}, file_path={file_path}")
-        
-        # 파일 존재 확인
-        if not os.path.exists(file_path):
-            logger.error(f"[Audio] 파일을 찾을 수 없음: {file_path}")
-            # 디렉토리 내용 확인
-            if os.path.exists(base_path):
-                logger.error(f"[Audio] 디렉토리 내용: {os.listdir(base_path)}")
-            else:
-                logger.error(f"[Audio] 디렉토리 없음: {base_path}")
-            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+        file_path = _resolve_audio_path(emp_id, folder_path, filename, request)
         
         # 파일 타입 결정
-        _, ext = os.path.splitext(filename)
-        media_type_map = {
-            '.mp3': 'audio/mpeg',
-            '.wav': 'audio/wav',
-            '.m4a': 'audio/mp4',
-            '.flac': 'audio/flac',
-            '.ogg': 'audio/ogg'
-        }
-        media_type = media_type_map.get(ext.lower(), 'audio/mpeg')
+        media_type = AUDIO_MEDIA_TYPES.get(file_path.suffix.lower(), 'audio/mpeg')
         
-        logger.info(f"[Audio] 오디오 파일 제공: {file_path} (type: {media_type})")
-        return FileResponse(
-            path=file_path,
-            media_type=media_type,
-            filename=filename
-        )
+        logger.debug(f"[Audio] 오디오 파일 제공: {file_path} (type: {media_type}, range: {request.headers.get('range')})")
+        return build_range_response(request, file_path, media_type, filename=filename)
         
     except HTTPException as e:
         raise
@@ -203,6 +217,83 @@ async def get_audio_file(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/waveform/{emp_id}/{folder_path}/{filename}")
+async def get_waveform(
+    emp_id: str,
+    folder_path: str,
+    filename: str,
+    request: Request,
+    points: int = Query(1000, ge=10, le=20000)
+):
+    """
+    파형 peaks 조회 (오디오를 받지 않고 파형 렌더링/탐색용)
+    
+    구간별 min/max 배열은 최초 요청 시 계산되어 파일 옆 .preview/에 캐시된다.
+    
+    Args:
+        emp_id: 사원번호
+        folder_path: 폴더 경로
+        filename: 파일명
+        points: 응답 구간 수 (10-20000, 기본값: 1000)
+    
+    Returns:
+        {"duration": float, "peaks_per_second": float, "points": int, "min": [...], "max": [...]}
+    """
+    try:
+        file_path = _resolve_audio_path(emp_id, folder_path, filename, request)
+        waveform = await run_in_threadpool(AudioPreviewService.get_waveform, file_path, points)
+        return JSONResponse(
+            content=waveform,
+            headers={"Cache-Control": "private, max-age=3600"}
+        )
+    
+    except HTTPException:
+        raise
+    except RuntimeError as e:
+        logger.warning(f"[Audio] 파형 계산 불가: {filename} ({e})")
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        logger.error(f"파형 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/preview/{emp_id}/{folder_path}/{filename}")
+async def get_audio_preview(
+    emp_id: str,
+    folder_path: str,
+    filename: str,
+    request: Request
+):
+    """
+    저비트레이트 미리보기 오디오 스트리밍 (mono MP3, Range 지원)
+    
+    최초 요청 시 ffmpeg로 변환하여 캐시하며, ffmpeg가 없으면 원본을 제공한다.
+    
+    Args:
+        emp_id: 사원번호
+        folder_path: 폴더 경로
+        filename: 파일명
+    
+    Returns:
+        StreamingResponse: 미리보기 오디오 (전체 또는 요청 범위)
+    """
+    try:
+        file_path = _resolve_audio_path(emp_id, folder_path, filename, request)
+        preview_path = await run_in_threadpool(AudioPreviewService.get_preview, file_path)
+        
+        if preview_path is None:
+            media_type = AUDIO_MEDIA_TYPES.get(file_path.suffix.lower(), 'audio/mpeg')
+            return build_range_response(request, file_path, media_type, filename=filename)
+        
+        return build_range_response(request, preview_path, 'audio/mpeg', filename=filename)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"미리보기 제공 실패: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/folders", status_code=201)
 async def create_folder(
     request: Request,
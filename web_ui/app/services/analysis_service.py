@@ -11,6 +11,7 @@ import random
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 import aiohttp
 
@@ -21,7 +22,9 @@ from app.models.analysis_schemas import (
 )
 from app.utils.file_utils import get_user_upload_dir
 from app.services.stt_service import stt_service
-from config import STT_API_URL, MAX_CONCURRENT_ANALYSIS
+from app.services.stt_scheduler import stt_scheduler
+from config import STT_API_URL, RESULT_PREVIEW_CHARS, STT_SCHEDULER_OVERLOAD_RETRIES
+from utils.tracing import tracer
 
 # Test configuration - set to 0 to disable, or value between 0.0-1.0 for failure rate
 TEST_FAILURE_RATE = 0.25 # 0.25 = 25% failure rate for testing fallback (dummy) responses only
@@ -342,30 +345,14 @@ class AnalysisService:
             # 결과 변환 - 프론트엔드에서 사용할 포맷
             results_list = []
             for r in results:
-                result_dict = {
+                results_list.append({
                     "filename": r.file_id,
                     "stt_text": r.stt_text,
                     "status": r.status,
-                    "confidence": None,
-                    "risk_level": None,
+                    **AnalysisService._summary_fields(r.status, r.stt_metadata, r.improper_detection_results),
                     "improper_detection_results": r.improper_detection_results,
                     "element_detection": r.improper_detection_results  # 프론트엔드에서 element_detection으로 사용
-                }
-                
-                # stt_metadata에서 confidence 추출
-                if r.stt_metadata:
-                    result_dict["confidence"] = r.stt_metadata.get("confidence", 0.5)
-                
-                # improper_detection_results 기반 risk_level 결정
-                if r.improper_detection_results:
-                    if r.improper_detection_results.get("detected_yn") == "Y":
-                        result_dict["risk_level"] = "danger"
-                    else:
-                        result_dict["risk_level"] = "safe"
-                else:
-                    result_dict["risk_level"] = None if r.status != "completed" else "safe"
-                
-                results_list.append(result_dict)
+                })
             
             return {
                 "job_id": job_id,
@@ -381,6 +368,151 @@ class AnalysisService:
         except Exception as e:
             raise Exception(f"결과 조회 실패: {str(e)}")
     
+    @staticmethod
+    def _summary_fields(status: Optional[str], stt_metadata: Optional[Dict], detection: Optional[Dict]) -> Dict:
+        """
+        결과 목록/상세 공통 값 (get_results, get_results_keyset, get_result_detail이 같은 규칙 사용)
+        
+        Returns:
+            {"confidence": stt_metadata의 confidence (메타데이터가 있으면 기본 0.5),
+             "risk_level": 탐지 결과가 있으면 'danger'(detected_yn=Y) / 'safe', 없으면 완료 시 'safe'}
+        """
+        if detection:
+            risk_level = "danger" if detection.get("detected_yn") == "Y" else "safe"
+        else:
+            risk_level = "safe" if status == "completed" else None
+        return {
+            "confidence": stt_metadata.get("confidence", 0.5) if stt_metadata else None,
+            "risk_level": risk_level
+        }
+    
+    @staticmethod
+    def get_results_keyset(
+        job_id: str,
+        emp_id: str,
+        cursor: Optional[int] = None,
+        page_size: int = 20,
+        include_total: bool = False,
+        db: Session = None
+    ):
+        """
+        분석 결과 목록 조회 (keyset 페이지네이션 + 목록용 컬럼만 조회)
+        
+        OFFSET 대신 마지막 결과 id 이후를 조회하므로 뒤쪽 페이지도 첫 페이지와 같은 비용이다.
+        STT 전문은 읽지 않고 미리보기(앞부분)와 길이만 DB에서 추출한다.
+        confidence / risk_level은 get_results와 같은 규칙(_summary_fields)으로 계산한다.
+        
+        Args:
+            job_id: 분석 작업 ID
+            emp_id: 사번
+            cursor: 이전 응답의 next_cursor (없으면 처음부터)
+            page_size: 페이지 크기
+            include_total: True면 전체 개수(근사값) 포함
+            db: DB 세션
+        
+        Returns:
+            {"results": [...], "next_cursor": 120, "has_more": True, "total_count": 10000}
+        """
+        job = db.query(AnalysisJob).filter(
+            AnalysisJob.job_id == job_id,
+            AnalysisJob.emp_id == emp_id
+        ).first()
+        
+        if not job:
+            raise ValueError("작업을 찾을 수 없습니다")
+        
+        query = db.query(
+            AnalysisResult.id,
+            AnalysisResult.file_id,
+            AnalysisResult.status,
+            func.substr(AnalysisResult.stt_text, 1, RESULT_PREVIEW_CHARS),
+            func.length(AnalysisResult.stt_text),
+            AnalysisResult.stt_metadata,
+            AnalysisResult.improper_detection_results
+        ).filter(AnalysisResult.job_id == job_id)
+        
+        if cursor:
+            query = query.filter(AnalysisResult.id > cursor)
+        
+        # 다음 페이지 존재 여부 확인을 위해 1건 더 조회
+        rows = query.order_by(AnalysisResult.id).limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        results_list = []
+        for (result_id, file_id, status, preview, text_length,
+             stt_metadata, detection) in rows:
+            results_list.append({
+                "id": result_id,
+                "filename": file_id,
+                "status": status,
+                **AnalysisService._summary_fields(status, stt_metadata, detection),
+                "detected_yn": detection.get("detected_yn") if detection else None,
+                "category": detection.get("category") if detection else None,
+                "stt_preview": preview,
+                "stt_length": text_length or 0,
+                "stt_truncated": (text_length or 0) > RESULT_PREVIEW_CHARS
+            })
+        
+        response = {
+            "job_id": job_id,
+            "page_size": page_size,
+            "cursor": cursor,
+            "next_cursor": rows[-1][0] if has_more else None,
+            "has_more": has_more,
+            "results": results_list
+        }
+        
+        if include_total:
+            # 작업 생성 시 기록한 파일 목록 길이를 근사값으로 사용 (COUNT(*) 회피)
+            if job.file_ids:
+                response["total_count"] = len(job.file_ids)
+            else:
+                response["total_count"] = db.query(func.count(AnalysisResult.id)).filter(
+                    AnalysisResult.job_id == job_id
+                ).scalar() or 0
+            response["total_is_approximate"] = bool(job.file_ids)
+        
+        return response
+    
+    @staticmethod
+    def get_result_detail(job_id: str, result_id: int, emp_id: str, db: Session):
+        """
+        분석 결과 1건 상세 조회 (STT 전문, 탐지 결과 전체)
+        
+        Args:
+            job_id: 분석 작업 ID
+            result_id: 분석 결과 ID (목록 응답의 id)
+            emp_id: 사번
+            db: DB 세션
+        
+        Returns:
+            결과 dict (get_results의 결과 항목과 동일한 형식 + id)
+        """
+        result = db.query(AnalysisResult).join(
+            AnalysisJob, AnalysisJob.job_id == AnalysisResult.job_id
+        ).filter(
+            AnalysisResult.id == result_id,
+            AnalysisResult.job_id == job_id,
+            AnalysisJob.emp_id == emp_id
+        ).first()
+        
+        if not result:
+            raise ValueError("분석 결과를 찾을 수 없습니다")
+        
+        detection = result.improper_detection_results
+        return {
+            "id": result.id,
+            "filename": result.file_id,
+            "stt_text": result.stt_text,
+            "stt_metadata": result.stt_metadata,
+            "status": result.status,
+            **AnalysisService._summary_fields(result.status, result.stt_metadata, detection),
+            "improper_detection_results": detection,
+            "element_detection": detection,
+            "updated_at": result.updated_at.isoformat() if result.updated_at else None
+        }
+    
     @staticmethod
     async def process_analysis_async(
         job_id: str,
@@ -578,7 +710,7 @@ class AnalysisService:
             
             total_files = len(files)
             logger.info(f"[process_analysis_sync] 처리할 파일 수: {total_files} (동시 처리)")
-            logger.info(f"[process_analysis_sync] 최대 동시 처리 개수: {MAX_CONCURRENT_ANALYSIS}")
+            logger.info(f"[process_analysis_sync] STT 스케줄러 상태: {stt_scheduler.get_stats()['limit']} 동시 요청 한도")
             
             # === Create pending result rows upfront ===
             # 각 파일에 대해 pending 상태의 result row 미리 생성 (재실행 시는 이미 리셋됨)
@@ -610,15 +742,16 @@ class AnalysisService:
             test_confidence_values = [0.2, 0.45, 0.8]  # danger, warning, safe
             
             # 비동기 함수로 파일 처리 (결과는 즉시 DB에 저장)
-            async def process_single_file(idx: int, filename: str, semaphore: asyncio.Semaphore):
-                """개별 파일 처리 (세마포어로 동시성 제어, 결과 즉시 저장)"""
+            async def process_single_file(idx: int, filename: str):
+                """개별 파일 처리 (전역 STT 스케줄러로 동시성 제어, 결과 즉시 저장)"""
                 import time
-                start_wait = time.time()
-                logger.info(f"[process_analysis_sync] 파일 대기 시작: {filename} (idx={idx}, semaphore_value={semaphore._value})")
+                logger.info(f"[process_analysis_sync] 파일 대기 시작: {filename} (idx={idx})")
                 
-                async with semaphore:  # 세마포어로 동시 실행 개수 제한
-                    wait_time = time.time() - start_wait
-                    logger.info(f"[process_analysis_sync] 파일 처리 시작: {filename} (idx={idx}, 대기시간={wait_time:.2f}s, semaphore_value={semaphore._value})")
+                # 모든 사용자/작업이 공유하는 STT API 슬롯 (사번·작업별 공정 분배)
+                # 파일 1개 = trace 1개 (스케줄러 대기 → STT API 호출 → DB 저장)
+                async with tracer.span("analysis.file", job_id=job_id, file=filename), \
+                        stt_scheduler.slot(emp_id, job_id, total_files) as slot:
+                    logger.info(f"[process_analysis_sync] 파일 처리 시작: {filename} (idx={idx}, 대기시간={slot.wait_time:.2f}s)")
                     
                     # === Update status to 'processing' in DB ===
                     from app.utils.db import SessionLocal as TempSessionLocal
@@ -655,14 +788,22 @@ class AnalysisService:
                         logger.info(f"[process_analysis_sync]   - element_detection: True (항상 수행)")
                         logger.info(f"[process_analysis_sync]   - classification: {include_classification} (요청에 따라)")
                         
-                        stt_result = await stt_service.transcribe_local_file(
-                            file_path=str(file_path),
-                            language="ko",
-                            is_stream=False,
-                            privacy_removal=False,  # privacy_removal 현재는 일시적으로 수행 안함
-                            classification=False,
-                            element_detection=True  # element_detection 항상 수행
-                        )
+                        # 과부하(429/503/타임아웃)면 슬롯을 반납하고 Retry-After만큼 쉰 뒤 다시 대기
+                        # (스케줄 경로에서는 Dummy 응답을 쓰지 않음 → 끝내 실패하면 failed로 저장)
+                        for attempt in range(STT_SCHEDULER_OVERLOAD_RETRIES + 1):
+                            stt_result = await stt_service.transcribe_local_file(
+                                file_path=str(file_path),
+                                language="ko",
+                                is_stream=False,
+                                privacy_removal=False,  # privacy_removal 현재는 일시적으로 수행 안함
+                                classification=False,
+                                element_detection=True,  # element_detection 항상 수행
+                                fallback_dummy=False
+                            )
+                            slot.report(stt_result)
+                            if not slot.overloaded or attempt == STT_SCHEDULER_OVERLOAD_RETRIES:
+                                break
+                            await slot.requeue(attempt)
                         
                         # === TEST MODE: Simulate failure on fallback (dummy response) ===
                         # STT 호출 실패 후 fallback(dummy)일 때만 TEST MODE 적용
@@ -744,7 +885,8 @@ class AnalysisService:
                                         "language": stt_result.get('language', 'ko'),
                                         "backend": stt_result.get('backend', 'unknown'),
                                         "processing_steps": stt_result.get('processing_steps', {}),
-                                        "confidence": confidence
+                                        "confidence": confidence,
+                                        "trace_id": stt_result.get('trace_id')
                                     }
                                     # 분석 결과 저장 (Agent 결과 또는 더미 데이터)
                                     existing_result.improper_detection_results = detection_result
@@ -762,7 +904,8 @@ class AnalysisService:
                                             "language": stt_result.get('language', 'ko'),
                                             "backend": stt_result.get('backend', 'unknown'),
                                             "processing_steps": stt_result.get('processing_steps', {}),
-                                            "confidence": confidence
+                                            "confidence": confidence,
+                                            "trace_id": stt_result.get('trace_id')
                                         },
                                         # 분석 결과 저장 (Agent 결과 또는 더미 데이터)
                                         improper_detection_results=detection_result
@@ -776,7 +919,8 @@ class AnalysisService:
                                     existing_result.stt_text = None
                                     existing_result.stt_metadata = {
                                         "error": stt_result.get('error', 'unknown'),
-                                        "message": stt_result.get('message', '처리 실패')
+                                        "message": stt_result.get('message', '처리 실패'),
+                                        "trace_id": stt_result.get('trace_id')
                                     }
                                     result = existing_result
                                     logger.warning(f"[process_analysis_sync] DB result 실패 업데이트: {filename}")
@@ -788,7 +932,8 @@ class AnalysisService:
                                         stt_text=None,
                                         stt_metadata={
                                             "error": stt_result.get('error', 'unknown'),
-                                            "message": stt_result.get('message', '처리 실패')
+                                            "message": stt_result.get('message', '처리 실패'),
+                                            "trace_id": stt_result.get('trace_id')
                                         }
                                     )
                                     db_session.add(result)
@@ -856,17 +1001,14 @@ class AnalysisService:
             
             # 모든 파일을 동시에 처리 (동시성 제어)
             async def process_all_files():
-                """모든 파일을 동시에 처리 (세마포어로 동시 개수 제한)"""
-                # 세마포어 생성: 동시에 MAX_CONCURRENT_ANALYSIS개만 실행
-                semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSIS)
-                
+                """모든 파일을 동시에 처리 (동시 개수는 전역 STT 스케줄러가 제한)"""
                 # 모든 파일을 처리할 task 생성
                 tasks = [
-                    process_single_file(idx, filename, semaphore)
+                    process_single_file(idx, filename)
                     for idx, filename in enumerate(files)
                 ]
                 
-                # 모든 task를 동시에 실행 (세마포어로 동시 개수 제한)
+                # 모든 task를 동시에 실행 (스케줄러가 배정한 순서대로 STT API 호출)
                 return await asyncio.gather(*tasks)
             
             # asyncio.run으로 동시 처리 실행
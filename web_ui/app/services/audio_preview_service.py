@@ -0,0 +1,339 @@
+"""
+오디오 미리보기 서비스
+분석 페이지에서 긴 녹취를 전부 받지 않고도 파형을 그리고 탐색할 수 있도록 지원
+
+- 파형 peaks: 구간별 min/max 배열을 한 번 계산해 파일 옆 .preview/ 디렉토리에 캐시
+- 저비트레이트 미리보기: ffmpeg로 mono MP3 변환 후 캐시 (ffmpeg 없으면 원본 사용)
+
+캐시 파일은 원본 파일의 크기/수정시간 시그니처로 검증하므로
+같은 이름으로 다시 업로드하면 자동으로 다시 계산된다.
+"""
+
+import array
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import wave
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from config import FFMPEG_BINARY, PREVIEW_AUDIO_BITRATE, WAVEFORM_PEAKS_PER_SECOND
+
+logger = logging.getLogger(__name__)
+
+# ffmpeg 디코딩 시 사용할 샘플레이트 (파형 계산용, mono)
+_DECODE_SAMPLE_RATE = 8000
+
+# PCM 읽기 단위 (frames)
+_READ_FRAMES = 64 * 1024
+
+
+class AudioPreviewService:
+    """오디오 파형/미리보기 캐시 관리"""
+
+    CACHE_DIR_NAME = ".preview"
+
+    # 캐시 파일별 생성 잠금 (동시 요청 시 중복 계산 방지)
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    @staticmethod
+    def get_cache_dir(file_path: Path) -> Path:
+        """원본 파일 옆의 캐시 디렉토리 ({folder}/.preview)"""
+        return file_path.parent / AudioPreviewService.CACHE_DIR_NAME
+
+    @staticmethod
+    def _signature(file_path: Path) -> str:
+        """원본 파일 시그니처 (크기 + 수정시간)"""
+        stat_result = file_path.stat()
+        return f"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+
+    @staticmethod
+    def _get_lock(key: str) -> threading.Lock:
+        with AudioPreviewService._locks_guard:
+            lock = AudioPreviewService._locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                AudioPreviewService._locks[key] = lock
+            return lock
+
+    @staticmethod
+    def clear_cache(file_path: Path) -> int:
+        """
+        파일의 파형/미리보기 캐시 삭제 (파일 삭제·교체 시 호출)
+
+        Args:
+            file_path: 원본 파일 경로
+
+        Returns:
+            int: 삭제된 캐시 파일 수
+        """
+        cache_dir = AudioPreviewService.get_cache_dir(file_path)
+        if not cache_dir.is_dir():
+            return 0
+
+        deleted = 0
+        for cached in cache_dir.glob(f"{file_path.name}.*"):
+            try:
+                cached.unlink()
+                deleted += 1
+            except OSError:
+                pass
+
+        try:
+            cache_dir.rmdir()
+        except OSError:
+            # 다른 파일의 캐시가 남아있음
+            pass
+        return deleted
+
+    # ========================================================================
+    # 파형 peaks
+    # ========================================================================
+
+    @staticmethod
+    def get_waveform(file_path: Path, points: int = 1000) -> dict:
+        """
+        파형 peaks 조회 (캐시 없으면 계산 후 저장)
+
+        블로킹 I/O가 있으므로 라우터에서는 threadpool로 호출한다.
+
+        Args:
+            file_path: 원본 오디오 파일 경로
+            points: 응답할 구간 수 (캐시 해상도 이하로 다운샘플링)
+
+        Returns:
+            {
+                "duration": float,
+                "peaks_per_second": float,
+                "points": int,
+                "min": [float, ...],   # -1.0 ~ 1.0
+                "max": [float, ...]
+            }
+        """
+        cache_path = AudioPreviewService.get_cache_dir(file_path) / f"{file_path.name}.peaks.json"
+
+        with AudioPreviewService._get_lock(str(cache_path)):
+            signature = AudioPreviewService._signature(file_path)
+            data = None
+            if cache_path.exists():
+                try:
+                    with open(cache_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("signature") != signature:
+                        data = None
+                except (OSError, ValueError):
+                    data = None
+
+            if data is None:
+                logger.info(f"[Preview] 파형 계산: {file_path.name}")
+                data = AudioPreviewService._compute_peaks(file_path)
+                data["signature"] = signature
+                AudioPreviewService._write_atomic(
+                    cache_path, json.dumps(data, separators=(",", ":")).encode("utf-8")
+                )
+
+        return AudioPreviewService._downsample(data, points)
+
+    @staticmethod
+    def _compute_peaks(file_path: Path) -> dict:
+        """원본 전체를 한 번 읽어 WAVEFORM_PEAKS_PER_SECOND 해상도의 min/max 계산"""
+        mins = array.array("h")
+        maxs = array.array("h")
+        total_frames = 0
+
+        pcm = AudioPreviewService._iter_pcm(file_path)
+        sample_rate, channels = next(pcm)
+        bucket_samples = max(1, int(sample_rate / WAVEFORM_PEAKS_PER_SECOND)) * channels
+
+        pending = array.array("h")
+        for block in pcm:
+            pending.extend(block)
+            full = len(pending) - len(pending) % bucket_samples
+            for offset in range(0, full, bucket_samples):
+                bucket = pending[offset:offset + bucket_samples]
+                mins.append(min(bucket))
+                maxs.append(max(bucket))
+            total_frames += full // channels
+            del pending[:full]
+
+        if pending:
+            mins.append(min(pending))
+            maxs.append(max(pending))
+            total_frames += len(pending) // channels
+
+        return {
+            "sample_rate": sample_rate,
+            "duration": round(total_frames / sample_rate, 3) if sample_rate else 0.0,
+            "peaks_per_second": WAVEFORM_PEAKS_PER_SECOND,
+            "min": mins.tolist(),
+            "max": maxs.tolist()
+        }
+
+    @staticmethod
+    def _iter_pcm(file_path: Path) -> Iterator:
+        """
+        int16 PCM 블록 생성기
+
+        첫 번째 값으로 (sample_rate, channels)를 반환한 뒤 array('h') 블록을 반환한다.
+        16/32bit PCM WAV는 표준 라이브러리로 직접 읽고, 나머지는 ffmpeg로 디코딩한다.
+        """
+        if file_path.suffix.lower() == ".wav":
+            try:
+                wav = wave.open(str(file_path), "rb")
+            except (wave.Error, EOFError):
+                wav = None
+            if wav is not None and wav.getsampwidth() in (2, 4):
+                with wav:
+                    sample_width = wav.getsampwidth()
+                    yield wav.getframerate(), wav.getnchannels()
+                    while True:
+                        raw = wav.readframes(_READ_FRAMES)
+                        if not raw:
+                            break
+                        yield AudioPreviewService._to_int16(raw, sample_width)
+                return
+            if wav is not None:
+                wav.close()
+
+        ffmpeg = shutil.which(FFMPEG_BINARY)
+        if not ffmpeg:
+            raise RuntimeError(f"{file_path.suffix} 파형 계산에는 ffmpeg가 필요합니다")
+
+        process = subprocess.Popen(
+            [
+                ffmpeg, "-v", "error", "-i", str(file_path),
+                "-f", "s16le", "-ac", "1", "-ar", str(_DECODE_SAMPLE_RATE), "-"
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        try:
+            yield _DECODE_SAMPLE_RATE, 1
+            while True:
+                raw = process.stdout.read(_READ_FRAMES * 2)
+                if not raw:
+                    break
+                yield AudioPreviewService._to_int16(raw[:len(raw) - len(raw) % 2], 2)
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read().decode("utf-8", "replace")
+            process.stderr.close()
+            if process.wait() != 0:
+                raise RuntimeError(f"ffmpeg 디코딩 실패: {stderr.strip()[:300]}")
+
+    @staticmethod
+    def _to_int16(raw: bytes, sample_width: int) -> array.array:
+        """little-endian PCM bytes → array('h')"""
+        if sample_width == 2:
+            samples = array.array("h")
+            samples.frombytes(raw)
+            if sys.byteorder == "big":
+                samples.byteswap()
+            return samples
+
+        wide = array.array("i")
+        wide.frombytes(raw)
+        if sys.byteorder == "big":
+            wide.byteswap()
+        return array.array("h", (value >> 16 for value in wide))
+
+    @staticmethod
+    def _downsample(data: dict, points: int) -> dict:
+        """캐시된 peaks를 요청한 구간 수로 병합 (구간별 min/max 유지)"""
+        mins = data["min"]
+        maxs = data["max"]
+        count = len(mins)
+        points = max(1, min(points, count)) if count else 0
+
+        out_min = []
+        out_max = []
+        for i in range(points):
+            start = i * count // points
+            end = max(start + 1, (i + 1) * count // points)
+            out_min.append(round(min(mins[start:end]) / 32768, 4))
+            out_max.append(round(max(maxs[start:end]) / 32768, 4))
+
+        return {
+            "duration": data["duration"],
+            "peaks_per_second": round(points / data["duration"], 4) if data["duration"] else 0,
+            "points": points,
+            "min": out_min,
+            "max": out_max
+        }
+
+    # ========================================================================
+    # 저비트레이트 미리보기
+    # ========================================================================
+
+    @staticmethod
+    def get_preview(file_path: Path) -> Optional[Path]:
+        """
+        저비트레이트 mono MP3 미리보기 경로 반환 (캐시 없으면 변환)
+
+        블로킹 I/O가 있으므로 라우터에서는 threadpool로 호출한다.
+
+        Args:
+            file_path: 원본 오디오 파일 경로
+
+        Returns:
+            Path: 미리보기 파일 경로 (ffmpeg가 없으면 None → 원본 사용)
+        """
+        ffmpeg = shutil.which(FFMPEG_BINARY)
+        if not ffmpeg:
+            logger.warning("[Preview] ffmpeg 미설치 - 원본 파일로 대체")
+            return None
+
+        cache_dir = AudioPreviewService.get_cache_dir(file_path)
+        signature = AudioPreviewService._signature(file_path)
+        preview_path = cache_dir / f"{file_path.name}.{signature}.{PREVIEW_AUDIO_BITRATE}.mp3"
+
+        with AudioPreviewService._get_lock(str(preview_path)):
+            if preview_path.exists():
+                return preview_path
+
+            # 이전 시그니처의 미리보기 정리
+            for stale in cache_dir.glob(f"{file_path.name}.*.mp3"):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = preview_path.with_name(preview_path.name + ".part")
+            logger.info(f"[Preview] 미리보기 변환: {file_path.name} ({PREVIEW_AUDIO_BITRATE})")
+            result = subprocess.run(
+                [
+                    ffmpeg, "-v", "error", "-y", "-i", str(file_path),
+                    "-vn", "-ac", "1", "-ar", "16000", "-b:a", PREVIEW_AUDIO_BITRATE,
+                    "-f", "mp3", str(tmp_path)
+                ],
+                capture_output=True
+            )
+            if result.returncode != 0:
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+                stderr = result.stderr.decode("utf-8", "replace").strip()
+                raise RuntimeError(f"미리보기 변환 실패: {stderr[:300]}")
+
+            os.replace(tmp_path, preview_path)
+            return preview_path
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes) -> None:
+        """임시 파일에 쓴 뒤 rename (동시 읽기 시 부분 파일 노출 방지)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".part")
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+# 전역 인스턴스 생성
+audio_preview_service = AudioPreviewService()
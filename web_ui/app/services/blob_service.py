@@ -0,0 +1,297 @@
+"""
+콘텐츠 해시 기반 blob 저장소 서비스
+동일한 녹취 파일이 여러 폴더에 업로드되어도 물리 파일은 하나만 유지
+
+저장 구조:
+    UPLOAD_DIR/.blobs/{hash[:2]}/{hash}     실제 파일 (blob)
+    UPLOAD_DIR/{emp_id}/{folder}/{filename} blob에 대한 하드링크
+
+폴더 내 파일은 기존과 같은 경로에 존재하므로 STT API(file_path 방식),
+오디오 스트리밍 등 경로 기반 코드는 변경 없이 동작한다.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.database import FileUpload, StoredBlob
+from config import BLOB_DIR
+
+logger = logging.getLogger(__name__)
+
+# 커밋 후 물리 파일을 삭제할 blob 해시 (Session.info 키)
+_RELEASED_KEY = "released_blobs"
+
+
+class BlobService:
+    """콘텐츠 주소 기반 blob 저장소 (참조 카운트 관리)"""
+
+    # 업로드 스트림을 읽는 단위 (1MB)
+    CHUNK_SIZE = 1024 * 1024
+
+    # 동시 해제/등록 경합 시 참조 확보 재시도 횟수
+    ACQUIRE_RETRIES = 3
+
+    @staticmethod
+    def get_blob_path(content_hash: str) -> Path:
+        """
+        blob 파일 경로 반환
+
+        Args:
+            content_hash: SHA256 해시 (16진수)
+
+        Returns:
+            Path: UPLOAD_DIR/.blobs/{hash[:2]}/{hash}
+        """
+        return Path(BLOB_DIR) / content_hash[:2] / content_hash
+
+    @staticmethod
+    def write_temp(stream: BinaryIO) -> Tuple[Path, str, int]:
+        """
+        업로드 스트림을 임시 파일로 저장하면서 SHA256 계산
+
+        파일 전체를 메모리에 올리지 않고 CHUNK_SIZE 단위로 기록한다.
+
+        Args:
+            stream: 업로드 파일 객체 (UploadFile.file)
+
+        Returns:
+            (임시 파일 경로, SHA256 해시, 파일 크기 bytes)
+        """
+        tmp_dir = Path(BLOB_DIR) / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{uuid.uuid4().hex}.part"
+
+        hasher = hashlib.sha256()
+        size_bytes = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    chunk = stream.read(BlobService.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    size_bytes += len(chunk)
+        except Exception:
+            BlobService.discard_temp(tmp_path)
+            raise
+
+        return tmp_path, hasher.hexdigest(), size_bytes
+
+    @staticmethod
+    def discard_temp(tmp_path: Optional[Path]) -> None:
+        """임시 파일 삭제 (없으면 무시)"""
+        if tmp_path is None:
+            return
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def acquire(
+        tmp_path: Path,
+        content_hash: str,
+        size_bytes: int,
+        db: Session
+    ) -> StoredBlob:
+        """
+        임시 파일을 blob 저장소에 등록하고 참조 카운트 증가
+
+        같은 해시의 blob이 이미 있으면 임시 파일은 버리고 기존 blob을 재사용한다.
+        임시 파일은 참조가 확보된 뒤에만 배치/삭제하므로, 동시에 마지막 참조가 해제되어
+        레코드가 사라진 경우에도 새 blob으로 다시 등록할 수 있다. 커밋은 호출자가 수행한다.
+
+        Args:
+            tmp_path: write_temp()로 생성한 임시 파일
+            content_hash: SHA256 해시
+            size_bytes: 파일 크기
+            db: DB 세션 (참조 카운트 없이 배치된 blob은 회수되지 않으므로 필수)
+
+        Returns:
+            StoredBlob: blob 레코드
+
+        Raises:
+            RuntimeError: 재시도 후에도 참조를 확보하지 못함
+        """
+        for _ in range(BlobService.ACQUIRE_RETRIES):
+            blob = db.query(StoredBlob).filter(
+                StoredBlob.content_hash == content_hash
+            ).first()
+
+            if blob:
+                if BlobService._add_ref(blob, db):
+                    BlobService._place(tmp_path, content_hash)
+                    logger.info(f"[Blob] 기존 blob 재사용: {content_hash[:12]} (refs={blob.ref_count})")
+                    return blob
+                # 마지막 참조가 동시에 해제되어 레코드가 삭제됨 → 새 blob으로 다시 등록
+                db.expunge(blob)
+                continue
+
+            blob = StoredBlob(
+                content_hash=content_hash,
+                size_bytes=size_bytes,
+                ref_count=1
+            )
+            try:
+                # 같은 파일이 동시에 처음 업로드되면 다른 요청이 먼저 INSERT할 수 있음 (content_hash UNIQUE)
+                with db.begin_nested():
+                    db.add(blob)
+                    db.flush()
+            except IntegrityError:
+                continue
+
+            BlobService._place(tmp_path, content_hash)
+            logger.info(f"[Blob] 새 blob 저장: {content_hash[:12]} ({size_bytes} bytes)")
+            return blob
+
+        raise RuntimeError(f"blob 참조 확보 실패: {content_hash[:12]}")
+
+    @staticmethod
+    def _add_ref(blob: StoredBlob, db: Session) -> bool:
+        """
+        기존 blob 참조 카운트 증가 (DB에서 원자적으로 +1)
+
+        Returns:
+            bool: 증가 성공 여부 (False면 레코드가 삭제되었거나 삭제 중)
+        """
+        updated = db.query(StoredBlob).filter(
+            StoredBlob.id == blob.id,
+            StoredBlob.ref_count > 0
+        ).update(
+            {StoredBlob.ref_count: StoredBlob.ref_count + 1},
+            synchronize_session=False
+        )
+        if not updated:
+            return False
+        db.refresh(blob)
+        return True
+
+    @staticmethod
+    def _place(tmp_path: Path, content_hash: str) -> None:
+        """참조를 확보한 blob의 물리 파일 배치 (이미 있으면 임시 파일 삭제)"""
+        blob_path = BlobService.get_blob_path(content_hash)
+        if blob_path.exists():
+            BlobService.discard_temp(tmp_path)
+        else:
+            # DB 레코드만 남고 파일이 사라진 경우에도 새 업로드로 복구
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, blob_path)
+
+    @staticmethod
+    def link(content_hash: str, target_path: Path) -> None:
+        """
+        폴더 내 파일 경로를 blob에 대한 하드링크로 생성
+
+        하드링크를 만들 수 없는 파일시스템(다른 디바이스 등)에서는 복사로 대체한다.
+
+        Args:
+            content_hash: SHA256 해시
+            target_path: 폴더 내 파일 경로
+        """
+        blob_path = BlobService.get_blob_path(content_hash)
+        if target_path.exists():
+            target_path.unlink()
+        try:
+            os.link(blob_path, target_path)
+        except OSError as e:
+            logger.warning(f"[Blob] 하드링크 실패, 복사로 대체: {target_path.name} ({e})")
+            shutil.copyfile(blob_path, target_path)
+
+    @staticmethod
+    def release(content_hash: str, db: Session) -> int:
+        """
+        blob 참조 카운트 감소 (0이 되면 레코드 삭제)
+
+        물리 파일은 세션이 커밋된 뒤에 삭제한다 (롤백되면 유지).
+        커밋은 호출자가 수행한다.
+
+        Args:
+            content_hash: SHA256 해시
+            db: DB 세션
+
+        Returns:
+            int: blob 크기 (bytes, blob이 없으면 0)
+        """
+        blob = db.query(StoredBlob).filter(
+            StoredBlob.content_hash == content_hash
+        ).with_for_update().first()
+        if not blob:
+            logger.warning(f"[Blob] 참조 해제 대상 없음: {content_hash[:12]}")
+            return 0
+
+        size_bytes = blob.size_bytes or 0
+        db.query(StoredBlob).filter(
+            StoredBlob.id == blob.id
+        ).update(
+            {StoredBlob.ref_count: StoredBlob.ref_count - 1},
+            synchronize_session=False
+        )
+        db.refresh(blob)
+
+        if blob.ref_count <= 0:
+            db.delete(blob)
+            db.flush()
+            db.info.setdefault(_RELEASED_KEY, set()).add(content_hash)
+            logger.info(f"[Blob] 참조 없음 - blob 삭제 예약: {content_hash[:12]} ({size_bytes} bytes)")
+
+        return size_bytes
+
+    @staticmethod
+    def count_user_references(emp_id: str, content_hash: str, db: Session) -> int:
+        """
+        사용자가 특정 콘텐츠를 참조하는 파일 레코드 수
+
+        Args:
+            emp_id: 사번
+            content_hash: SHA256 해시
+            db: DB 세션
+
+        Returns:
+            int: 참조 레코드 수
+        """
+        return db.query(func.count(FileUpload.id)).filter(
+            FileUpload.emp_id == emp_id,
+            FileUpload.content_hash == content_hash
+        ).scalar() or 0
+
+
+@event.listens_for(Session, "after_commit")
+def _unlink_released_blobs(session: Session) -> None:
+    """
+    커밋된 참조 해제의 물리 파일 삭제
+
+    커밋 사이에 같은 콘텐츠가 다시 등록되었으면 (레코드 존재) 파일을 유지한다.
+    """
+    released = session.info.pop(_RELEASED_KEY, None)
+    if not released:
+        return
+    with session.get_bind().connect() as conn:
+        for content_hash in released:
+            if conn.execute(
+                select(StoredBlob.id).where(StoredBlob.content_hash == content_hash)
+            ).first():
+                continue
+            blob_path = BlobService.get_blob_path(content_hash)
+            try:
+                blob_path.unlink()
+                blob_path.parent.rmdir()
+            except OSError:
+                # 파일이 이미 없거나 같은 prefix 디렉토리에 다른 blob이 남아있음
+                pass
+            logger.info(f"[Blob] blob 파일 삭제: {content_hash[:12]}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_released_blobs(session: Session) -> None:
+    """롤백된 참조 해제는 파일을 삭제하지 않음"""
+    session.info.pop(_RELEASED_KEY, None)
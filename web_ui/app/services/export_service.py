@@ -0,0 +1,408 @@
+"""
+분석 결과 내보내기 서비스
+분석 결과를 서버에서 한 행씩 CSV / XLSX로 변환하여 스트리밍
+
+- 화면과 동일한 컬럼 / 상태 라벨 / 필터(status, risk) 적용
+- 결과를 EXPORT_FETCH_SIZE 단위의 keyset 배치(id > 마지막 id)로 읽어 메모리 사용량 일정
+- CSV: UTF-8 BOM + 증분 gzip 압축
+- XLSX: openpyxl 없이 inline string 시트를 ZIP 스트림으로 직접 기록
+"""
+
+import csv
+import io
+import logging
+import re
+import zipfile
+import zlib
+from typing import Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy.orm import Session
+
+from app.models.database import AnalysisJob, AnalysisResult
+from app.utils.db import SessionLocal
+from config import EXPORT_FETCH_SIZE, EXPORT_GZIP_LEVEL
+
+logger = logging.getLogger(__name__)
+
+# 화면(analysis.html) 내보내기와 동일한 컬럼 구성
+EXPORT_COLUMNS = [
+    "번호", "파일명", "STT 전문", "분석 상태", "카테고리", "분석 결과",
+    "분석 내용 (Detected Sentence)", "분석 내용 (Detected Reason)", "분석 내용 (Detected Keyword)"
+]
+
+# XLSX 열 너비 (문자 수 기준)
+EXPORT_COLUMN_WIDTHS = [8, 30, 80, 12, 15, 15, 50, 50, 30]
+
+STATUS_LABELS = {
+    "completed": "완료",
+    "pending": "대기중",
+    "processing": "분석중",
+    "failed": "실패"
+}
+
+VALID_STATUS_FILTERS = {"all", "pending", "processing", "completed", "failed"}
+VALID_RISK_FILTERS = {"all", "safe", "danger"}
+
+# Excel 셀 최대 글자 수 (초과 시 파일 복구 경고 발생)
+_XLSX_CELL_LIMIT = 32767
+
+# XML 1.0에서 허용되지 않는 제어 문자
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="분석결과" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# 스타일 0: 기본, 스타일 1: 헤더(굵게)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class _StreamBuffer:
+    """
+    쓰기 전용 버퍼 (zipfile / csv writer 출력 수집)
+
+    tell/seek를 제공하지 않으므로 zipfile은 data descriptor 방식으로
+    순차 기록하며, 쌓인 바이트는 drain()으로 꺼내 응답에 흘려보낸다.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """분석 결과 CSV / XLSX 스트리밍 내보내기"""
+
+    @staticmethod
+    def get_job(job_id: str, emp_id: str, db: Session) -> AnalysisJob:
+        """
+        내보내기 대상 작업 조회 (소유자 확인)
+
+        Args:
+            job_id: 분석 작업 ID
+            emp_id: 사번
+            db: DB 세션
+
+        Returns:
+            AnalysisJob
+
+        Raises:
+            ValueError: 작업이 없거나 다른 사용자의 작업
+        """
+        job = db.query(AnalysisJob).filter(
+            AnalysisJob.job_id == job_id,
+            AnalysisJob.emp_id == emp_id
+        ).first()
+        if not job:
+            raise ValueError("작업을 찾을 수 없습니다")
+        return job
+
+    @staticmethod
+    def _risk_of(detection: Optional[dict]) -> str:
+        """탐지 결과 → 'danger' / 'safe' (화면 필터와 동일 기준)"""
+        if isinstance(detection, dict) and detection.get("detected_yn") == "Y":
+            return "danger"
+        return "safe"
+
+    @staticmethod
+    def iter_results(
+        job_id: str,
+        status: str = "all",
+        risk: str = "all",
+        fetch_size: int = EXPORT_FETCH_SIZE
+    ) -> Iterator[tuple]:
+        """
+        필터가 적용된 분석 결과를 id 순서로 반환
+
+        응답 스트리밍 동안 요청 세션은 이미 닫혀 있으므로 자체 세션을 사용한다.
+        배치마다 커서를 모두 소비해 SQLite 읽기 잠금을 오래 잡지 않는다.
+
+        Args:
+            job_id: 분석 작업 ID
+            status: 상태 필터 (all / pending / processing / completed / failed)
+            risk: 위험도 필터 (all / safe / danger) - 완료된 결과에만 적용
+            fetch_size: 배치당 행 수
+
+        Yields:
+            (file_id, status, stt_text, improper_detection_results)
+        """
+        # 위험도 필터는 화면과 같이 완료된 결과만 대상
+        if risk != "all":
+            if status not in ("all", "completed"):
+                return
+            status = "completed"
+
+        db = SessionLocal()
+        try:
+            last_id = 0
+            while True:
+                query = db.query(
+                    AnalysisResult.id,
+                    AnalysisResult.file_id,
+                    AnalysisResult.status,
+                    AnalysisResult.stt_text,
+                    AnalysisResult.improper_detection_results
+                ).filter(
+                    AnalysisResult.job_id == job_id,
+                    AnalysisResult.id > last_id
+                )
+                if status != "all":
+                    query = query.filter(AnalysisResult.status == status)
+
+                batch = query.order_by(AnalysisResult.id).limit(fetch_size).all()
+                if not batch:
+                    break
+
+                for row_id, file_id, row_status, stt_text, detection in batch:
+                    if risk != "all" and ExportService._risk_of(detection) != risk:
+                        continue
+                    yield file_id, row_status, stt_text, detection
+
+                last_id = batch[-1][0]
+                if len(batch) < fetch_size:
+                    break
+        finally:
+            db.close()
+
+    @staticmethod
+    def build_row(index: int, file_id: str, status: str, stt_text: Optional[str],
+                  detection: Optional[dict]) -> list:
+        """
+        결과 1건을 내보내기 행으로 변환 (화면 내보내기와 동일한 값)
+
+        Args:
+            index: 1부터 시작하는 행 번호
+            file_id: 파일명
+            status: 결과 상태
+            stt_text: STT 전문
+            detection: improper_detection_results
+
+        Returns:
+            list: EXPORT_COLUMNS 순서의 값
+        """
+        category = "-"
+        detection_result = "-"
+        sentences = "-"
+        reasons = "-"
+        keywords = "-"
+
+        if status == "completed" and isinstance(detection, dict):
+            if detection.get("category"):
+                category = detection["category"]
+
+            if detection.get("detected_yn") == "Y":
+                detection_result = "위반 탐지"
+            elif detection.get("detected_yn") == "N":
+                detection_result = "이상 없음"
+
+            if isinstance(detection.get("detected_sentences"), list):
+                sentences = " | ".join(str(s) for s in detection["detected_sentences"])
+            if isinstance(detection.get("detected_reasons"), list):
+                reasons = " | ".join(str(r) for r in detection["detected_reasons"])
+            if isinstance(detection.get("detected_keywords"), list):
+                keywords = ", ".join(str(k) for k in detection["detected_keywords"])
+
+        return [
+            index,
+            file_id or "",
+            stt_text or "-",
+            STATUS_LABELS.get(status, "-"),
+            category,
+            detection_result,
+            sentences,
+            reasons,
+            keywords
+        ]
+
+    @staticmethod
+    def iter_rows(job_id: str, status: str = "all", risk: str = "all") -> Iterator[list]:
+        """필터가 적용된 내보내기 행 생성기 (헤더 제외)"""
+        for index, record in enumerate(ExportService.iter_results(job_id, status, risk), start=1):
+            yield ExportService.build_row(index, *record)
+
+    # ========================================================================
+    # CSV
+    # ========================================================================
+
+    @staticmethod
+    def stream_csv(rows: Iterator[list], compress: bool = True) -> Iterator[bytes]:
+        """
+        CSV 바이트 스트림 (UTF-8 BOM 포함, 선택적으로 gzip)
+
+        Args:
+            rows: 내보내기 행 생성기
+            compress: True면 gzip(Content-Encoding: gzip) 스트림으로 압축
+
+        Yields:
+            bytes: 응답 청크
+        """
+        compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+        text = io.StringIO()
+        writer = csv.writer(text, lineterminator="\r\n")
+
+        def encode(flush: bool = False) -> bytes:
+            data = text.getvalue().encode("utf-8")
+            text.seek(0)
+            text.truncate(0)
+            if compressor is None:
+                return data
+            chunk = compressor.compress(data)
+            if flush:
+                chunk += compressor.flush(zlib.Z_SYNC_FLUSH)
+            return chunk
+
+        # Excel에서 한글이 깨지지 않도록 BOM 추가
+        text.write("\ufeff")
+        writer.writerow(EXPORT_COLUMNS)
+        # 헤더를 즉시 내보내 다운로드가 바로 시작되도록 함
+        yield encode(flush=True)
+
+        pending = 0
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= EXPORT_FETCH_SIZE:
+                chunk = encode(flush=True)
+                pending = 0
+                if chunk:
+                    yield chunk
+
+        tail = encode()
+        if compressor is not None:
+            tail += compressor.flush()
+        if tail:
+            yield tail
+
+    # ========================================================================
+    # XLSX
+    # ========================================================================
+
+    @staticmethod
+    def _xlsx_cell(value) -> str:
+        """셀 값 → inline string / number XML"""
+        if isinstance(value, int):
+            return f'<c t="n"><v>{value}</v></c>'
+        text = _ILLEGAL_XML_CHARS.sub("", str(value))[:_XLSX_CELL_LIMIT]
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+    @staticmethod
+    def stream_xlsx(rows: Iterator[list]) -> Iterator[bytes]:
+        """
+        XLSX 바이트 스트림 (단일 시트, inline string)
+
+        공유 문자열 테이블을 만들지 않으므로 행 수와 무관하게 메모리 사용량이 일정하다.
+
+        Args:
+            rows: 내보내기 행 생성기
+
+        Yields:
+            bytes: 응답 청크
+        """
+        buffer = _StreamBuffer()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+            archive.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+            archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+            archive.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+            archive.writestr("xl/styles.xml", _XLSX_STYLES)
+            yield buffer.drain()
+
+            with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+                cols = "".join(
+                    f'<col min="{i}" max="{i}" width="{width}" customWidth="1"/>'
+                    for i, width in enumerate(EXPORT_COLUMN_WIDTHS, start=1)
+                )
+                header = "".join(
+                    f'<c t="inlineStr" s="1"><is><t>{escape(name)}</t></is></c>'
+                    for name in EXPORT_COLUMNS
+                )
+                sheet.write((
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    f'<cols>{cols}</cols><sheetData><row>{header}</row>'
+                ).encode("utf-8"))
+
+                pending = []
+                for row in rows:
+                    pending.append(
+                        "<row>" + "".join(ExportService._xlsx_cell(v) for v in row) + "</row>"
+                    )
+                    if len(pending) >= EXPORT_FETCH_SIZE:
+                        sheet.write("".join(pending).encode("utf-8"))
+                        pending = []
+                        chunk = buffer.drain()
+                        if chunk:
+                            yield chunk
+
+                pending.append("</sheetData></worksheet>")
+                sheet.write("".join(pending).encode("utf-8"))
+
+        yield buffer.drain()
+
+
+# 전역 인스턴스 생성
+export_service = ExportService()
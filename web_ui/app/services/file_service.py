@@ -13,6 +13,8 @@ from app.models.database import FileUpload, Employee
 from app.models.file_schemas import FileUploadResponse, FileListResponse, FolderListResponse
 from app.utils import file_utils
 from app.services.storage_service import StorageService
+from app.services.blob_service import BlobService
+from app.services.audio_preview_service import AudioPreviewService
 from config import UPLOAD_DIR
 import shutil
 import os
@@ -60,42 +62,77 @@ class FileService:
             # 3. 폴더 경로 생성
             folder_path = file_utils.create_folder_path(emp_id, folder_name)
             
-            # 4. 파일 크기 확인 및 할당량 검증
-            file_content = file.file.read()
-            file_size_bytes = len(file_content)
-            file_utils.validate_file_size(file_size_bytes)
-            
-            # Phase 4: 저장 용량 할당량 확인
-            if db:
-                quota_check = StorageService.check_quota_available(emp_id, file_size_bytes, db)
-                if not quota_check["available"]:
-                    raise HTTPException(status_code=413, detail=quota_check["error"])
-            
-            # 5. 파일 저장
-            user_dir = file_utils.get_user_upload_dir(emp_id)
-            full_folder_path = user_dir / folder_path
-            full_file_path = full_folder_path / filename
-            
-            # 파일 저장
-            with open(full_file_path, 'wb') as f:
-                f.write(file_content)
+            # 4. 임시 파일로 스트리밍 저장 (SHA256 계산) 및 크기 확인
+            tmp_path, content_hash, file_size_bytes = BlobService.write_temp(file.file)
+            try:
+                file_utils.validate_file_size(file_size_bytes)
+                
+                # 같은 위치에 기존 업로드가 있으면 교체
+                existing_record = None
+                if db:
+                    existing_record = db.query(FileUpload).filter(
+                        FileUpload.emp_id == emp_id,
+                        FileUpload.folder_path == folder_path,
+                        FileUpload.filename == filename
+                    ).first()
+                
+                # Phase 4: 저장 용량 할당량 확인
+                # 사용자가 이미 같은 콘텐츠를 보유 중이면 추가 물리 사용량 없음
+                charged_bytes = file_size_bytes
+                if db:
+                    if BlobService.count_user_references(emp_id, content_hash, db) > 0:
+                        charged_bytes = 0
+                    quota_check = StorageService.check_quota_available(emp_id, charged_bytes, db)
+                    if not quota_check["available"]:
+                        raise HTTPException(status_code=413, detail=quota_check["error"])
+                
+                user_dir = file_utils.get_user_upload_dir(emp_id)
+                full_file_path = user_dir / folder_path / filename
+                AudioPreviewService.clear_cache(full_file_path)
+                
+                # 5. blob 저장소 등록 (중복 콘텐츠는 기존 blob 재사용)
+                #    폴더 내 파일은 blob에 대한 하드링크
+                #    DB가 없으면 참조 카운트를 관리할 수 없으므로 blob 저장소 없이 바로 배치
+                if db:
+                    BlobService.acquire(tmp_path, content_hash, file_size_bytes, db)
+                    BlobService.link(content_hash, full_file_path)
+                else:
+                    os.replace(tmp_path, full_file_path)
+            except Exception:
+                BlobService.discard_temp(tmp_path)
+                raise
             
             # 파일 크기 계산 (MB)
             file_size_mb = file_utils.get_file_size_mb(full_file_path)
             
             # 6. DB에 기록 및 사용량 업데이트
             if db:
-                file_record = FileUpload(
-                    emp_id=emp_id,
-                    folder_path=folder_path,
-                    filename=filename,
-                    file_size_mb=file_size_mb,
-                    uploaded_at=datetime.utcnow()
-                )
-                db.add(file_record)
+                if existing_record:
+                    previous_hash = existing_record.content_hash
+                    previous_size_mb = existing_record.file_size_mb
+                    existing_record.content_hash = content_hash
+                    existing_record.file_size_mb = file_size_mb
+                    existing_record.uploaded_at = datetime.utcnow()
+                    db.flush()
+                    freed_bytes = FileService._release_reference(
+                        emp_id, previous_hash, previous_size_mb, db
+                    )
+                    if freed_bytes > 0:
+                        StorageService.subtract_usage(emp_id, freed_bytes, db)
+                else:
+                    file_record = FileUpload(
+                        emp_id=emp_id,
+                        folder_path=folder_path,
+                        filename=filename,
+                        file_size_mb=file_size_mb,
+                        content_hash=content_hash,
+                        uploaded_at=datetime.utcnow()
+                    )
+                    db.add(file_record)
                 
-                # Phase 4: 사용량 증가
-                StorageService.add_usage(emp_id, file_size_bytes, db)
+                # Phase 4: 사용량 증가 (물리 사용량 기준)
+                if charged_bytes > 0:
+                    StorageService.add_usage(emp_id, charged_bytes, db)
                 
                 db.commit()
             
@@ -108,6 +145,8 @@ class FileService:
                 message="파일 업로드 성공"
             )
         
+        except HTTPException:
+            raise
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except FileExistsError:
@@ -254,28 +293,26 @@ class FileService:
                 if not employee:
                     raise HTTPException(status_code=401, detail="사용자 정보를 찾을 수 없습니다")
             
-            # Phase 4: 파일 크기 조회 (삭제 전에)
-            file_size_bytes = 0
+            # Phase 4: 파일 레코드 조회 (삭제 전에)
+            file_record = None
             if db:
                 file_record = db.query(FileUpload).filter(
                     FileUpload.emp_id == emp_id,
                     FileUpload.filename == filename,
                     FileUpload.folder_path == folder_path
                 ).first()
-                
-                if file_record:
-                    file_size_bytes = int(file_record.file_size_mb * 1024 * 1024)
             
             # 파일 경로 검증
             file_path = file_utils.validate_file_path(emp_id, folder_path, filename)
             
-            # 파일 삭제
+            # 파일 삭제 (blob에 대한 하드링크 제거)
             if not file_path.exists():
                 raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
             
             file_utils.delete_file(file_path)
+            AudioPreviewService.clear_cache(file_path)
             
-            # DB에서 삭제 및 사용량 차감
+            # DB에서 삭제, blob 참조 해제 및 사용량 차감
             if db:
                 # folder_path가 지정되면 해당 폴더에서만 삭제
                 files_to_delete = db.query(FileUpload).filter(
@@ -285,9 +322,16 @@ class FileService:
                 )
                 
                 # 삭제할 레코드 수
-                delete_count = files_to_delete.delete()
+                delete_count = files_to_delete.delete(synchronize_session=False)
+                db.flush()
+                
+                file_size_bytes = 0
+                if file_record:
+                    file_size_bytes = FileService._release_reference(
+                        emp_id, file_record.content_hash, file_record.file_size_mb, db
+                    )
                 
-                # Phase 4: 사용량 차감
+                # Phase 4: 사용량 차감 (사용자가 더 이상 참조하지 않는 콘텐츠만)
                 if file_size_bytes > 0:
                     StorageService.subtract_usage(emp_id, file_size_bytes, db)
                 
@@ -311,6 +355,37 @@ class FileService:
             logger.error(f"파일 삭제 실패 - emp_id: {emp_id}, filename: {filename}, folder_path: {folder_path}, error: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"삭제 실패: {str(e)}")
 
+    @staticmethod
+    def _release_reference(
+        emp_id: str,
+        content_hash: str,
+        file_size_mb: float,
+        db: Session
+    ) -> int:
+        """
+        삭제(또는 교체)된 파일 레코드의 blob 참조 해제
+        
+        레코드 변경이 flush된 이후에 호출해야 한다.
+        사용자가 같은 콘텐츠를 다른 폴더에서 계속 참조하면 사용량은 차감하지 않는다.
+        
+        Args:
+            emp_id: 사번
+            content_hash: 레코드가 참조하던 SHA256 해시 (레거시 업로드는 None)
+            file_size_mb: 레코드의 파일 크기 (MB)
+            db: DB 세션
+        
+        Returns:
+            int: 사용자 사용량에서 차감할 bytes
+        """
+        if not content_hash:
+            # 레거시 업로드: 독립 파일이므로 크기 그대로 차감
+            return int((file_size_mb or 0) * 1024 * 1024)
+        
+        blob_size = BlobService.release(content_hash, db)
+        if BlobService.count_user_references(emp_id, content_hash, db) > 0:
+            return 0
+        return blob_size
+
     @staticmethod
     def create_folder(emp_id: str, folder_name: str, db: Session = None) -> dict:
         """
@@ -422,6 +497,7 @@ class FileService:
             # 3. 폴더 내 파일 조회 및 용량 계산
             total_size = 0
             file_count = 0
+            files_in_folder = []
             
             if db:
                 files_in_folder = db.query(FileUpload).filter(
@@ -437,7 +513,7 @@ class FileService:
                 
                 logger.info(f"폴더 내 파일 - folder: {folder_name}, count: {file_count}, size: {total_size} bytes")
             
-            # 4. 물리적 폴더 및 파일 삭제
+            # 4. 물리적 폴더 및 파일 삭제 (blob 하드링크 제거)
             user_dir = file_utils.get_user_upload_dir(emp_id)
             folder_path = user_dir / folder_name
             
@@ -445,25 +521,35 @@ class FileService:
                 shutil.rmtree(folder_path)
                 logger.info(f"물리적 폴더 삭제 완료: {folder_path}")
             
-            # 5. DB에서 파일 레코드 삭제
+            # 5. DB에서 파일 레코드 삭제 및 blob 참조 해제
+            freed_bytes = 0
             if db:
+                released = [(f.content_hash, f.file_size_mb) for f in files_in_folder]
+                
                 delete_count = db.query(FileUpload).filter(
                     FileUpload.emp_id == emp_id,
                     FileUpload.folder_path == folder_name
-                ).delete()
+                ).delete(synchronize_session=False)
+                db.flush()
+                
+                for content_hash, file_size_mb in released:
+                    freed_bytes += FileService._release_reference(
+                        emp_id, content_hash, file_size_mb, db
+                    )
                 
-                # Phase 4: 사용량 차감
-                if total_size > 0:
-                    StorageService.subtract_usage(emp_id, total_size, db)
+                # Phase 4: 사용량 차감 (물리 사용량 기준)
+                if freed_bytes > 0:
+                    StorageService.subtract_usage(emp_id, freed_bytes, db)
                 
                 db.commit()
-                logger.info(f"DB에서 폴더 및 파일 삭제: {delete_count}개 레코드, {total_size} bytes 차감")
+                logger.info(f"DB에서 폴더 및 파일 삭제: {delete_count}개 레코드, {freed_bytes} bytes 차감 (논리 크기 {total_size} bytes)")
             
             return {
                 "success": True,
                 "message": f"폴더가 삭제되었습니다 (파일 {file_count}개, {total_size / (1024*1024):.2f} MB)",
                 "deleted_files": file_count,
-                "freed_bytes": total_size
+                "deleted_bytes": total_size,
+                "freed_bytes": freed_bytes
             }
         
         except HTTPException:
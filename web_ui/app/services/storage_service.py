@@ -1,11 +1,14 @@
 """
 Storage quota management service
 Tracks and enforces user storage limits
+
+storage_used는 물리 사용량(중복 업로드는 한 번만 계산)을 기준으로 한다.
+논리 사용량(폴더별 사본을 모두 합산)은 조회 시 함께 제공한다.
 """
 from sqlalchemy.orm import Session
 from typing import Dict
-from app.models.database import Employee, FileUpload
-from sqlalchemy import func
+from app.models.database import Employee, FileUpload, StoredBlob
+from sqlalchemy import func, select
 
 
 class StorageService:
@@ -126,6 +129,9 @@ class StorageService:
                 "error": "사용자 정보를 찾을 수 없습니다"
             }
         
+        usage = StorageService.calculate_usage(emp_id, db)
+        logical_bytes = usage["logical_bytes"]
+        
         storage_used_gb = employee.storage_used / (1024**3)
         storage_quota_gb = employee.storage_quota / (1024**3)
         usage_percent = (employee.storage_used / employee.storage_quota * 100) if employee.storage_quota > 0 else 0
@@ -138,7 +144,49 @@ class StorageService:
             "storage_used_gb": round(storage_used_gb, 2),
             "storage_quota_gb": round(storage_quota_gb, 2),
             "available_gb": round(available_gb, 2),
-            "usage_percent": round(usage_percent, 1)
+            "usage_percent": round(usage_percent, 1),
+            "logical_bytes": logical_bytes,
+            "logical_used_gb": round(logical_bytes / (1024**3), 2),
+            "dedup_saved_gb": round(max(0, logical_bytes - usage["physical_bytes"]) / (1024**3), 2)
+        }
+    
+    @staticmethod
+    def calculate_usage(emp_id: str, db: Session) -> Dict[str, int]:
+        """
+        사용자의 논리/물리 저장 사용량 계산
+        
+        - logical_bytes: 모든 파일 레코드 크기 합계 (폴더별 사본 포함)
+        - physical_bytes: 사용자가 참조하는 고유 blob 크기 합계 + 레거시 파일 크기
+        
+        Args:
+            emp_id: 사원번호
+            db: Database session
+            
+        Returns:
+            {"logical_bytes": int, "physical_bytes": int}
+        """
+        logical_mb = db.query(func.sum(FileUpload.file_size_mb)).filter(
+            FileUpload.emp_id == emp_id
+        ).scalar() or 0.0
+        
+        # 레거시 업로드 (content_hash 없음): 독립 파일
+        legacy_mb = db.query(func.sum(FileUpload.file_size_mb)).filter(
+            FileUpload.emp_id == emp_id,
+            FileUpload.content_hash.is_(None)
+        ).scalar() or 0.0
+        
+        # 사용자가 참조하는 고유 blob
+        user_hashes = select(FileUpload.content_hash).where(
+            FileUpload.emp_id == emp_id,
+            FileUpload.content_hash.isnot(None)
+        ).distinct()
+        blob_bytes = db.query(func.sum(StoredBlob.size_bytes)).filter(
+            StoredBlob.content_hash.in_(user_hashes)
+        ).scalar() or 0
+        
+        return {
+            "logical_bytes": int(logical_mb * 1024 * 1024),
+            "physical_bytes": int(legacy_mb * 1024 * 1024) + int(blob_bytes)
         }
     
     @staticmethod
@@ -159,13 +207,8 @@ class StorageService:
             if not employee:
                 return False
             
-            # Calculate total file size from file_uploads table
-            total_size = db.query(func.sum(FileUpload.file_size_mb)).filter(
-                FileUpload.emp_id == emp_id
-            ).scalar() or 0.0
-            
-            # Convert MB to bytes
-            total_bytes = int(total_size * 1024 * 1024)
+            # 물리 사용량 기준으로 재계산 (중복 콘텐츠는 한 번만)
+            total_bytes = StorageService.calculate_usage(emp_id, db)["physical_bytes"]
             
             employee.storage_used = total_bytes
             db.commit()
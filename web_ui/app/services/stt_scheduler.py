@@ -0,0 +1,387 @@
+"""
+STT API 요청 스케줄러
+Web UI 프로세스 전체에서 STT API(/transcribe)로 나가는 동시 요청 수를 하나의 한도로 관리
+
+- 가중 공정 큐잉(WFQ): 사번마다 같은 몫을 받고, 사번 안에서는 작업별로 나눠 가짐
+  파일 수가 적은 작업(선택 파일 재실행 등)은 가중치를 높여 대용량 폴더 뒤에서 오래 기다리지 않음
+- AIMD 동시 요청 한도: 정상 응답 시 가산 증가, 429/503/타임아웃/지연 급증 시 승산 감소
+  STT API가 /health로 보고하는 슬롯 수(slots.max)를 상한으로 사용
+- 과부하 응답을 받은 요청은 슬롯을 반납하고 Retry-After(없으면 지수 backoff)만큼 쉰 뒤 다시 대기
+
+분석 작업은 작업마다 별도 스레드의 이벤트 루프(asyncio.run)에서 실행되므로
+상태는 threading.Lock으로 보호하고, 대기자는 각자의 이벤트 루프에서 깨운다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional, Tuple
+
+from config import (
+    STT_SCHEDULER_INITIAL_LIMIT, STT_SCHEDULER_MIN_INFLIGHT, STT_SCHEDULER_MAX_INFLIGHT,
+    STT_SCHEDULER_SMALL_JOB_FILES, STT_SCHEDULER_SMALL_JOB_WEIGHT, STT_SCHEDULER_BACKOFF,
+    STT_SCHEDULER_LATENCY_TOLERANCE, STT_SCHEDULER_CAPACITY_POLL_SEC,
+    STT_SCHEDULER_RETRY_BASE_SEC, STT_SCHEDULER_RETRY_MAX_SEC
+)
+from app.services.stt_service import stt_service
+from app import metrics
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# 과부하로 판단하는 STT API 응답
+_OVERLOAD_STATUSES = {429, 503, "timeout", "connection_error"}
+
+# 지연 EWMA 평활 계수
+_LATENCY_ALPHA = 0.2
+
+# 최저 지연 기준값이 서서히 올라가도록 하는 비율 (부하 패턴 변화 반영)
+_LATENCY_FLOOR_DRIFT = 1.01
+
+
+class _Waiter:
+    """슬롯 대기자 (이벤트 루프 + future)"""
+
+    __slots__ = ("loop", "future", "enqueued_at", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class _Flow:
+    """(사번, 작업) 단위 대기열"""
+
+    def __init__(self, emp_id: str, job_id: str, weight: float):
+        self.emp_id = emp_id
+        self.job_id = job_id
+        self.weight = weight
+        self.vtime = 0.0
+        self.waiters: Deque[_Waiter] = deque()
+        self.in_flight = 0
+
+
+class SlotTicket:
+    """획득한 슬롯 (STT 호출 결과를 report()로 전달하면 동시 요청 한도 조정에 반영)"""
+
+    def __init__(self, scheduler: "STTScheduler", job_size: int, flow: _Flow, wait_time: float):
+        self.wait_time = wait_time
+        self.api_status = None
+        self.api_elapsed = None
+        self.audio_duration = None
+        self.retry_after = None
+        self._scheduler = scheduler
+        self._job_size = job_size
+        self._flow = flow
+        self._held = True
+
+    def report(self, stt_result: Optional[dict]) -> None:
+        """
+        STT 호출 결과 기록
+
+        Args:
+            stt_result: stt_service.transcribe_local_file() 반환값
+        """
+        if not stt_result:
+            return
+        self.api_status = stt_result.get("api_status")
+        self.api_elapsed = stt_result.get("api_elapsed_sec")
+        self.audio_duration = stt_result.get("duration_sec") or stt_result.get("duration")
+        self.retry_after = stt_result.get("retry_after")
+
+    @property
+    def overloaded(self) -> bool:
+        """마지막 STT 호출이 과부하 응답(429/503/타임아웃/연결 실패)인지"""
+        return self.api_status in _OVERLOAD_STATUSES
+
+    async def requeue(self, attempt: int) -> None:
+        """
+        슬롯을 반납하고 재시도 대기 후 다시 슬롯 획득
+
+        대기 시간은 Retry-After, 없으면 STT_SCHEDULER_RETRY_BASE_SEC × 2^attempt (최대 STT_SCHEDULER_RETRY_MAX_SEC).
+        반납 시 보고된 결과는 동시 요청 한도 조정에 반영된다.
+
+        Args:
+            attempt: 재시도 횟수 (0부터)
+        """
+        delay = self.retry_after
+        if delay is None:
+            delay = STT_SCHEDULER_RETRY_BASE_SEC * (2 ** attempt)
+        delay = min(delay, STT_SCHEDULER_RETRY_MAX_SEC)
+        await self._scheduler._requeue(self, delay)
+
+
+class STTScheduler:
+    """프로세스 전역 STT 요청 스케줄러 (WFQ + AIMD)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flows: Dict[Tuple[str, str], _Flow] = {}
+        self._virtual_clock = 0.0
+
+        self._capacity = STT_SCHEDULER_MAX_INFLIGHT
+        self._limit = float(min(max(STT_SCHEDULER_INITIAL_LIMIT, STT_SCHEDULER_MIN_INFLIGHT), self._capacity))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+
+        self._latency_ewma: Optional[float] = None
+        self._latency_floor: Optional[float] = None
+        self._last_elapsed = 0.0
+
+        self._last_capacity_poll = 0.0
+        self._capacity_polling = False
+
+        self._stats = {"granted": 0, "completed": 0, "overloads": 0, "latency_backoffs": 0, "requeued": 0}
+
+    # ========================================================================
+    # 슬롯 획득 / 반납
+    # ========================================================================
+
+    @asynccontextmanager
+    async def slot(self, emp_id: str, job_id: str, job_size: int):
+        """
+        STT API 호출 슬롯 획득 (async with)
+
+        Args:
+            emp_id: 사번 (공정 분배 단위)
+            job_id: 분석 작업 ID
+            job_size: 작업의 파일 수 (작을수록 우선)
+
+        Yields:
+            SlotTicket
+        """
+        ticket = SlotTicket(self, job_size, *await self._acquire(emp_id, job_id, job_size))
+        try:
+            yield ticket
+        finally:
+            if ticket._held:
+                self._release(ticket)
+
+    async def _acquire(self, emp_id: str, job_id: str, job_size: int) -> Tuple[_Flow, float]:
+        """슬롯 배정까지 대기 (반환: 대기열, 대기 시간)"""
+        await self._maybe_refresh_capacity()
+
+        waiter = _Waiter(asyncio.get_running_loop())
+        with self._lock:
+            flow = self._get_flow(emp_id, job_id, job_size)
+            if not flow.waiters and flow.in_flight == 0:
+                # 유휴 상태였던 대기열은 현재 가상 시각부터 시작 (과거 몫 누적 방지)
+                flow.vtime = max(flow.vtime, self._virtual_clock)
+            flow.waiters.append(waiter)
+            self._dispatch_locked()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._finish_locked(flow)
+                else:
+                    flow.waiters.remove(waiter)
+                    self._drop_flow_if_idle(flow)
+                self._dispatch_locked()
+            raise
+
+        wait_time = time.monotonic() - waiter.enqueued_at
+        metrics.SCHEDULER_WAIT_SECONDS.observe(wait_time)
+        tracer.record_span("stt_scheduler.wait", time.time() - wait_time, emp_id=emp_id)
+        return flow, wait_time
+
+    def _release(self, ticket: SlotTicket) -> None:
+        """슬롯 반납 + 보고된 결과로 한도 조정"""
+        ticket._held = False
+        with self._lock:
+            self._finish_locked(ticket._flow)
+            self._adjust_limit_locked(ticket)
+            self._dispatch_locked()
+
+    async def _requeue(self, ticket: SlotTicket, delay: float) -> None:
+        """SlotTicket.requeue() 본체 (반납 → delay초 대기 → 같은 사번/작업 대기열로 재진입)"""
+        flow = ticket._flow
+        self._release(ticket)
+        with self._lock:
+            self._stats["requeued"] += 1
+        logger.warning(f"[Scheduler] STT API {ticket.api_status} → {delay:.1f}초 후 재시도 "
+                       f"(emp_id={flow.emp_id}, job_id={flow.job_id})")
+        await asyncio.sleep(delay)
+
+        ticket.api_status = ticket.api_elapsed = ticket.audio_duration = ticket.retry_after = None
+        ticket._flow, wait_time = await self._acquire(flow.emp_id, flow.job_id, ticket._job_size)
+        ticket.wait_time += delay + wait_time
+        ticket._held = True
+
+    def _get_flow(self, emp_id: str, job_id: str, job_size: int) -> _Flow:
+        key = (emp_id, job_id)
+        flow = self._flows.get(key)
+        if flow is None:
+            weight = STT_SCHEDULER_SMALL_JOB_WEIGHT if job_size <= STT_SCHEDULER_SMALL_JOB_FILES else 1.0
+            flow = _Flow(emp_id, job_id, weight)
+            self._flows[key] = flow
+        return flow
+
+    def _drop_flow_if_idle(self, flow: _Flow) -> None:
+        if not flow.waiters and flow.in_flight == 0:
+            self._flows.pop((flow.emp_id, flow.job_id), None)
+
+    def _finish_locked(self, flow: _Flow) -> None:
+        flow.in_flight -= 1
+        self._in_flight -= 1
+        self._stats["completed"] += 1
+        self._drop_flow_if_idle(flow)
+
+    def _dispatch_locked(self) -> None:
+        """한도 내에서 가상 시각이 가장 앞선 대기열부터 슬롯 배정"""
+        while self._in_flight < max(STT_SCHEDULER_MIN_INFLIGHT, int(self._limit)):
+            candidates = [f for f in self._flows.values() if f.waiters]
+            if not candidates:
+                return
+
+            flow = min(candidates, key=lambda f: (f.vtime, f.waiters[0].enqueued_at))
+            waiter = flow.waiters.popleft()
+
+            # 사번 하나의 몫을 그 사번의 활성 작업 수로 나눔
+            active_jobs = sum(
+                1 for f in self._flows.values()
+                if f.emp_id == flow.emp_id and (f.waiters or f.in_flight or f is flow)
+            )
+            self._virtual_clock = flow.vtime
+            flow.vtime += active_jobs / flow.weight
+
+            flow.in_flight += 1
+            self._in_flight += 1
+            waiter.granted = True
+            try:
+                waiter.loop.call_soon_threadsafe(self._wake, waiter.future)
+            except RuntimeError:
+                # 대기자의 이벤트 루프가 이미 종료됨 → 배정 취소
+                waiter.granted = False
+                flow.in_flight -= 1
+                self._in_flight -= 1
+                self._drop_flow_if_idle(flow)
+                continue
+            self._stats["granted"] += 1
+
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    # ========================================================================
+    # 동시 요청 한도 조정 (AIMD)
+    # ========================================================================
+
+    def _decrease_locked(self, factor: float, reason: str) -> None:
+        """승산 감소 (최근 지연 시간 안에 한 번만 적용해 동시 실패로 급감하지 않도록 함)"""
+        now = time.monotonic()
+        if now - self._last_decrease < max(1.0, self._last_elapsed):
+            return
+        self._last_decrease = now
+        previous = self._limit
+        self._limit = max(float(STT_SCHEDULER_MIN_INFLIGHT), self._limit * factor)
+        logger.warning(f"[Scheduler] 동시 요청 한도 감소: {previous:.2f} → {self._limit:.2f} ({reason})")
+
+    def _adjust_limit_locked(self, ticket: SlotTicket) -> None:
+        status = ticket.api_status
+        if status is None:
+            return
+
+        if status in _OVERLOAD_STATUSES:
+            self._stats["overloads"] += 1
+            self._decrease_locked(STT_SCHEDULER_BACKOFF, f"STT API {status}")
+            return
+
+        if status != 200 or ticket.api_elapsed is None:
+            return
+
+        self._last_elapsed = ticket.api_elapsed
+
+        # 오디오 길이가 있으면 초당 처리 시간으로 정규화 (파일 길이 차이 보정)
+        latency = ticket.api_elapsed
+        if ticket.audio_duration:
+            latency = ticket.api_elapsed / max(ticket.audio_duration, 1.0)
+
+        self._latency_ewma = latency if self._latency_ewma is None else (
+            _LATENCY_ALPHA * latency + (1 - _LATENCY_ALPHA) * self._latency_ewma
+        )
+        if self._latency_floor is None or self._latency_ewma < self._latency_floor:
+            self._latency_floor = self._latency_ewma
+        else:
+            self._latency_floor *= _LATENCY_FLOOR_DRIFT
+
+        if self._latency_ewma > self._latency_floor * STT_SCHEDULER_LATENCY_TOLERANCE:
+            self._stats["latency_backoffs"] += 1
+            self._decrease_locked(0.9, f"지연 증가 {self._latency_ewma:.2f}/{self._latency_floor:.2f}")
+            return
+
+        # 가산 증가: 한도만큼 완료될 때마다 약 +1
+        if self._limit < self._capacity:
+            self._limit = min(float(self._capacity), self._limit + 1.0 / self._limit)
+
+    async def _maybe_refresh_capacity(self) -> None:
+        """STT API 슬롯 상태를 주기적으로 조회해 상한/한도에 반영"""
+        with self._lock:
+            now = time.monotonic()
+            if self._capacity_polling or now - self._last_capacity_poll < STT_SCHEDULER_CAPACITY_POLL_SEC:
+                return
+            self._capacity_polling = True
+            self._last_capacity_poll = now
+
+        slots = None
+        try:
+            slots = await stt_service.get_capacity()
+        finally:
+            with self._lock:
+                self._capacity_polling = False
+                if slots and slots.get("max"):
+                    self._capacity = max(STT_SCHEDULER_MIN_INFLIGHT, int(slots["max"]))
+                    self._limit = min(self._limit, float(self._capacity))
+                    if slots.get("waiting", 0) > 0:
+                        # STT API 내부 대기열이 생김 → 이미 포화 상태
+                        self._decrease_locked(STT_SCHEDULER_BACKOFF, f"STT API 대기 {slots['waiting']}건")
+                self._dispatch_locked()
+
+    # ========================================================================
+    # 상태 조회
+    # ========================================================================
+
+    def get_stats(self) -> dict:
+        """
+        스케줄러 상태 조회
+
+        Returns:
+            {"limit": float, "in_flight": int, "queued": int, "capacity": int, "flows": [...], ...}
+        """
+        with self._lock:
+            flows = [
+                {
+                    "emp_id": f.emp_id,
+                    "job_id": f.job_id,
+                    "weight": f.weight,
+                    "waiting": len(f.waiters),
+                    "in_flight": f.in_flight
+                }
+                for f in self._flows.values()
+            ]
+            return {
+                "limit": round(self._limit, 2),
+                "in_flight": self._in_flight,
+                "queued": sum(flow["waiting"] for flow in flows),
+                "capacity": self._capacity,
+                "latency_ewma": self._latency_ewma,
+                "latency_floor": self._latency_floor,
+                "flows": flows,
+                **self._stats
+            }
+
+
+# 전역 인스턴스 생성
+stt_scheduler = STTScheduler()
+
+metrics.SCHEDULER_IN_FLIGHT.set_function(lambda: stt_scheduler._in_flight)
+metrics.SCHEDULER_QUEUED.set_function(lambda: stt_scheduler.get_stats()["queued"])
+metrics.SCHEDULER_LIMIT.set_function(lambda: stt_scheduler._limit)
@@ -3,10 +3,14 @@ STT API와의 통신을 담당하는 서비스
 """
 import aiohttp
 import asyncio
+import json
 import logging
 import random
+import time
 from typing import Optional
-from config import STT_API_URL, STT_API_TIMEOUT
+from config import STT_API_URL, STT_API_TIMEOUT, STT_RESPONSE_EXCLUDE
+from app.metrics import STT_API_TRACE_CONFIGS
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +25,7 @@ class STTService:
     async def health_check(self) -> bool:
         """STT API 헬스 체크"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=STT_API_TRACE_CONFIGS) as session:
                 async with session.get(
                     f"{self.api_url}/health",
                     timeout=aiohttp.ClientTimeout(total=10)  # 10초: Docker 네트워크 지연 고려
@@ -36,6 +40,60 @@ class STTService:
         except Exception as e:
             logger.error(f"[STT Service] 헬스 체크 실패: {e}")
             return False
+
+    async def get_capacity(self) -> Optional[dict]:
+        """
+        STT API 동시 처리 슬롯 상태 조회 (/health의 slots 필드)
+
+        Returns:
+            {"max": 6, "in_use": 2, "waiting": 0} 또는 None (조회 실패/미지원)
+        """
+        try:
+            async with aiohttp.ClientSession(trace_configs=STT_API_TRACE_CONFIGS) as session:
+                async with session.get(
+                    f"{self.api_url}/health",
+                    timeout=aiohttp.ClientTimeout(total=3)
+                ) as response:
+                    if response.status != 200:
+                        return None
+                    data = await response.json()
+                    return data.get("slots")
+        except Exception as e:
+            logger.debug(f"[STT Service] 슬롯 상태 조회 실패: {e}")
+            return None
+
+    async def _read_transcribe_stream(self, response, on_event=None) -> dict:
+        """
+        /transcribe 스트리밍 응답(is_stream=true, NDJSON) 읽기
+        
+        Args:
+            response: aiohttp 응답 (status 200)
+            on_event: 이벤트마다 호출할 콜백 (event, data)
+        
+        Returns:
+            result 이벤트의 TranscribeResponse 딕셔너리 (error 이벤트 또는 결과 없이 종료 시 실패 딕셔너리)
+        """
+        buffer = b""
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                event, data = message.get("event"), message.get("data")
+                if on_event:
+                    on_event(event, data)
+                if event == "result":
+                    return data
+                if event == "error":
+                    return {"success": False, **data}
+        
+        return {
+            "success": False,
+            "error": "stream_incomplete",
+            "message": "스트리밍 응답이 결과 없이 종료됨"
+        }
     
     async def transcribe_local_file(
         self,
@@ -47,7 +105,8 @@ class STTService:
         classification: bool = False,
         element_detection: bool = True,
         agent_url: str = "",
-        agent_request_format: str = "text_only"
+        agent_request_format: str = "text_only",
+        fallback_dummy: bool = True
     ) -> dict:
         """
         로컬 파일을 STT API에 전달 (파일 경로 방식)
@@ -56,6 +115,9 @@ class STTService:
         - Web UI 경로: /app/data/uploads/... 
         - API 경로: /app/web_ui/data/uploads/... (마운트된 볼륨이 같음)
         
+        호출 구간을 span으로 기록하고 trace ID를 STT API로 전파합니다
+        (진행 중인 trace가 없으면 새 trace 시작).
+        
         Args:
             file_path: Web UI 컨테이너의 파일 경로 (/app/data/uploads/...)
             language: 언어 코드
@@ -66,10 +128,36 @@ class STTService:
             element_detection: 요소 탐지 여부 (항상 enabled)
             agent_url: Agent 서버 URL (element_detection용)
             agent_request_format: Agent 요청 형식 (text_only 또는 prompt_based)
+            fallback_dummy: API 실패 시 Dummy 응답 반환 여부
+                (False면 실패 딕셔너리 반환, 429/503은 retry_after 포함 → 스케줄러가 재시도)
         
         Returns:
-            처리 결과 딕셔너리 (processing_steps 포함)
+            처리 결과 딕셔너리 (processing_steps, trace_id 포함)
         """
+        with tracer.span("stt_service.transcribe_local_file", file=file_path.rsplit("/", 1)[-1]) as span:
+            result = await self._transcribe_local_file(
+                file_path, language, is_stream, backend, privacy_removal, classification,
+                element_detection, agent_url, agent_request_format, fallback_dummy
+            )
+            span.set(success=bool(result.get("success")), api_status=str(result.get("api_status", "")))
+        result["trace_id"] = span.trace_id
+        logger.info(f"[STT Service] trace_id={span.trace_id} ({span.duration:.2f}s)")
+        return result
+    
+    async def _transcribe_local_file(
+        self,
+        file_path: str,
+        language: str,
+        is_stream: bool,
+        backend: Optional[str],
+        privacy_removal: bool,
+        classification: bool,
+        element_detection: bool,
+        agent_url: str,
+        agent_request_format: str,
+        fallback_dummy: bool
+    ) -> dict:
+        """transcribe_local_file() 본체 (STT API 호출, 실패 시 Dummy 응답 또는 실패 딕셔너리)"""
         try:
             logger.info(f"[STT Service] 파일 처리 시작: {file_path}")
             logger.info(f"  - 언어: {language}, 스트림: {is_stream}, 백엔드: {backend}")
@@ -90,7 +178,7 @@ class STTService:
             
             logger.info(f"[STT Service] API 파일 경로: {api_file_path}")
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=STT_API_TRACE_CONFIGS) as session:
                 data = aiohttp.FormData()
                 data.add_field("file_path", api_file_path)
                 data.add_field("language", language)
@@ -110,11 +198,17 @@ class STTService:
                 if backend:
                     data.add_field("backend", backend)
                 
+                # 분석 결과 저장에 쓰지 않는 필드는 받지 않음 (응답은 aiohttp가 gzip 자동 해제)
+                if STT_RESPONSE_EXCLUDE:
+                    data.add_field("exclude", STT_RESPONSE_EXCLUDE)
+                
                 estimated_timeout = max(600, self.timeout)
                 logger.info(f"[STT Service] API URL: {self.api_url}/transcribe")
                 logger.info(f"[STT Service] API 타임아웃: {estimated_timeout}초")
                 logger.info(f"[STT Service] 요청 파라미터: language={language}, is_stream={is_stream}, backend={backend}")
                 
+                # api_status / api_elapsed_sec: 스케줄러가 STT API 부하를 판단하는 데 사용
+                request_start = time.monotonic()
                 try:
                     logger.debug(f"[STT Service] POST 요청: {self.api_url}/transcribe")
                     logger.info(f"[STT Service] API 호출 대기 중... (타임아웃: {estimated_timeout}초)")
@@ -123,10 +217,15 @@ class STTService:
                         data=data,
                         timeout=aiohttp.ClientTimeout(total=estimated_timeout)
                     ) as response:
-                        logger.info(f"[STT Service] API 응답 수신: status={response.status}")
+                        api_elapsed = time.monotonic() - request_start
+                        logger.info(f"[STT Service] API 응답 수신: status={response.status} ({api_elapsed:.2f}s)")
                         
                         try:
-                            result = await response.json()
+                            if is_stream and response.status == 200:
+                                result = await self._read_transcribe_stream(response)
+                                api_elapsed = time.monotonic() - request_start
+                            else:
+                                result = await response.json()
                         except Exception as json_err:
                             logger.error(f"[STT Service] JSON 파싱 실패: {json_err}")
                             response_text = await response.text()
@@ -134,7 +233,9 @@ class STTService:
                             return {
                                 "success": False,
                                 "error": "json_parse_error",
-                                "message": f"응답 파싱 오류: {str(json_err)}"
+                                "message": f"응답 파싱 오류: {str(json_err)}",
+                                "api_status": response.status,
+                                "api_elapsed_sec": api_elapsed
                             }
                         
                         logger.info(f"[STT Service] JSON 파싱 완료")
@@ -155,25 +256,40 @@ class STTService:
                                     element_result = result.get('element_detection', {})
                                     detected_yn = element_result.get('detected_yn', 'N')
                                     logger.info(f"[STT Service] 요소 탐지 완료: detected_yn={detected_yn}")
+                            result["api_status"] = response.status
+                            result["api_elapsed_sec"] = api_elapsed
                             return result
                         else:
                             logger.error(f"[STT Service] HTTP {response.status} 에러")
                             logger.error(f"[STT Service] 응답 내용: {result}")
-                            logger.info(f"[STT Service] Dummy 응답 반환 (API 에러)")
-                            return await self._get_dummy_response(language, file_path)
+                            detail = result.get("detail") if isinstance(result, dict) else None
+                            return await self._failure_response(
+                                fallback_dummy, language, file_path,
+                                "stt_overloaded" if response.status in (429, 503) else "api_error",
+                                str(detail or f"HTTP {response.status}"),
+                                response.status, api_elapsed,
+                                retry_after=self._parse_retry_after(response.headers.get("Retry-After"))
+                            )
                 
                 except asyncio.TimeoutError:
                     logger.error(f"[STT Service] API 타임아웃 ({estimated_timeout}초): {api_file_path}")
-                    logger.info(f"[STT Service] Dummy 응답 반환 (타임아웃)")
-                    return await self._get_dummy_response(language, file_path)
+                    return await self._failure_response(
+                        fallback_dummy, language, file_path, "timeout",
+                        f"API 처리 시간 초과 ({estimated_timeout}초)",
+                        "timeout", time.monotonic() - request_start
+                    )
                 except aiohttp.ClientError as client_err:
                     logger.error(f"[STT Service] HTTP 클라이언트 오류: {type(client_err).__name__}: {client_err}")
-                    logger.info(f"[STT Service] Dummy 응답 반환 (연결 실패)")
-                    return await self._get_dummy_response(language, file_path)
+                    return await self._failure_response(
+                        fallback_dummy, language, file_path, "connection_error", str(client_err),
+                        "connection_error", time.monotonic() - request_start
+                    )
                 except Exception as ae:
                     logger.error(f"[STT Service] API 통신 오류: {type(ae).__name__}: {ae}", exc_info=True)
-                    logger.info(f"[STT Service] Dummy 응답 반환 (예외 발생)")
-                    return await self._get_dummy_response(language, file_path)
+                    if fallback_dummy:
+                        logger.info(f"[STT Service] Dummy 응답 반환 (예외 발생)")
+                        return await self._get_dummy_response(language, file_path)
+                    return {"success": False, "error": "api_error", "message": str(ae)}
         
         except Exception as e:
             logger.error(f"[STT Service] 파일 처리 오류: {type(e).__name__}: {e}", exc_info=True)
@@ -184,10 +300,66 @@ class STTService:
                 "message": str(e)
             }
     
+    async def _failure_response(
+        self,
+        fallback_dummy: bool,
+        language: str,
+        file_path: str,
+        error: str,
+        message: str,
+        api_status,
+        api_elapsed: float,
+        retry_after: Optional[float] = None
+    ) -> dict:
+        """
+        STT API 실패 응답 구성
+        
+        Args:
+            fallback_dummy: True면 Dummy 응답 (개발/테스트), False면 실패 딕셔너리
+            error / message: 실패 코드 / 메시지
+            api_status: HTTP 상태 코드 또는 "timeout" / "connection_error" (스케줄러 부하 판단용)
+            api_elapsed: API 호출 시간 (초)
+            retry_after: 서버가 알려준 재시도 대기 시간 (초, Retry-After 헤더)
+        """
+        if fallback_dummy:
+            logger.info(f"[STT Service] Dummy 응답 반환 ({error})")
+            result = await self._get_dummy_response(language, file_path)
+        else:
+            result = {"success": False, "error": error, "message": message}
+            if retry_after is not None:
+                result["retry_after"] = retry_after
+        result["api_status"] = api_status
+        result["api_elapsed_sec"] = api_elapsed
+        return result
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After 헤더 (초 단위만 지원, HTTP-date 등은 None)"""
+        try:
+            return max(float(value), 0.0) if value else None
+        except ValueError:
+            return None
+    
+    async def get_trace_spans(self, trace_id: str) -> list:
+        """STT API에 기록된 trace의 span 목록 (/debug/trace/{id}?format=spans, 없거나 실패 시 빈 리스트)"""
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(
+                    f"{self.api_url}/debug/trace/{trace_id}",
+                    params={"format": "spans"},
+                    timeout=aiohttp.ClientTimeout(total=5)
+                ) as response:
+                    if response.status != 200:
+                        return []
+                    return (await response.json()).get("spans", [])
+        except Exception as e:
+            logger.warning(f"[STT Service] trace 조회 실패: {type(e).__name__}: {e}")
+            return []
+    
     async def get_backend_info(self) -> dict:
         """STT API 백엔드 정보 조회"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=STT_API_TRACE_CONFIGS) as session:
                 async with session.get(
                     f"{self.api_url}/backend/current",
                     timeout=aiohttp.ClientTimeout(total=5)
@@ -197,6 +369,24 @@ class STTService:
             logger.error(f"[STT Service] 백엔드 정보 조회 실패: {e}")
             return {}
     
+    @staticmethod
+    def _update_stream_progress(job, stream_state: dict, event: str, data: dict) -> None:
+        """
+        스트리밍 이벤트로 작업 진행률 갱신
+        
+        STT 구간(15~80%)은 마지막 세그먼트 끝 시각 / 오디오 길이, 후처리 단계는 단계마다 증가
+        """
+        if event == "start":
+            stream_state["duration"] = data.get("duration") or 0
+        elif event == "segment":
+            duration = stream_state.get("duration")
+            if duration:
+                job.progress = max(job.progress, 15 + int(65 * min(1.0, data.get("end", 0) / duration)))
+        elif event == "stt_done":
+            job.progress = max(job.progress, 80)
+        elif event in ("privacy_removal", "classification", "element_detection"):
+            job.progress = min(89, max(job.progress, 80) + 3)
+    
     async def process_transcribe_job(self, job, privacy_removal: bool = False, classification: bool = False, element_detection: bool = True, agent_url: str = "", agent_request_format: str = "text_only") -> dict:
         """
         비동기 작업 큐에서 호출되는 메서드
@@ -230,10 +420,10 @@ class STTService:
             
             logger.debug(f"[STT Service] 경로 변환: {file_path} -> {api_file_path}")
             
-            # 진행률 업데이트: 준비 중
+            # 진행률 업데이트: 준비 중 (is_stream이면 이후 세그먼트 수신에 따라 갱신)
             job.progress = 15
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=STT_API_TRACE_CONFIGS) as session:
                 data = aiohttp.FormData()
                 data.add_field("file_path", api_file_path)
                 data.add_field("language", job.language)
@@ -260,7 +450,14 @@ class STTService:
                         logger.info(f"[STT Service] API 응답 수신: status={response.status} (job: {job.job_id})")
                         
                         try:
-                            result = await response.json()
+                            if job.is_stream and response.status == 200:
+                                stream_state = {}
+                                result = await self._read_transcribe_stream(
+                                    response,
+                                    on_event=lambda event, data: self._update_stream_progress(job, stream_state, event, data)
+                                )
+                            else:
+                                result = await response.json()
                         except Exception as json_err:
                             logger.error(f"[STT Service] JSON 파싱 실패 (job: {job.job_id}): {json_err}")
                             return {
@@ -362,7 +559,7 @@ class STTService:
             
             logger.info(f"[Privacy Removal] 처리 시작: {len(text)} 글자, 프롬프트: {prompt_type}")
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=STT_API_TRACE_CONFIGS) as session:
                 payload = {
                     "text": text,
                     "prompt_type": prompt_type
@@ -7,12 +7,19 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from app.models.database import Base
 from config import DATABASE_URL
+from app.metrics import DB_WRITE_SECONDS
+from utils.tracing import tracer
 import logging
 import time
 
 # 성능 측정 로거 설정
 perf_logger = logging.getLogger("performance")
 
+# 쓰기 지연 메트릭 대상 (문장 첫 단어)
+_WRITE_OPERATIONS = {"INSERT": DB_WRITE_SECONDS.labels("insert"),
+                     "UPDATE": DB_WRITE_SECONDS.labels("update"),
+                     "DELETE": DB_WRITE_SECONDS.labels("delete")}
+
 # 데이터베이스 엔진 생성
 # SQLite 사용 시 check_same_thread=False 필수 (멀티스레드 환경에서)
 engine = create_engine(
@@ -30,8 +37,17 @@ def receive_before_cursor_execute(conn, cursor, statement, parameters, context,
 @event.listens_for(engine, "after_cursor_execute")
 def receive_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     """쿼리 실행 후 소요 시간 기록"""
-    total_time = time.time() - conn.info['query_start_time'].pop(-1)
+    start_time = conn.info['query_start_time'].pop(-1)
+    total_time = time.time() - start_time
     perf_logger.debug(f"Query execution time: {total_time:.3f}s")
+    operation = statement[:6].upper()
+    histogram = _WRITE_OPERATIONS.get(operation)
+    if histogram is not None:
+        histogram.observe(total_time)
+        # 분석 파일 처리 중이면 해당 trace에 DB 쓰기 구간 기록 (UPDATE t / INSERT INTO t / DELETE FROM t)
+        words = statement.split(None, 3)
+        table = words[1 if operation == "UPDATE" else 2] if len(words) > 2 else ""
+        tracer.record_span("db.write", start_time, operation=operation.lower(), table=table.strip('"'))
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,186 @@
+"""
+HTTP Range 요청 지원 파일 응답
+오디오 탐색(seek) 시 전체 파일을 다시 받지 않도록 206 Partial Content 제공
+
+- Range: bytes=start-end / bytes=start- / bytes=-suffix (단일 범위)
+- ETag / Last-Modified 기반 조건부 요청 (304 Not Modified)
+- If-Range 검증 실패 시 전체 파일(200) 응답
+"""
+
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+
+# 스트리밍 청크 크기 (64KB)
+CHUNK_SIZE = 64 * 1024
+
+
+def make_etag(stat_result: os.stat_result) -> str:
+    """
+    파일 크기와 수정 시간으로 강한(strong) ETag 생성
+
+    Args:
+        stat_result: os.stat() 결과
+
+    Returns:
+        str: '"<size>-<mtime_ns>"' 형식 ETag
+    """
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range_header(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더 파싱 (단일 byte range만 지원)
+
+    Args:
+        range_header: "bytes=0-1023" 형식의 헤더 값
+        file_size: 파일 크기 (bytes)
+
+    Returns:
+        (start, end) 포함 범위.
+        다중 범위, 지원하지 않는 단위, 형식이 잘못된 헤더(숫자 아님, end < start)는 None (전체 응답, RFC 9110 14.2)
+
+    Raises:
+        ValueError: 형식은 맞지만 만족할 수 없는 범위 (416)
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, sep, end_str = spec.strip().partition("-")
+    start_str, end_str = start_str.strip(), end_str.strip()
+    if not sep or not (start_str or end_str):
+        return None
+    if (start_str and not start_str.isdigit()) or (end_str and not end_str.isdigit()):
+        return None
+
+    if start_str == "":
+        # bytes=-500 → 마지막 500 bytes
+        suffix = int(end_str)
+        if suffix == 0 or file_size == 0:
+            raise ValueError(f"만족할 수 없는 범위: {range_header} (size={file_size})")
+        return max(0, file_size - suffix), file_size - 1
+
+    start = int(start_str)
+    if end_str and int(end_str) < start:
+        return None
+    if start >= file_size:
+        raise ValueError(f"만족할 수 없는 범위: {range_header} (size={file_size})")
+    end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+    return start, end
+
+
+def _is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """If-None-Match / If-Modified-Since 조건 확인"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def _if_range_matches(request: Request, etag: str, last_modified: str) -> bool:
+    """If-Range 검증 (없으면 True)"""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    return if_range.strip() in (etag, last_modified)
+
+
+def _iter_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    """파일의 [start, start+length) 구간을 CHUNK_SIZE 단위로 읽기"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def build_range_response(
+    request: Request,
+    file_path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    max_age: int = 3600
+) -> Response:
+    """
+    Range / 조건부 요청을 처리하는 파일 응답 생성
+
+    Args:
+        request: FastAPI 요청
+        file_path: 응답할 파일 경로
+        media_type: Content-Type
+        filename: Content-Disposition에 사용할 파일명 (선택)
+        max_age: Cache-Control max-age (초)
+
+    Returns:
+        Response: 200 / 206 / 304 응답
+
+    Raises:
+        HTTPException: 416 Range Not Satisfiable
+    """
+    stat_result = file_path.stat()
+    file_size = stat_result.st_size
+    etag = make_etag(stat_result)
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": f"private, max-age={max_age}",
+    }
+    if filename:
+        headers["Content-Disposition"] = f"inline; filename*=utf-8''{quote(filename)}"
+
+    if _is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range_header(range_header, file_size)
+        except ValueError:
+            raise HTTPException(
+                status_code=416,
+                detail="요청한 범위를 제공할 수 없습니다",
+                headers={"Content-Range": f"bytes */{file_size}"}
+            )
+
+    if byte_range is None:
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(
+            _iter_file(file_path, 0, file_size),
+            status_code=200,
+            media_type=media_type,
+            headers=headers
+        )
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    return StreamingResponse(
+        _iter_file(file_path, start, length),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
@@ -23,6 +23,8 @@ else:
     DATA_DIR = BASE_DIR / "data"
 
 UPLOAD_DIR = DATA_DIR / "uploads"
+# 콘텐츠 해시 기반 blob 저장소 (폴더의 파일은 이 blob에 대한 하드링크)
+BLOB_DIR = UPLOAD_DIR / ".blobs"
 RESULT_DIR = DATA_DIR / "results"
 BATCH_INPUT_DIR = DATA_DIR / "batch_input"
 DB_PATH = DATA_DIR / "db.sqlite"
@@ -61,6 +63,7 @@ AI_AGENTS = {
 
 # 디렉토리 생성
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+BLOB_DIR.mkdir(parents=True, exist_ok=True)
 RESULT_DIR.mkdir(parents=True, exist_ok=True)
 BATCH_INPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -72,23 +75,83 @@ WEB_PORT = int(os.getenv("WEB_PORT", 8100))
 STT_API_URL = os.getenv("STT_API_URL", "http://localhost:8003")
 STT_API_TIMEOUT = int(os.getenv("STT_API_TIMEOUT", 300))
 
+# STT_RESPONSE_EXCLUDE: 분석 작업의 /transcribe 호출에서 응답에서 뺄 필드 (쉼표 구분, 분석 결과 저장에 쓰지 않는 필드)
+# 기본: segments(원문을 구간별로 다시 담음), memory_info, performance / 빈 문자열이면 전체 응답
+STT_RESPONSE_EXCLUDE = os.getenv("STT_RESPONSE_EXCLUDE", "segments,memory_info,performance")
+
 # 파일 업로드 설정
 # MAX_UPLOAD_SIZE_MB: 무제한 (환경변수로 제한 설정 가능, 예: MAX_UPLOAD_SIZE_MB=5000)
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", 999999))  # 무제한 (약 1000TB)
 ALLOWED_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg"}
 
+# 오디오 미리보기 설정 (분석 페이지 파형/탐색)
+# WAVEFORM_PEAKS_PER_SECOND: 캐시되는 파형 해상도 (초당 min/max 구간 수)
+# PREVIEW_AUDIO_BITRATE: 저비트레이트 미리보기 MP3 비트레이트 (ffmpeg 필요)
+WAVEFORM_PEAKS_PER_SECOND = float(os.getenv("WAVEFORM_PEAKS_PER_SECOND", 10))
+PREVIEW_AUDIO_BITRATE = os.getenv("PREVIEW_AUDIO_BITRATE", "32k")
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
 # 배치 처리 설정
 BATCH_PARALLEL_COUNT = int(os.getenv("BATCH_PARALLEL_COUNT", 2))
 BATCH_CHECK_INTERVAL = int(os.getenv("BATCH_CHECK_INTERVAL", 5))  # 초
 
 # 분석 작업 동시 처리 설정
-# 분석 중 동시에 처리할 최대 파일 개수 (기본값: 2)
+# STT API 스케줄러의 초기 동시 요청 한도 (기본값: 2, 이후 STT API 상태에 따라 자동 조절)
 # 환경변수: MAX_CONCURRENT_ANALYSIS (예: 1, 2, 3, 4)
 MAX_CONCURRENT_ANALYSIS = int(os.getenv("MAX_CONCURRENT_ANALYSIS", 2))
 
+# STT API 요청 스케줄러 (모든 사용자/작업이 공유하는 동시 요청 한도)
+# STT_SCHEDULER_MAX_INFLIGHT: 동시 요청 상한 (STT API /health의 slots.max를 받으면 그 값으로 대체)
+# STT_SCHEDULER_SMALL_JOB_FILES / _WEIGHT: 파일 수가 이 값 이하인 작업(재실행 등)의 우선 가중치
+# STT_SCHEDULER_BACKOFF: 429/503/타임아웃 시 한도 감소 비율
+# STT_SCHEDULER_LATENCY_TOLERANCE: 최저 지연 대비 이 배수를 넘으면 한도 감소
+# STT_SCHEDULER_CAPACITY_POLL_SEC: STT API 슬롯 상태 조회 주기 (초)
+# STT_SCHEDULER_OVERLOAD_RETRIES: 과부하(429/503/타임아웃) 응답 시 슬롯을 반납하고 다시 대기하는 최대 횟수
+# STT_SCHEDULER_RETRY_BASE_SEC / _MAX_SEC: Retry-After가 없을 때 재시도 대기 (지수 증가, 최대값)
+STT_SCHEDULER_INITIAL_LIMIT = int(os.getenv("STT_SCHEDULER_INITIAL_LIMIT", MAX_CONCURRENT_ANALYSIS))
+STT_SCHEDULER_MIN_INFLIGHT = int(os.getenv("STT_SCHEDULER_MIN_INFLIGHT", 1))
+STT_SCHEDULER_MAX_INFLIGHT = int(os.getenv("STT_SCHEDULER_MAX_INFLIGHT", 6))
+STT_SCHEDULER_SMALL_JOB_FILES = int(os.getenv("STT_SCHEDULER_SMALL_JOB_FILES", 10))
+STT_SCHEDULER_SMALL_JOB_WEIGHT = float(os.getenv("STT_SCHEDULER_SMALL_JOB_WEIGHT", 4.0))
+STT_SCHEDULER_BACKOFF = float(os.getenv("STT_SCHEDULER_BACKOFF", 0.5))
+STT_SCHEDULER_LATENCY_TOLERANCE = float(os.getenv("STT_SCHEDULER_LATENCY_TOLERANCE", 2.0))
+STT_SCHEDULER_CAPACITY_POLL_SEC = float(os.getenv("STT_SCHEDULER_CAPACITY_POLL_SEC", 30))
+STT_SCHEDULER_OVERLOAD_RETRIES = int(os.getenv("STT_SCHEDULER_OVERLOAD_RETRIES", 3))
+STT_SCHEDULER_RETRY_BASE_SEC = float(os.getenv("STT_SCHEDULER_RETRY_BASE_SEC", 5))
+STT_SCHEDULER_RETRY_MAX_SEC = float(os.getenv("STT_SCHEDULER_RETRY_MAX_SEC", 120))
+
+# 분석 결과 내보내기 설정
+# EXPORT_FETCH_SIZE: 서버 측 커서에서 한 번에 가져올 행 수 (메모리 사용량 상한)
+# EXPORT_GZIP_LEVEL: CSV gzip 압축 레벨 (1=빠름 ~ 9=최대 압축)
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", 500))
+EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", 6))
+
+# 분석 결과 목록 STT 미리보기 글자 수 (전문은 상세 조회 API로 제공)
+RESULT_PREVIEW_CHARS = int(os.getenv("RESULT_PREVIEW_CHARS", 200))
+
 # 로깅 설정
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FORMAT = "[%(asctime)s] %(levelname)s - %(name)s - %(message)s"
+# LOG_DIR: 로그 디렉토리 (기본: 현재 디렉토리의 logs)
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+# 콘솔/파일 출력은 리스너 스레드에서 처리 (utils/logging_pipeline.py)
+# LOG_JSON: JSON 1줄 형식 출력 / LOG_QUEUE_SIZE: 출력 대기 레코드 수 한도 (초과분은 버림)
+# LOG_RATE_LIMITS: 로거별 초당 최대 INFO/DEBUG 레코드 수 (예: app.services=50,*=200)
+# LOG_LEVELS: 로거별 레벨 (예: app.services.stt_service=DEBUG,sqlalchemy=WARNING)
+LOG_JSON = os.getenv("LOG_JSON", "false").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+# 요청 추적 (분석 파일 1개 = trace 1개, STT API로 traceparent 헤더 전파)
+# TRACING_ENABLED: span 기록 여부 (false여도 헤더 전파는 유지)
+# TRACE_EXPORT_FILE: span JSONL 파일 (빈 문자열이면 사용 안 함)
+# TRACE_OTLP_ENDPOINT: OTLP HTTP 수집기 주소 (예: http://otel-collector:4318)
+# TRACE_BUFFER_SIZE: /debug/trace/{id}로 조회할 수 있는 최근 trace 수
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE", "logs/traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", 500))
 
 # 데이터베이스 설정
 DATABASE_URL = f"sqlite:///{DB_PATH}"
@@ -14,6 +14,11 @@ if [ "${RUN_MIGRATIONS}" = "true" ]; then
     else
         echo "⚠️  마이그레이션 파일이 없습니다: /app/migrations/add_result_status.py"
     fi
+    if [ -f /app/migrations/add_file_content_hash.py ]; then
+        python /app/migrations/add_file_content_hash.py || {
+            echo "⚠️  마이그레이션 경고 (무시하고 계속): $?"
+        }
+    fi
 else
     echo "⏭️  마이그레이션 스킵 (RUN_MIGRATIONS=true로 설정하면 실행됨)"
 fi
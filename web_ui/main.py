@@ -28,7 +28,8 @@ from config import (
     CORS_ORIGINS,
     UPLOAD_DIR, RESULT_DIR, BATCH_INPUT_DIR,
     STT_API_URL,
-    SESSION_SECRET_KEY
+    SESSION_SECRET_KEY,
+    TRACING_ENABLED, TRACE_EXPORT_FILE, TRACE_OTLP_ENDPOINT, TRACE_BUFFER_SIZE
 )
 # Phase 1: 인증 및 DB 임포트
 from app.utils.db import init_db
@@ -40,11 +41,24 @@ from app.routes import auth, files, analysis, admin, storage
 #     BatchProgressResponse
 # )
 from app.services.stt_service import stt_service
+from app.services.stt_scheduler import stt_scheduler  # noqa: F401 (스케줄러 게이지 등록)
+from utils.metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from utils import tracing
+from utils.tracing import tracer
 # from app.services.file_service import file_service
 # from app.services.batch_service import batch_service, FileStatus
 # from app.services.job_queue import transcribe_queue, JobStatus
 
 
+tracer.configure(
+    service="web-ui",
+    enabled=TRACING_ENABLED,
+    export_file=TRACE_EXPORT_FILE,
+    otlp_endpoint=TRACE_OTLP_ENDPOINT,
+    max_traces=TRACE_BUFFER_SIZE
+)
+
+
 # === 성능 모니터링 미들웨어 ===
 class PerformanceMiddleware(BaseHTTPMiddleware):
     """API 응답 시간 측정"""
@@ -253,6 +267,41 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus 메트릭 (스케줄러 대기, DB 쓰기, STT API 커넥션 대기, 프로세스 메모리)"""
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/debug/traces")
+async def debug_traces(limit: int = 20, min_ms: float = 0.0):
+    """최근 분석 파일 trace 목록 (최신순, min_ms 이상 걸린 것만)"""
+    return {"traces": tracer.recent(limit, min_ms), "dropped": tracer.dropped}
+
+
+@app.get("/debug/trace/{trace_id}")
+async def debug_trace(trace_id: str, format: str = "json"):
+    """
+    trace 1건의 span 트리 (Web UI span + STT API span 병합)
+
+    trace ID는 분석 결과 stt_metadata.trace_id, STT API 응답 헤더 X-Trace-Id, 로그의 trace_id에서 확인
+
+    Args:
+        trace_id: trace ID
+        format: json (트리 + critical path) / text (워터폴)
+    """
+    if not tracing.is_trace_id(trace_id):
+        raise HTTPException(status_code=400, detail="trace ID는 32자리 16진수입니다")
+    spans = tracer.get_trace(trace_id)
+    known = {span["span_id"] for span in spans}
+    spans += [span for span in await stt_service.get_trace_spans(trace_id) if span["span_id"] not in known]
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"trace 없음 (만료되었거나 잘못된 ID): {trace_id}")
+    if format == "text":
+        return Response(tracing.render_text(spans), media_type="text/plain; charset=utf-8")
+    return tracing.trace_view(trace_id, spans)
+
+
 @app.get("/api/backend/current")
 async def get_backend_info():
     """STT API의 현재 백엔드 정보 조회"""
@@ -0,0 +1,77 @@
+"""
+Migration: Add content-addressed blob storage for uploaded files
+
+- Creates stored_blobs table (content_hash, size_bytes, ref_count)
+- Adds content_hash column to file_uploads table (with index)
+
+기존 업로드 레코드는 content_hash가 NULL로 남으며 독립 파일(레거시)로 취급된다.
+새로 업로드되는 파일부터 UPLOAD_DIR/.blobs 저장소를 공유한다.
+"""
+
+import sqlite3
+import os
+
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'db.sqlite')
+
+
+def migrate():
+    """Apply the migration"""
+    if not os.path.exists(DB_PATH):
+        print(f"⏭️  DB 파일이 없습니다: {DB_PATH}")
+        return
+    
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        print("🔄 Starting migration: add_file_content_hash")
+        
+        # 1. stored_blobs 테이블 생성
+        print("  Creating 'stored_blobs' table...")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stored_blobs (
+                id INTEGER PRIMARY KEY,
+                content_hash VARCHAR(64) NOT NULL UNIQUE,
+                size_bytes INTEGER NOT NULL,
+                ref_count INTEGER DEFAULT 0,
+                created_at DATETIME
+            );
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_stored_blobs_content_hash
+            ON stored_blobs(content_hash);
+        """)
+        print("  ✅ 'stored_blobs' table ready")
+        
+        # 2. file_uploads.content_hash 컬럼 추가
+        cursor.execute("PRAGMA table_info(file_uploads);")
+        columns = [row[1] for row in cursor.fetchall()]
+        
+        if 'content_hash' in columns:
+            print("  ✅ 'content_hash' column already exists")
+        else:
+            print("  Adding 'content_hash' column...")
+            cursor.execute("""
+                ALTER TABLE file_uploads
+                ADD COLUMN content_hash VARCHAR(64) REFERENCES stored_blobs(content_hash);
+            """)
+            print("  ✅ 'content_hash' column added")
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_file_uploads_content_hash
+            ON file_uploads(content_hash);
+        """)
+        
+        conn.commit()
+        print("✅ Migration completed successfully")
+        
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,12 @@
+"""
+Web UI 유틸리티
+
+metrics / tracing / logging_pipeline은 STT API와 같은 저장소 루트 utils/ 모듈을 사용합니다.
+이미지에는 Dockerfile이 ./utils/로 함께 복사하고, 소스 트리에서 실행할 때는 루트 utils/도 검색합니다.
+"""
+
+from pathlib import Path
+
+_SHARED_UTILS = Path(__file__).resolve().parent.parent.parent / "utils"
+if _SHARED_UTILS.is_dir():
+    __path__.append(str(_SHARED_UTILS))
@@ -1,59 +1,39 @@
 """
 로깅 설정
+
+콘솔/파일 핸들러는 리스너 스레드에서 실행됩니다 (utils/logging_pipeline.py).
 """
 import logging
-import logging.handlers
 from pathlib import Path
-from config import LOG_LEVEL, LOG_FORMAT
+from config import LOG_DIR as LOG_DIR_PATH, LOG_LEVEL, LOG_FORMAT, LOG_JSON, LOG_QUEUE_SIZE, LOG_RATE_LIMITS, LOG_LEVELS
+from utils.logging_pipeline import log_pipeline
 
 # 로그 디렉토리 생성
-LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
+LOG_DIR = Path(LOG_DIR_PATH)
+LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 # 기본 로거 설정
 def setup_logging():
     """로깅 초기화"""
     
-    # 루트 로거
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, LOG_LEVEL))
-    
-    # 포매터
-    formatter = logging.Formatter(LOG_FORMAT)
-    
-    # 콘솔 핸들러
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
-    # 파일 핸들러
-    file_handler = logging.handlers.RotatingFileHandler(
-        LOG_DIR / "web_ui.log",
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
+    # 루트 로거 (콘솔 + web_ui.log)
+    log_pipeline.configure(
+        file_name="web_ui.log",
+        level=LOG_LEVEL,
+        log_format=LOG_FORMAT,
+        json_format=LOG_JSON,
+        queue_size=LOG_QUEUE_SIZE,
+        rate_limits=LOG_RATE_LIMITS,
+        levels=LOG_LEVELS,
+        log_dir=str(LOG_DIR)
     )
-    file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
     
-    # 성능 모니터링 로거 (별도 파일)
+    # 성능 모니터링 로거 (별도 파일, 콘솔은 루트 로거로 전달)
     perf_logger = logging.getLogger("performance")
     perf_logger.setLevel(logging.INFO)
+    log_pipeline.add_file("performance", "performance.log", "%(asctime)s - %(message)s", log_dir=str(LOG_DIR))
     
-    perf_handler = logging.handlers.RotatingFileHandler(
-        LOG_DIR / "performance.log",
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    perf_formatter = logging.Formatter("%(asctime)s - %(message)s")
-    perf_handler.setFormatter(perf_formatter)
-    perf_logger.addHandler(perf_handler)
-    
-    # 콘솔에도 성능 로그 출력
-    perf_console = logging.StreamHandler()
-    perf_console.setFormatter(perf_formatter)
-    perf_logger.addHandler(perf_console)
-    
-    return root_logger
+    return logging.getLogger()
 
 
 # 초기화
@@ -63,4 +43,3 @@ setup_logging()
 def get_logger(name: str) -> logging.Logger:
     """로거 인스턴스 반환"""
     return logging.getLogger(name)
-